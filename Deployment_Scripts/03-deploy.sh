@@ -145,9 +145,11 @@ declare -A SERVICE_URLS
 # read-service
 # -----------------------------------------------------------------------------
 log ">>> Building read-service..."
-cd "$PIPELINE_PATH/read_service"
+# Built from the VidSynth directory so the image can include common/
+cd "$PIPELINE_PATH"
 
-gcloud builds submit --tag "${REGISTRY}/read-service"
+gcloud builds submit --config cloudbuild.yaml \
+    --substitutions "_SERVICE=read_service,_IMAGE=${REGISTRY}/read-service" .
 
 log ">>> Deploying read-service..."
 gcloud run deploy read-service \
@@ -167,9 +169,11 @@ log "read-service deployed: ${SERVICE_URLS["URL_READ"]}"
 # preprocess-service
 # -----------------------------------------------------------------------------
 log ">>> Building preprocess-service..."
-cd "$PIPELINE_PATH/preprocess_service"
+# Built from the VidSynth directory so the image can include common/
+cd "$PIPELINE_PATH"
 
-gcloud builds submit --tag "${REGISTRY}/preprocess-service"
+gcloud builds submit --config cloudbuild.yaml \
+    --substitutions "_SERVICE=preprocess_service,_IMAGE=${REGISTRY}/preprocess-service" .
 
 log ">>> Deploying preprocess-service..."
 gcloud run deploy preprocess-service \
@@ -190,9 +194,11 @@ log "preprocess-service deployed: ${SERVICE_URLS["URL_PREPROCESS"]}"
 # validate-service
 # -----------------------------------------------------------------------------
 log ">>> Building validate-service..."
-cd "$PIPELINE_PATH/validate_service"
+# Built from the VidSynth directory so the image can include common/
+cd "$PIPELINE_PATH"
 
-gcloud builds submit --tag "${REGISTRY}/validate-service"
+gcloud builds submit --config cloudbuild.yaml \
+    --substitutions "_SERVICE=validate_service,_IMAGE=${REGISTRY}/validate-service" .
 
 log ">>> Deploying validate-service..."
 gcloud run deploy validate-service \
@@ -213,9 +219,11 @@ log "validate-service deployed: ${SERVICE_URLS["URL_VALIDATE"]}"
 # push-service
 # -----------------------------------------------------------------------------
 log ">>> Building push-service..."
-cd "$PIPELINE_PATH/push_service"
+# Built from the VidSynth directory so the image can include common/
+cd "$PIPELINE_PATH"
 
-gcloud builds submit --tag "${REGISTRY}/push-service"
+gcloud builds submit --config cloudbuild.yaml \
+    --substitutions "_SERVICE=push_service,_IMAGE=${REGISTRY}/push-service" .
 
 log ">>> Deploying push-service..."
 gcloud run deploy push-service \
@@ -250,9 +258,11 @@ fi
 # -----------------------------------------------------------------------------
 if [ "$TGI_EXISTS" = true ]; then
     log ">>> Building llm-service (wrapper)..."
-    cd "$PIPELINE_PATH/llm_service"
+    # Built from the VidSynth directory so the image can include common/
+    cd "$PIPELINE_PATH"
     
-    gcloud builds submit --tag "${REGISTRY}/llm-service"
+    gcloud builds submit --config cloudbuild.yaml \
+        --substitutions "_SERVICE=llm_service,_IMAGE=${REGISTRY}/llm-service" .
     
     log ">>> Deploying llm-service with TGI_SERVICE_URL..."
     gcloud run deploy llm-service \
@@ -352,9 +362,11 @@ AIRFLOW_URI=$(gcloud composer environments describe "$COMPOSER_ENV" \
     --format="value(config.airflowUri)")
 
 log ">>> Building gateway-service..."
-cd "$PIPELINE_PATH/gateway_service"
+# Built from the VidSynth directory so the image can include common/
+cd "$PIPELINE_PATH"
 
-gcloud builds submit --tag "${REGISTRY}/gateway-service"
+gcloud builds submit --config cloudbuild.yaml \
+    --substitutions "_SERVICE=gateway_service,_IMAGE=${REGISTRY}/gateway-service" .
 
 log ">>> Deploying gateway-service with AIRFLOW_WEBSERVER_URL..."
 gcloud run deploy gateway-service \
@@ -364,6 +376,7 @@ gcloud run deploy gateway-service \
     --max-instances 3 \
     --memory 512Mi \
     --cpu 1 \
+    --no-cpu-throttling \
     --set-env-vars "AIRFLOW_WEBSERVER_URL=${AIRFLOW_URI}" \
     --allow-unauthenticated
 
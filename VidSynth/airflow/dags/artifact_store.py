@@ -0,0 +1,181 @@
+"""
+Artifact Store Module
+Claim-check storage for payloads passed between pipeline tasks.
+
+XCom lives in the Airflow metadata database, so passing full transcripts and
+comment blobs through it bloats Postgres and slows the scheduler. A task
+stash()es its output instead: payloads larger than VIDSYNTH_XCOM_INLINE_MAX_BYTES
+are written to the artifact store and replaced by a small reference that keeps
+a few metadata fields for the UI and for branching:
+
+    {"artifact": {"uri": ".../ab/<sha256>.json.gz", "sha256": "<sha256>", "bytes": 48213},
+     "video_id": "HAnw168huqA", "is_valid": true}
+
+The next task fetch()es its input, which returns small payloads unchanged and
+loads referenced ones. Artifacts are named by the SHA-256 of their content, so
+a retried task re-writing the same payload is a no-op.
+
+VIDSYNTH_ARTIFACT_ROOT is a directory shared by every worker (local-disk
+stand-in) or a gs://bucket/prefix. When it is unset, payloads stay inline.
+Nothing is deleted here; expire old artifacts with a bucket lifecycle rule
+or a periodic find -mtime on the directory.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+ARTIFACT_ROOT = os.getenv("VIDSYNTH_ARTIFACT_ROOT")
+XCOM_INLINE_MAX_BYTES = int(os.getenv("VIDSYNTH_XCOM_INLINE_MAX_BYTES", "8192"))
+
+# Kept on references so they stay readable in the Airflow UI and usable for branching
+REF_METADATA_KEYS = ("video_id", "video_link", "is_valid")
+
+
+def encode_payload(payload: Any) -> bytes:
+    """Canonical JSON, so equal payloads always hash the same."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def is_reference(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get("artifact"), dict) and "uri" in value["artifact"]
+
+
+class LocalArtifactStore:
+    """Artifacts as gzip files under root/<2 hex>/<sha256>.json.gz."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def put(self, digest: str, data: bytes) -> str:
+        directory = os.path.join(self.root, digest[:2])
+        path = os.path.join(directory, f"{digest}.json.gz")
+        if os.path.exists(path):
+            return path
+
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data, mtime=0))
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def get(self, uri: str) -> bytes:
+        with open(uri, "rb") as f:
+            return gzip.decompress(f.read())
+
+
+class GCSArtifactStore:
+    """Artifacts as gzip objects under gs://bucket/prefix/<2 hex>/<sha256>.json.gz."""
+
+    def __init__(self, bucket_name: str, prefix: str = "", client=None):
+        self.bucket_name = bucket_name
+        self.prefix = prefix.strip("/")
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from google.cloud import storage
+                    self._client = storage.Client()
+        return self._client
+
+    def put(self, digest: str, data: bytes) -> str:
+        from google.api_core.exceptions import PreconditionFailed
+        name = "/".join(p for p in (self.prefix, digest[:2], f"{digest}.json.gz") if p)
+        blob = self.client.bucket(self.bucket_name).blob(name)
+        try:
+            # Same name means same content: an existing object is already correct
+            blob.upload_from_string(gzip.compress(data, mtime=0), content_type="application/gzip", if_generation_match=0)
+        except PreconditionFailed:
+            pass
+        return f"gs://{self.bucket_name}/{name}"
+
+    def get(self, uri: str) -> bytes:
+        bucket_name, name = uri[len("gs://"):].split("/", 1)
+        blob = self.client.bucket(bucket_name).blob(name)
+        return gzip.decompress(blob.download_as_bytes(raw_download=True))
+
+
+def create_artifact_store(root: Optional[str]):
+    """Store for a local directory or gs://bucket/prefix root, or None when unset."""
+    if not root:
+        return None
+    if root.startswith("gs://"):
+        bucket_name, _, prefix = root[len("gs://"):].partition("/")
+        return GCSArtifactStore(bucket_name, prefix)
+    return LocalArtifactStore(root)
+
+
+_artifact_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """Get or create the process-wide store for ARTIFACT_ROOT (None when unset)."""
+    global _artifact_store
+    if _artifact_store is None and ARTIFACT_ROOT:
+        with _store_lock:
+            if _artifact_store is None:
+                _artifact_store = create_artifact_store(ARTIFACT_ROOT)
+                logger.info(f"Artifact store at {ARTIFACT_ROOT} (inline up to {XCOM_INLINE_MAX_BYTES} bytes)")
+    return _artifact_store
+
+
+def stash(payload: Any, store=None, max_inline_bytes: Optional[int] = None) -> Any:
+    """
+    Payload itself if it is small enough for XCom, otherwise a reference to a stored copy.
+
+    Args:
+        payload: JSON-serialisable task output
+        store: Artifact store (defaults to the one for VIDSYNTH_ARTIFACT_ROOT)
+        max_inline_bytes: Largest payload kept inline (defaults to VIDSYNTH_XCOM_INLINE_MAX_BYTES)
+    """
+    store = store or get_artifact_store()
+    limit = XCOM_INLINE_MAX_BYTES if max_inline_bytes is None else max_inline_bytes
+    if store is None or is_reference(payload):
+        return payload
+
+    data = encode_payload(payload)
+    if len(data) <= limit:
+        return payload
+
+    digest = hashlib.sha256(data).hexdigest()
+    uri = store.put(digest, data)
+    reference = {"artifact": {"uri": uri, "sha256": digest, "bytes": len(data)}}
+    if isinstance(payload, dict):
+        reference.update({key: payload[key] for key in REF_METADATA_KEYS if key in payload})
+    return reference
+
+
+def fetch(value: Any, store=None) -> Any:
+    """Payload a reference points to (checked against its hash), or value unchanged if it is not one."""
+    if not is_reference(value):
+        return value
+
+    artifact = value["artifact"]
+    uri = artifact["uri"]
+    # Stores read by full URI, so one of the right kind can read any artifact
+    store = store or get_artifact_store() or create_artifact_store(uri)
+    data = store.get(uri)
+    if hashlib.sha256(data).hexdigest() != artifact["sha256"]:
+        raise ValueError(f"Artifact {uri} does not match its sha256")
+    return json.loads(data)
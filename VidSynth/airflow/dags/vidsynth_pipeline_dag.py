@@ -1,7 +1,23 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 import pendulum
 import requests
 from airflow.decorators import dag, task
 from airflow.models.param import Param
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Claim check: large task outputs go to the artifact store, XCom carries references
+from artifact_store import fetch, stash
+# Shared with the gateway's in-process runner (VidSynth/common)
+from vidsynth_common.freshness import (
+    SKIPPABLE_STAGES, input_hash, last_ready_result, reuse_output, video_id_from_link, with_previous_comments
+)
+from vidsynth_common.stage_metrics import RunMetrics, parse_server_timing, stage_record
 
 # --- SERVICE URLS ---
 URL_READ = "YOUR_CLOUD_RUN_URL"
@@ -9,6 +25,310 @@ URL_PREPROCESS = "YOUR_CLOUD_RUN_URL"
 URL_LLM = "YOUR_CLOUD_RUN_URL"
 URL_VALIDATE = "YOUR_CLOUD_RUN_URL"
 URL_PUSH = "YOUR_CLOUD_RUN_URL"
+URL_TELEMETRY = "YOUR_CLOUD_RUN_URL"  # push_service /telemetry
+URL_READ_BATCH = "YOUR_CLOUD_RUN_URL"  # read_service /read/batch
+URL_EXPAND = "YOUR_CLOUD_RUN_URL"  # read_service /expand (playlist/channel links)
+URL_VALIDATE_BATCH = "YOUR_CLOUD_RUN_URL"  # validate_service /validate/batch
+URL_PUSH_BATCH = "YOUR_CLOUD_RUN_URL"  # push_service /push/batch
+URL_GATEWAY = "YOUR_CLOUD_RUN_URL"  # gateway_service base URL (GET /meta/{id}, /result/{id})
+
+# --- EXECUTION MODES ---
+# "fused": one task calls all five services back to back over a pooled session
+#          (no per-stage scheduling or XCom round trips; used for interactive runs)
+# "tasks": one Airflow task per service, for debugging and per-stage retries
+EXECUTION_MODES = ["fused", "tasks"]
+
+# Service calls before push, in order, and each call's timeout in seconds
+STAGES = [("read", URL_READ), ("preprocess", URL_PREPROCESS), ("llm", URL_LLM), ("validate", URL_VALIDATE)]
+TIMEOUTS = {"read": 30, "preprocess": 60, "llm": 600, "validate": 300, "push": 30}
+HTTP_RETRIES = 2
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# --- BULK RUNS ---
+# A run whose conf carries "video_links" (a list) processes all of them in one
+# DAG run: the list is split into chunks and each stage is a task mapped over
+# the chunks. A video that fails a stage is dropped from its chunk and reported
+# at the end; it never fails the chunk or the run.
+BULK_CHUNK_SIZE = 25  # default, can be overridden per run with conf "chunk_size"
+# Chunks of a stage processed at once (mapped task instances per run)
+BULK_MAX_ACTIVE_CHUNKS = {"read": 8, "preprocess": 8, "llm": 2, "validate": 4, "push": 4}
+# Concurrent calls within a chunk for stages without a batch endpoint
+BULK_CALLS_PER_CHUNK = {"read": 8, "preprocess": 8, "llm": 4}
+# read, validate and push take a whole chunk per request
+BULK_TIMEOUTS = {"read": 30, "validate": 900, "push": 120}
+# Longest wait for the next line of a playlist/channel expansion
+EXPAND_TIMEOUT = 120
+
+# --- SHARED HTTP SESSION ---
+# One keep-alive session per worker process, so repeated calls to a service
+# reuse the TCP/TLS connection instead of opening a new one each time.
+_http_session = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    global _http_session
+    if _http_session is None:
+        with _session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                # Retry refused connections and gateway errors (cold starts, proxy hiccups); every service is safe to call again
+                retries = Retry(total=HTTP_RETRIES, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=None, raise_on_status=False)
+                adapter = HTTPAdapter(pool_connections=len(STAGES) + 1, pool_maxsize=max(BULK_CALLS_PER_CHUNK.values()), max_retries=retries)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def gateway_get(path: str, video_id: str, missing: dict = None) -> dict:
+    """
+    GET a gateway result endpoint; `missing` if there is no result, None if the
+    gateway cannot be reached.
+    """
+    try:
+        response = get_http_session().get(f"{URL_GATEWAY}/{path}/{video_id}", timeout=10)
+        if response.status_code == 404:
+            return missing
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        # The check only saves work; without it the run simply does everything
+        print(f"FRESHNESS CHECK FAILED ({path}/{video_id}): {e}")
+        return None
+
+
+def previous_result(video_id: str) -> dict:
+    """Last ready result for the video (with its stage input hashes), or None."""
+    return last_ready_result(gateway_get("result", video_id)) if video_id else None
+
+
+# Fields the DAG attaches to payloads (and the comments and token counts llm_service passed on).
+# Services drop unknown fields, so they are re-attached to each response until
+# push stores them with the result.
+CARRIED_FIELDS = ("input_hashes", "run_metrics", "comments", "token_counts")
+
+
+def carry(source: dict, output: dict) -> dict:
+    for field in CARRIED_FIELDS:
+        if source.get(field) is not None and field not in output:
+            output[field] = source[field]
+    return output
+
+
+def run_stage(stage: str, url: str, payload: dict, previous: dict = None) -> dict:
+    """
+    call_stage, except that a SKIPPABLE_STAGES stage whose input is unchanged
+    since the previous result reuses that result's output, and an llm call gets
+    the previous comment summary to update. Stage input hashes and metrics are
+    accumulated on the payload.
+    """
+    metrics = RunMetrics(payload.get("run_metrics"))
+    hashes = dict(payload.get("input_hashes") or {})
+    output = None
+    if stage in SKIPPABLE_STAGES:
+        hashes[stage] = input_hash(stage, payload)
+        output = reuse_output(stage, payload, hashes[stage], previous)
+        if output is not None:
+            print(f"{stage.upper()} SKIPPED: input unchanged since {previous.get('generated_at')}")
+            metrics.record(stage, stage_record(0.0, skipped=True))
+    if output is None:
+        request = with_previous_comments(payload, previous) if stage == "llm" else payload
+        output = call_stage(stage, url, request, metrics)
+    if hashes:
+        output["input_hashes"] = hashes
+    output["run_metrics"] = metrics.summary()
+    return carry(payload, output)
+
+
+def post_instrumented(stage: str, url: str, payload, timeout: float, metrics: RunMetrics = None) -> requests.Response:
+    """
+    POST payload as JSON and record the call's wall/HTTP time, retries, sizes and
+    Server-Timing into metrics (or straight to the metrics backend).
+    """
+    start = time.perf_counter()
+    body = json.dumps(payload).encode("utf-8")
+    response = None
+    http_seconds = 0.0
+    try:
+        http_start = time.perf_counter()
+        response = get_http_session().post(url, data=body, headers=JSON_HEADERS, timeout=timeout)
+        http_seconds = time.perf_counter() - http_start
+        return response
+    finally:
+        record = stage_record(
+            time.perf_counter() - start,
+            http_seconds=http_seconds,
+            retries=len(response.raw.retries.history) if response is not None and getattr(response.raw, "retries", None) else 0,
+            request_bytes=len(body),
+            response_bytes=len(response.content) if response is not None else 0,
+            server=parse_server_timing(response.headers.get("Server-Timing")) if response is not None else {},
+            error=response is None or response.status_code >= 400
+        )
+        (metrics or RunMetrics()).record(stage, record)
+
+
+def call_stage(stage: str, url: str, payload: dict, metrics: RunMetrics = None) -> dict:
+    """POST payload to one service and return its JSON (the call is recorded in metrics)."""
+    try:
+        response = post_instrumented(stage, url, payload, TIMEOUTS[stage], metrics)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"{stage.upper()} FAILED: {e}")
+        raise
+
+
+def push_result(validate_data: dict, run_token: str = None) -> dict:
+    """Push a validated result, or record the run in telemetry if it was judged invalid."""
+    payload = dict(validate_data)
+    if run_token:
+        payload["run_token"] = run_token
+    metrics = RunMetrics(payload.get("run_metrics"))
+    if metrics.stages:
+        payload["stage_timings"] = metrics.stage_timings()
+
+    if not validate_data.get("is_valid"):
+        print(f"PUSH ABORTED: Job is invalid. Issues: {validate_data.get('issues')}")
+        # Keep the discarded run in telemetry; failing to record it must not fail the task
+        try:
+            get_http_session().post(URL_TELEMETRY, json=payload, timeout=10)
+        except Exception as e:
+            print(f"TELEMETRY FAILED: {e}")
+        return {
+            "status": "discarded",
+            "video_id": validate_data.get("video_id"),
+            "reason": validate_data.get("issues")
+        }
+
+    print("PUSH: Finalizing results...")
+    try:
+        # The stored run summary covers the stages before push; push itself goes to the metrics backend
+        response = post_instrumented("push", URL_PUSH, payload, TIMEOUTS["push"], metrics)
+        if response.status_code == 409:
+            # A newer run for this video owns the result; nothing to retry
+            print(f"PUSH SKIPPED: Run superseded. {response.text}")
+            return {"status": "superseded", "video_id": validate_data.get("video_id")}
+        response.raise_for_status()
+        print("PUSH SUCCESS.")
+        return response.json()
+    except Exception as e:
+        print(f"PUSH FAILED: {e}")
+        raise
+
+
+def log_run_metrics(summary: dict):
+    print(
+        f"RUN METRICS: wall {summary['wall_seconds']}s, http {summary['http_seconds']}s, "
+        f"{summary['retries']} retries, sent {summary['request_bytes']} B, received {summary['response_bytes']} B"
+    )
+    for stage, record in summary["stages"].items():
+        print(f"  {stage}: {record}")
+
+
+def run_conf(kwargs: dict) -> dict:
+    dag_run = kwargs.get('dag_run')
+    return dag_run.conf if dag_run and dag_run.conf else {}
+
+
+def chunk_links(links: list, chunk_size: int, fresh: int = 0, failed: list = None) -> list:
+    """
+    Split links into chunks of per-stage work. There is always at least one
+    (possibly empty) chunk so the run still reports; the first one carries the
+    number of videos skipped because their results were fresh, and the links
+    that failed before chunking.
+    """
+    chunks = [
+        {"items": [{"video_link": link} for link in links[i:i + chunk_size]], "failed": []}
+        for i in range(0, len(links), chunk_size)
+    ] or [{"items": [], "failed": []}]
+    chunks[0]["fresh"] = fresh
+    chunks[0]["failed"] = list(failed or [])
+    return chunks
+
+
+def expand_link(link: str):
+    """Canonical links of a playlist or channel, read line by line from read_service's /expand NDJSON stream."""
+    with get_http_session().post(URL_EXPAND, json={"video_link": link}, stream=True, timeout=EXPAND_TIMEOUT) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            record = json.loads(line)
+            if "error" in record:
+                raise RuntimeError(f"Expansion stopped after {record['count']} video(s): {record['error']}")
+            if "video_id" in record:
+                yield record["canonical_link"]
+
+
+def stream_video_links(video_links: list, failed: list):
+    """
+    Links to process, in order: video links as given, playlist and channel links
+    replaced by their videos as /expand streams them. Links that cannot be
+    expanded are added to failed.
+    """
+    for link in (link.strip() for link in video_links if link and link.strip()):
+        if video_id_from_link(link):
+            yield link
+            continue
+        try:
+            yield from expand_link(link)
+        except Exception as e:
+            print(f"EXPAND FAILED for {link}: {e}")
+            failed.append({"video": link, "stage": "expand", "error": str(e)})
+
+
+def is_fresh(video_link: str) -> bool:
+    video_id = video_id_from_link(video_link)
+    meta = gateway_get("meta", video_id) if video_id else None
+    return bool(meta and meta.get("fresh"))
+
+
+def claimed(chunk: dict, item: dict) -> dict:
+    """The item with the run token and expected generation it pushes with (see plan_bulk_chunks)."""
+    claim = chunk.get("claims", {}).get(item.get("video_id"))
+    if not claim:
+        return item
+    item = dict(item, run_token=claim["run_token"])
+    if claim.get("generation") is not None:
+        item["expected_generation"] = claim["generation"]
+    return item
+
+
+def item_name(item: dict) -> str:
+    return item.get("video_id") or item.get("video_link") or "unknown"
+
+
+def call_stage_per_item(stage: str, url: str, chunk: dict, force: bool = False) -> dict:
+    """
+    Run one stage for every item of a chunk, BULK_CALLS_PER_CHUNK[stage] at a time.
+    Items that fail move to the chunk's failed list.
+    """
+    def call(item):
+        try:
+            payload = fetch(item)
+            previous = previous_result(payload.get("video_id")) if stage in SKIPPABLE_STAGES and not force else None
+            return stash(run_stage(stage, url, payload, previous)), None
+        except Exception as e:
+            return None, str(e)
+
+    with ThreadPoolExecutor(BULK_CALLS_PER_CHUNK[stage]) as pool:
+        results = list(pool.map(call, chunk["items"]))
+
+    items, failed = [], list(chunk["failed"])
+    for item, (result, error) in zip(chunk["items"], results):
+        if error is None:
+            items.append(result)
+        else:
+            failed.append({"video": item_name(item), "stage": stage, "error": error})
+    print(f"{stage.upper()}: {len(items)} ok, {len(failed) - len(chunk['failed'])} failed")
+    return dict(chunk, items=items, failed=failed)
+
+
+def post_batch(stage: str, url: str, items: list) -> dict:
+    # Recorded as e.g. "validate_batch"; per-video summaries only cover per-video calls
+    response = post_instrumented(f"{stage}_batch", url, {"items": items}, BULK_TIMEOUTS[stage])
+    response.raise_for_status()
+    return response.json()
 
 
 @dag(
@@ -24,92 +344,262 @@ URL_PUSH = "YOUR_CLOUD_RUN_URL"
             type="string",
             title="YouTube Video Link",
             description="Paste the full YouTube URL to summarize.",
-        )
+        ),
+        "execution_mode": Param(
+            "fused",
+            enum=EXECUTION_MODES,
+            title="Execution Mode",
+            description="fused: all services in one task (fastest). tasks: one task per service (debugging).",
+        ),
+        "video_links": Param(
+            [],
+            type="array",
+            title="YouTube Video Links (bulk)",
+            description="Video, playlist or channel URLs to summarize in one run. When set, video_link and execution_mode are ignored.",
+        ),
     },
 )
 def vidsynth_processing_pipeline():
 
+    @task.branch
+    def check_freshness(**kwargs):
+        """Skip the whole run when the stored result is fresh (unless conf force is set)."""
+        conf = run_conf(kwargs)
+        if conf.get('video_links') or kwargs['params'].get('video_links') or conf.get('force'):
+            # Bulk runs check each video while planning chunks
+            return "choose_execution_mode"
+
+        video_link = conf.get('video_link') or kwargs['params']['video_link']
+        if is_fresh(video_link):
+            print(f"FRESH: A recent valid result exists for {video_link}; nothing to do")
+            return "result_is_fresh"
+        return "choose_execution_mode"
+
     @task
-    def read_service_task(**kwargs):
-        dag_run = kwargs.get('dag_run')
-        video_link = None
-        if dag_run and dag_run.conf:
-            video_link = dag_run.conf.get('video_link')
-        
-        if not video_link:
-            video_link = kwargs['params']['video_link']
+    def result_is_fresh(**kwargs):
+        video_link = run_conf(kwargs).get('video_link') or kwargs['params']['video_link']
+        return {"status": "fresh", "video_id": video_id_from_link(video_link)}
+
+    @task.branch
+    def choose_execution_mode(**kwargs):
+        if run_conf(kwargs).get('video_links') or kwargs['params'].get('video_links'):
+            print("MODE: bulk")
+            return "plan_bulk_chunks"
+
+        mode = run_conf(kwargs).get('execution_mode') or kwargs['params']['execution_mode']
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution_mode: {mode}")
+        print(f"MODE: {mode}")
+        return "fused_pipeline_task" if mode == "fused" else "read_service_task"
+
+    @task
+    def fused_pipeline_task(**kwargs):
+        conf = run_conf(kwargs)
+        video_link = conf.get('video_link') or kwargs['params']['video_link']
+        previous = None if conf.get('force') else previous_result(video_id_from_link(video_link))
 
+        data = {"video_link": video_link}
+        for stage, url in STAGES:
+            print(f"{stage.upper()}: calling service...")
+            data = run_stage(stage, url, data, previous)
+
+        result = push_result(data, conf.get('run_token'))
+        log_run_metrics(data["run_metrics"])
+        return dict(result, run_metrics=data["run_metrics"])
+
+    @task
+    def read_service_task(**kwargs):
+        video_link = run_conf(kwargs).get('video_link') or kwargs['params']['video_link']
         print(f"READ: Sending request for {video_link}")
-        try:
-            response = requests.post(URL_READ, json={"video_link": video_link}, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"READ FAILED: {e}")
-            raise
+        return stash(run_stage("read", URL_READ, {"video_link": video_link}))
 
     @task
     def preprocess_service_task(read_data: dict):
         video_id = read_data.get("video_id")
         print(f"PREPROCESS: Fetching data for {video_id}")
-        
-        try:
-            response = requests.post(URL_PREPROCESS, json=read_data, timeout=60)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"PREPROCESS FAILED: {e}")
-            raise
+        return stash(run_stage("preprocess", URL_PREPROCESS, fetch(read_data)))
 
     @task
-    def llm_service_task(preprocess_data: dict):
+    def llm_service_task(preprocess_data: dict, **kwargs):
         print(f"LLM: Sending data to Monolithic Llama 3 Service...")
-        
-        try:
-            response = requests.post(URL_LLM, json=preprocess_data, timeout=600)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"LLM FAILED: {e}")
-            raise
+        previous = None if run_conf(kwargs).get('force') else previous_result(preprocess_data.get("video_id"))
+        return stash(run_stage("llm", URL_LLM, fetch(preprocess_data), previous))
 
     @task
-    def validate_service_task(llm_data: dict):
+    def validate_service_task(llm_data: dict, **kwargs):
         print("VALIDATE: Checking for bias and quality...")
+        previous = None if run_conf(kwargs).get('force') else previous_result(llm_data.get("video_id"))
+        return stash(run_stage("validate", URL_VALIDATE, fetch(llm_data), previous))
+
+    @task
+    def push_service_task(validate_data: dict, **kwargs):
+        # Token minted by the gateway for this run; push rejects writes from superseded runs
+        validate_data = fetch(validate_data)
+        result = push_result(validate_data, run_conf(kwargs).get('run_token'))
+        if validate_data.get("run_metrics"):
+            log_run_metrics(validate_data["run_metrics"])
+        return result
+
+    # --- BULK (dynamic task mapping over chunks) ---
+    @task
+    def plan_bulk_chunks(**kwargs):
+        conf = run_conf(kwargs)
+        video_links = conf.get('video_links') or kwargs['params']['video_links']
+        chunk_size = int(conf.get('chunk_size') or BULK_CHUNK_SIZE)
+        force = conf.get('force')
+
+        # Playlists and channels are expanded while their videos stream in, and
+        # each video's metadata lookup starts as soon as its line arrives
+        checks, failed = {}, []
+        with ThreadPoolExecutor(BULK_CALLS_PER_CHUNK["read"]) as pool:
+            for link in stream_video_links(video_links, failed):
+                video_id = video_id_from_link(link)
+                key = video_id or link
+                if key not in checks:
+                    checks[key] = (link, pool.submit(gateway_get, "meta", video_id, {"generation": 0}) if video_id else None)
+            metas = {key: (link, check and check.result()) for key, (link, check) in checks.items()}
+
+        # Bulk runs write no placeholder: each video gets its own run token and
+        # pushes only if the result is still at the generation read here, so an
+        # interactive run started meanwhile is never overwritten
+        links, claims = [], {}
+        for key, (link, meta) in metas.items():
+            if meta and meta.get("fresh") and not force:
+                continue
+            links.append(link)
+            claims[link] = {"run_token": uuid.uuid4().hex, "generation": meta.get("generation") if meta else None}
+
+        fresh = len(checks) - len(links)
+        chunks = chunk_links(links, chunk_size, fresh=fresh, failed=failed)
+        for chunk in chunks:
+            # Keyed by link until read_chunk knows the video ids
+            chunk["claims"] = {item["video_link"]: claims[item["video_link"]] for item in chunk["items"]}
+        print(f"BULK: {len(links)} video(s) in {len(chunks)} chunk(s) of up to {chunk_size}, {fresh} already fresh, {len(failed)} link(s) not expanded")
+        return chunks
+
+    @task(max_active_tis_per_dagrun=BULK_MAX_ACTIVE_CHUNKS["read"])
+    def read_chunk(chunk: dict):
+        # One request per chunk: /read/batch canonicalises every link at once
         try:
-            response = requests.post(URL_VALIDATE, json=llm_data, timeout=300)
-            response.raise_for_status()
-            return response.json()
+            results = post_batch("read", URL_READ_BATCH, chunk["items"])["results"]
         except Exception as e:
-            print(f"VALIDATE FAILED: {e}")
-            raise
+            print(f"READ FAILED: {e}")
+            failed = [{"video": item_name(item), "stage": "read", "error": str(e)} for item in chunk["items"]]
+            return dict(chunk, items=[], failed=chunk["failed"] + failed)
+
+        items = [{k: r[k] for k in ("video_id", "original_link", "canonical_link")} for r in results if not r.get("error")]
+        failed = [{"video": r["original_link"], "stage": "read", "error": r["error"]} for r in results if r.get("error")]
+        claims = {
+            r["video_id"]: chunk["claims"][r["original_link"]]
+            for r in results if not r.get("error") and r["original_link"] in chunk.get("claims", {})
+        }
+        print(f"READ: {len(items)} ok, {len(failed)} failed")
+        return dict(chunk, items=items, failed=chunk["failed"] + failed, claims=claims)
+
+    @task(max_active_tis_per_dagrun=BULK_MAX_ACTIVE_CHUNKS["preprocess"])
+    def preprocess_chunk(chunk: dict):
+        return call_stage_per_item("preprocess", URL_PREPROCESS, chunk)
+
+    @task(max_active_tis_per_dagrun=BULK_MAX_ACTIVE_CHUNKS["llm"])
+    def llm_chunk(chunk: dict, **kwargs):
+        return call_stage_per_item("llm", URL_LLM, chunk, force=bool(run_conf(kwargs).get('force')))
+
+    @task(max_active_tis_per_dagrun=BULK_MAX_ACTIVE_CHUNKS["validate"])
+    def validate_chunk(chunk: dict, **kwargs):
+        force = run_conf(kwargs).get('force')
+        items, reused = [], []
+        for item in (fetch(item) for item in chunk["items"]):
+            previous = None if force else previous_result(item.get("video_id"))
+            digest = input_hash("validate", item)
+            output = reuse_output("validate", item, digest, previous)
+            if output is None:
+                items.append(dict(item, input_hashes=dict(item.get("input_hashes") or {}, validate=digest)))
+            else:
+                reused.append(stash(carry(item, dict(output, input_hashes=dict(item.get("input_hashes") or {}, validate=digest)))))
+        if reused:
+            print(f"VALIDATE SKIPPED for {len(reused)} item(s) with unchanged input")
+        if not items:
+            return dict(chunk, items=reused)
 
-    @task
-    def push_service_task(validate_data: dict):
-        if not validate_data.get("is_valid"):
-            print(f"PUSH ABORTED: Job is invalid. Issues: {validate_data.get('issues')}")
-            return {
-                "status": "discarded",
-                "video_id": validate_data.get("video_id"),
-                "reason": validate_data.get("issues")
-            }
-
-        print("PUSH: Finalizing results...")
         try:
-            response = requests.post(URL_PUSH, json=validate_data, timeout=30)
-            response.raise_for_status()
-            print("PUSH SUCCESS.")
-            return response.json()
+            # One request per chunk: bias checks share a single encoder pass
+            results = post_batch("validate", URL_VALIDATE_BATCH, items)["results"]
+            results = [carry(item, result) for item, result in zip(items, results)]
+            return dict(chunk, items=reused + [stash(result) for result in results])
         except Exception as e:
-            print(f"PUSH FAILED: {e}")
-            raise
+            print(f"VALIDATE FAILED: {e}")
+            failed = [{"video": item_name(item), "stage": "validate", "error": str(e)} for item in items]
+            return dict(chunk, items=reused, failed=chunk["failed"] + failed)
+
+    @task(max_active_tis_per_dagrun=BULK_MAX_ACTIVE_CHUNKS["push"])
+    def push_chunk(chunk: dict):
+        failed = list(chunk["failed"])
+        items = [claimed(chunk, fetch(item)) for item in chunk["items"]]
+        valid = [item for item in items if item.get("is_valid")]
+        invalid = [item for item in items if not item.get("is_valid")]
+
+        for item in invalid:
+            try:
+                get_http_session().post(URL_TELEMETRY, json=item, timeout=10)
+            except Exception as e:
+                print(f"TELEMETRY FAILED: {e}")
+
+        pushed = stale = 0
+        if valid:
+            try:
+                result = post_batch("push", URL_PUSH_BATCH, valid)
+                pushed, stale = result["pushed"], result.get("stale", 0)
+                failed += [
+                    {"video": r["video_id"], "stage": "push", "error": r.get("error")}
+                    for r in result["results"] if r["status"] == "failed"
+                ]
+            except Exception as e:
+                print(f"PUSH FAILED: {e}")
+                failed += [{"video": item_name(item), "stage": "push", "error": str(e)} for item in valid]
+
+        print(f"PUSH: {pushed} pushed, {len(invalid)} discarded, {stale} superseded, {len(failed)} failed in chunk")
+        return {"pushed": pushed, "discarded": len(invalid), "superseded": stale, "fresh": chunk.get("fresh", 0), "failed": failed}
+
+    @task(trigger_rule="none_skipped")
+    def report_bulk(chunk_results, **kwargs):
+        chunk_results = [r for r in chunk_results if r]
+        failed = [f for r in chunk_results for f in r["failed"]]
+        totals = {key: sum(r[key] for r in chunk_results) for key in ("pushed", "discarded", "superseded", "fresh")}
+        totals["failed"] = len(failed)
+        processed = sum(totals.values()) - totals["fresh"]
+
+        dag_run = kwargs.get('dag_run')
+        elapsed = (pendulum.now("UTC") - dag_run.start_date).total_seconds() if dag_run and dag_run.start_date else None
+        throughput = round(processed / elapsed * 60, 1) if elapsed else None
+
+        failed_by_stage = {}
+        for f in failed:
+            failed_by_stage[f["stage"]] = failed_by_stage.get(f["stage"], 0) + 1
+            print(f"FAILED [{f['stage']}] {f['video']}: {f['error']}")
+        print(f"BULK DONE: {totals} in {elapsed:.0f}s ({throughput} videos/min)" if elapsed else f"BULK DONE: {totals}")
+
+        return dict(totals, failed_by_stage=failed_by_stage, elapsed_seconds=elapsed, videos_per_minute=throughput, failures=failed)
 
     # --- DEFINE WORKFLOW ---
+    freshness = check_freshness()
+    mode = choose_execution_mode()
+    freshness >> [result_is_fresh(), mode]
+    mode >> fused_pipeline_task()
+
     read_output = read_service_task()
+    mode >> read_output
     preprocess_output = preprocess_service_task(read_output)
     llm_output = llm_service_task(preprocess_output)
     validate_output = validate_service_task(llm_output)
     push_service_task(validate_output)
 
+    chunks = plan_bulk_chunks()
+    mode >> chunks
+    read_chunks = read_chunk.expand(chunk=chunks)
+    preprocess_chunks = preprocess_chunk.expand(chunk=read_chunks)
+    llm_chunks = llm_chunk.expand(chunk=preprocess_chunks)
+    validate_chunks = validate_chunk.expand(chunk=llm_chunks)
+    report_bulk(push_chunk.expand(chunk=validate_chunks))
+
 # Instantiate
-vidsynth_processing_pipeline()
\ No newline at end of file
+vidsynth_processing_pipeline()
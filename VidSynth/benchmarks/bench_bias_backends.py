@@ -0,0 +1,116 @@
+"""
+Benchmark for the bias encoder backends in the validate service.
+
+Runs each backend in its own subprocess so resident memory is measured in
+isolation, and reports:
+  - load:    time to construct BiasMonitor (includes ONNX export on first run)
+  - p50/p95: latency of a single check_bias call
+  - batch:   throughput of check_bias_many over --batch items
+  - rss:     peak resident memory of the process
+  - parity:  max |score difference| against the torch backend
+
+Usage:
+    python benchmarks/bench_bias_backends.py
+    python benchmarks/bench_bias_backends.py --backends torch,onnx --threads 2
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "validate_service"))
+
+WORDS = (
+    "python tutorial history war music review science space football election "
+    "recipe cooking travel guide beginner advanced explained news interview game "
+    "climate economy market crypto physics chemistry biology art design movie"
+).split()
+
+
+def make_pairs(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    titles = [" ".join(rng.choices(WORDS, k=8)).title() for _ in range(n)]
+    summaries = [" ".join(rng.choices(WORDS, k=90)) + "." for _ in range(n)]
+    return titles, summaries
+
+
+def run_backend(args):
+    """Measure one backend in this process and print a JSON result line."""
+    import logging
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    from bias_monitor import BiasMonitor
+    logging.getLogger("bias_monitor").setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    monitor = BiasMonitor(model_name=args.model, cache_size=0, backend=args.worker)
+    if args.worker == "onnx" and args.threads:
+        from onnx_encoder import OnnxEncoder
+        monitor.model = OnnxEncoder(args.model, export_dir=os.getenv("BIAS_ONNX_DIR"), num_threads=args.threads)
+    load = time.perf_counter() - start
+
+    titles, summaries = make_pairs(args.batch)
+    monitor.check_bias_many(titles[:4], summaries[:4])  # warm up
+
+    latencies = []
+    for i in range(args.requests):
+        t = time.perf_counter()
+        monitor.check_bias(titles[i % len(titles)], summaries[i % len(summaries)])
+        latencies.append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    results = monitor.check_bias_many(titles, summaries)
+    batch = time.perf_counter() - t
+
+    print(json.dumps({
+        "backend": args.worker,
+        "load_s": load,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000,
+        "items_per_s": args.batch / batch,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "scores": [r["similarity_score"] for r in results]
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bias encoder backend benchmark")
+    parser.add_argument("--model", default=os.getenv("BIAS_MODEL_NAME", "all-MiniLM-L6-v2"))
+    parser.add_argument("--backends", default="torch,onnx")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 = library default)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_backend(args)
+        return
+
+    results = {}
+    for backend in args.backends.split(","):
+        cmd = [sys.executable, __file__, "--worker", backend, "--model", args.model,
+               "--requests", str(args.requests), "--batch", str(args.batch), "--threads", str(args.threads)]
+        out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+        results[backend] = json.loads(out.strip().splitlines()[-1])
+
+    reference = results.get("torch")
+    print(f"{'backend':>8}{'load s':>9}{'p50 ms':>9}{'p95 ms':>9}{'items/s':>10}{'rss MB':>9}{'max diff':>10}")
+    for backend, r in results.items():
+        diff = max(abs(a - b) for a, b in zip(r["scores"], reference["scores"])) if reference else float("nan")
+        print(
+            f"{backend:>8}{r['load_s']:>9.2f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+            f"{r['items_per_s']:>10.0f}{r['rss_mb']:>9.0f}{diff:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark for batched bias checking in the validate service.
+
+Compares, at batch sizes 1..256:
+  - legacy:  the old check_bias path, two single-text encodes plus sklearn-style
+             cosine per item
+  - loop:    BiasMonitor.check_bias called once per item
+  - batched: one BiasMonitor.check_bias_many call for the whole batch
+
+Usage:
+    python benchmarks/bench_bias_batch.py
+    python benchmarks/bench_bias_batch.py --model all-MiniLM-L6-v2 --repeats 5
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "validate_service"))
+
+from bias_monitor import BiasMonitor
+
+WORDS = (
+    "python tutorial history war music review science space football election "
+    "recipe cooking travel guide beginner advanced explained news interview game "
+    "climate economy market crypto physics chemistry biology art design movie"
+).split()
+
+
+def make_pairs(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    titles = [" ".join(rng.choices(WORDS, k=8)).title() for _ in range(n)]
+    summaries = [" ".join(rng.choices(WORDS, k=90)) + "." for _ in range(n)]
+    return titles, summaries
+
+
+def legacy_check(monitor: BiasMonitor, title: str, summary: str) -> float:
+    a = np.asarray(monitor.model.encode([title]))
+    b = np.asarray(monitor.model.encode([summary]))
+    return float(a @ b.T / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def timed(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched bias check benchmark")
+    parser.add_argument("--model", default=os.getenv("BIAS_MODEL_NAME", "all-MiniLM-L6-v2"))
+    parser.add_argument("--sizes", default="1,2,4,8,16,32,64,128,256")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    monitor = BiasMonitor(model_name=args.model)
+    logging.getLogger("bias_monitor").setLevel(logging.WARNING)
+    monitor.check_bias_many(*make_pairs(4))  # warm up
+
+    print(f"{'batch':>6}{'legacy ms':>12}{'loop ms':>12}{'batched ms':>12}{'items/s':>12}{'speedup':>10}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        titles, summaries = make_pairs(n, seed=n)
+
+        legacy = timed(lambda: [legacy_check(monitor, t, s) for t, s in zip(titles, summaries)], args.repeats)
+        loop = timed(lambda: [monitor.check_bias(t, s) for t, s in zip(titles, summaries)], args.repeats)
+        batched = timed(lambda: monitor.check_bias_many(titles, summaries), args.repeats)
+
+        print(
+            f"{n:>6}{legacy * 1000:>12.1f}{loop * 1000:>12.1f}{batched * 1000:>12.1f}"
+            f"{n / batched:>12.0f}{legacy / batched:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark for the validate service's comment coverage check.
+
+Times the clustering plus similarity-matrix stage on synthetic embeddings
+(several topics with noise) at 500..20000 comments. With --model, it also
+times the full BiasMonitor.check_comment_coverage call including encoding.
+
+Usage:
+    python benchmarks/bench_comment_coverage.py
+    python benchmarks/bench_comment_coverage.py --model all-MiniLM-L6-v2 --sizes 1000,5000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "validate_service"))
+
+from comment_coverage import comment_coverage
+
+WORDS = (
+    "great video audio quality editing music funny boring long short explained "
+    "thanks tutorial helped confusing intro ads sponsor voice camera lighting"
+).split()
+
+
+def synthetic(n: int, dim: int = 384, topics: int = 40, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(topics, dim))
+    emb = centers[rng.integers(0, topics, n)] + rng.normal(scale=0.6, size=(n, dim))
+    emb = (emb / np.linalg.norm(emb, axis=1, keepdims=True)).astype(np.float32)
+    sentences = centers[:3] / np.linalg.norm(centers[:3], axis=1, keepdims=True)
+    return emb, sentences.astype(np.float32)
+
+
+def timed(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comment coverage benchmark")
+    parser.add_argument("--sizes", default="500,1000,2000,5000,10000,20000")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--model", help="Also time end-to-end with this sentence-transformer")
+    args = parser.parse_args()
+
+    monitor = None
+    if args.model:
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor(model_name=args.model, cache_size=0)
+        logging.getLogger("bias_monitor").setLevel(logging.WARNING)
+
+    header = f"{'comments':>9}{'clusters':>10}{'numpy ms':>10}"
+    print(header + (f"{'end-to-end ms':>15}" if monitor else ""))
+    for n in (int(s) for s in args.sizes.split(",")):
+        emb, sentences = synthetic(n, seed=n)
+        comments = [f"comment {i}" for i in range(n)]
+        result = comment_coverage(emb, sentences, comments)
+        numpy_s = timed(lambda: comment_coverage(emb, sentences, comments), args.repeats)
+        line = f"{n:>9}{result['num_clusters']:>10}{numpy_s * 1000:>10.1f}"
+
+        if monitor:
+            rng = random.Random(n)
+            texts = [" ".join(rng.choices(WORDS, k=12)) for _ in range(n)]
+            summary = "Viewers praised the editing. Some found the intro long. Audio quality was a concern."
+            full_s = timed(lambda: monitor.check_comment_coverage(texts, summary), 1)
+            line += f"{full_s * 1000:>15.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
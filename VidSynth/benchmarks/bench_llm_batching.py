@@ -0,0 +1,149 @@
+"""
+Throughput / latency sweep for the LLM service micro-batcher.
+
+Fires prompts from N concurrent client threads through MicroBatcher at a range of
+(max_batch_size, max_wait_ms) settings and reports throughput and latency
+percentiles for each point, plus an unbatched baseline.
+
+By default the backend is an in-process TGI model: every request pays a fixed
+HTTP overhead, waits for a prefill pass (one pass covers every prompt that
+arrived before it started, so aligned arrivals share it), then decodes in
+lock-step with whatever else is running. Pass --url to hit a real (or fake)
+TGI endpoint instead.
+
+Usage:
+    python benchmarks/bench_llm_batching.py
+    python benchmarks/bench_llm_batching.py --clients 32 --requests 256
+    python benchmarks/bench_llm_batching.py --url http://localhost:8080/generate
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "llm_service"))
+
+from batcher import MicroBatcher
+
+
+class SimulatedTGI:
+    """
+    Crude continuous-batching model: prefill runs one pass at a time and each
+    pass admits everything queued when it starts; decode steps are shared by all
+    in-flight sequences and get slightly slower as the running batch grows.
+    """
+
+    def __init__(self, overhead_ms=30.0, prefill_ms=40.0, step_ms=4.0,
+                 step_ms_per_seq=0.15, tokens=64, slots=10):
+        self.overhead = overhead_ms / 1000.0
+        self.prefill = prefill_ms / 1000.0
+        self.step = step_ms / 1000.0
+        self.step_per_seq = step_ms_per_seq / 1000.0
+        self.tokens = tokens
+        self.slots = threading.Semaphore(slots)
+        self._lock = threading.Lock()
+        self._prefill_lock = threading.Lock()
+        self._next_pass = 0
+        self._completed_pass = -1
+        self._running = 0
+
+    def _wait_for_prefill(self):
+        with self._lock:
+            my_pass = self._next_pass
+        with self._prefill_lock:
+            if self._completed_pass >= my_pass:
+                return
+            with self._lock:
+                pass_id = self._next_pass
+                self._next_pass += 1
+            time.sleep(self.prefill)
+            self._completed_pass = pass_id
+
+    def generate(self, prompt: str) -> str:
+        time.sleep(self.overhead)
+        with self.slots:
+            self._wait_for_prefill()
+            with self._lock:
+                self._running += 1
+            try:
+                for _ in range(self.tokens):
+                    with self._lock:
+                        running = self._running
+                    time.sleep(self.step + self.step_per_seq * running)
+            finally:
+                with self._lock:
+                    self._running -= 1
+        return prompt[::-1]
+
+
+def run_point(generate_fn, clients: int, total: int):
+    latencies = []
+    lock = threading.Lock()
+
+    def one(i):
+        start = time.perf_counter()
+        generate_fn(f"prompt {i}")
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+
+    lat = np.array(latencies) * 1000.0
+    return {
+        "throughput": total / wall,
+        "p50": float(np.percentile(lat, 50)),
+        "p95": float(np.percentile(lat, 95)),
+        "p99": float(np.percentile(lat, 99))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--url", help="TGI endpoint to benchmark instead of the simulator")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=128)
+    parser.add_argument("--sizes", default="1,2,4,8")
+    parser.add_argument("--waits", default="0,10,25,50")
+    args = parser.parse_args()
+
+    if args.url:
+        os.environ["TGI_SERVICE_URL"] = args.url
+        from llm_handler import LLMHandler
+        backend = LLMHandler().generate
+    else:
+        backend = SimulatedTGI().generate
+
+    print(f"{'mode':<22}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+
+    # Baseline mirrors the old service: every prompt goes straight to the backend
+    res = run_point(backend, args.clients, args.requests)
+    print(f"{'unbatched':<22}{res['throughput']:>10.1f}{res['p50']:>10.1f}{res['p95']:>10.1f}{res['p99']:>10.1f}")
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        for wait in (float(w) for w in args.waits.split(",")):
+            batcher = MicroBatcher(backend, max_batch_size=size, max_wait_ms=wait,
+                                   max_in_flight=max(size, 10))
+            try:
+                res = run_point(batcher.generate, args.clients, args.requests)
+                stats = batcher.stats()
+            finally:
+                batcher.shutdown()
+            label = f"size={size} wait={wait:g}ms"
+            print(
+                f"{label:<22}{res['throughput']:>10.1f}{res['p50']:>10.1f}"
+                f"{res['p95']:>10.1f}{res['p99']:>10.1f}"
+                f"   avg batch {stats['avg_batch_size']:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Upload throughput benchmark for the push service against a local GCS emulator.
+
+Compares three ways of pushing the same results:
+  per-request  a new storage.Client per upload (the old /push behaviour)
+  /push        the running service, one request per result from N clients
+  /push/batch  the running service, results sent in batches
+
+The emulator is fake-gcs-server (docker compose --profile loadtest up fake_gcs).
+The service is started under uvicorn with STORAGE_EMULATOR_HOST pointing at it.
+
+Usage:
+    python benchmarks/bench_push_throughput.py
+    python benchmarks/bench_push_throughput.py --items 1000 --clients 1,8,32 --batch-size 100
+    python benchmarks/bench_push_throughput.py --emulator http://localhost:4443 --concurrency 32
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import numpy as np
+
+SERVICE_DIR = os.path.join(os.path.dirname(__file__), "..", "push_service")
+COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "common"))
+BUCKET_NAME = "vidsynth-results"
+
+
+def make_payload(i: int) -> dict:
+    return {
+        "video_id": f"bench{i:06d}",
+        "video_title": f"Benchmark video {i}",
+        "video_summary": "A benchmark summary sentence. " * 40,
+        "comment_summary": "Viewers liked the benchmark. " * 20,
+        "is_valid": True,
+        "issues": [],
+        "bias_check": {"similarity_score": 0.7, "is_biased": False, "threshold": 0.3}
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def ensure_bucket(emulator: str):
+    os.environ["STORAGE_EMULATOR_HOST"] = emulator
+    from google.cloud import storage
+    client = storage.Client()
+    if client.lookup_bucket(BUCKET_NAME) is None:
+        client.create_bucket(BUCKET_NAME)
+
+
+def start_service(emulator: str, concurrency: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, STORAGE_EMULATOR_HOST=emulator, PUSH_MAX_CONCURRENCY=str(concurrency), PYTHONPATH=COMMON_DIR)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline and proc.poll() is None:
+        try:
+            if httpx.get(f"{base}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("push service did not start")
+
+
+def report(label: str, items: int, elapsed: float, latencies):
+    lat = np.array(latencies) * 1000
+    print(
+        f"{label:<28} {items / elapsed:9.1f} items/s   "
+        f"p50 {np.percentile(lat, 50):7.1f} ms   p95 {np.percentile(lat, 95):7.1f} ms"
+    )
+
+
+def run_per_request_client(payloads, clients: int):
+    """The old /push path: build a client for every upload."""
+    import json
+    from google.cloud import storage
+
+    def upload(payload):
+        start = time.perf_counter()
+        blob = storage.Client().bucket(BUCKET_NAME).blob(f"{payload['video_id']}.json")
+        blob.upload_from_string(
+            data=json.dumps({"status": "ready", "video_id": payload["video_id"], "data": {
+                "video_summary": payload["video_summary"], "comment_summary": payload["comment_summary"]
+            }}),
+            content_type="application/json"
+        )
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        latencies = list(pool.map(upload, payloads))
+    report(f"per-request c={clients}", len(payloads), time.perf_counter() - start, latencies)
+
+
+def run_push(base: str, payloads, clients: int):
+    with httpx.Client(base_url=base, timeout=60, limits=httpx.Limits(max_connections=clients)) as http:
+        def push(payload):
+            start = time.perf_counter()
+            http.post("/push", json=payload).raise_for_status()
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            latencies = list(pool.map(push, payloads))
+    report(f"/push c={clients}", len(payloads), time.perf_counter() - start, latencies)
+
+
+def run_batch(base: str, payloads, batch_size: int):
+    latencies = []
+    failed = 0
+    start = time.perf_counter()
+    with httpx.Client(base_url=base, timeout=300) as http:
+        for i in range(0, len(payloads), batch_size):
+            t0 = time.perf_counter()
+            response = http.post("/push/batch", json={"items": payloads[i:i + batch_size]})
+            response.raise_for_status()
+            failed += response.json()["failed"]
+            latencies.append(time.perf_counter() - t0)
+    report(f"/push/batch b={batch_size}", len(payloads), time.perf_counter() - start, latencies)
+    if failed:
+        print(f"  ({failed} uploads failed)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Push service upload throughput against a GCS emulator")
+    parser.add_argument("--emulator", default=os.getenv("STORAGE_EMULATOR_HOST", "http://localhost:4443"))
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--clients", default="1,8,32", help="Comma-separated client counts")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16, help="PUSH_MAX_CONCURRENCY for the service")
+    args = parser.parse_args()
+
+    ensure_bucket(args.emulator)
+    payloads = [make_payload(i) for i in range(args.items)]
+    client_counts = [int(c) for c in args.clients.split(",")]
+
+    print(f"{args.items} results, emulator {args.emulator}, PUSH_MAX_CONCURRENCY={args.concurrency}\n")
+    for clients in client_counts:
+        run_per_request_client(payloads, clients)
+
+    port = free_port()
+    proc = start_service(args.emulator, args.concurrency, port)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        for clients in client_counts:
+            run_push(base, payloads, clients)
+        run_batch(base, payloads, args.batch_size)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
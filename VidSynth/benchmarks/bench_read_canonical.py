@@ -0,0 +1,95 @@
+"""
+Throughput benchmark for read_service's URL canonicaliser.
+
+Runs a realistic mix of link variants (watch/shorts/live/embed/youtu.be, mobile
+and music hosts, tracking params, some invalid) through:
+    urlparse     the previous urlparse/parse_qs implementation
+    regex        the precompiled pattern alone (every call a cache miss)
+    cached       canonical_video_id with its LRU cache, as the service runs it
+
+Single thread, so the numbers are URLs per second per core.
+
+Usage:
+    python benchmarks/bench_read_canonical.py
+    python benchmarks/bench_read_canonical.py --urls 5000000 --distinct 50000
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "read_service"))
+
+import canonical
+from canonical import canonical_video_id
+
+ID_CHARS = string.ascii_letters + string.digits + "_-"
+FORMS = [
+    "https://www.youtube.com/watch?v={id}",
+    "https://www.youtube.com/watch?v={id}&t=42s",
+    "https://m.youtube.com/watch?feature=share&v={id}",
+    "https://music.youtube.com/watch?v={id}&list=RDAMVM{id}",
+    "https://youtu.be/{id}?si=Xk2lq9PzT0aB",
+    "https://www.youtube.com/shorts/{id}",
+    "https://www.youtube.com/live/{id}?si=abc",
+    "https://www.youtube-nocookie.com/embed/{id}?rel=0",
+    "https://vimeo.com/{id}",
+    "https://youtu.be/{id}x",
+]
+
+
+def legacy_extract_video_id(url: str):
+    """The urlparse-based parser read_service used before canonical.py."""
+    try:
+        parsed_url = urlparse(url)
+        if parsed_url.hostname == "youtu.be":
+            return parsed_url.path[1:]
+        elif parsed_url.hostname in ["www.youtube.com", "youtube.com"]:
+            if parsed_url.path == "/watch":
+                return parse_qs(parsed_url.query).get("v", [None])[0]
+            elif parsed_url.path.startswith("/embed/") or parsed_url.path.startswith("/v/"):
+                return parsed_url.path.split("/")[2]
+        return None
+    except Exception:
+        return None
+
+
+def regex_only(url: str):
+    match = canonical._VIDEO_LINK.fullmatch(url.strip())
+    return match.group(1) if match else None
+
+
+def run(label: str, fn, urls: list):
+    start = time.perf_counter()
+    valid = sum(1 for url in urls if fn(url))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(urls) / elapsed / 1e6:6.2f} M URLs/s   {elapsed * 1e9 / len(urls):7.0f} ns/URL   {valid} valid")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="URL canonicaliser throughput benchmark")
+    parser.add_argument("--urls", type=int, default=2000000)
+    parser.add_argument("--distinct", type=int, default=20000, help="distinct links (bulk lists repeat links)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    distinct = [
+        rng.choice(FORMS).format(id="".join(rng.choices(ID_CHARS, k=11)))
+        for _ in range(args.distinct)
+    ]
+    urls = [rng.choice(distinct) for _ in range(args.urls)]
+    print(f"{args.urls} URLs ({args.distinct} distinct), cache size {canonical.CANONICAL_CACHE_SIZE}\n")
+
+    run("urlparse", legacy_extract_video_id, urls)
+    run("regex", regex_only, urls)
+    canonical._match_video_id.cache_clear()
+    run("cached", canonical_video_id, urls)
+    print(f"\n{canonical.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
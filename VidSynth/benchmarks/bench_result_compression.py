@@ -0,0 +1,95 @@
+"""
+Storage and egress benchmark for push_service result objects.
+
+Encodes the results push_service writes (real summaries from the
+Model_Dev_Pipeline videoList.json) with json / orjson and none / gzip / zstd,
+and reports stored bytes per result, the ratio against the old
+json.dumps object, and encode / decode time. The gateway passes compressed
+objects straight through to clients that accept the encoding, so stored
+bytes are also the per-request egress.
+
+Usage:
+    python benchmarks/bench_result_compression.py
+    python benchmarks/bench_result_compression.py --video-list path/to/videoList.json --repeat 2000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "push_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
+
+from main import encode_result
+
+DEFAULT_VIDEO_LIST = os.path.join(
+    os.path.dirname(__file__), "..", "..", "Model_Dev_Pipeline", "src", "videoList.json"
+)
+
+
+def load_results(path: str):
+    with open(path) as f:
+        videos = json.load(f)["videoList"]
+    return [
+        {
+            "status": "ready",
+            "video_id": v["video_url"].rsplit("=", 1)[-1],
+            "data": {
+                "video_summary": v.get("trans_summary") or "",
+                "comment_summary": v.get("comment_summary") or ""
+            }
+        }
+        for v in videos
+    ]
+
+
+def decoder(encoding):
+    if encoding == "gzip":
+        return gzip.decompress
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress
+    return lambda data: data
+
+
+def time_per_call(fn, items, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            fn(item)
+    return (time.perf_counter() - start) / (repeat * len(items)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Result object size and codec cost")
+    parser.add_argument("--video-list", default=DEFAULT_VIDEO_LIST)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    results = load_results(args.video_list)
+    baseline = [json.dumps(r).encode() for r in results]
+    baseline_bytes = np.mean([len(b) for b in baseline])
+
+    print(f"{len(results)} results, json.dumps baseline {baseline_bytes:.0f} bytes/result\n")
+    print(f"{'variant':<16} {'bytes':>8} {'ratio':>7} {'encode us':>10} {'decode us':>10}")
+
+    base_encode = time_per_call(lambda r: json.dumps(r).encode(), results, args.repeat)
+    base_decode = time_per_call(json.loads, baseline, args.repeat)
+    print(f"{'json/none':<16} {baseline_bytes:8.0f} {1.0:7.2f} {base_encode:10.1f} {base_decode:10.1f}")
+
+    for compression in ("none", "gzip", "zstd"):
+        encoded = [encode_result(r, compression) for r in results]
+        decode = decoder(encoded[0][1])
+        size = np.mean([len(data) for data, _ in encoded])
+        encode_us = time_per_call(lambda r: encode_result(r, compression), results, args.repeat)
+        decode_us = time_per_call(lambda d: json.loads(decode(d[0])), encoded, args.repeat)
+        print(f"{'orjson/' + compression:<16} {size:8.0f} {baseline_bytes / size:7.2f} {encode_us:10.1f} {decode_us:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
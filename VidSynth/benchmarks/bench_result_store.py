@@ -0,0 +1,81 @@
+"""
+Read/write benchmark for the result store backends.
+
+Writes then reads N result-sized objects from T threads against each backend
+and reports throughput and latency percentiles. The gcs backend runs only
+when --emulator is given (fake-gcs-server, see docker-compose loadtest profile).
+
+Usage:
+    python benchmarks/bench_result_store.py
+    python benchmarks/bench_result_store.py --objects 5000 --threads 1,16 --fsync
+    python benchmarks/bench_result_store.py --emulator http://localhost:4443
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "push_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
+
+from vidsynth_common.result_store import GCSResultStore, LocalFSResultStore, MemoryResultStore
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run(label: str, store, objects: int, threads: int, data: bytes):
+    keys = [f"bench{i:06d}.json" for i in range(objects)]
+    for phase, fn in (("put", lambda k: store.put(k, data)), ("get", store.get)):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            latencies = np.array(list(pool.map(lambda k: timed(fn, k), keys))) * 1000
+        elapsed = time.perf_counter() - start
+        print(
+            f"{label:<14} {phase} t={threads:<3} {objects / elapsed:10.0f} ops/s   "
+            f"p50 {np.percentile(latencies, 50):7.3f} ms   p99 {np.percentile(latencies, 99):7.3f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Result store backend throughput")
+    parser.add_argument("--objects", type=int, default=2000)
+    parser.add_argument("--threads", default="1,8", help="Comma-separated thread counts")
+    parser.add_argument("--size", type=int, default=1500, help="Object size in bytes (gzip result is ~1.5 KB)")
+    parser.add_argument("--fsync", action="store_true", help="fsync local writes")
+    parser.add_argument("--emulator", help="fake-gcs-server URL; enables the gcs backend")
+    args = parser.parse_args()
+
+    data = os.urandom(args.size)
+    thread_counts = [int(t) for t in args.threads.split(",")]
+
+    with tempfile.TemporaryDirectory() as root:
+        backends = [
+            ("memory", lambda: MemoryResultStore()),
+            ("local" + ("+fsync" if args.fsync else ""), lambda: LocalFSResultStore(root, fsync=args.fsync)),
+        ]
+        if args.emulator:
+            os.environ["STORAGE_EMULATOR_HOST"] = args.emulator
+
+            def gcs():
+                store = GCSResultStore("vidsynth-results", pool_size=max(thread_counts))
+                if store.client.lookup_bucket("vidsynth-results") is None:
+                    store.client.create_bucket("vidsynth-results")
+                return store
+            backends.append(("gcs", gcs))
+
+        for label, make in backends:
+            for threads in thread_counts:
+                run(label, make(), args.objects, threads, data)
+
+
+if __name__ == "__main__":
+    main()
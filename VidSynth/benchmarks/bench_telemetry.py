@@ -0,0 +1,111 @@
+"""
+Benchmark for push_service telemetry.
+
+Measures what a request pays for TelemetryWriter.record() (buffer append only),
+how fast the background writer commits, and how long typical analytics queries
+take over the resulting Parquet dataset. The comparison is a JSON-lines log of
+the same rows, which is roughly what grepping service logs amounts to.
+
+Usage:
+    python benchmarks/bench_telemetry.py
+    python benchmarks/bench_telemetry.py --rows 1000000 --flush-rows 50000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "push_service"))
+
+from telemetry import TelemetryWriter
+
+ISSUES = ["Video summary is too short.", "Potential bias detected: low similarity", "Comment summary is missing."]
+
+
+def make_row(i: int, total: int, rng: random.Random, start: datetime) -> dict:
+    issues = rng.sample(ISSUES, k=rng.choice([0, 0, 0, 1, 2]))
+    score = rng.betavariate(5, 3)
+    return {
+        # Spread over two days so queries can prune partitions
+        "recorded_at": start + timedelta(seconds=i * 172800 / total),
+        "video_id": f"vid{i:08d}",
+        "run_token": f"{i:032x}",
+        "status": "pushed" if not issues else "discarded",
+        "is_valid": not issues,
+        "issues": issues,
+        "num_issues": len(issues),
+        "similarity_score": score,
+        "is_biased": score < 0.3,
+        "bias_threshold": 0.3,
+        "stage_timings": {"read": rng.uniform(0.1, 0.5), "llm": rng.uniform(5, 40), "validate": rng.uniform(0.1, 2)},
+        "token_counts": {"prefill_tokens": rng.randint(500, 4000), "generated_tokens": rng.randint(50, 300)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry writer and query benchmark")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--flush-rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    rows = [make_row(i, args.rows, rng, start) for i in range(args.rows)]
+
+    with tempfile.TemporaryDirectory() as root:
+        writer = TelemetryWriter(root, flush_rows=args.flush_rows, flush_seconds=3600, max_buffer_rows=args.rows)
+        record_ns = []
+        t0 = time.perf_counter()
+        for row in rows:
+            t = time.perf_counter_ns()
+            writer.record(row)
+            record_ns.append(time.perf_counter_ns() - t)
+        writer.close()
+        elapsed = time.perf_counter() - t0
+
+        stats = writer.stats()
+        parquet_bytes = sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files)
+        print(f"{args.rows} rows -> {stats['files_written']} files, {parquet_bytes / 1e6:.1f} MB parquet, {elapsed:.1f}s total")
+        print(f"record(): p50 {np.percentile(record_ns, 50) / 1000:.2f} us   p99 {np.percentile(record_ns, 99) / 1000:.2f} us")
+
+        jsonl = os.path.join(root, "..", f"telemetry-{os.getpid()}.jsonl")
+        with open(jsonl, "w") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str) + "\n")
+        print(f"jsonl equivalent: {os.path.getsize(jsonl) / 1e6:.1f} MB\n")
+
+        dataset = ds.dataset(root, format="parquet", partitioning="hive")
+
+        t = time.perf_counter()
+        table = dataset.to_table(columns=["similarity_score", "is_biased"])
+        biased_share = pc.mean(pc.cast(table["is_biased"], "int8")).as_py()
+        parquet_q1 = time.perf_counter() - t
+
+        t = time.perf_counter()
+        one_day = dataset.to_table(columns=["num_issues"], filter=ds.field("date") == "2026-10-19")
+        parquet_q2 = time.perf_counter() - t
+
+        t = time.perf_counter()
+        biased = total = 0
+        with open(jsonl) as f:
+            for line in f:
+                biased += json.loads(line)["is_biased"]
+                total += 1
+        jsonl_q1 = time.perf_counter() - t
+        os.remove(jsonl)
+
+        print(f"biased share ({biased_share:.3f}):   parquet {parquet_q1 * 1000:8.1f} ms   jsonl {jsonl_q1 * 1000:8.1f} ms")
+        print(f"one-day partition ({one_day.num_rows} rows): parquet {parquet_q2 * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Cold-start benchmark for the validate service's bias model.
+
+Each mode runs in a fresh subprocess and reports import time, model load time,
+first-encode latency and total time-to-ready:
+  - hub:           SentenceTransformer(model_name) through the Hugging Face cache
+  - local:         model_loader.load_local_model with checksum verification
+  - local-noverify: the same artifact without checksum verification
+
+Usage:
+    python benchmarks/bench_validate_cold_start.py --model-dir /app/models/all-MiniLM-L6-v2
+    python benchmarks/bench_validate_cold_start.py --repeats 5   # bakes into a temp dir first
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SERVICE_DIR = os.path.join(os.path.dirname(__file__), "..", "validate_service")
+sys.path.insert(0, SERVICE_DIR)
+
+
+def run_mode(args):
+    """Cold-load once in this process and print a JSON result line."""
+    start = time.perf_counter()
+    from sentence_transformers import SentenceTransformer
+    from model_loader import load_local_model
+    imported = time.perf_counter()
+
+    if args.worker == "hub":
+        model = SentenceTransformer(args.model, device="cpu")
+    else:
+        model = load_local_model(args.model_dir, verify=args.worker == "local", warm_up=False)
+    loaded = time.perf_counter()
+
+    model.encode(["first request after startup"], show_progress_bar=False)
+    ready = time.perf_counter()
+
+    print(json.dumps({
+        "import_s": imported - start,
+        "load_s": loaded - imported,
+        "first_encode_s": ready - loaded,
+        "ready_s": ready - start
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate service cold-start benchmark")
+    parser.add_argument("--model", default=os.getenv("BIAS_MODEL_NAME", "all-MiniLM-L6-v2"))
+    parser.add_argument("--model-dir", default=os.getenv("BIAS_MODEL_DIR"))
+    parser.add_argument("--modes", default="hub,local,local-noverify")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_mode(args)
+        return
+
+    if not args.model_dir:
+        from model_loader import bake
+        args.model_dir = os.path.join(tempfile.mkdtemp(prefix="vidsynth-model-"), "model")
+        bake(args.model, args.model_dir)
+
+    print(f"{'mode':>15}{'import s':>10}{'load s':>9}{'encode s':>10}{'ready s':>9}")
+    for mode in args.modes.split(","):
+        runs = []
+        for _ in range(args.repeats):
+            cmd = [sys.executable, __file__, "--worker", mode, "--model", args.model, "--model-dir", args.model_dir]
+            out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+
+        med = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+        print(
+            f"{mode:>15}{med['import_s']:>10.2f}{med['load_s']:>9.2f}"
+            f"{med['first_encode_s']:>10.3f}{med['ready_s']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
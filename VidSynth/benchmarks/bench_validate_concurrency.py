@@ -0,0 +1,145 @@
+"""
+Concurrency benchmark for the validate service's bias-check execution modes.
+
+Starts the real service under uvicorn once per BIAS_EXECUTION_MODE, waits for
+/ready, then drives /validate from 1..64 parallel clients. While the load runs,
+a separate prober hits / to measure how responsive the event loop stays.
+Reports throughput, request latency percentiles and probe latency.
+
+Usage:
+    python benchmarks/bench_validate_concurrency.py
+    python benchmarks/bench_validate_concurrency.py --modes thread,process --workers 4
+    BIAS_MODEL_DIR=/app/models/all-MiniLM-L6-v2 python benchmarks/bench_validate_concurrency.py
+"""
+
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import numpy as np
+
+SERVICE_DIR = os.path.join(os.path.dirname(__file__), "..", "validate_service")
+COMMON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "common"))
+
+WORDS = (
+    "python tutorial history war music review science space football election "
+    "recipe cooking travel guide beginner advanced explained news interview game "
+    "climate economy market crypto physics chemistry biology art design movie"
+).split()
+
+
+def make_payload(rng: random.Random) -> dict:
+    return {
+        "video_id": f"bench{rng.randrange(10 ** 6)}",
+        "video_title": " ".join(rng.choices(WORDS, k=8)).title(),
+        "video_summary": " ".join(rng.choices(WORDS, k=90)) + ".",
+        "comment_summary": " ".join(rng.choices(WORDS, k=40)) + "."
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_service(mode: str, workers: int, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        ENABLE_BIAS_CHECK="true",
+        BIAS_EXECUTION_MODE=mode,
+        BIAS_POOL_WORKERS=str(workers),
+        # Measure encoding, not cache hits
+        BIAS_EMBED_CACHE_SIZE="0",
+        PYTHONPATH=COMMON_DIR
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 300
+    while time.monotonic() < deadline and proc.poll() is None:
+        try:
+            response = httpx.get(f"{base}/ready", timeout=1)
+            if response.status_code == 200:
+                return proc
+            if response.json().get("status") == "failed":
+                break
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError(f"validate service ({mode}) did not become ready")
+
+
+def run_level(base: str, clients: int, requests_per_client: int):
+    latencies = []
+    probes = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def client_loop(seed):
+        rng = random.Random(seed)
+        with httpx.Client(base_url=base, timeout=120) as http:
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                http.post("/validate", json=make_payload(rng)).raise_for_status()
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+
+    def prober():
+        with httpx.Client(base_url=base, timeout=120) as http:
+            while not stop.is_set():
+                start = time.perf_counter()
+                http.get("/")
+                probes.append(time.perf_counter() - start)
+                time.sleep(0.05)
+
+    probe_thread = threading.Thread(target=prober, daemon=True)
+    probe_thread.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(client_loop, range(clients)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    probe_thread.join()
+
+    lat = np.array(latencies) * 1000
+    probe = np.array(probes or [0.0]) * 1000
+    return len(latencies) / elapsed, np.percentile(lat, 50), np.percentile(lat, 95), np.percentile(probe, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate service concurrency benchmark")
+    parser.add_argument("--modes", default="thread,process")
+    parser.add_argument("--clients", default="1,2,4,8,16,32,64")
+    parser.add_argument("--requests", type=int, default=8, help="Requests per client per level")
+    parser.add_argument("--workers", type=int, default=2, help="Encoder processes in process mode")
+    args = parser.parse_args()
+
+    for mode in args.modes.split(","):
+        port = free_port()
+        proc = start_service(mode, args.workers, port)
+        base = f"http://127.0.0.1:{port}"
+        try:
+            run_level(base, 2, 2)  # warm up
+            print(f"\nmode={mode}")
+            print(f"{'clients':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'probe p95 ms':>14}")
+            for clients in (int(c) for c in args.clients.split(",")):
+                rps, p50, p95, probe = run_level(base, clients, args.requests)
+                print(f"{clients:>8}{rps:>9.1f}{p50:>9.1f}{p95:>9.1f}{probe:>14.1f}")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
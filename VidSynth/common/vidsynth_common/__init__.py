@@ -0,0 +1,5 @@
+"""
+VidSynth Common
+Code shared by more than one service. Each service's Dockerfile copies this
+package into its image (the images are built from the VidSynth directory).
+"""
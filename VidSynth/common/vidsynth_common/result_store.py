@@ -0,0 +1,289 @@
+"""
+Result Store Module
+Storage backends for the per-video result objects written by push_service and
+read by gateway_service.
+
+- GCSResultStore: the vidsynth-results bucket (production)
+- LocalFSResultStore: a directory tree, for on-prem deployments and load tests
+- MemoryResultStore: a dict, for tests and single-process runs
+
+Objects are stored as raw bytes. Compression is recognisable from the bytes
+themselves (gzip / zstd magic), so no backend has to keep metadata alongside.
+
+Every object has a generation that changes on each write. put() can be made
+conditional on it (GCS if_generation_match semantics, 0 = "must not exist"),
+which is how push_service fences out writes from superseded pipeline runs.
+
+Shared by push_service and gateway_service through the vidsynth_common package.
+"""
+
+import fcntl
+import hashlib
+import itertools
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StaleWriteError(RuntimeError):
+    """A conditional write was rejected because the object changed since it was read."""
+
+
+def _check_generation(key: str, current: Optional[int], expected: Optional[int]):
+    if expected is not None and (current or 0) != expected:
+        raise StaleWriteError(f"{key} is at generation {current or 0}, expected {expected}")
+
+
+class ResultStore(ABC):
+    """Key -> bytes object store for pipeline results."""
+
+    @abstractmethod
+    def put(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str = "application/json",
+        content_encoding: Optional[str] = None,
+        if_generation_match: Optional[int] = None
+    ) -> int:
+        """
+        Write an object, replacing any existing one. Readers never see a partial write.
+
+        Args:
+            if_generation_match: Only write if the object is at this generation
+                (0 = only if it does not exist); raises StaleWriteError otherwise
+
+        Returns:
+            The generation of the new object
+        """
+
+    @abstractmethod
+    def get_versioned(self, key: str) -> Optional[Tuple[bytes, int]]:
+        """(stored bytes, generation), or None if there is no such object."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        """The stored bytes (not decompressed), or None if there is no such object."""
+        versioned = self.get_versioned(key)
+        return versioned[0] if versioned is not None else None
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether an object is stored under key."""
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Remove an object. Returns False if there was nothing to delete."""
+
+
+class MemoryResultStore(ResultStore):
+    """In-process dict; contents are lost on restart."""
+
+    def __init__(self):
+        self._objects: Dict[str, Tuple[bytes, int]] = {}
+        self._generations = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def put(self, key, data, content_type="application/json", content_encoding=None, if_generation_match=None):
+        with self._lock:
+            current = self._objects.get(key)
+            _check_generation(key, current[1] if current else None, if_generation_match)
+            generation = next(self._generations)
+            self._objects[key] = (bytes(data), generation)
+            return generation
+
+    def get_versioned(self, key):
+        with self._lock:
+            return self._objects.get(key)
+
+    def exists(self, key):
+        with self._lock:
+            return key in self._objects
+
+    def delete(self, key):
+        with self._lock:
+            return self._objects.pop(key, None) is not None
+
+
+class LocalFSResultStore(ResultStore):
+    """
+    Objects as files under root, sharded by key hash (root/ab/cd/key) so no
+    directory grows past a few thousand entries. Writes go to a temporary file
+    in the target directory and are renamed into place, which is atomic on POSIX.
+
+    The generation is the file's mtime in nanoseconds. Writers hold a per-shard
+    flock while they check it and rename, so conditional writes are safe across
+    processes on the same host; readers take no lock.
+    """
+
+    def __init__(self, root: str, shard_depth: int = 2, fsync: bool = False):
+        """
+        Args:
+            root: Directory holding the store (created if missing)
+            shard_depth: Levels of two-hex-digit shard directories
+            fsync: Flush each object to disk before renaming it (durable, slower)
+        """
+        self.root = os.path.abspath(root)
+        self.shard_depth = shard_depth
+        self.fsync = fsync
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        if not key or "/" in key or "\\" in key or key.startswith("."):
+            raise ValueError(f"Invalid result key: {key!r}")
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        shards = [digest[2 * i:2 * i + 2] for i in range(self.shard_depth)]
+        return os.path.join(self.root, *shards, key)
+
+    @contextmanager
+    def _locked(self, directory: str):
+        with open(os.path.join(directory, ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def put(self, key, data, content_type="application/json", content_encoding=None, if_generation_match=None):
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            with self._locked(directory):
+                try:
+                    current = os.stat(path).st_mtime_ns
+                except FileNotFoundError:
+                    current = None
+                _check_generation(key, current, if_generation_match)
+                # Strictly increasing even when writes land within the clock's resolution
+                generation = max(time.time_ns(), (current or 0) + 1)
+                os.utime(tmp, ns=(generation, generation))
+                os.replace(tmp, path)
+                # Read back: filesystems with coarser timestamps round what was set
+                return os.stat(path).st_mtime_ns
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def get_versioned(self, key):
+        try:
+            with open(self.path(key), "rb") as f:
+                return f.read(), os.fstat(f.fileno()).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+
+    def delete(self, key):
+        try:
+            os.unlink(self.path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+
+class GCSResultStore(ResultStore):
+    """
+    A Cloud Storage bucket. One storage client is shared by every call, with its
+    connection pool sized for the expected number of concurrent requests.
+    """
+
+    def __init__(self, bucket_name: str, pool_size: int = 10, client=None):
+        self.bucket_name = bucket_name
+        self.pool_size = pool_size
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is not None:
+            return self._client
+
+        with self._lock:
+            if self._client is None:
+                from google.cloud import storage
+                from requests.adapters import HTTPAdapter
+
+                client = storage.Client()
+                # The default pool keeps 10 connections
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                client._http.mount("https://", adapter)
+                client._http.mount("http://", adapter)
+                self._client = client
+                logger.info(f"Storage client created for gs://{self.bucket_name} (pool size {self.pool_size})")
+        return self._client
+
+    def _blob(self, key: str):
+        return self.client.bucket(self.bucket_name).blob(key)
+
+    def put(self, key, data, content_type="application/json", content_encoding=None, if_generation_match=None):
+        from google.api_core.exceptions import PreconditionFailed
+        blob = self._blob(key)
+        blob.content_encoding = content_encoding
+        try:
+            blob.upload_from_string(data=data, content_type=content_type, if_generation_match=if_generation_match)
+        except PreconditionFailed as e:
+            raise StaleWriteError(f"{key} changed since generation {if_generation_match}") from e
+        return blob.generation
+
+    def get_versioned(self, key):
+        from google.api_core.exceptions import NotFound
+        blob = self._blob(key)
+        try:
+            # raw_download: keep GCS from transcoding gzip objects
+            data = blob.download_as_bytes(raw_download=True)
+        except NotFound:
+            return None
+        # The download response headers carry the object's generation
+        return data, blob.generation
+
+    def exists(self, key):
+        return self._blob(key).exists()
+
+    def delete(self, key):
+        from google.api_core.exceptions import NotFound
+        try:
+            self._blob(key).delete()
+            return True
+        except NotFound:
+            return False
+
+
+def create_result_store(kind: str, bucket_name: str = "vidsynth-results", path: Optional[str] = None, pool_size: int = 10) -> ResultStore:
+    """
+    Build a store from configuration.
+
+    Args:
+        kind: "gcs", "local" or "memory"
+        bucket_name: Bucket for the gcs backend
+        path: Root directory for the local backend
+        pool_size: Connection pool size for the gcs backend
+    """
+    kind = kind.lower()
+    if kind == "gcs":
+        return GCSResultStore(bucket_name, pool_size=pool_size)
+    if kind == "local":
+        if not path:
+            raise ValueError("The local result store needs RESULT_STORE_PATH")
+        return LocalFSResultStore(path)
+    if kind == "memory":
+        return MemoryResultStore()
+    raise ValueError(f"Unknown result store: {kind}")
@@ -0,0 +1,23 @@
+"""
+Server Timing Module
+Middleware that appends the handler's total time ("app") to the Server-Timing
+header of every response, after any entries the handler set itself (e.g.
+validate's per-check timings or llm's TGI time). The DAG's stage metrics read it.
+"""
+
+import time
+
+from fastapi import FastAPI
+
+
+def add_server_timing(app: FastAPI):
+    """Register the Server-Timing middleware on app."""
+
+    @app.middleware("http")
+    async def server_timing(request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        timing = f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+        existing = response.headers.get("Server-Timing")
+        response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+        return response
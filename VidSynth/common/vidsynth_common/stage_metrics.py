@@ -0,0 +1,176 @@
+"""
+Stage Metrics Module
+Per-stage latency and payload-size instrumentation for pipeline runs, shared by
+the DAG and the gateway's in-process runner so both store the same summary.
+
+Every service call records:
+    wall_seconds     whole call (encode request, HTTP, decode response)
+    http_seconds     the HTTP exchange alone, including retries
+    retries          attempts retried by the session (connection errors, 502/503/504)
+    request_bytes / response_bytes
+    server           timings the service reported in its Server-Timing header (ms),
+                     e.g. {"app": 8123.4, "tgi": 8010.2} from llm_service
+
+Records are sent to the metrics backend as they happen and accumulated into a
+per-run summary (RunMetrics) that push_service stores with the result.
+
+Backend, from VIDSYNTH_METRICS:
+    statsd://host:8125         StatsD over UDP (docker-compose runs statsd-exporter,
+                               which serves them as OpenMetrics on :9102/metrics)
+    file:///path/metrics.jsonl  local stand-in: one JSON line per record
+    unset                      no metrics are sent (the run summary is still kept)
+"""
+
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+METRICS_URL = os.getenv("VIDSYNTH_METRICS")
+METRICS_PREFIX = os.getenv("VIDSYNTH_METRICS_PREFIX", "vidsynth")
+
+_SERVER_TIMING = re.compile(r"^\s*([\w.-]+)\s*(?:;.*?dur=([\d.]+))?")
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """{"name": milliseconds} from a Server-Timing header (entries without dur are skipped)."""
+    timings = {}
+    for entry in (header or "").split(","):
+        match = _SERVER_TIMING.match(entry)
+        if match and match.group(2):
+            timings[match.group(1)] = float(match.group(2))
+    return timings
+
+
+class StatsDClient:
+    """Fire-and-forget StatsD over UDP; a lost datagram only loses a sample."""
+
+    def __init__(self, host: str, port: int = 8125, prefix: str = METRICS_PREFIX):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, stage: str, record: Dict):
+        base = f"{self.prefix}.stage.{stage}"
+        lines = [
+            f"{base}.wall:{record['wall_seconds'] * 1000:.3f}|ms",
+            f"{base}.http:{record['http_seconds'] * 1000:.3f}|ms",
+            f"{base}.request_bytes:{record['request_bytes']}|h",
+            f"{base}.response_bytes:{record['response_bytes']}|h",
+            f"{base}.calls:1|c",
+        ]
+        if record["retries"]:
+            lines.append(f"{base}.retries:{record['retries']}|c")
+        if record.get("error"):
+            lines.append(f"{base}.errors:1|c")
+        if record.get("skipped"):
+            lines.append(f"{base}.skipped:1|c")
+        lines += [f"{base}.server.{name}:{ms:.3f}|ms" for name, ms in record["server"].items()]
+        try:
+            self._socket.sendto("\n".join(lines).encode("ascii"), self.address)
+        except OSError as e:
+            logger.debug(f"StatsD send failed: {e}")
+
+
+class FileMetricsClient:
+    """Local stand-in: appends one JSON line per record."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def send(self, stage: str, record: Dict):
+        line = json.dumps(dict(record, stage=stage, ts=time.time()))
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+
+class NullMetricsClient:
+    def send(self, stage: str, record: Dict):
+        pass
+
+
+def create_metrics_client(url: Optional[str]):
+    """Client for a statsd://host:port or file:///path URL (no-op when unset)."""
+    if not url:
+        return NullMetricsClient()
+    parsed = urlparse(url)
+    if parsed.scheme == "statsd":
+        return StatsDClient(parsed.hostname or "localhost", parsed.port or 8125)
+    if parsed.scheme == "file":
+        return FileMetricsClient(parsed.path)
+    raise ValueError(f"Unknown VIDSYNTH_METRICS backend: {url}")
+
+
+_metrics_client = None
+_client_lock = threading.Lock()
+
+
+def get_metrics_client():
+    """Get or create the process-wide metrics client for VIDSYNTH_METRICS."""
+    global _metrics_client
+    if _metrics_client is None:
+        with _client_lock:
+            if _metrics_client is None:
+                _metrics_client = create_metrics_client(METRICS_URL)
+    return _metrics_client
+
+
+def stage_record(
+    wall_seconds: float,
+    http_seconds: float = 0.0,
+    retries: int = 0,
+    request_bytes: int = 0,
+    response_bytes: int = 0,
+    server: Optional[Dict[str, float]] = None,
+    error: bool = False,
+    skipped: bool = False
+) -> Dict:
+    return {
+        "wall_seconds": round(wall_seconds, 4),
+        "http_seconds": round(http_seconds, 4),
+        "retries": retries,
+        "request_bytes": request_bytes,
+        "response_bytes": response_bytes,
+        "server": server or {},
+        "error": error,
+        "skipped": skipped,
+    }
+
+
+class RunMetrics:
+    """
+    Stage records for one video's run. The summary is plain JSON, so it can
+    travel with the payload between tasks and be resumed by the next one.
+    """
+
+    def __init__(self, summary: Optional[Dict] = None):
+        self.stages: Dict[str, Dict] = dict((summary or {}).get("stages") or {})
+
+    def record(self, stage: str, record: Dict, client=None):
+        """Keep a stage's record for the run summary and send it to the metrics backend."""
+        self.stages[stage] = record
+        (client or get_metrics_client()).send(stage, record)
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Wall seconds per stage."""
+        return {stage: record["wall_seconds"] for stage, record in self.stages.items()}
+
+    def summary(self) -> Dict:
+        records = self.stages.values()
+        return {
+            "stages": self.stages,
+            "wall_seconds": round(sum(r["wall_seconds"] for r in records), 4),
+            "http_seconds": round(sum(r["http_seconds"] for r in records), 4),
+            "retries": sum(r["retries"] for r in records),
+            "request_bytes": sum(r["request_bytes"] for r in records),
+            "response_bytes": sum(r["response_bytes"] for r in records),
+        }
@@ -0,0 +1,234 @@
+"""
+Fake TGI Service
+CPU-only stand-in for the GPU-backed tgi-service (Deployment_Scripts/tgi-service.yaml).
+Speaks the same /generate, /generate_stream and compat / API with deterministic
+output, configurable prefill/per-token latency, TGI-style admission control
+(--max-concurrent-requests -> 429) and a bounded decode batch, plus injectable
+errors and overloads. Used to load-test llm_service offline.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="VidSynth Fake TGI Service")
+
+VOCABULARY = (
+    "the video discusses main topics viewers comments sentiment overall positive "
+    "negative mixed explains key points while many people agree that this content "
+    "covers history science music news tutorial review game and shows examples"
+).split()
+
+
+class FakeTGIConfig(BaseModel):
+    """Runtime behaviour of the fake server. Defaults come from FAKE_TGI_* env vars."""
+    prefill_ms: float = float(os.getenv("FAKE_TGI_PREFILL_MS", "20"))
+    per_token_ms: float = float(os.getenv("FAKE_TGI_PER_TOKEN_MS", "5"))
+    output_tokens: int = int(os.getenv("FAKE_TGI_OUTPUT_TOKENS", "64"))
+    max_concurrent_requests: int = int(os.getenv("FAKE_TGI_MAX_CONCURRENT_REQUESTS", "10"))
+    max_batch_size: int = int(os.getenv("FAKE_TGI_MAX_BATCH_SIZE", "4"))
+    max_input_length: int = int(os.getenv("FAKE_TGI_MAX_INPUT_LENGTH", "4096"))
+    error_rate: float = float(os.getenv("FAKE_TGI_ERROR_RATE", "0"))
+    error_status: int = int(os.getenv("FAKE_TGI_ERROR_STATUS", "500"))
+    overload_rate: float = float(os.getenv("FAKE_TGI_OVERLOAD_RATE", "0"))
+    seed: int = int(os.getenv("FAKE_TGI_SEED", "0"))
+
+
+class _State:
+    """Admission counters, decode slots and the fault-injection RNG."""
+
+    def __init__(self, config: FakeTGIConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.decode_slots = asyncio.Semaphore(config.max_batch_size)
+        self.admitted = 0
+        self.running = 0
+        self.counters = {"requests": 0, "completed": 0, "overloaded": 0, "errors": 0, "rejected_input": 0}
+
+
+state = _State(FakeTGIConfig())
+
+
+def configure(**overrides) -> FakeTGIConfig:
+    """Replace the active configuration and reset counters, slots and the RNG."""
+    global state
+    config = FakeTGIConfig(**{**state.config.model_dump(), **overrides})
+    state = _State(config)
+    logger.info(f"FAKE TGI: configured {config.model_dump()}")
+    return config
+
+
+def count_tokens(text: str) -> int:
+    """Whitespace token count; close enough to drive latency and length limits."""
+    return len(text.split())
+
+
+def fake_tokens(prompt: str, n: int):
+    """Deterministic pseudo-tokens derived from the prompt."""
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+    for i in range(n):
+        yield (" " if i else "") + rng.choice(VOCABULARY)
+
+
+def _error(status: int, message: str, error_type: str) -> JSONResponse:
+    return JSONResponse(status_code=status, content={"error": message, "error_type": error_type})
+
+
+def _admit(inputs: str) -> Optional[JSONResponse]:
+    """Apply TGI's admission rules. Returns an error response, or None if admitted."""
+    config = state.config
+    state.counters["requests"] += 1
+
+    if state.admitted >= config.max_concurrent_requests or state.rng.random() < config.overload_rate:
+        state.counters["overloaded"] += 1
+        return _error(429, "Model is overloaded", "overloaded")
+
+    if count_tokens(inputs) > config.max_input_length:
+        state.counters["rejected_input"] += 1
+        return _error(
+            422,
+            f"`inputs` must have less than {config.max_input_length} tokens.",
+            "validation"
+        )
+
+    if state.rng.random() < config.error_rate:
+        state.counters["errors"] += 1
+        return _error(config.error_status, "Injected generation failure", "generation")
+
+    state.admitted += 1
+    return None
+
+
+def _new_tokens(parameters: Dict[str, Any]) -> int:
+    requested = parameters.get("max_new_tokens") or state.config.output_tokens
+    return max(1, min(int(requested), state.config.output_tokens))
+
+
+def _details(n_tokens: int, inputs: str, decoder_input_details: bool = False) -> Dict[str, Any]:
+    details = {
+        "finish_reason": "length",
+        "generated_tokens": n_tokens,
+        "seed": None
+    }
+    # Like TGI there is no prompt token count here; the prompt tokens are only
+    # listed when decoder_input_details is requested (the count is in x-prompt-tokens)
+    if decoder_input_details:
+        details["prefill"] = [{"id": i, "text": token, "logprob": None} for i, token in enumerate(inputs.split())]
+    return details
+
+
+@app.get("/health")
+def health():
+    return {"status": "healthy", "service": "fake_tgi_service"}
+
+
+@app.get("/info")
+def info():
+    """Subset of TGI's /info, reflecting the active limits."""
+    return {
+        "model_id": "fake-tgi",
+        "max_concurrent_requests": state.config.max_concurrent_requests,
+        "max_input_length": state.config.max_input_length,
+        "max_batch_size": state.config.max_batch_size
+    }
+
+
+@app.get("/fake/stats")
+def fake_stats():
+    return {**state.counters, "admitted": state.admitted, "running": state.running}
+
+
+@app.put("/fake/config")
+def fake_config(overrides: Dict[str, Any]):
+    return configure(**overrides).model_dump()
+
+
+@app.post("/generate")
+async def generate(payload: Dict[str, Any]):
+    inputs = payload.get("inputs", "")
+    parameters = payload.get("parameters") or {}
+
+    rejection = _admit(inputs)
+    if rejection:
+        return rejection
+
+    try:
+        n_tokens = _new_tokens(parameters)
+        async with state.decode_slots:
+            state.running += 1
+            try:
+                config = state.config
+                await asyncio.sleep((config.prefill_ms + config.per_token_ms * n_tokens) / 1000.0)
+            finally:
+                state.running -= 1
+
+        text = "".join(fake_tokens(inputs, n_tokens))
+        if parameters.get("return_full_text"):
+            text = inputs + text
+
+        state.counters["completed"] += 1
+        response = {"generated_text": text}
+        if parameters.get("details"):
+            response["details"] = _details(n_tokens, inputs, parameters.get("decoder_input_details", False))
+        return JSONResponse(content=response, headers={"x-prompt-tokens": str(count_tokens(inputs))})
+    finally:
+        state.admitted -= 1
+
+
+@app.post("/generate_stream")
+async def generate_stream(payload: Dict[str, Any]):
+    inputs = payload.get("inputs", "")
+    parameters = payload.get("parameters") or {}
+
+    rejection = _admit(inputs)
+    if rejection:
+        return rejection
+
+    n_tokens = _new_tokens(parameters)
+
+    async def events():
+        try:
+            async with state.decode_slots:
+                state.running += 1
+                try:
+                    config = state.config
+                    await asyncio.sleep(config.prefill_ms / 1000.0)
+                    text = ""
+                    for i, token in enumerate(fake_tokens(inputs, n_tokens)):
+                        await asyncio.sleep(config.per_token_ms / 1000.0)
+                        text += token
+                        last = i == n_tokens - 1
+                        event = {
+                            "token": {"id": i, "text": token, "logprob": 0.0, "special": False},
+                            "generated_text": text if last else None,
+                            "details": _details(n_tokens, inputs) if last else None
+                        }
+                        yield f"data:{json.dumps(event)}\n\n"
+                finally:
+                    state.running -= 1
+            state.counters["completed"] += 1
+        finally:
+            state.admitted -= 1
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/")
+async def compat_generate(request: Request):
+    """TGI's compat route: dispatches on the `stream` flag."""
+    payload = await request.json()
+    if payload.get("stream"):
+        return await generate_stream(payload)
+    return await generate(payload)
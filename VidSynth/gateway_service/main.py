@@ -1,13 +1,21 @@
 import os
+import asyncio
+import gzip
 import json
 import logging
+import threading
+import uuid
+from datetime import datetime, timezone
 import requests
 import google.auth
 from google.auth.transport.requests import Request
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request as HTTPRequest, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from google.cloud import storage
+from typing import Optional
+from vidsynth_common.freshness import VALIDATION_FIELDS
+from vidsynth_common.result_store import ResultStore, StaleWriteError, create_result_store
+from pipeline_runner import PipelineRunner
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,33 +35,101 @@ app.add_middleware(
 RESULTS_BUCKET = "vidsynth-results" # can keep hard coded, since will have been already created before deploy 
 DAG_ID = "vidsynth_pipeline" # simlar to above 
 
+# Where push_service writes results: "gcs" (RESULTS_BUCKET), "local" (RESULT_STORE_PATH) or "memory"
+RESULT_STORE = os.getenv("RESULT_STORE", "gcs")
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH")
+
 # AIRFLOW_WEBSERVER_URL = "YOUR_AIRFLOW_WEBSERVER_URL"  # MAYBE put back for CI/CD continous deploy, GitHub secret?
 AIRFLOW_WEBSERVER_URL = os.getenv("AIRFLOW_WEBSERVER_URL")
 
+# A ready result younger than this is served as-is; /summarize does not re-run the pipeline
+RESULT_FRESH_SECONDS = int(os.getenv("RESULT_FRESH_SECONDS", "21600"))
+
+# DAG execution_mode for runs started here: "fused" (one task, lowest latency) or "tasks" (one task per service)
+PIPELINE_EXECUTION_MODE = os.getenv("PIPELINE_EXECUTION_MODE", "fused")
+
+# Who runs /summarize requests: "airflow" (trigger the DAG) or "inprocess"
+# (pipeline_runner.py calls the services directly, no scheduler start-up).
+# Bulk runs always go through Airflow.
+PIPELINE_RUNNER = os.getenv("PIPELINE_RUNNER", "airflow")
+
 class VideoRequest(BaseModel):
     video_id: str
+    force: bool = False  # re-run even if a fresh result exists
+
+_result_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+def get_result_store() -> ResultStore:
+    """Get or create the process-wide result store."""
+    global _result_store
+    if _result_store is None:
+        with _store_lock:
+            if _result_store is None:
+                _result_store = create_result_store(RESULT_STORE, bucket_name=RESULTS_BUCKET, path=RESULT_STORE_PATH)
+    return _result_store
+
+_pipeline_runner: Optional[PipelineRunner] = None
+_runner_lock = threading.Lock()
+
+def get_pipeline_runner() -> PipelineRunner:
+    """Get or create the process-wide in-process runner (one connection pool and set of stage limits)."""
+    global _pipeline_runner
+    if _pipeline_runner is None:
+        with _runner_lock:
+            if _pipeline_runner is None:
+                _pipeline_runner = PipelineRunner()
+    return _pipeline_runner
 
 @app.get("/")
 def root():
     return {"message": "VidSynth Gateway is Running (Fast Mode)"}
 
 @app.post("/summarize")
-def trigger_pipeline(request: VideoRequest):
+def trigger_pipeline(request: VideoRequest, background_tasks: BackgroundTasks):
     video_id = request.video_id
     video_link = f"https://www.youtube.com/watch?v={video_id}"
-    logger.info(f"Triggering DAG for: {video_link}")
+    logger.info(f"Triggering {PIPELINE_RUNNER} run for: {video_link}")
 
     
-    if not AIRFLOW_WEBSERVER_URL:
+    if PIPELINE_RUNNER == "airflow" and not AIRFLOW_WEBSERVER_URL:
         raise HTTPException(status_code=500, detail="AIRFLOW_WEBSERVER_URL not configured")
 
     try:
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(RESULTS_BUCKET)
-        blob = bucket.blob(f"{video_id}.json")
-        if blob.exists():
-            logger.info("Deleting stale data...")
-            blob.delete()
+        previous = load_result(get_result_store().get(f"{video_id}.json"))
+        if previous is not None and not request.force and is_fresh(previous):
+            logger.info(f"Result for {video_id} is fresh ({previous['generated_at']}); not re-running")
+            return {
+                "status": "fresh",
+                "message": "A recent result exists; pass force=true to re-run",
+                "video_id": video_id,
+                "generated_at": previous["generated_at"]
+            }
+
+        # Replace any old result with a placeholder stamped with this run's token
+        # (rather than deleting it). push_service only accepts a write from the
+        # run whose token is stored, so a late push from an older run for the
+        # same video cannot overwrite this one, and readers never see the object vanish.
+        run_token = uuid.uuid4().hex
+        placeholder = {"status": "processing", "video_id": video_id, "run_token": run_token}
+        last_ready = previous if previous and previous.get("status") == "ready" else (previous or {}).get("previous")
+        if last_ready:
+            # Kept so the pipeline can reuse stages whose inputs have not changed
+            keys = ("generated_at", "input_hashes", "data", "comments") + VALIDATION_FIELDS
+            placeholder["previous"] = {k: last_ready[k] for k in keys if k in last_ready}
+        get_result_store().put(f"{video_id}.json", json.dumps(placeholder).encode())
+
+        if PIPELINE_RUNNER == "inprocess":
+            # Runs after the response is sent; the client polls /result as usual
+            background_tasks.add_task(
+                run_in_process, get_pipeline_runner(), video_id, video_link, run_token, placeholder.get("previous")
+            )
+            return {
+                "status": "started",
+                "message": "Pipeline started in the gateway",
+                "video_id": video_id,
+                "run_token": run_token
+            }
 
         credentials, _ = google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
         credentials.refresh(Request())
@@ -68,7 +144,7 @@ def trigger_pipeline(request: VideoRequest):
         
 
         payload = {
-            "conf": {"video_link": video_link}
+            "conf": {"video_link": video_link, "run_token": run_token, "execution_mode": PIPELINE_EXECUTION_MODE}
         }
 
 
@@ -82,23 +158,153 @@ def trigger_pipeline(request: VideoRequest):
         return {
             "status": "started", 
             "message": "Pipeline triggered instantly via REST API",
-            "video_id": video_id
+            "video_id": video_id,
+            "run_token": run_token
         }
 
     except Exception as e:
         logger.error(f"Gateway Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- In-process runs ---
+# On Cloud Run these continue after the response, so the gateway is deployed
+# with --no-cpu-throttling (see pipeline_runner.py)
+async def run_in_process(runner: PipelineRunner, video_id: str, video_link: str, run_token: str, previous: Optional[dict] = None):
+    try:
+        outcome = await runner.run(video_link, run_token, previous)
+        logger.info(f"In-process run for {video_id}: {outcome['status']}")
+        if outcome["status"] == "discarded":
+            # Nothing was pushed, so the placeholder is still there
+            await asyncio.to_thread(mark_finished, video_id, run_token, "discarded", issues=outcome.get("issues") or [])
+    except Exception as e:
+        logger.error(f"In-process run for {video_id} failed: {e}")
+        await asyncio.to_thread(mark_finished, video_id, run_token, "failed", error=str(e))
+
+def mark_finished(video_id: str, run_token: str, status: str, **fields):
+    """
+    Replace this run's placeholder with a final status ("failed" or "discarded",
+    plus the error or issues), so clients stop polling. Skipped if a newer run
+    has taken over the result since.
+    """
+    store = get_result_store()
+    key = f"{video_id}.json"
+    current = store.get_versioned(key)
+    placeholder = load_result(current[0]) if current else None
+    if not placeholder or placeholder.get("run_token") != run_token:
+        return
+    finished = dict(placeholder, status=status, **fields)
+    try:
+        store.put(key, json.dumps(finished).encode(), if_generation_match=current[1])
+    except StaleWriteError:
+        pass  # a newer run wrote in between
+
+@app.get("/runner/stats")
+def runner_stats():
+    """Queued and in-flight calls per stage for in-process runs (this gateway process)."""
+    if PIPELINE_RUNNER != "inprocess":
+        return {"runner": PIPELINE_RUNNER}
+    return {"runner": PIPELINE_RUNNER, "stages": get_pipeline_runner().stats()}
+
+# --- Result decoding ---
+# push_service may store results gzip- or zstd-compressed; older blobs are plain JSON.
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+def result_encoding(raw: bytes):
+    """Content encoding of a stored result, sniffed from its magic bytes."""
+    if raw.startswith(GZIP_MAGIC):
+        return "gzip"
+    if raw.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+def decode_result(raw: bytes, encoding) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(raw)
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(raw, max_output_size=64 * 1024 * 1024)
+    return raw
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == encoding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+def load_result(raw: Optional[bytes]) -> Optional[dict]:
+    """Parsed stored result, or None if there is none or it cannot be read."""
+    if raw is None:
+        return None
+    try:
+        return json.loads(decode_result(raw, result_encoding(raw)))
+    except Exception as e:
+        logger.warning(f"Unreadable stored result: {e}")
+        return None
+
+def result_age_seconds(result: dict) -> Optional[float]:
+    try:
+        generated_at = datetime.fromisoformat(result["generated_at"])
+    except (KeyError, TypeError, ValueError):
+        return None  # results written before generated_at was recorded
+    return (datetime.now(timezone.utc) - generated_at).total_seconds()
+
+def is_fresh(result: dict) -> bool:
+    """A ready result generated within RESULT_FRESH_SECONDS."""
+    age = result_age_seconds(result)
+    return result.get("status") == "ready" and age is not None and age < RESULT_FRESH_SECONDS
+
+@app.get("/meta/{video_id}")
+def get_result_meta(video_id: str):
+    """
+    Status, age, generation and stage input hashes of the stored result, without
+    the summaries. Used by the DAG's freshness check.
+    """
+    try:
+        stored = get_result_store().get_versioned(f"{video_id}.json")
+        result = load_result(stored[0]) if stored else None
+    except Exception as e:
+        logger.error(f"Error reading result metadata: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No result for {video_id}")
+
+    age = result_age_seconds(result)
+    meta = {
+        "video_id": video_id,
+        "status": result.get("status"),
+        "run_token": result.get("run_token"),
+        # Bulk runs push conditionally on this, so they never overwrite a newer run
+        "generation": stored[1],
+        "generated_at": result.get("generated_at"),
+        "age_seconds": round(age, 1) if age is not None else None,
+        "fresh": is_fresh(result),
+        "input_hashes": result.get("input_hashes"),
+        "metrics": result.get("metrics")
+    }
+    if "previous" in result:
+        meta["previous"] = {k: result["previous"].get(k) for k in ("generated_at", "input_hashes")}
+    return meta
+
 @app.get("/result/{video_id}")
-def get_result(video_id: str):
+def get_result(video_id: str, request: HTTPRequest):
     try:
-        client = storage.Client()
-        bucket = client.bucket(RESULTS_BUCKET)
-        blob = bucket.blob(f"{video_id}.json")
+        # Stored bytes as written (no transcoding), so compressed results can go straight out
+        raw = get_result_store().get(f"{video_id}.json")
+
+        if raw is not None:
+            encoding = result_encoding(raw)
+
+            if encoding and accepts_encoding(request.headers.get("accept-encoding", ""), encoding):
+                return Response(
+                    content=raw,
+                    media_type="application/json",
+                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+                )
 
-        if blob.exists():
-            content = blob.download_as_text()
-            data = json.loads(content)
+            data = json.loads(decode_result(raw, encoding))
             return data 
         else:
             return {"status": "processing"}
@@ -0,0 +1,249 @@
+"""
+Pipeline Runner Module
+Runs one video through read -> preprocess -> llm -> validate -> push from
+inside the gateway, without going through Airflow.
+
+Triggering the DAG costs the Airflow REST API, a scheduler loop and task
+start-up before the first service is called; for an interactive request that
+wait is longer than read and preprocess together. This runner calls the same
+services over a pooled async HTTP client instead (they run in separate
+containers with their own dependencies, so they are not imported as libraries).
+
+Per stage:
+    concurrency  at most RUNNER_CONCURRENCY[stage] calls in flight per gateway
+                 process; the rest queue, so a burst of requests cannot pile
+                 onto the LLM
+    deadline     RUNNER_DEADLINES[stage] seconds, counting the time spent
+                 queued; past it the run fails with StageDeadlineExceeded
+    retries      502/503/504 and connection errors are retried within the deadline
+
+Both can be overridden per stage with RUNNER_<STAGE>_CONCURRENCY and
+RUNNER_<STAGE>_DEADLINE. Bulk runs stay on Airflow.
+
+Runs use the DAG's freshness and stage metrics modules (vidsynth_common): llm
+and validate are skipped when their input hashes match the previous result,
+and push stores the same input_hashes and run metrics summary as a DAG run.
+
+Runs continue after /summarize has answered, so on Cloud Run the gateway must
+keep its CPU between requests (--no-cpu-throttling) and at least one instance
+(--min-instances 1). A run on an instance that is shut down anyway is lost and
+its placeholder stays "processing" until the video is requested again.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from vidsynth_common.freshness import SKIPPABLE_STAGES, input_hash, reuse_output, with_previous_comments
+from vidsynth_common.stage_metrics import RunMetrics, parse_server_timing, stage_record
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("read", "preprocess", "llm", "validate", "push")
+STAGE_PATHS = {"read": "/read", "preprocess": "/preprocess", "llm": "/run-llm", "validate": "/validate", "push": "/push"}
+# Base URLs of the services, e.g. http://read_service:8080
+SERVICE_URLS = {stage: os.getenv(f"{stage.upper()}_SERVICE_URL") for stage in STAGES}
+
+RUNNER_CONCURRENCY = {
+    stage: int(os.getenv(f"RUNNER_{stage.upper()}_CONCURRENCY", default))
+    for stage, default in {"read": 64, "preprocess": 8, "llm": 4, "validate": 8, "push": 32}.items()
+}
+# Same budgets as the DAG's per-stage timeouts
+RUNNER_DEADLINES = {
+    stage: float(os.getenv(f"RUNNER_{stage.upper()}_DEADLINE", default))
+    for stage, default in {"read": 30, "preprocess": 60, "llm": 600, "validate": 300, "push": 30}.items()
+}
+HTTP_RETRIES = 2
+RETRY_STATUSES = (502, 503, 504)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class StageError(RuntimeError):
+    """A stage failed; the run stops there."""
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(f"{stage}: {message}")
+        self.stage = stage
+
+
+class StageDeadlineExceeded(StageError):
+    pass
+
+
+class PipelineRunner:
+    """Runs single videos through the services with per-stage concurrency limits and deadlines."""
+
+    def __init__(
+        self,
+        urls: Optional[Dict[str, str]] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        deadlines: Optional[Dict[str, float]] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.urls = dict(urls or SERVICE_URLS)
+        missing = [stage for stage in STAGES if not self.urls.get(stage)]
+        if missing:
+            raise ValueError(f"No service URL configured for: {', '.join(missing)}")
+        self.concurrency = dict(RUNNER_CONCURRENCY, **(concurrency or {}))
+        self.deadlines = dict(RUNNER_DEADLINES, **(deadlines or {}))
+        self._semaphores = {stage: asyncio.Semaphore(self.concurrency[stage]) for stage in STAGES}
+        self._client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(None, connect=10),
+            transport=httpx.AsyncHTTPTransport(
+                retries=HTTP_RETRIES,  # connection errors only
+                limits=httpx.Limits(max_connections=sum(self.concurrency.values()), max_keepalive_connections=sum(self.concurrency.values()))
+            )
+        )
+        self._counts = {stage: {"in_flight": 0, "queued": 0, "ok": 0, "failed": 0, "deadline_exceeded": 0} for stage in STAGES}
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def stats(self) -> Dict:
+        """Calls queued, in flight and finished per stage (this process only)."""
+        return {stage: dict(counts, limit=self.concurrency[stage]) for stage, counts in self._counts.items()}
+
+    # --- Stage calls ---
+    async def _post(self, stage: str, url: str, body: bytes, timing: dict) -> httpx.Response:
+        for attempt in range(HTTP_RETRIES + 1):
+            timing["retries"] = attempt
+            response = await self._client.post(url, content=body, headers=JSON_HEADERS)
+            if response.status_code not in RETRY_STATUSES or attempt == HTTP_RETRIES:
+                return response
+            logger.warning(f"RUNNER {stage}: HTTP {response.status_code}, retrying")
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def _call(self, stage: str, body: bytes, timing: dict, path: Optional[str] = None) -> httpx.Response:
+        counts = self._counts[stage]
+        counts["queued"] += 1
+        queued_at = time.perf_counter()
+        try:
+            async with self._semaphores[stage]:
+                counts["queued"] -= 1
+                counts["in_flight"] += 1
+                started = time.perf_counter()
+                timing["queue_seconds"] = round(started - queued_at, 4)
+                try:
+                    return await self._post(stage, self.urls[stage].rstrip("/") + (path or STAGE_PATHS[stage]), body, timing)
+                finally:
+                    counts["in_flight"] -= 1
+                    timing["http_seconds"] = time.perf_counter() - started
+        except asyncio.CancelledError:
+            if "queue_seconds" not in timing:
+                counts["queued"] -= 1
+            raise
+
+    async def call_stage(
+        self,
+        stage: str,
+        payload: dict,
+        metrics: Optional[RunMetrics] = None,
+        path: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        POST payload to stage, queueing for a slot, within the stage's deadline.
+        The call is recorded in metrics (a stage_record plus queue_seconds) when given.
+        """
+        body = json.dumps(payload).encode("utf-8")
+        timing = {}
+        response = None
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._call(stage, body, timing, path), self.deadlines[stage])
+        except asyncio.TimeoutError:
+            self._counts[stage]["deadline_exceeded"] += 1
+            raise StageDeadlineExceeded(stage, f"no response within {self.deadlines[stage]:.0f}s")
+        except httpx.HTTPError as e:
+            self._counts[stage]["failed"] += 1
+            raise StageError(stage, str(e))
+        finally:
+            if metrics is not None:
+                record = stage_record(
+                    time.perf_counter() - start,
+                    http_seconds=timing.get("http_seconds", 0.0),
+                    retries=timing.get("retries", 0),
+                    request_bytes=len(body),
+                    response_bytes=len(response.content) if response is not None else 0,
+                    server=parse_server_timing(response.headers.get("Server-Timing")) if response is not None else {},
+                    error=response is None or response.status_code >= 400
+                )
+                metrics.record(stage, dict(record, queue_seconds=timing.get("queue_seconds", 0.0)))
+        return response
+
+    async def run_stage(self, stage: str, payload: dict, metrics: RunMetrics) -> dict:
+        response = await self.call_stage(stage, payload, metrics)
+        if response.status_code >= 400:
+            self._counts[stage]["failed"] += 1
+            raise StageError(stage, f"HTTP {response.status_code}: {response.text[:300]}")
+        self._counts[stage]["ok"] += 1
+        return response.json()
+
+    # --- Whole run ---
+    async def run(self, video_link: str, run_token: Optional[str] = None, previous: Optional[Dict] = None) -> Dict:
+        """
+        Run one video end to end. previous is the last ready result (the gateway
+        placeholder's "previous"); llm and validate reuse its output when their
+        input is unchanged, and an llm call updates its comment summary. Returns the outcome ("pushed", "discarded" or
+        "superseded") with the run metrics; raises StageError if a stage fails.
+        """
+        metrics = RunMetrics()
+        hashes: Dict[str, str] = {}
+        comments = token_counts = None
+        data = {"video_link": video_link}
+        for stage in STAGES[:-1]:
+            output = None
+            if stage in SKIPPABLE_STAGES:
+                hashes[stage] = input_hash(stage, data)
+                output = reuse_output(stage, data, hashes[stage], previous)
+                if output is not None:
+                    logger.info(f"RUNNER {stage}: skipped, input unchanged since {previous.get('generated_at')}")
+                    metrics.record(stage, stage_record(0.0, skipped=True))
+            if output is None:
+                request = with_previous_comments(data, previous) if stage == "llm" else data
+                output = await self.run_stage(stage, request, metrics)
+            if stage == "llm":
+                # validate does not pass these on
+                comments, token_counts = output.get("comments"), output.get("token_counts")
+            data = output
+
+        video_id = data.get("video_id")
+        # Same fields as a DAG push: stored with the result for the next run's skipping
+        payload = dict(
+            data,
+            comments=comments,
+            token_counts=token_counts,
+            run_token=run_token,
+            input_hashes=hashes,
+            stage_timings=metrics.stage_timings(),
+            run_metrics=metrics.summary()
+        )
+
+        if not data.get("is_valid"):
+            logger.info(f"RUNNER: {video_id} discarded as invalid: {data.get('issues')}")
+            # Telemetry only; failing to record it does not fail the run
+            try:
+                await self.call_stage("push", payload, path="/telemetry")
+            except StageError as e:
+                logger.warning(f"RUNNER: telemetry for {video_id} failed: {e}")
+            return {"status": "discarded", "video_id": video_id, "issues": data.get("issues"), "metrics": metrics.summary()}
+
+        # The stored summary covers the stages before push; push itself is only sent to the metrics backend
+        response = await self.call_stage("push", payload, metrics)
+        if response.status_code == 409:
+            # A newer run for this video owns the result
+            logger.info(f"RUNNER: push for {video_id} superseded")
+            return {"status": "superseded", "video_id": video_id, "metrics": metrics.summary()}
+        if response.status_code >= 400:
+            self._counts["push"]["failed"] += 1
+            raise StageError("push", f"HTTP {response.status_code}: {response.text[:300]}")
+        self._counts["push"]["ok"] += 1
+
+        summary = metrics.summary()
+        breakdown = ", ".join(f"{s} {r['wall_seconds']}s" for s, r in summary["stages"].items())
+        logger.info(f"RUNNER: {video_id} pushed in {summary['wall_seconds']}s ({breakdown})")
+        return {"status": "pushed", "video_id": video_id, "metrics": summary}
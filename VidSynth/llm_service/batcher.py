@@ -0,0 +1,149 @@
+"""
+Micro-Batching Dispatcher
+Collects prompts from concurrent /run-llm requests over a short window (or until
+a size cap is hit) and dispatches them to TGI together, so they land in the same
+continuous-batching step on the GPU. Results are handed back to each caller
+through its own Future.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger("uvicorn")
+
+
+class MicroBatcher:
+    """
+    Window/size bounded micro-batcher in front of a blocking generate function.
+    """
+
+    def __init__(
+        self,
+        generate_fn: Callable[[str], Any],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 25.0,
+        max_in_flight: int = 10
+    ):
+        """
+        Args:
+            generate_fn: Blocking function that turns one prompt into its result
+                (generated text, or text and token counts)
+            max_batch_size: Maximum number of prompts dispatched together
+            max_wait_ms: Longest time the first prompt of a batch waits for company
+            max_in_flight: Cap on prompts outstanding at TGI across all batches
+                (keep at or below TGI's --max-concurrent-requests)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        if max_in_flight < max_batch_size:
+            raise ValueError("max_in_flight must be at least max_batch_size")
+
+        self.generate_fn = generate_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_in_flight = max_in_flight
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight,
+            thread_name_prefix="tgi-dispatch"
+        )
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._prompts = 0
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._collect_loop, name="llm-batcher", daemon=True)
+        self._thread.start()
+
+        logger.info(
+            f"MicroBatcher started (max_batch_size={max_batch_size}, "
+            f"max_wait_ms={max_wait_ms}, max_in_flight={max_in_flight})"
+        )
+
+    def submit(self, prompt: str) -> Future:
+        """Queue a prompt and return a Future resolving to generate_fn's result for it."""
+        if self._stopped:
+            raise RuntimeError("MicroBatcher has been shut down")
+
+        future: Future = Future()
+        self._queue.put((prompt, future))
+        return future
+
+    def generate(self, prompt: str) -> Any:
+        """Blocking convenience wrapper around submit()."""
+        return self.submit(prompt).result()
+
+    def generate_many(self, prompts: List[str]) -> List[Any]:
+        """Submit several prompts at once and return their results in order."""
+        futures = [self.submit(p) for p in prompts]
+        return [f.result() for f in futures]
+
+    def stats(self) -> Dict:
+        """Return dispatch counters."""
+        with self._stats_lock:
+            batches, prompts = self._batches, self._prompts
+        return {
+            "batches_dispatched": batches,
+            "prompts_dispatched": prompts,
+            "avg_batch_size": (prompts / batches) if batches else 0.0,
+            "queue_depth": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "max_in_flight": self.max_in_flight
+        }
+
+    def shutdown(self):
+        """Stop collecting and wait for in-flight prompts to finish."""
+        self._stopped = True
+        self._queue.put(None)
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _collect_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._dispatch(batch)
+                    return
+                batch.append(nxt)
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        with self._stats_lock:
+            self._batches += 1
+            self._prompts += len(batch)
+
+        logger.debug(f"MicroBatcher dispatching {len(batch)} prompt(s)")
+
+        for prompt, caller in batch:
+            if not caller.set_running_or_notify_cancel():
+                continue
+            self._executor.submit(self._run_one, prompt, caller)
+
+    def _run_one(self, prompt: str, caller: Future):
+        try:
+            caller.set_result(self.generate_fn(prompt))
+        except Exception as e:
+            caller.set_exception(e)
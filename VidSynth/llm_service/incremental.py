@@ -0,0 +1,87 @@
+"""
+Incremental Comment Summaries
+When a video is refreshed, decides whether the comment summary can be updated
+from the previous summary plus only the newly added comments, reused as-is, or
+must be recomputed from the full comment blob.
+"""
+
+from typing import List, Optional, Tuple
+
+# Same cap as the full comment prompt
+MAX_COMMENT_CHARS = 3000
+
+
+class CommentPlan:
+    """How to produce the comment summary for this run."""
+
+    FULL = "full"
+    INCREMENTAL = "incremental"
+    REUSED = "reused"
+
+    def __init__(self, mode: str, new_comments: Optional[List[str]] = None, drift: float = 1.0):
+        self.mode = mode
+        self.new_comments = new_comments or []
+        self.drift = drift
+
+
+def split_comments(blob: Optional[str]) -> List[str]:
+    """Split the preprocess service's newline-joined comment blob."""
+    if not blob:
+        return []
+    return [line.strip() for line in blob.split("\n") if line.strip()]
+
+
+def comment_drift(previous: List[str], current: List[str]) -> Tuple[List[str], float]:
+    """
+    Return the comments that are new since the previous run, and the drift
+    between the two sets (Jaccard distance: 0 = identical, 1 = disjoint).
+    """
+    prev_set = set(previous)
+    cur_set = set(current)
+
+    new_comments = [c for c in current if c not in prev_set]
+    union = prev_set | cur_set
+    if not union:
+        return new_comments, 0.0
+
+    drift = 1.0 - len(prev_set & cur_set) / len(union)
+    return new_comments, drift
+
+
+def plan_comment_summary(
+    comments: str,
+    previous_summary: Optional[str],
+    previous_comments: Optional[str],
+    drift_threshold: float
+) -> CommentPlan:
+    """
+    Pick full / incremental / reused for the comment summary.
+
+    Falls back to a full recompute when there is no usable prior state or the
+    comment set has drifted past drift_threshold.
+    """
+    if not previous_summary or previous_comments is None:
+        return CommentPlan(CommentPlan.FULL)
+
+    new_comments, drift = comment_drift(split_comments(previous_comments), split_comments(comments))
+
+    if drift > drift_threshold:
+        return CommentPlan(CommentPlan.FULL, drift=drift)
+
+    if not new_comments:
+        return CommentPlan(CommentPlan.REUSED, drift=drift)
+
+    return CommentPlan(CommentPlan.INCREMENTAL, new_comments=new_comments, drift=drift)
+
+
+def build_incremental_prompt(previous_summary: str, new_comments: List[str]) -> str:
+    """Prompt that folds new comments into an existing comment summary."""
+    new_blob = "\n".join(new_comments)[:MAX_COMMENT_CHARS]
+    return (
+        f"<|begin_of_text|><|start_header_id|>system<|end_header_id|> "
+        f"You are a concise sentiment analyst. You are given an existing summary of a video's comments and a batch of newly posted comments. "
+        f"Output only the updated summary of the overall sentiment and main discussion points in three short sentences, keeping what still holds and folding in anything new. "
+        f"DO NOT INCLUDE ANY INTRODUCTORY PHRASES OR LABELS.<|eot_id|>"
+        f"<|start_header_id|>user<|end_header_id|>\nExisting summary:\n{previous_summary}\n\nNew comments:\n{new_blob}\n<|eot_id|>"
+        f"<|start_header_id|>assistant<|end_header_id|>"
+    )
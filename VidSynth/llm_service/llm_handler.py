@@ -2,6 +2,8 @@ import os
 import logging
 import requests
 import json
+from typing import Dict, Tuple
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger("uvicorn")
 
@@ -15,10 +17,23 @@ class LLMHandler:
         
         logger.info(f"🔗 Configured to use TGI Service at: {self.api_url}")
 
+        # Shared keep-alive pool so concurrent prompts reuse TGI connections
+        pool_size = int(os.getenv("LLM_HTTP_POOL_SIZE", "16"))
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
     def generate(self, prompt: str) -> str:
         """
         Sends the prompt to the TGI service and returns the generated text.
         """
+        return self.generate_with_usage(prompt)[0]
+
+    def generate_with_usage(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Sends the prompt to the TGI service and returns the generated text with
+        its token counts ({"prefill_tokens", "generated_tokens"}; empty on error).
+        """
         headers = {
             "Content-Type": "application/json"
         }
@@ -29,23 +44,41 @@ class LLMHandler:
                 "max_new_tokens": 512, 
                 "temperature": 0.3,
                 "do_sample": True,
+                "details": True,
             }
         }
 
         try:
-            response = requests.post(self.api_url, json=payload, headers=headers, timeout=120)
+            response = self.session.post(self.api_url, json=payload, headers=headers, timeout=120)
             response.raise_for_status()
             
             result = response.json()
             
             if isinstance(result, list) and "generated_text" in result[0]:
-                generated_text = result[0]["generated_text"]
+                result = result[0]
+                generated_text = result["generated_text"]
                 if generated_text.startswith(prompt):
-                    return generated_text[len(prompt):].strip()
-                return generated_text.strip()
+                    generated_text = generated_text[len(prompt):]
+                return generated_text.strip(), self._token_counts(result, response.headers)
             
-            return result.get("generated_text", "")
+            return result.get("generated_text", ""), self._token_counts(result, response.headers)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error calling TGI Service: {e}")
-            return f"Error generating content: {str(e)}"
\ No newline at end of file
+            return f"Error generating content: {str(e)}", {}
+
+    @staticmethod
+    def _token_counts(result: dict, headers) -> Dict[str, int]:
+        """Prompt and generated token counts from TGI's x-prompt-tokens header and details."""
+        details = result.get("details") or {}
+        counts = {}
+        # TGI has no prompt token count in details; it sends it as a header, and
+        # lists the prompt tokens in details only if decoder_input_details is requested
+        prefill = headers.get("x-prompt-tokens")
+        if prefill is None and details.get("prefill") is not None:
+            prefill = len(details["prefill"])
+        if prefill is not None:
+            counts["prefill_tokens"] = int(prefill)
+        if details.get("generated_tokens") is not None:
+            counts["generated_tokens"] = int(details["generated_tokens"])
+        return counts
\ No newline at end of file
@@ -1,7 +1,13 @@
 import logging
-from fastapi import FastAPI, HTTPException
+import os
+import time
+from typing import Dict, List, Tuple
+from fastapi import FastAPI, HTTPException, Response
 from schemas import PreprocessOutput, LLMOutput
 from llm_handler import LLMHandler
+from batcher import MicroBatcher
+from incremental import MAX_COMMENT_CHARS, CommentPlan, plan_comment_summary, build_incremental_prompt
+from vidsynth_common.server_timing import add_server_timing
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -9,25 +15,74 @@ logger = logging.getLogger("uvicorn")
 
 app = FastAPI(title="VidSynth LLM Service (Client)")
 
+add_server_timing(app)
+
+# Configuration
+ENABLE_BATCHING = os.getenv("LLM_BATCHING_ENABLED", "false").lower() == "true"
+BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("LLM_BATCH_MAX_WAIT_MS", "25"))
+BATCH_MAX_IN_FLIGHT = int(os.getenv("LLM_BATCH_MAX_IN_FLIGHT", "10"))  # TGI --max-concurrent-requests
+# Recompute the comment summary from scratch once this share of the comment set has changed
+INCREMENTAL_DRIFT_THRESHOLD = float(os.getenv("INCREMENTAL_DRIFT_THRESHOLD", "0.3"))
+
 llm_engine = None
+llm_batcher = None
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the API Client."""
-    global llm_engine
+    global llm_engine, llm_batcher
     try:
         llm_engine = LLMHandler()
         logger.info("✅ LLM Handler ready (connected to TGI backend)")
     except Exception as e:
         logger.error(f"CRITICAL: Failed to initialize LLM handler: {e}")
+        return
+
+    if ENABLE_BATCHING:
+        llm_batcher = MicroBatcher(
+            llm_engine.generate_with_usage,
+            max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS,
+            max_in_flight=max(BATCH_MAX_IN_FLIGHT, BATCH_MAX_SIZE)
+        )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if llm_batcher:
+        llm_batcher.shutdown()
+
+def generate_all(prompts: List[str]) -> Tuple[List[str], Dict[str, int]]:
+    """
+    Run a set of prompts through TGI. With batching enabled they join the shared
+    micro-batch queue (alongside other requests' prompts); otherwise they run in order.
+
+    Returns:
+        The generated texts, and TGI's token counts summed over the prompts
+    """
+    if llm_batcher:
+        results = llm_batcher.generate_many(prompts)
+    else:
+        results = [llm_engine.generate_with_usage(p) for p in prompts]
+    token_counts: Dict[str, int] = {}
+    for _, counts in results:
+        for name, n in counts.items():
+            token_counts[name] = token_counts.get(name, 0) + n
+    return [text for text, _ in results], token_counts
 
 @app.get("/")
 def root():
     status = "Ready" if llm_engine else "Not Ready"
     return {"message": f"VidSynth LLM Service (Client Mode). Status: {status}"}
 
+@app.get("/batcher/stats")
+def batcher_stats():
+    if not llm_batcher:
+        return {"enabled": False}
+    return {"enabled": True, **llm_batcher.stats()}
+
 @app.post("/run-llm", response_model=LLMOutput)
-def run_llm(request: PreprocessOutput):
+def run_llm(request: PreprocessOutput, response: Response):
     if not llm_engine:
         raise HTTPException(status_code=503, detail="LLM Handler is not initialized.")
 
@@ -40,20 +95,46 @@ def run_llm(request: PreprocessOutput):
         f"<|start_header_id|>user<|end_header_id|>\n{request.transcript[:10000]}\n<|eot_id|>"
         f"<|start_header_id|>assistant<|end_header_id|>"
     )
-    video_sum = llm_engine.generate(trans_prompt) 
 
     # 2. Summarize Comments (Comment Sentiment)
-    comm_prompt = (
-        f"<|begin_of_text|><|start_header_id|>system<|end_header_id|> "
-        f"You are a concise sentiment analyst. Output only the summary of the overall sentiment and main discussion points in three short sentences. DO NOT INCLUDE ANY INTRODUCTORY PHRASES OR LABELS.<|eot_id|>"
-        f"<|start_header_id|>user<|end_header_id|>\n{request.comments[:3000]}\n<|eot_id|>"
-        f"<|start_header_id|>assistant<|end_header_id|>"
+    # Only the prompted part of the blob counts: it is what push stores as next run's previous_comments
+    comments = request.comments[:MAX_COMMENT_CHARS]
+    plan = plan_comment_summary(
+        comments,
+        request.previous_comment_summary,
+        request.previous_comments,
+        INCREMENTAL_DRIFT_THRESHOLD
     )
-    comment_sum = llm_engine.generate(comm_prompt)
+    logger.info(f"Comment summary mode: {plan.mode} (drift {plan.drift:.2f})")
+
+    tgi_start = time.perf_counter()
+    if plan.mode == CommentPlan.REUSED:
+        (video_sum,), token_counts = generate_all([trans_prompt])
+        comment_sum = request.previous_comment_summary
+    else:
+        if plan.mode == CommentPlan.INCREMENTAL:
+            comm_prompt = build_incremental_prompt(request.previous_comment_summary, plan.new_comments)
+        else:
+            comm_prompt = (
+                f"<|begin_of_text|><|start_header_id|>system<|end_header_id|> "
+                f"You are a concise sentiment analyst. Output only the summary of the overall sentiment and main discussion points in three short sentences. DO NOT INCLUDE ANY INTRODUCTORY PHRASES OR LABELS.<|eot_id|>"
+                f"<|start_header_id|>user<|end_header_id|>\n{comments}\n<|eot_id|>"
+                f"<|start_header_id|>assistant<|end_header_id|>"
+            )
+        (video_sum, comment_sum), token_counts = generate_all([trans_prompt, comm_prompt])
+    # Includes time queued in the micro-batcher and in TGI
+    response.headers["Server-Timing"] = f"tgi;dur={(time.perf_counter() - tgi_start) * 1000:.1f}"
 
     return LLMOutput(
         video_id=request.video_id,
         video_summary=video_sum,
         comment_summary=comment_sum,
-        video_title=request.video_title
+        video_title=request.video_title,
+        category=request.category,
+        language=request.language,
+        comment_summary_mode=plan.mode,
+        token_counts=token_counts or None,
+        # Only the part of the blob a full prompt sees, so validate scores coverage against what the model read
+        comments=comments,
+        transcript=request.transcript
     )
\ No newline at end of file
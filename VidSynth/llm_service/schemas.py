@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 
 # --- Input Schema ---
 class PreprocessOutput(BaseModel):
@@ -11,6 +11,12 @@ class PreprocessOutput(BaseModel):
     transcript: str
     comments: str
     video_title: Optional[str] = None
+    category: Optional[str] = None
+    language: Optional[str] = None
+    # Refresh runs: the last published comment summary and the comments it was
+    # built from. When both are present the comment summary is updated incrementally.
+    previous_comment_summary: Optional[str] = None
+    previous_comments: Optional[str] = None
 
 # --- Output Schema ---
 class LLMOutput(BaseModel):
@@ -22,4 +28,13 @@ class LLMOutput(BaseModel):
     video_summary: str
     comment_summary: str
     video_title: Optional[str] = None
+    # Passed through for validate's calibrated thresholds and per-language monitoring
+    category: Optional[str] = None
+    language: Optional[str] = None
+    comment_summary_mode: Optional[str] = None  # "full", "incremental" or "reused"
+    # TGI token usage over this request's prompts: {"prefill_tokens": ..., "generated_tokens": ...}
+    token_counts: Optional[Dict[str, int]] = None
+    # Passed through so validate can check comment coverage and transcript grounding
+    comments: Optional[str] = None
+    transcript: Optional[str] = None
 
@@ -2,6 +2,7 @@
 from fastapi import FastAPI, HTTPException 
 from schemas import VideoIdInput, PreprocessOutput
 from youtube_client import youtube_client  
+from vidsynth_common.server_timing import add_server_timing
 import logging  
 
 # basic logging 
@@ -9,6 +10,8 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 app = FastAPI(title="VidSynth Preprocess Service") 
 
+add_server_timing(app)
+
 @app.get("/")
 def root():
     """Returns a simple message indicating the service is running."""
@@ -45,5 +48,7 @@ def preprocess(request: VideoIdInput):
         video_id=video_id,
         transcript=transcript,
         comments=comments,
-        video_title=video_title 
+        video_title=video_title,
+        category=data.get("category"),
+        language=data.get("language")
     )
\ No newline at end of file
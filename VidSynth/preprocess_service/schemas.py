@@ -17,4 +17,6 @@ class PreprocessOutput(BaseModel):
     transcript: str
     comments: str
     video_title: Optional[str] = None
+    category: Optional[str] = None  # e.g. "education", from the video's categoryId
+    language: Optional[str] = None  # e.g. "en", from the video's defaultAudioLanguage
 
@@ -8,6 +8,15 @@ from googleapiclient.discovery import build
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("YouTubeClient")
 
+# snippet.categoryId -> category name (YouTube's fixed list), lowercased as the
+# keys of validate's calibrated thresholds are
+VIDEO_CATEGORIES = {
+    "1": "film & animation", "2": "autos & vehicles", "10": "music", "15": "pets & animals",
+    "17": "sports", "19": "travel & events", "20": "gaming", "22": "people & blogs",
+    "23": "comedy", "24": "entertainment", "25": "news & politics", "26": "howto & style",
+    "27": "education", "28": "science & technology", "29": "nonprofits & activism"
+}
+
 class YouTubeClient:
     def __init__(self):
         self.api_key = os.getenv("YOUTUBE_API_KEY")
@@ -37,7 +46,7 @@ class YouTubeClient:
         return {
             "transcript": self._get_transcript(video_id),
             "comments": self._get_comments(video_id),
-            "video_title": self._get_video_title(video_id)
+            **self._get_video_details(video_id)
         }
 
     def _get_transcript(self, video_id: str) -> str:
@@ -120,12 +129,24 @@ class YouTubeClient:
         except Exception:
             return ""
 
-    def _get_video_title(self, video_id: str) -> str:
-        if not self.youtube_api: return "Unknown"
+    def _get_video_details(self, video_id: str) -> dict:
+        """Title, category (e.g. "education") and spoken language (e.g. "en") from the video's snippet."""
+        details = {"video_title": "Unknown", "category": None, "language": None}
+        if not self.youtube_api: return details
         try:
             resp = self.youtube_api.videos().list(part="snippet", id=video_id).execute()
-            return resp['items'][0]['snippet']['title'] if resp.get('items') else "Unknown"
         except Exception:
-            return "Unknown"
+            return details
+        if not resp.get('items'):
+            return details
+        snippet = resp['items'][0]['snippet']
+        details["video_title"] = snippet.get('title', "Unknown")
+        category_id = snippet.get('categoryId')
+        details["category"] = VIDEO_CATEGORIES.get(category_id, category_id)
+        # "en-US" -> "en"; defaultLanguage (title/description language) when the audio language is unset
+        language = snippet.get('defaultAudioLanguage') or snippet.get('defaultLanguage')
+        if language:
+            details["language"] = language.split('-')[0].lower()
+        return details
 
 youtube_client = YouTubeClient()
\ No newline at end of file
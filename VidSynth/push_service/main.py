@@ -1,9 +1,18 @@
 import os
-import json
+import gzip
+import asyncio
 import logging
-from fastapi import FastAPI, HTTPException
-from google.cloud import storage
-from schemas import PushInput, PushOutput
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+import orjson
+from fastapi import FastAPI, HTTPException, Response
+from vidsynth_common.result_store import ResultStore, StaleWriteError, create_result_store
+from schemas import PushInput, PushOutput, PushBatchInput, PushBatchOutput, PushBatchResult
+from telemetry import create_telemetry_writer
+from vidsynth_common.server_timing import add_server_timing
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,9 +20,82 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="VidSynth Push Service")
 
+add_server_timing(app)
+
 # CONFIGURATION
 BUCKET_NAME = "vidsynth-results" # can keep hardcoded 
 
+# Where results go: "gcs" (BUCKET_NAME), "local" (RESULT_STORE_PATH) or "memory"
+RESULT_STORE = os.getenv("RESULT_STORE", "gcs")
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH")
+
+# Uploads in flight at once (also the size of the storage client's connection pool)
+PUSH_MAX_CONCURRENCY = int(os.getenv("PUSH_MAX_CONCURRENCY", "16"))
+PUSH_BATCH_MAX_ITEMS = int(os.getenv("PUSH_BATCH_MAX_ITEMS", "500"))
+
+# Result object encoding: "gzip" (default), "zstd" or "none".
+# gzip objects are stored with Content-Encoding: gzip, so GCS still serves them
+# decompressed to readers that do not accept gzip. zstd objects must be read
+# through the gateway. The blob name stays {video_id}.json either way.
+RESULT_COMPRESSION = os.getenv("RESULT_COMPRESSION", "gzip").lower()
+RESULT_COMPRESSION_LEVEL = int(os.getenv("RESULT_COMPRESSION_LEVEL", "0"))  # 0 = codec default
+
+# Per-run telemetry (Parquet, partitioned by date/hour); disabled unless TELEMETRY_DIR is set.
+# TELEMETRY_DIR may be a local path or a URI such as gs://bucket/telemetry
+TELEMETRY_DIR = os.getenv("TELEMETRY_DIR")
+telemetry_writer = create_telemetry_writer(
+    TELEMETRY_DIR,
+    flush_rows=int(os.getenv("TELEMETRY_FLUSH_ROWS", "5000")),
+    flush_seconds=float(os.getenv("TELEMETRY_FLUSH_SECONDS", "30")),
+    max_buffer_rows=int(os.getenv("TELEMETRY_MAX_BUFFER_ROWS", "100000"))
+)
+
+# --- Shared result store ---
+# One store (and so one storage client) per process: building a client
+# re-resolves credentials, and every new client opens fresh TLS connections.
+_result_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+# Blocking uploads run here, so bulk pushes never exhaust Starlette's threadpool
+_upload_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_result_store() -> ResultStore:
+    """Get or create the process-wide result store."""
+    global _result_store
+
+    if _result_store is not None:
+        return _result_store
+
+    with _store_lock:
+        if _result_store is None:
+            _result_store = create_result_store(
+                RESULT_STORE, bucket_name=BUCKET_NAME, path=RESULT_STORE_PATH, pool_size=PUSH_MAX_CONCURRENCY
+            )
+            logger.info(f"PUSH: Using {RESULT_STORE} result store")
+    return _result_store
+
+
+def get_upload_executor() -> ThreadPoolExecutor:
+    global _upload_executor
+    with _store_lock:
+        if _upload_executor is None:
+            _upload_executor = ThreadPoolExecutor(max_workers=PUSH_MAX_CONCURRENCY, thread_name_prefix="push-upload")
+    return _upload_executor
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Let in-flight uploads finish and commit buffered telemetry."""
+    global _upload_executor
+    with _store_lock:
+        executor, _upload_executor = _upload_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    if telemetry_writer is not None:
+        telemetry_writer.close()
+
+
 @app.get("/")
 def root():
     return {"message": "VidSynth Push Service Running (FastAPI)"}
@@ -22,8 +104,161 @@ def root():
 def health_check():
     return {"status": "healthy", "service": "push_service"}
 
+
+def log_bias_result(request: PushInput):
+    """Log the bias detection result carried over from validate_service."""
+    video_title = request.video_title or "Unknown Title"
+
+    if request.bias_check:
+        bias = request.bias_check
+
+        status_icon = "⚠️ BIASED" if bias.is_biased else "✅ UNBIASED"
+        score_display = f"{bias.similarity_score:.2f}" if bias.similarity_score is not None else "N/A"
+        
+        logger.info(f"PUSH: Video '{video_title}' ({request.video_id}) | Result: {status_icon} (Score: {score_display})")
+        
+        if bias.is_biased:
+            logger.warning("PUSH: Low similarity detected between title and summary.")
+    else:
+        logger.info(f"PUSH: Processing '{video_title}' (No bias data available)")
+
+
+def record_telemetry(request: PushInput, status: str, error: Optional[str] = None):
+    """Queue a telemetry row for this run (no-op when telemetry is disabled)."""
+    if telemetry_writer is None:
+        return
+    bias = request.bias_check
+    telemetry_writer.record({
+        "video_id": request.video_id,
+        "run_token": request.run_token,
+        "status": status,
+        "is_valid": request.is_valid,
+        "issues": request.issues,
+        "num_issues": len(request.issues),
+        "similarity_score": bias.similarity_score if bias else None,
+        "is_biased": bias.is_biased if bias else None,
+        "bias_threshold": bias.threshold if bias else None,
+        "grounding_score": (request.grounding or {}).get("grounding_score"),
+        "comment_covered_share": (request.comment_coverage or {}).get("covered_share"),
+        "stage_timings": request.stage_timings,
+        "token_counts": request.token_counts,
+        "error": error
+    })
+
+
+def encode_result(final_output: dict, compression: str = "none", level: int = 0) -> tuple:
+    """
+    Serialise a result with orjson and compress it.
+
+    Returns:
+        (bytes, content encoding or None)
+    """
+    data = orjson.dumps(final_output)
+    if compression == "gzip":
+        # mtime=0 keeps identical results byte-identical
+        return gzip.compress(data, compresslevel=level or 6, mtime=0), "gzip"
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=level or 3).compress(data), "zstd"
+    if compression != "none":
+        raise ValueError(f"Unknown RESULT_COMPRESSION: {compression}")
+    return data, None
+
+
+def stored_run_token(raw: bytes) -> Optional[str]:
+    """run_token of a stored result or placeholder (None for untagged or unreadable objects)."""
+    try:
+        if raw.startswith(b"\x1f\x8b"):
+            raw = gzip.decompress(raw)
+        elif raw.startswith(b"\x28\xb5\x2f\xfd"):
+            import zstandard
+            raw = zstandard.ZstdDecompressor().decompress(raw, max_output_size=64 * 1024 * 1024)
+        return orjson.loads(raw).get("run_token")
+    except Exception:
+        return None
+
+
+def fenced_generation(store: ResultStore, key: str, run_token: str, expected_generation: Optional[int] = None) -> int:
+    """
+    Generation a write from run_token must match. The gateway stamps each new run's
+    token into a placeholder object, so an object carrying another token means
+    this run has been superseded. Bulk runs write no placeholder; they pass the
+    generation they read when they started instead, and any other write since
+    then supersedes them.
+    """
+    current = store.get_versioned(key)
+    if current is None:
+        raw, generation = None, 0
+    else:
+        raw, generation = current
+    token = stored_run_token(raw) if raw is not None else None
+    if token == run_token:
+        # Our own placeholder, or our own earlier write (a retried push)
+        return generation
+    if expected_generation is not None:
+        if generation != expected_generation:
+            raise StaleWriteError(f"Run {run_token} is stale: {key} changed since generation {expected_generation}")
+        return generation
+    if token is not None:
+        raise StaleWriteError(f"Run {run_token} is stale: {key} belongs to run {token}")
+    return generation
+
+
+def upload_result(request: PushInput):
+    """Save the summary to the result store in the strict JSON structure required by the Extension."""
+    final_output = {
+        "status": "ready",
+        "video_id": request.video_id,
+        "data": {
+            "video_summary": request.video_summary,
+            "comment_summary": request.comment_summary
+        },
+        # Read by the gateway / DAG freshness check
+        "generated_at": datetime.now(timezone.utc).isoformat()
+    }
+    if request.run_token:
+        final_output["run_token"] = request.run_token
+    if request.input_hashes:
+        final_output["input_hashes"] = request.input_hashes
+    if request.run_metrics:
+        final_output["metrics"] = request.run_metrics
+    if request.comments is not None:
+        final_output["comments"] = request.comments
+    # validate's results, carried over by a later run that skips validate
+    final_output["is_valid"] = request.is_valid
+    final_output["issues"] = request.issues
+    if request.bias_check is not None:
+        final_output["bias_check"] = request.bias_check.model_dump()
+    if request.comment_coverage is not None:
+        final_output["comment_coverage"] = request.comment_coverage
+    if request.grounding is not None:
+        final_output["grounding"] = request.grounding
+
+    filename = f"{request.video_id}.json"
+    store = get_result_store()
+
+    # Runs with a token only write over their own placeholder / result, and only
+    # if nothing else wrote in between; untagged pushes write unconditionally
+    generation = (
+        fenced_generation(store, filename, request.run_token, request.expected_generation)
+        if request.run_token else None
+    )
+
+    data, encoding = encode_result(final_output, RESULT_COMPRESSION, RESULT_COMPRESSION_LEVEL)
+
+    logger.info(f"PUSH: Saving {filename} ({len(data)} bytes, {encoding or 'uncompressed'})...")
+    
+    store.put(filename, data, content_type="application/json", content_encoding=encoding, if_generation_match=generation)
+
+
+async def upload_result_async(request: PushInput):
+    """Run upload_result on the bounded upload executor."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_upload_executor(), upload_result, request)
+
+
 @app.post("/push", response_model=PushOutput)
-def push_to_storage(request: PushInput):
+async def push_to_storage(request: PushInput, response: Response):
     """
     Receives validated data, logs Bias Detection results, and saves 
     the summary to GCS in the strict JSON structure required by the Extension.
@@ -31,45 +266,74 @@ def push_to_storage(request: PushInput):
     logger.info(f"PUSH: Received request for video_id: {request.video_id}")
 
     try:
-        video_title = request.video_title or "Unknown Title"
-        
-        if request.bias_check:
-            bias = request.bias_check
-
-            status_icon = "⚠️ BIASED" if bias.is_biased else "✅ UNBIASED"
-            score_display = f"{bias.similarity_score:.2f}" if bias.similarity_score is not None else "N/A"
-            
-            logger.info(f"PUSH: Video '{video_title}' | Result: {status_icon} (Score: {score_display})")
-            
-            if bias.is_biased:
-                logger.warning("PUSH: Low similarity detected between title and summary.")
-        else:
-            logger.info(f"PUSH: Processing '{video_title}' (No bias data available)")
-
-        final_output = {
-            "status": "ready",
-            "video_id": request.video_id,
-            "data": {
-                "video_summary": request.video_summary,
-                "comment_summary": request.comment_summary
-            }
-        }
-
-        filename = f"{request.video_id}.json"
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(BUCKET_NAME)
-        blob = bucket.blob(filename)
-
-        logger.info(f"PUSH: Saving {filename} to bucket...")
-        
-        blob.upload_from_string(
-            data=json.dumps(final_output),
-            content_type="application/json"
-        )
+        log_bias_result(request)
+        start = time.perf_counter()
+        await upload_result_async(request)
+        response.headers["Server-Timing"] = f"store;dur={(time.perf_counter() - start) * 1000:.1f}"
 
         logger.info("PUSH: Success.")
+        record_telemetry(request, "pushed")
         return PushOutput(status="pushed", video_id=request.video_id)
 
+    except StaleWriteError as e:
+        logger.warning(f"PUSH: Rejected stale write: {e}")
+        record_telemetry(request, "stale", str(e))
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"PUSH ERROR: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        record_telemetry(request, "failed", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/push/batch", response_model=PushBatchOutput)
+async def push_batch(request: PushBatchInput):
+    """
+    Upload many results concurrently (at most PUSH_MAX_CONCURRENCY at a time).
+    A failed or stale upload is reported on its item and does not fail the batch.
+    """
+    items = request.items
+    if len(items) > PUSH_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch too large: {len(items)} items (max {PUSH_BATCH_MAX_ITEMS})")
+
+    logger.info(f"PUSH: Received batch of {len(items)} item(s)")
+
+    async def push_one(item: PushInput) -> PushBatchResult:
+        try:
+            log_bias_result(item)
+            await upload_result_async(item)
+            result = PushBatchResult(video_id=item.video_id, status="pushed")
+        except StaleWriteError as e:
+            logger.warning(f"PUSH: Rejected stale write ({item.video_id}): {e}")
+            result = PushBatchResult(video_id=item.video_id, status="stale", error=str(e))
+        except Exception as e:
+            logger.error(f"PUSH ERROR ({item.video_id}): {e}")
+            result = PushBatchResult(video_id=item.video_id, status="failed", error=str(e))
+        record_telemetry(item, result.status, result.error)
+        return result
+
+    results = await asyncio.gather(*(push_one(item) for item in items))
+    pushed = sum(1 for r in results if r.status == "pushed")
+    stale = sum(1 for r in results if r.status == "stale")
+    failed = len(results) - pushed - stale
+
+    logger.info(f"PUSH: Batch done ({pushed} pushed, {stale} stale, {failed} failed)")
+    return PushBatchOutput(results=results, pushed=pushed, failed=failed, stale=stale)
+
+
+@app.post("/telemetry")
+def record_run(request: PushInput):
+    """
+    Record a run that is not being pushed (e.g. discarded as invalid by the DAG),
+    so it still shows up in telemetry.
+    """
+    if telemetry_writer is None:
+        return {"recorded": False, "reason": "TELEMETRY_DIR not set"}
+    record_telemetry(request, "discarded")
+    return {"recorded": True}
+
+
+@app.get("/telemetry/stats")
+def telemetry_stats():
+    if telemetry_writer is None:
+        return {"enabled": False}
+    return {"enabled": True, **telemetry_writer.stats()}
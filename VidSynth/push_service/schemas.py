@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # --- Bias Check Result Schema ---
 class BiasCheckResult(BaseModel):
@@ -24,6 +24,26 @@ class PushInput(BaseModel):
     issues: List[str]
     video_title: Optional[str] = None
     bias_check: Optional[BiasCheckResult] = None
+    # Pipeline run that produced this result (minted by the gateway); writes from
+    # superseded runs are rejected
+    run_token: Optional[str] = None
+    # Set by bulk runs (which have no placeholder): generation of the stored
+    # result when the run read it; the write is rejected if it has changed since
+    expected_generation: Optional[int] = None
+    # Stored with the result (a later run that skips validate reuses them) and logged to telemetry
+    comment_coverage: Optional[Dict[str, Any]] = None
+    grounding: Optional[Dict[str, Any]] = None
+    stage_timings: Optional[Dict[str, float]] = None  # seconds per pipeline stage
+    token_counts: Optional[Dict[str, int]] = None  # from llm_service, e.g. {"prefill_tokens": 1800, "generated_tokens": 210}
+    # Hash of each stage's input (set by the DAG), stored with the result so a
+    # later run can skip stages whose input has not changed
+    input_hashes: Optional[Dict[str, str]] = None
+    # Per-stage wall/HTTP time, retries and payload sizes for this run (set by the
+    # DAG), stored with the result as "metrics"
+    run_metrics: Optional[Dict[str, Any]] = None
+    # Comments the comment summary was built from (newline-joined), stored with
+    # the result so a refresh can summarise just the new ones
+    comments: Optional[str] = None
 
 # --- Output Schema ---
 class PushOutput(BaseModel):
@@ -31,4 +51,19 @@ class PushOutput(BaseModel):
     Represents the data structure returned BY the push_service.
     """
     status: str
-    video_id: str
\ No newline at end of file
+    video_id: str
+
+# --- Batch Schemas ---
+class PushBatchInput(BaseModel):
+    items: List[PushInput]
+
+class PushBatchResult(BaseModel):
+    video_id: str
+    status: str  # "pushed", "stale" or "failed"
+    error: Optional[str] = None
+
+class PushBatchOutput(BaseModel):
+    results: List[PushBatchResult]
+    pushed: int
+    failed: int
+    stale: int = 0
@@ -0,0 +1,186 @@
+"""
+Telemetry Module
+Append-only, columnar record of every pipeline run that reaches push_service:
+validity, issues, bias / grounding / coverage scores, stage timings and token
+counts. Pushed, discarded, stale and failed runs are all kept.
+
+record() only appends to an in-memory buffer, so requests never wait on I/O.
+A background thread group-commits the buffer into a new Parquet file per
+flush, under hive-style partitions:
+
+    <root>/date=2026-10-19/hour=14/part-<ms>-<id>.parquet
+
+Queries read only the partitions and columns they need, for example
+pyarrow.dataset.dataset(root, partitioning="hive") or DuckDB's read_parquet.
+The buffer is bounded; when the writer falls behind, new records are
+dropped and counted rather than growing memory without limit.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = pa.schema([
+    ("recorded_at", pa.timestamp("ms", tz="UTC")),
+    ("video_id", pa.string()),
+    ("run_token", pa.string()),
+    ("status", pa.string()),  # pushed / discarded / stale / failed
+    ("is_valid", pa.bool_()),
+    ("issues", pa.list_(pa.string())),
+    ("num_issues", pa.int32()),
+    ("similarity_score", pa.float64()),
+    ("is_biased", pa.bool_()),
+    ("bias_threshold", pa.float64()),
+    ("grounding_score", pa.float64()),
+    ("comment_covered_share", pa.float64()),
+    ("stage_timings", pa.map_(pa.string(), pa.float64())),
+    ("token_counts", pa.map_(pa.string(), pa.int64())),
+    ("error", pa.string()),
+])
+
+
+class TelemetryWriter:
+    """
+    Buffered Parquet writer with size- and time-based group commit.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        flush_rows: int = 5000,
+        flush_seconds: float = 30.0,
+        max_buffer_rows: int = 100000,
+        compression: str = "zstd"
+    ):
+        """
+        Args:
+            root: Local directory or filesystem URI (e.g. gs://bucket/telemetry)
+            flush_rows: Buffered records that trigger a commit
+            flush_seconds: Longest a record waits before being committed
+            max_buffer_rows: Records held at most; beyond this new ones are dropped
+            compression: Parquet codec
+        """
+        self.filesystem, self.root = pafs.FileSystem.from_uri(root) if "://" in root else (pafs.LocalFileSystem(), os.path.abspath(root))
+        self._local = isinstance(self.filesystem, pafs.LocalFileSystem)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.max_buffer_rows = max_buffer_rows
+        self.compression = compression
+
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+
+        self.records = 0
+        self.dropped = 0
+        self.files_written = 0
+        self.rows_written = 0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        logger.info(f"Telemetry writer started ({root}, flush every {flush_rows} rows / {flush_seconds}s)")
+
+    def record(self, row: Dict):
+        """Queue one record (missing columns are null). Never blocks on I/O."""
+        row.setdefault("recorded_at", datetime.now(timezone.utc))
+        with self._lock:
+            if self._closed or len(self._buffer) >= self.max_buffer_rows:
+                self.dropped += 1
+                return
+            self._buffer.append(row)
+            self.records += 1
+            full = len(self._buffer) >= self.flush_rows
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Commit everything buffered now. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                self._write(rows)
+                return len(rows)
+            except Exception as e:
+                # Telemetry must never take the service down; the batch is lost
+                self.write_errors += 1
+                logger.error(f"Telemetry write failed ({len(rows)} rows dropped): {e}")
+                return 0
+
+    def _write(self, rows: List[Dict]):
+        table = pa.Table.from_pylist(rows, schema=SCHEMA)
+
+        # One file per (date, hour) partition present in the batch
+        hours = {row["recorded_at"].strftime("date=%Y-%m-%d/hour=%H") for row in rows}
+        for partition in sorted(hours):
+            part = table
+            if len(hours) > 1:
+                mask = [row["recorded_at"].strftime("date=%Y-%m-%d/hour=%H") == partition for row in rows]
+                part = table.filter(pa.array(mask))
+
+            directory = f"{self.root}/{partition}"
+            self.filesystem.create_dir(directory, recursive=True)
+            name = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+            final = f"{directory}/{name}"
+
+            if self._local:
+                # Dot-prefixed temp name is skipped by dataset readers; rename is atomic
+                tmp = f"{directory}/.{name}.tmp"
+                pq.write_table(part, tmp, filesystem=self.filesystem, compression=self.compression)
+                self.filesystem.move(tmp, final)
+            else:
+                # Object stores publish an object only once its upload completes
+                pq.write_table(part, final, filesystem=self.filesystem, compression=self.compression)
+
+            self.files_written += 1
+            self.rows_written += part.num_rows
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+            if self._closed:
+                return
+
+    def close(self):
+        """Stop accepting records and commit what is buffered."""
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            "records": self.records,
+            "buffered": buffered,
+            "dropped": self.dropped,
+            "files_written": self.files_written,
+            "rows_written": self.rows_written,
+            "write_errors": self.write_errors
+        }
+
+
+def create_telemetry_writer(root: Optional[str], **kwargs) -> Optional[TelemetryWriter]:
+    """A writer for root, or None when telemetry is not configured."""
+    if not root:
+        return None
+    return TelemetryWriter(root, **kwargs)
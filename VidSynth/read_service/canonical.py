@@ -0,0 +1,60 @@
+"""
+Canonical Module
+Turns any supported YouTube link into its video id and canonical watch URL.
+
+Supported forms (http or https, scheme optional, host case-insensitive):
+    youtube.com/watch?v=ID        www., m. and music. hosts; v may come after other params
+    youtube.com/{embed,v,e,shorts,live}/ID
+    youtube-nocookie.com/{embed,v}/ID
+    youtu.be/ID
+
+Ids must be exactly 11 characters of [A-Za-z0-9_-]; anything else is rejected
+here instead of failing later in preprocess. The canonical URL is the cache key
+for a video, so every variant of a link maps to the same one.
+
+A single precompiled pattern does the whole match (no urlparse/parse_qs per
+call), and results are kept in an LRU cache because bulk lists repeat links.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Optional
+
+CANONICAL_CACHE_SIZE = int(os.getenv("READ_CANONICAL_CACHE_SIZE", "65536"))
+# Longer inputs are rejected before matching (and never enter the cache)
+MAX_URL_LENGTH = 2048
+
+_VIDEO_LINK = re.compile(
+    r"(?i:https?://)?"
+    r"(?i:(?:(?:www|m|music)\.)?youtube\.com/(?:watch\?(?:[^#]*?&)?v=|(?:embed|v|e|shorts|live)/)"
+    r"|(?:www\.)?youtube-nocookie\.com/(?:embed|v)/"
+    r"|youtu\.be/)"
+    r"([A-Za-z0-9_-]{11})"
+    r"(?:[?&#/].*)?",
+    re.DOTALL,
+)
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def _match_video_id(url: str) -> Optional[str]:
+    match = _VIDEO_LINK.fullmatch(url.strip())
+    return match.group(1) if match else None
+
+
+def canonical_video_id(url: str) -> Optional[str]:
+    """The 11-character video id of a supported YouTube link, or None."""
+    # Cache lookup on the raw string: a hit costs one dict probe, no stripping or matching
+    if url and len(url) <= MAX_URL_LENGTH:
+        return _match_video_id(url)
+    return None
+
+
+def canonical_link(video_id: str) -> str:
+    """The one URL used for a video everywhere downstream."""
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def cache_info():
+    """Hit/miss counts of the canonicaliser's LRU cache."""
+    return _match_video_id.cache_info()
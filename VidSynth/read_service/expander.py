@@ -0,0 +1,269 @@
+"""
+Expander Module
+Turns playlist and channel links into a lazily generated stream of video ids,
+using the YouTube Data API v3.
+
+Supported forms (besides single video links, which expand to themselves):
+    youtube.com/playlist?list=ID       (watch?v=...&list=... stays the single video)
+    youtube.com/channel/UC...          the channel's uploads
+    youtube.com/@handle, /c/name, /user/name
+
+How it stays cheap:
+    - pages of up to 50 ids are requested with a fields mask (ids and privacy only)
+    - the next page is requested in the background while the current one is consumed
+    - no page is requested past max_items
+    - finished expansions are cached for EXPAND_CACHE_TTL seconds, so the same
+      playlist pasted again costs no quota
+    - handle/username -> uploads playlist lookups are kept (up to
+      EXPAND_UPLOADS_CACHE_SIZE of them; a channel's uploads playlist never changes)
+
+The API is called over a pooled requests.Session rather than googleapiclient,
+whose HTTP client cannot be shared between the prefetch threads.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+import requests
+
+from canonical import canonical_video_id
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://www.googleapis.com/youtube/v3"
+EXPAND_MAX_ITEMS = int(os.getenv("EXPAND_MAX_ITEMS", "5000"))
+EXPAND_CACHE_TTL = float(os.getenv("EXPAND_CACHE_TTL", "3600"))
+EXPAND_CACHE_SIZE = int(os.getenv("EXPAND_CACHE_SIZE", "256"))
+EXPAND_UPLOADS_CACHE_SIZE = int(os.getenv("EXPAND_UPLOADS_CACHE_SIZE", "4096"))
+EXPAND_PREFETCH_WORKERS = int(os.getenv("EXPAND_PREFETCH_WORKERS", "8"))
+PAGE_SIZE = 50  # Data API maximum
+API_TIMEOUT = 15
+
+_PLAYLIST_LINK = re.compile(
+    r"(?i:https?://)?(?i:(?:www|m|music)\.)?youtube\.com/playlist\?(?:[^#]*?&)?list=([A-Za-z0-9_-]{2,64})(?:[&#].*)?",
+    re.DOTALL,
+)
+_CHANNEL_LINK = re.compile(
+    r"(?i:https?://)?(?i:(?:www|m)\.)?youtube\.com/"
+    r"(?:channel/(UC[A-Za-z0-9_-]{22})|(@[\w.-]{3,30})|c/([\w.-]{1,100})|user/([\w.-]{1,100}))"
+    r"(?:/(?:videos|featured|streams)?)?/?(?:[?#].*)?",
+    re.DOTALL,
+)
+_VIDEO_ID = re.compile(r"[A-Za-z0-9_-]{11}")
+# Deleted and private videos stay in playlists but cannot be processed
+_UNAVAILABLE = {"private", "privacyStatusUnspecified"}
+# What a 404 from each Data API resource means, and the parameters naming what was asked for
+_NOT_FOUND = {
+    "playlistItems": ("Playlist", ("playlistId",)),
+    "channels": ("Channel", ("id", "forHandle", "forUsername")),
+}
+
+
+class ExpansionError(Exception):
+    """The link cannot be expanded; status_code is the HTTP status to report."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _not_found_message(resource: str, params: dict) -> str:
+    label, keys = _NOT_FOUND.get(resource, (resource, ()))
+    requested = next((params[key] for key in keys if params.get(key)), None)
+    return f"{label} not found: {requested}" if requested else f"{label} not found"
+
+
+def parse_collection_link(url: str) -> Optional[Tuple[str, str]]:
+    """
+    ("playlist", id), ("channel", UC id), ("handle", @name), ("username", name),
+    ("video", id), or None for an unsupported link.
+    """
+    url = (url or "").strip()
+    match = _PLAYLIST_LINK.fullmatch(url)
+    if match:
+        return "playlist", match.group(1)
+    match = _CHANNEL_LINK.fullmatch(url)
+    if match:
+        channel_id, handle, custom, username = match.groups()
+        if channel_id:
+            return "channel", channel_id
+        if username:
+            return "username", username
+        # Custom /c/ URLs have no API lookup; most now match the channel's handle
+        return "handle", handle or f"@{custom}"
+    video_id = canonical_video_id(url)
+    if video_id:
+        return "video", video_id
+    return None
+
+
+class PlaylistExpander:
+    """Streams the video ids of playlists and channels, with prefetching and a TTL cache."""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        session: Optional[requests.Session] = None,
+        cache_ttl: float = EXPAND_CACHE_TTL,
+        cache_size: int = EXPAND_CACHE_SIZE,
+        prefetch_workers: int = EXPAND_PREFETCH_WORKERS,
+        uploads_cache_size: int = EXPAND_UPLOADS_CACHE_SIZE
+    ):
+        self.api_key = api_key
+        self.session = session or requests.Session()
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.uploads_cache_size = uploads_cache_size
+        self._cache: "OrderedDict[str, Tuple[float, list, bool]]" = OrderedDict()
+        self._uploads: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        # Guards the caches and api_calls; prefetch threads and requests share them
+        self._lock = threading.Lock()
+        self._prefetch = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="expand-prefetch")
+        self.api_calls = 0
+
+    # --- Data API ---
+    def _get(self, resource: str, **params) -> dict:
+        if not self.api_key:
+            raise ExpansionError("YOUTUBE_API_KEY is not set; playlist and channel links cannot be expanded.", 503)
+        with self._lock:
+            self.api_calls += 1
+        response = self.session.get(f"{API_URL}/{resource}", params=dict(params, key=self.api_key), timeout=API_TIMEOUT)
+        if response.status_code == 404:
+            raise ExpansionError(_not_found_message(resource, params), 404)
+        response.raise_for_status()
+        return response.json()
+
+    def _page(self, playlist_id: str, page_token: Optional[str]) -> dict:
+        params = {
+            "part": "contentDetails,status",
+            "playlistId": playlist_id,
+            "maxResults": PAGE_SIZE,
+            "fields": "nextPageToken,items(contentDetails/videoId,status/privacyStatus)",
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        return self._get("playlistItems", **params)
+
+    def uploads_playlist(self, kind: str, value: str) -> str:
+        """The playlist holding a channel's uploads."""
+        if kind == "channel":
+            # A channel's uploads playlist id is its channel id with UC replaced by UU
+            return "UU" + value[2:]
+        key = (kind, value.lower())
+        with self._lock:
+            uploads = self._uploads.get(key)
+            if uploads is not None:
+                self._uploads.move_to_end(key)
+                return uploads
+
+        # Looked up outside the lock; two concurrent misses both ask, and the answer is the same
+        lookup = {"forHandle": value} if kind == "handle" else {"forUsername": value}
+        items = self._get("channels", part="contentDetails", fields="items(contentDetails/relatedPlaylists/uploads)", **lookup).get("items")
+        if not items:
+            raise ExpansionError(f"No channel found for {value}", 404)
+        uploads = items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+        with self._lock:
+            self._uploads[key] = uploads
+            self._uploads.move_to_end(key)
+            while len(self._uploads) > self.uploads_cache_size:
+                self._uploads.popitem(last=False)
+        return uploads
+
+    # --- Cache ---
+    def _cached(self, playlist_id: str, max_items: int) -> Optional[list]:
+        with self._lock:
+            entry = self._cache.get(playlist_id)
+            if not entry:
+                return None
+            expires_at, ids, complete = entry
+            if expires_at < time.monotonic():
+                del self._cache[playlist_id]
+                return None
+            if not complete and len(ids) < max_items:
+                return None
+            self._cache.move_to_end(playlist_id)
+            return ids[:max_items]
+
+    def _store(self, playlist_id: str, ids: list, complete: bool):
+        with self._lock:
+            self._cache[playlist_id] = (time.monotonic() + self.cache_ttl, ids, complete)
+            self._cache.move_to_end(playlist_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # --- Expansion ---
+    def resolve(self, url: str) -> Tuple[str, str]:
+        """("playlist", playlist_id) or ("video", video_id) for a link; raises ExpansionError."""
+        parsed = parse_collection_link(url)
+        if parsed is None:
+            raise ExpansionError("Not a YouTube video, playlist or channel link.")
+        kind, value = parsed
+        if kind in ("video", "playlist"):
+            return kind, value
+        return "playlist", self.uploads_playlist(kind, value)
+
+    def expand(self, url: str, max_items: int = EXPAND_MAX_ITEMS) -> Iterator[str]:
+        """
+        Video ids of the link's playlist or channel, in playlist order and without
+        repeats, at most max_items of them. The link is resolved before the first
+        id is requested, so a bad link raises here rather than mid-stream.
+        """
+        kind, value = self.resolve(url)
+        if kind == "video":
+            return iter([value])
+        cached = self._cached(value, max_items)
+        if cached is not None:
+            logger.info(f"EXPAND: {value} served from cache ({len(cached)} ids)")
+            return iter(cached)
+        return self._stream(value, max_items)
+
+    def _stream(self, playlist_id: str, max_items: int) -> Iterator[str]:
+        ids, seen = [], set()
+        future = self._prefetch.submit(self._page, playlist_id, None)
+        try:
+            while future is not None:
+                page = future.result()
+                items = page.get("items", [])
+                token = page.get("nextPageToken")
+                # Ask for the next page before handing out this one, unless this one is enough
+                future = None
+                if token and len(ids) + len(items) < max_items:
+                    future = self._prefetch.submit(self._page, playlist_id, token)
+
+                for item in items:
+                    video_id = (item.get("contentDetails") or {}).get("videoId")
+                    status = (item.get("status") or {}).get("privacyStatus")
+                    if not video_id or not _VIDEO_ID.fullmatch(video_id) or status in _UNAVAILABLE or video_id in seen:
+                        continue
+                    seen.add(video_id)
+                    ids.append(video_id)
+                    yield video_id
+                    if len(ids) >= max_items:
+                        self._store(playlist_id, ids, complete=False)
+                        return
+            self._store(playlist_id, ids, complete=True)
+        finally:
+            # Consumer stopped early (client gone): drop the pending page
+            if future is not None:
+                future.cancel()
+
+
+# --- Shared expander ---
+_expander = None
+_expander_lock = threading.Lock()
+
+
+def get_expander() -> PlaylistExpander:
+    """Get or create the process-wide expander (one session, cache and prefetch pool)."""
+    global _expander
+    if _expander is None:
+        with _expander_lock:
+            if _expander is None:
+                _expander = PlaylistExpander(os.getenv("YOUTUBE_API_KEY"))
+    return _expander
@@ -1,34 +1,33 @@
 # Import necessary libraries
 from fastapi import FastAPI, HTTPException 
-from schemas import ReadRequest, ReadOutput  
-from urllib.parse import urlparse, parse_qs 
+from fastapi.responses import StreamingResponse
+from schemas import ReadRequest, ReadOutput, ReadBatchInput, ReadBatchResult, ReadBatchOutput, ExpandRequest
+from canonical import canonical_video_id, canonical_link, cache_info
+from expander import EXPAND_MAX_ITEMS, ExpansionError, get_expander
+from vidsynth_common.server_timing import add_server_timing
+import itertools
+import json
 import logging 
+import os
 
 # Initialize the FastAPI application instance
 app = FastAPI(title="VidSynth Read Service") 
 
+add_server_timing(app)
+
 # basic logging 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# --- Configuration ---
+READ_BATCH_MAX_ITEMS = int(os.getenv("READ_BATCH_MAX_ITEMS", "10000"))
+
 # helper function to extract the YouTube video ID from various URL formats # TEST EDIT FOR CI/CD
 def extract_video_id(url: str) -> str | None: 
-    """Extracts YouTube video ID from various common link patterns."""
+    """Extracts YouTube video ID from various common link patterns (see canonical.py)."""
     try:
-        parsed_url = urlparse(url)
-        if parsed_url.hostname == "youtu.be":
-            return parsed_url.path[1:]
-        elif parsed_url.hostname in ["www.youtube.com", "youtube.com"]:
-            if parsed_url.path == "/watch":
-                query = parse_qs(parsed_url.query)
-                return query.get("v", [None])[0] 
-            elif parsed_url.path.startswith("/embed/"):
-                return parsed_url.path.split("/")[2]
-            elif parsed_url.path.startswith("/v/"):
-                return parsed_url.path.split("/")[2]
-        return None
+        return canonical_video_id(url)
     except Exception as e:
-
         logger.error(f"Error parsing URL '{url}': {e}", exc_info=True)
         return None
 
@@ -51,5 +50,64 @@ def read(request: ReadRequest):
         raise HTTPException(status_code=400, detail="Invalid YouTube video link provided.")
 
     logger.info(f"READ: Extracted video_id: {video_id}")
-    return ReadOutput(video_id=video_id, original_link=request.video_link)
+    return ReadOutput(video_id=video_id, original_link=request.video_link, canonical_link=canonical_link(video_id))
+
+
+@app.post("/read/batch", response_model=ReadBatchOutput)
+def read_batch(request: ReadBatchInput):
+    """
+    Canonicalise many links in one request, in order.
+    An invalid link is reported on its item and does not fail the batch.
+    """
+    items = request.items
+    if len(items) > READ_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch too large: {len(items)} items (max {READ_BATCH_MAX_ITEMS})")
+
+    results = []
+    for item in items:
+        video_id = extract_video_id(item.video_link)
+        if video_id:
+            results.append(ReadBatchResult(video_id=video_id, original_link=item.video_link, canonical_link=canonical_link(video_id)))
+        else:
+            results.append(ReadBatchResult(original_link=item.video_link, error="Invalid YouTube video link provided."))
+
+    valid = sum(1 for r in results if r.video_id)
+    logger.info(f"READ: Batch of {len(items)} link(s), {valid} valid ({cache_info().hits} cache hits so far)")
+    return ReadBatchOutput(results=results, valid=valid, invalid=len(results) - valid)
+
+
+@app.post("/expand")
+def expand(request: ExpandRequest):
+    """
+    Expand a playlist or channel link (or a single video link) into its videos,
+    streamed as NDJSON while the pages are still being fetched:
+        {"video_id": ..., "canonical_link": ...}   one line per video
+        {"count": n, "limit_reached": bool}        last line
+    A failure after the first line ends the stream with {"error": ..., "count": n}.
+    """
+    max_items = max(1, min(request.max_items or EXPAND_MAX_ITEMS, EXPAND_MAX_ITEMS))
+    logger.info(f"EXPAND: Received request for {request.video_link} (max {max_items})")
+    try:
+        video_ids = get_expander().expand(request.video_link, max_items)
+        # Fetch the first page now, so a missing playlist is a 404 rather than a broken stream
+        first = list(itertools.islice(video_ids, 1))
+    except ExpansionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        logger.error(f"EXPAND ERROR: {e}")
+        raise HTTPException(status_code=502, detail=str(e))
+
+    def lines():
+        count = 0
+        try:
+            for video_id in itertools.chain(first, video_ids):
+                count += 1
+                yield json.dumps({"video_id": video_id, "canonical_link": canonical_link(video_id)}) + "\n"
+        except Exception as e:
+            logger.error(f"EXPAND ERROR after {count} video(s): {e}")
+            yield json.dumps({"error": str(e), "count": count}) + "\n"
+            return
+        logger.info(f"EXPAND: Streamed {count} video(s) for {request.video_link}")
+        yield json.dumps({"count": count, "limit_reached": count >= max_items}) + "\n"
 
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 
 class ReadRequest(BaseModel):
@@ -16,4 +16,25 @@ class ReadOutput(BaseModel):
     """
     video_id: Optional[str] = None
     original_link: str
+    canonical_link: Optional[str] = None  # https://www.youtube.com/watch?v=<video_id>
 
+# --- Batch Schemas ---
+class ReadBatchInput(BaseModel):
+    items: List[ReadRequest]
+
+class ReadBatchResult(BaseModel):
+    video_id: Optional[str] = None
+    original_link: str
+    canonical_link: Optional[str] = None
+    error: Optional[str] = None
+
+class ReadBatchOutput(BaseModel):
+    results: List[ReadBatchResult]
+    valid: int
+    invalid: int
+
+
+# --- Expansion Schemas ---
+class ExpandRequest(BaseModel):
+    video_link: str  # playlist, channel or video link
+    max_items: Optional[int] = None  # capped at the service's EXPAND_MAX_ITEMS
@@ -0,0 +1,88 @@
+"""
+Tests for the DAG's claim-check artifact store (airflow/dags/artifact_store.py).
+"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "airflow", "dags"))
+
+import artifact_store
+from artifact_store import LocalArtifactStore, fetch, is_reference, stash
+
+TRANSCRIPT = "word " * 5000
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalArtifactStore(str(tmp_path / "artifacts"))
+
+
+def test_small_payload_stays_inline(store):
+    """Payloads under the limit should be returned unchanged."""
+    payload = {"video_id": "abc123", "video_summary": "short"}
+
+    assert stash(payload, store=store, max_inline_bytes=1024) is payload
+    assert fetch(payload) is payload
+
+
+def test_large_payload_becomes_reference(store):
+    """Payloads over the limit should be replaced by a small reference with metadata."""
+    payload = {"video_id": "abc123", "is_valid": True, "transcript": TRANSCRIPT}
+
+    ref = stash(payload, store=store, max_inline_bytes=1024)
+
+    assert is_reference(ref)
+    assert ref["video_id"] == "abc123"
+    assert ref["is_valid"] is True
+    assert "transcript" not in ref
+    assert len(json.dumps(ref)) < 1024
+    assert fetch(ref, store=store) == payload
+
+
+def test_fetch_works_without_a_configured_store(store):
+    """A reference should be readable by a task with no store of its own."""
+    ref = stash({"transcript": TRANSCRIPT}, store=store, max_inline_bytes=0)
+
+    assert fetch(ref) == {"transcript": TRANSCRIPT}
+
+
+def test_identical_payloads_share_one_artifact(store):
+    """Content addressing: re-stashing equal payloads (e.g. a task retry) should write once."""
+    first = stash({"transcript": TRANSCRIPT, "video_id": "a"}, store=store, max_inline_bytes=0)
+    second = stash({"video_id": "a", "transcript": TRANSCRIPT}, store=store, max_inline_bytes=0)
+
+    files = [f for _, _, names in os.walk(store.root) for f in names]
+    assert first["artifact"] == second["artifact"]
+    assert len(files) == 1
+    assert first["artifact"]["bytes"] > os.path.getsize(first["artifact"]["uri"])  # stored compressed
+
+
+def test_fetch_rejects_corrupted_artifact(store):
+    """A reference whose content no longer matches its hash should fail loudly."""
+    ref = stash({"transcript": TRANSCRIPT}, store=store, max_inline_bytes=0)
+    ref["artifact"]["sha256"] = "0" * 64
+
+    with pytest.raises(ValueError):
+        fetch(ref, store=store)
+
+
+def test_stash_is_inline_when_store_not_configured(monkeypatch):
+    """Without VIDSYNTH_ARTIFACT_ROOT nothing is written and payloads pass through."""
+    monkeypatch.setattr(artifact_store, "ARTIFACT_ROOT", None)
+    monkeypatch.setattr(artifact_store, "_artifact_store", None)
+    payload = {"transcript": TRANSCRIPT}
+
+    assert stash(payload, max_inline_bytes=0) is payload
+
+
+def test_create_artifact_store_selects_backend(tmp_path):
+    """Roots select the local or GCS backend."""
+    gcs = artifact_store.create_artifact_store("gs://vidsynth-artifacts/xcom")
+
+    assert isinstance(artifact_store.create_artifact_store(str(tmp_path)), LocalArtifactStore)
+    assert isinstance(gcs, artifact_store.GCSArtifactStore)
+    assert (gcs.bucket_name, gcs.prefix) == ("vidsynth-artifacts", "xcom")
+    assert artifact_store.create_artifact_store(None) is None
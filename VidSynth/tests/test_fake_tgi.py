@@ -0,0 +1,212 @@
+"""
+Tests for the fake TGI service used for offline load testing.
+"""
+import os
+import sys
+import json
+import asyncio
+
+# ---------------------------------------------------------------------------
+# Path setup (must come before importing service code)
+# ---------------------------------------------------------------------------
+
+# Add fake TGI service directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "fake_tgi_service"))
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+import main
+from main import app, configure
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def fast_config():
+    """Reset to a fast, fault-free configuration before every test."""
+    configure(
+        prefill_ms=0, per_token_ms=0, output_tokens=16, max_concurrent_requests=10,
+        max_batch_size=4, max_input_length=4096, error_rate=0, overload_rate=0, seed=0
+    )
+
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI app."""
+    return TestClient(app)
+
+
+def run_concurrently(n, payload, path="/generate"):
+    """Fire n requests at once through the ASGI app and return their responses."""
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://fake") as ac:
+            return await asyncio.gather(*[ac.post(path, json=payload) for _ in range(n)])
+    return asyncio.run(go())
+
+
+# ---------------------------------------------------------------------------
+# Tests for /generate
+# ---------------------------------------------------------------------------
+
+def test_generate_returns_generated_text(client):
+    """POST /generate should return TGI's response shape."""
+    response = client.post("/generate", json={"inputs": "Summarize this video"})
+
+    assert response.status_code == 200
+    assert isinstance(response.json()["generated_text"], str)
+    assert len(response.json()["generated_text"].split()) == 16
+
+
+def test_generate_is_deterministic(client):
+    """The same prompt should always produce the same text."""
+    first = client.post("/generate", json={"inputs": "same prompt"}).json()
+    second = client.post("/generate", json={"inputs": "same prompt"}).json()
+    other = client.post("/generate", json={"inputs": "different prompt"}).json()
+
+    assert first == second
+    assert first != other
+
+
+def test_generate_honours_max_new_tokens_and_details(client):
+    """max_new_tokens should cap output and details should report counts."""
+    response = client.post("/generate", json={
+        "inputs": "a b c",
+        "parameters": {"max_new_tokens": 5, "details": True}
+    })
+
+    data = response.json()
+    assert len(data["generated_text"].split()) == 5
+    assert data["details"]["generated_tokens"] == 5
+    assert response.headers["x-prompt-tokens"] == "3"
+    assert "prefill" not in data["details"]
+
+
+def test_generate_lists_prefill_only_with_decoder_input_details(client):
+    """Like TGI, the prompt tokens should only be listed when decoder_input_details is set."""
+    response = client.post("/generate", json={
+        "inputs": "a b c",
+        "parameters": {"max_new_tokens": 5, "details": True, "decoder_input_details": True}
+    })
+
+    assert [token["text"] for token in response.json()["details"]["prefill"]] == ["a", "b", "c"]
+
+
+def test_generate_return_full_text_prefixes_prompt(client):
+    """return_full_text should echo the prompt like TGI does."""
+    response = client.post("/generate", json={
+        "inputs": "PROMPT",
+        "parameters": {"return_full_text": True}
+    })
+
+    assert response.json()["generated_text"].startswith("PROMPT")
+
+
+def test_compat_route_matches_generate(client):
+    """POST / without stream should behave like /generate."""
+    direct = client.post("/generate", json={"inputs": "hello"}).json()
+    compat = client.post("/", json={"inputs": "hello"}).json()
+
+    assert direct == compat
+
+
+def test_input_too_long_returns_422(client):
+    """Inputs over max_input_length should be rejected like TGI does."""
+    configure(max_input_length=3)
+
+    response = client.post("/generate", json={"inputs": "one two three four"})
+
+    assert response.status_code == 422
+    assert response.json()["error_type"] == "validation"
+
+
+# ---------------------------------------------------------------------------
+# Tests for /generate_stream
+# ---------------------------------------------------------------------------
+
+def test_generate_stream_emits_sse_tokens(client):
+    """POST /generate_stream should stream one SSE event per token."""
+    response = client.post("/generate_stream", json={
+        "inputs": "stream me",
+        "parameters": {"max_new_tokens": 4}
+    })
+
+    events = [json.loads(line[len("data:"):]) for line in response.text.splitlines() if line.startswith("data:")]
+    assert response.status_code == 200
+    assert len(events) == 4
+    assert all(e["generated_text"] is None for e in events[:-1])
+    assert events[-1]["generated_text"] == "".join(e["token"]["text"] for e in events)
+    assert events[-1]["details"]["generated_tokens"] == 4
+
+
+# ---------------------------------------------------------------------------
+# Tests for admission control and fault injection
+# ---------------------------------------------------------------------------
+
+def test_excess_concurrency_returns_429():
+    """Requests beyond max_concurrent_requests should get 429 overloaded."""
+    configure(max_concurrent_requests=2, max_batch_size=1, prefill_ms=50)
+
+    responses = run_concurrently(5, {"inputs": "load"})
+
+    codes = sorted(r.status_code for r in responses)
+    assert codes.count(200) == 2
+    assert codes.count(429) == 3
+    assert main.state.admitted == 0
+
+
+def test_decode_batch_limits_running_requests(monkeypatch):
+    """Only max_batch_size requests should decode at once; the rest queue."""
+    configure(max_concurrent_requests=8, max_batch_size=2, prefill_ms=20)
+    peak = []
+
+    original_sleep = asyncio.sleep
+
+    async def spy_sleep(delay):
+        peak.append(main.state.running)
+        await original_sleep(delay)
+
+    monkeypatch.setattr(main.asyncio, "sleep", spy_sleep)
+    responses = run_concurrently(6, {"inputs": "queue"})
+
+    assert all(r.status_code == 200 for r in responses)
+    assert max(peak) == 2
+
+
+def test_injected_errors_use_configured_status(client):
+    """error_rate=1 should fail every request with error_status."""
+    configure(error_rate=1.0, error_status=503)
+
+    response = client.post("/generate", json={"inputs": "boom"})
+
+    assert response.status_code == 503
+    assert response.json()["error_type"] == "generation"
+
+
+def test_injected_overloads_return_429(client):
+    """overload_rate=1 should return 429 even when idle."""
+    configure(overload_rate=1.0)
+
+    response = client.post("/generate", json={"inputs": "busy"})
+
+    assert response.status_code == 429
+
+
+def test_fault_injection_is_seeded(client):
+    """The same seed should reproduce the same error pattern."""
+    def pattern():
+        configure(error_rate=0.5, seed=42)
+        return [client.post("/generate", json={"inputs": str(i)}).status_code for i in range(20)]
+
+    assert pattern() == pattern()
+
+
+def test_config_endpoint_updates_limits(client):
+    """PUT /fake/config should change the limits reported by /info."""
+    response = client.put("/fake/config", json={"max_concurrent_requests": 3})
+
+    assert response.status_code == 200
+    assert client.get("/info").json()["max_concurrent_requests"] == 3
@@ -0,0 +1,119 @@
+"""
+Tests for the stage-skipping decisions (common/vidsynth_common/freshness.py).
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
+
+from vidsynth_common.freshness import input_hash, last_ready_result, reuse_output, video_id_from_link, with_previous_comments
+
+PREPROCESSED = {
+    "video_id": "HAnw168huqA",
+    "video_title": "How GPUs work",
+    "category": "science & technology",
+    "language": "en",
+    "transcript": "Today we look at how GPUs schedule warps.",
+    "comments": "Great video\nVery clear",
+}
+PREVIOUS = {
+    "status": "ready",
+    "generated_at": "2026-10-18T12:00:00+00:00",
+    "input_hashes": {"llm": input_hash("llm", PREPROCESSED)},
+    "data": {"video_summary": "GPUs schedule warps.", "comment_summary": "Viewers liked it."},
+}
+
+
+def test_video_id_from_link():
+    """Common YouTube URL forms should yield the video id."""
+    for link in [
+        "https://www.youtube.com/watch?v=HAnw168huqA",
+        "https://www.youtube.com/watch?feature=share&v=HAnw168huqA&t=30",
+        "https://youtu.be/HAnw168huqA?si=abc",
+        "https://www.youtube.com/shorts/HAnw168huqA",
+    ]:
+        assert video_id_from_link(link) == "HAnw168huqA"
+    assert video_id_from_link("https://example.com/") is None
+
+
+def test_input_hash_ignores_unrelated_fields():
+    """Run tokens, hashes and the like must not change a stage's input hash."""
+    noisy = dict(PREPROCESSED, run_token="abc", input_hashes={"x": "y"}, previous_comments="old")
+
+    assert input_hash("llm", noisy) == input_hash("llm", PREPROCESSED)
+    assert input_hash("llm", dict(PREPROCESSED, comments="New comment")) != input_hash("llm", PREPROCESSED)
+    # The category picks validate's threshold, so it changes validate's hash but not the LLM's
+    recategorised = dict(PREPROCESSED, category="music")
+    assert input_hash("llm", recategorised) == input_hash("llm", PREPROCESSED)
+    assert input_hash("validate", recategorised) != input_hash("validate", PREPROCESSED)
+
+
+def test_unchanged_llm_input_reuses_previous_summaries():
+    """Same transcript and comments should reuse the stored summaries."""
+    output = reuse_output("llm", PREPROCESSED, input_hash("llm", PREPROCESSED), PREVIOUS)
+
+    assert output["video_summary"] == "GPUs schedule warps."
+    assert output["comment_summary_mode"] == "reused"
+    assert output["transcript"] == PREPROCESSED["transcript"]
+    assert output["language"] == "en"
+
+
+def test_changed_input_runs_the_stage():
+    """New comments (or no previous result) should mean the LLM runs."""
+    changed = dict(PREPROCESSED, comments="A brand new comment")
+
+    assert reuse_output("llm", changed, input_hash("llm", changed), PREVIOUS) is None
+    assert reuse_output("llm", PREPROCESSED, input_hash("llm", PREPROCESSED), None) is None
+
+
+VALIDATION = {
+    "is_valid": True,
+    "issues": ["Comment summary covers 40% of the comments"],
+    "bias_check": {"similarity_score": 0.71, "is_biased": False, "threshold": 0.3},
+    "comment_coverage": {"coverage": 0.4},
+    "grounding": {"grounded": 0.9},
+}
+
+
+def test_reused_llm_output_also_skips_validation():
+    """Reused summaries were validated before, so validate's stored results should be carried over."""
+    original_llm_output = dict(PREPROCESSED, video_summary="GPUs schedule warps.", comment_summary="Viewers liked it.", comment_summary_mode="full")
+    previous = dict(PREVIOUS, **VALIDATION, input_hashes=dict(PREVIOUS["input_hashes"], validate=input_hash("validate", original_llm_output)))
+
+    reused = reuse_output("llm", PREPROCESSED, input_hash("llm", PREPROCESSED), previous)
+    validated = reuse_output("validate", reused, input_hash("validate", reused), previous)
+
+    assert {key: validated[key] for key in VALIDATION} == VALIDATION
+    assert validated["video_summary"] == "GPUs schedule warps."
+
+
+def test_validation_runs_when_previous_result_has_no_verdict():
+    """A result stored without validate's results should not be assumed to have passed."""
+    digest = input_hash("validate", PREPROCESSED)
+    previous = dict(PREVIOUS, input_hashes={"validate": digest})
+
+    assert reuse_output("validate", PREPROCESSED, digest, previous) is None
+
+
+def test_last_ready_result_reads_through_placeholder():
+    """A processing placeholder should expose the result it replaced."""
+    placeholder = {"status": "processing", "run_token": "t1", "previous": PREVIOUS}
+
+    assert last_ready_result(PREVIOUS) is PREVIOUS
+    assert last_ready_result(placeholder) is PREVIOUS
+    assert last_ready_result({"status": "processing"}) is None
+    assert last_ready_result(None) is None
+
+
+def test_llm_request_carries_previous_comment_summary():
+    """A stored result with its comments should turn the llm call into an incremental update."""
+    previous = dict(PREVIOUS, comments="Great video")
+
+    request = with_previous_comments(PREPROCESSED, previous)
+
+    assert request["previous_comment_summary"] == "Viewers liked it."
+    assert request["previous_comments"] == "Great video"
+    assert input_hash("llm", request) == input_hash("llm", PREPROCESSED)
+    # Results stored before comments were kept cannot be updated incrementally
+    assert with_previous_comments(PREPROCESSED, PREVIOUS) is PREPROCESSED
+    assert with_previous_comments(PREPROCESSED, None) is PREPROCESSED
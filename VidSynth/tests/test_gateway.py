@@ -3,7 +3,9 @@ Tests for the gateway service.
 """
 import os
 import sys
+import gzip
 import json
+from datetime import datetime, timedelta, timezone
 
 # ---------------------------------------------------------------------------
 # Path and environment setup (must come before importing service code)
@@ -12,13 +14,16 @@ import json
 # Set required environment variable before importing main
 os.environ["AIRFLOW_WEBSERVER_URL"] = "https://fake-airflow.example.com"
 
-# Add gateway service directory to Python path
+# Add gateway service and shared package directories to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "gateway_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
 
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
-from main import app, RESULTS_BUCKET, DAG_ID, AIRFLOW_WEBSERVER_URL
+from google.api_core.exceptions import NotFound
+import main
+from main import app, RESULTS_BUCKET, DAG_ID, AIRFLOW_WEBSERVER_URL, RESULT_FRESH_SECONDS
 
 
 # ---------------------------------------------------------------------------
@@ -34,7 +39,9 @@ def client():
 @pytest.fixture
 def mock_gcs():
     """Mock Google Cloud Storage client."""
-    with patch("main.storage.Client") as mock_client_class:
+    # The result store (and its client) is cached per process; start each test without one
+    main._result_store = None
+    with patch("main.RESULT_STORE", "gcs"), patch("google.cloud.storage.Client") as mock_client_class:
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
         
@@ -119,32 +126,39 @@ def test_summarize_uses_correct_bucket(mock_gcs, mock_auth, mock_requests, clien
     mock_gcs["client"].bucket.assert_called_with(RESULTS_BUCKET)
 
 
-def test_summarize_checks_for_stale_data(mock_gcs, mock_auth, mock_requests, client):
-    """POST /summarize should check if blob exists."""
-    mock_gcs["blob"].exists.return_value = False
-    
-    client.post("/summarize", json={"video_id": "abc123"})
+def test_summarize_writes_placeholder_with_run_token(mock_gcs, mock_auth, mock_requests, client):
+    """POST /summarize should overwrite the result with a placeholder for the new run."""
+    response = client.post("/summarize", json={"video_id": "abc123"})
     
     mock_gcs["bucket"].blob.assert_called_with("abc123.json")
-    mock_gcs["blob"].exists.assert_called_once()
+    placeholder = json.loads(mock_gcs["blob"].upload_from_string.call_args.kwargs["data"])
+    assert placeholder["status"] == "processing"
+    assert placeholder["run_token"] == response.json()["run_token"]
 
 
-def test_summarize_deletes_stale_data_if_exists(mock_gcs, mock_auth, mock_requests, client):
-    """POST /summarize should delete existing blob before triggering."""
+def test_summarize_does_not_delete_old_result(mock_gcs, mock_auth, mock_requests, client):
+    """POST /summarize should never leave a window where the result is missing."""
     mock_gcs["blob"].exists.return_value = True
     
     client.post("/summarize", json={"video_id": "abc123"})
     
-    mock_gcs["blob"].delete.assert_called_once()
+    mock_gcs["blob"].delete.assert_not_called()
 
 
-def test_summarize_skips_delete_if_no_stale_data(mock_gcs, mock_auth, mock_requests, client):
-    """POST /summarize should not delete if blob doesn't exist."""
-    mock_gcs["blob"].exists.return_value = False
+def test_summarize_passes_run_token_to_dag(mock_gcs, mock_auth, mock_requests, client):
+    """The DAG run should carry the token stamped into the placeholder."""
+    response = client.post("/summarize", json={"video_id": "abc123"})
     
-    client.post("/summarize", json={"video_id": "abc123"})
+    payload = mock_requests["post"].call_args.kwargs["json"]
+    assert payload["conf"]["run_token"] == response.json()["run_token"]
+
+
+def test_summarize_mints_a_new_token_per_run(mock_gcs, mock_auth, mock_requests, client):
+    """Each trigger should get its own run token."""
+    first = client.post("/summarize", json={"video_id": "abc123"}).json()["run_token"]
+    second = client.post("/summarize", json={"video_id": "abc123"}).json()["run_token"]
     
-    mock_gcs["blob"].delete.assert_not_called()
+    assert first != second
 
 
 # ---------------------------------------------------------------------------
@@ -182,6 +196,16 @@ def test_summarize_sends_video_link_in_payload(mock_gcs, mock_auth, mock_request
     assert payload["conf"]["video_link"] == "https://www.youtube.com/watch?v=abc123"
 
 
+def test_summarize_requests_fused_execution_by_default(mock_gcs, mock_auth, mock_requests, client):
+    """POST /summarize should ask the DAG for the configured execution mode (fused by default)."""
+    client.post("/summarize", json={"video_id": "abc123"})
+    assert mock_requests["post"].call_args.kwargs["json"]["conf"]["execution_mode"] == "fused"
+
+    with patch("main.PIPELINE_EXECUTION_MODE", "tasks"):
+        client.post("/summarize", json={"video_id": "abc123"})
+    assert mock_requests["post"].call_args.kwargs["json"]["conf"]["execution_mode"] == "tasks"
+
+
 def test_summarize_uses_bearer_token(mock_gcs, mock_auth, mock_requests, client):
     """POST /summarize should use Bearer token from Google auth."""
     mock_gcs["blob"].exists.return_value = False
@@ -278,14 +302,14 @@ def test_summarize_empty_body_returns_422(client):
 def test_result_returns_data_when_ready(mock_gcs, client):
     """GET /result/{video_id} should return data when blob exists."""
     mock_gcs["blob"].exists.return_value = True
-    mock_gcs["blob"].download_as_text.return_value = json.dumps({
+    mock_gcs["blob"].download_as_bytes.return_value = json.dumps({
         "status": "ready",
         "video_id": "abc123",
         "data": {
             "video_summary": "This is the summary.",
             "comment_summary": "These are the comments."
         }
-    })
+    }).encode()
     
     response = client.get("/result/abc123")
     
@@ -298,7 +322,7 @@ def test_result_returns_data_when_ready(mock_gcs, client):
 
 def test_result_returns_processing_when_not_ready(mock_gcs, client):
     """GET /result/{video_id} should return status='processing' when blob doesn't exist."""
-    mock_gcs["blob"].exists.return_value = False
+    mock_gcs["blob"].download_as_bytes.side_effect = NotFound("No such object")
     
     response = client.get("/result/abc123")
     
@@ -308,7 +332,7 @@ def test_result_returns_processing_when_not_ready(mock_gcs, client):
 
 def test_result_uses_correct_bucket(mock_gcs, client):
     """GET /result/{video_id} should access the configured results bucket."""
-    mock_gcs["blob"].exists.return_value = False
+    mock_gcs["blob"].download_as_bytes.side_effect = NotFound("No such object")
     
     client.get("/result/abc123")
     
@@ -317,7 +341,7 @@ def test_result_uses_correct_bucket(mock_gcs, client):
 
 def test_result_uses_correct_blob_name(mock_gcs, client):
     """GET /result/{video_id} should look for {video_id}.json blob."""
-    mock_gcs["blob"].exists.return_value = False
+    mock_gcs["blob"].download_as_bytes.side_effect = NotFound("No such object")
     
     client.get("/result/test_video_xyz")
     
@@ -341,7 +365,7 @@ def test_result_returns_500_on_gcs_error(mock_gcs, client):
 def test_result_returns_500_on_download_error(mock_gcs, client):
     """GET /result/{video_id} should return 500 when download fails."""
     mock_gcs["blob"].exists.return_value = True
-    mock_gcs["blob"].download_as_text.side_effect = Exception("Download failed")
+    mock_gcs["blob"].download_as_bytes.side_effect = Exception("Download failed")
     
     response = client.get("/result/abc123")
     
@@ -351,8 +375,221 @@ def test_result_returns_500_on_download_error(mock_gcs, client):
 def test_result_returns_500_on_invalid_json(mock_gcs, client):
     """GET /result/{video_id} should return 500 when blob contains invalid JSON."""
     mock_gcs["blob"].exists.return_value = True
-    mock_gcs["blob"].download_as_text.return_value = "not valid json"
+    mock_gcs["blob"].download_as_bytes.return_value = b"not valid json"
     
     response = client.get("/result/abc123")
     
-    assert response.status_code == 500
\ No newline at end of file
+    assert response.status_code == 500
+
+# ---------------------------------------------------------------------------
+# Tests for /result/{video_id} endpoint - compressed results
+# ---------------------------------------------------------------------------
+
+RESULT = {
+    "status": "ready",
+    "video_id": "abc123",
+    "data": {"video_summary": "This is the summary.", "comment_summary": "These are the comments."}
+}
+
+
+def test_result_passes_gzip_through_when_accepted(mock_gcs, client):
+    """A gzip result should be sent as-is to clients that accept gzip."""
+    import gzip
+    mock_gcs["blob"].exists.return_value = True
+    mock_gcs["blob"].download_as_bytes.return_value = gzip.compress(json.dumps(RESULT).encode())
+    
+    response = client.get("/result/abc123", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == RESULT
+    mock_gcs["blob"].download_as_bytes.assert_called_once_with(raw_download=True)
+
+
+def test_result_decompresses_gzip_for_other_clients(mock_gcs, client):
+    """Clients that do not accept gzip should get plain JSON."""
+    import gzip
+    mock_gcs["blob"].exists.return_value = True
+    mock_gcs["blob"].download_as_bytes.return_value = gzip.compress(json.dumps(RESULT).encode())
+    
+    response = client.get("/result/abc123", headers={"Accept-Encoding": "identity"})
+    
+    assert "content-encoding" not in response.headers
+    assert response.json() == RESULT
+
+
+def test_result_decompresses_zstd_when_not_accepted(mock_gcs, client):
+    """zstd results should be decoded for clients without zstd support."""
+    zstandard = pytest.importorskip("zstandard")
+    mock_gcs["blob"].exists.return_value = True
+    mock_gcs["blob"].download_as_bytes.return_value = zstandard.ZstdCompressor().compress(json.dumps(RESULT).encode())
+    
+    response = client.get("/result/abc123", headers={"Accept-Encoding": "gzip;q=1.0, zstd;q=0"})
+    
+    assert "content-encoding" not in response.headers
+    assert response.json() == RESULT
+
+
+def test_result_reads_from_local_result_store(client, tmp_path):
+    """RESULT_STORE=local should serve results written under RESULT_STORE_PATH."""
+    main._result_store = None
+    with patch("main.RESULT_STORE", "local"), patch("main.RESULT_STORE_PATH", str(tmp_path)):
+        main.get_result_store().put("abc123.json", json.dumps(RESULT).encode())
+        ready = client.get("/result/abc123").json()
+        missing = client.get("/result/other").json()
+    main._result_store = None
+    
+    assert ready == RESULT
+    assert missing == {"status": "processing"}
+
+
+# ---------------------------------------------------------------------------
+# Tests for freshness (/meta and /summarize short-circuit)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def memory_store():
+    """Serve results from an in-memory store."""
+    main._result_store = None
+    with patch("main.RESULT_STORE", "memory"):
+        yield main.get_result_store()
+    main._result_store = None
+
+
+def ready_result(age_seconds, input_hashes=None):
+    generated_at = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+    return dict(RESULT, generated_at=generated_at.isoformat(), input_hashes=input_hashes or {"llm": "h1"})
+
+
+def test_summarize_skips_pipeline_when_result_is_fresh(memory_store, mock_auth, mock_requests, client):
+    """A recent ready result should be served without triggering the DAG or replacing it."""
+    memory_store.put("abc123.json", json.dumps(ready_result(60)).encode())
+    
+    response = client.post("/summarize", json={"video_id": "abc123"})
+    
+    assert response.json()["status"] == "fresh"
+    mock_requests["post"].assert_not_called()
+    assert json.loads(memory_store.get("abc123.json"))["status"] == "ready"
+
+
+def test_summarize_reruns_stale_or_forced_result(memory_store, mock_auth, mock_requests, client):
+    """Old results, and any result when force is set, should trigger a new run."""
+    memory_store.put("abc123.json", json.dumps(ready_result(RESULT_FRESH_SECONDS + 60)).encode())
+    memory_store.put("fresh1.json", json.dumps(ready_result(60)).encode())
+    
+    assert client.post("/summarize", json={"video_id": "abc123"}).json()["status"] == "started"
+    assert client.post("/summarize", json={"video_id": "fresh1", "force": True}).json()["status"] == "started"
+    assert mock_requests["post"].call_count == 2
+
+
+def test_summarize_placeholder_keeps_previous_result_for_reuse(memory_store, mock_auth, mock_requests, client):
+    """The placeholder should carry the last ready result so unchanged stages can be skipped."""
+    validation = {"is_valid": True, "issues": [], "bias_check": {"is_biased": False, "threshold": 0.3}, "grounding": {"grounded": 0.9}}
+    previous = dict(ready_result(RESULT_FRESH_SECONDS + 60, {"llm": "h1", "validate": "h2"}), comments="Great video", **validation)
+    memory_store.put("abc123.json", json.dumps(previous).encode())
+    
+    client.post("/summarize", json={"video_id": "abc123"})
+    client.post("/summarize", json={"video_id": "abc123", "force": True})
+    
+    placeholder = json.loads(memory_store.get("abc123.json"))
+    assert placeholder["status"] == "processing"
+    assert placeholder["previous"]["input_hashes"] == {"llm": "h1", "validate": "h2"}
+    assert placeholder["previous"]["data"] == RESULT["data"]
+    assert placeholder["previous"]["comments"] == "Great video"
+    assert {k: placeholder["previous"][k] for k in validation} == validation
+
+
+def test_meta_reports_age_and_hashes_without_summaries(memory_store, client):
+    """GET /meta should describe the stored result without returning its content."""
+    memory_store.put("abc123.json", gzip.compress(json.dumps(ready_result(60)).encode()))
+    
+    meta = client.get("/meta/abc123").json()
+    
+    assert meta["status"] == "ready"
+    assert meta["fresh"] is True
+    assert 59 <= meta["age_seconds"] < 120
+    assert meta["input_hashes"] == {"llm": "h1"}
+    assert meta["generation"] == memory_store.get_versioned("abc123.json")[1]
+    assert "data" not in meta
+
+
+def test_meta_returns_404_when_missing(memory_store, client):
+    """GET /meta for an unknown video should return 404."""
+    assert client.get("/meta/unknown").status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# Tests for in-process runs (PIPELINE_RUNNER=inprocess)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def inprocess_runner():
+    """Run /summarize in the gateway with a mocked runner."""
+    runner = MagicMock()
+    with patch("main.PIPELINE_RUNNER", "inprocess"), patch("main.get_pipeline_runner", return_value=runner):
+        yield runner
+
+
+def test_summarize_inprocess_skips_airflow(memory_store, mock_auth, mock_requests, inprocess_runner, client):
+    """In-process runs should start the pipeline in the gateway with the placeholder's token."""
+    async def run(video_link, run_token, previous):
+        return {"status": "pushed"}
+    inprocess_runner.run.side_effect = run
+
+    response = client.post("/summarize", json={"video_id": "abc123"})
+
+    assert response.json()["status"] == "started"
+    mock_requests["post"].assert_not_called()
+    mock_auth["default"].assert_not_called()
+    inprocess_runner.run.assert_called_once_with("https://www.youtube.com/watch?v=abc123", response.json()["run_token"], None)
+
+
+def test_summarize_inprocess_passes_previous_result(memory_store, mock_auth, mock_requests, inprocess_runner, client):
+    """The runner should get the last ready result so it can skip unchanged stages."""
+    memory_store.put("abc123.json", json.dumps(ready_result(RESULT_FRESH_SECONDS + 60, {"llm": "h1"})).encode())
+    async def run(video_link, run_token, previous):
+        return {"status": "pushed"}
+    inprocess_runner.run.side_effect = run
+
+    client.post("/summarize", json={"video_id": "abc123"})
+
+    previous = inprocess_runner.run.call_args.args[2]
+    assert previous["input_hashes"] == {"llm": "h1"}
+    assert previous["data"] == RESULT["data"]
+
+
+def test_summarize_inprocess_failure_marks_result_failed(memory_store, mock_auth, mock_requests, inprocess_runner, client):
+    """A failed in-process run should leave a failed status (keeping the previous result) instead of a placeholder."""
+    memory_store.put("abc123.json", json.dumps(ready_result(RESULT_FRESH_SECONDS + 60)).encode())
+    async def run(video_link, run_token, previous):
+        raise RuntimeError("llm: no response within 600s")
+    inprocess_runner.run.side_effect = run
+
+    client.post("/summarize", json={"video_id": "abc123"})
+
+    stored = json.loads(memory_store.get("abc123.json"))
+    assert stored["status"] == "failed"
+    assert "llm" in stored["error"]
+    assert stored["previous"]["data"] == RESULT["data"]
+
+
+def test_summarize_inprocess_discarded_run_is_marked(memory_store, mock_auth, mock_requests, inprocess_runner, client):
+    """A run discarded as invalid should replace the placeholder with its issues."""
+    async def run(video_link, run_token, previous):
+        return {"status": "discarded", "issues": ["Video summary is too short."]}
+    inprocess_runner.run.side_effect = run
+
+    client.post("/summarize", json={"video_id": "abc123"})
+
+    stored = json.loads(memory_store.get("abc123.json"))
+    assert stored["status"] == "discarded"
+    assert stored["issues"] == ["Video summary is too short."]
+
+
+def test_mark_finished_leaves_newer_runs_alone(memory_store):
+    """A failure from a superseded run must not overwrite the newer run's placeholder."""
+    memory_store.put("abc123.json", json.dumps({"status": "processing", "run_token": "new"}).encode())
+
+    main.mark_finished("abc123", "old", "failed", error="boom")
+
+    assert json.loads(memory_store.get("abc123.json"))["status"] == "processing"
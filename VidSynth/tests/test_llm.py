@@ -0,0 +1,387 @@
+"""
+Tests for the LLM service.
+"""
+import os
+import sys
+import threading
+import time
+
+# ---------------------------------------------------------------------------
+# Path and environment setup (must come before importing service code)
+# ---------------------------------------------------------------------------
+
+# Set required environment variable before LLMHandler is constructed
+os.environ["TGI_SERVICE_URL"] = "http://fake-tgi.example.com/generate"
+
+# Add llm service and shared package directories to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "llm_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
+
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from main import app
+from batcher import MicroBatcher
+from incremental import CommentPlan, comment_drift, plan_comment_summary
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def client():
+    """Create a test client for the FastAPI app."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def mock_engine():
+    """Patch the module-level LLM handler with a mock."""
+    with patch("main.llm_engine") as mock:
+        mock.generate_with_usage.side_effect = lambda prompt: (
+            f"summary of {len(prompt)} chars",
+            {"prefill_tokens": len(prompt) // 4, "generated_tokens": 20}
+        )
+        yield mock
+
+
+@pytest.fixture
+def preprocess_output():
+    """Valid input coming from the preprocess service."""
+    return {
+        "video_id": "abc123",
+        "transcript": "This is the video transcript.",
+        "comments": "Great video!\nVery informative.",
+        "video_title": "Test Video Title",
+        "category": "education",
+        "language": "en"
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tests for root endpoint
+# ---------------------------------------------------------------------------
+
+def test_root_reports_not_ready_without_engine(client):
+    """GET / should report Not Ready before the handler is initialised."""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    assert "Not Ready" in response.json()["message"]
+
+
+# ---------------------------------------------------------------------------
+# Tests for /run-llm endpoint
+# ---------------------------------------------------------------------------
+
+def test_run_llm_returns_503_without_engine(client, preprocess_output):
+    """POST /run-llm should return 503 when the handler failed to initialise."""
+    response = client.post("/run-llm", json=preprocess_output)
+
+    assert response.status_code == 503
+
+
+def test_run_llm_returns_both_summaries(mock_engine, client, preprocess_output):
+    """POST /run-llm should return video and comment summaries."""
+    response = client.post("/run-llm", json=preprocess_output)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["video_id"] == "abc123"
+    assert data["video_title"] == "Test Video Title"
+    assert data["category"] == "education"
+    assert data["language"] == "en"
+    assert data["video_summary"].startswith("summary of")
+    assert data["comment_summary"].startswith("summary of")
+    assert data["comments"] == preprocess_output["comments"]
+    assert mock_engine.generate_with_usage.call_count == 2
+
+
+def test_run_llm_returns_token_counts_of_both_prompts(mock_engine, client, preprocess_output):
+    """TGI's prefill and generated token counts should be summed over the request's prompts."""
+    data = client.post("/run-llm", json=preprocess_output).json()
+
+    prompts = [call.args[0] for call in mock_engine.generate_with_usage.call_args_list]
+    assert data["token_counts"] == {
+        "prefill_tokens": sum(len(p) // 4 for p in prompts),
+        "generated_tokens": 40
+    }
+
+
+def test_handler_reads_token_counts_from_tgi_details():
+    """The handler should ask TGI for details and report its token counts."""
+    from llm_handler import LLMHandler
+    handler = LLMHandler()
+    response = MagicMock(headers={"x-prompt-tokens": "812"})
+    response.json.return_value = {"generated_text": "A summary.", "details": {"generated_tokens": 57, "finish_reason": "eos_token"}}
+
+    with patch.object(handler.session, "post", return_value=response) as post:
+        text, counts = handler.generate_with_usage("prompt")
+
+    assert post.call_args.kwargs["json"]["parameters"]["details"] is True
+    assert text == "A summary."
+    assert counts == {"prefill_tokens": 812, "generated_tokens": 57}
+
+
+def test_handler_counts_prefill_tokens_from_decoder_input_details():
+    """Without the header, the prompt length should come from the listed prefill tokens."""
+    from llm_handler import LLMHandler
+    details = {"generated_tokens": 57, "prefill": [{"id": i, "text": "t", "logprob": None} for i in range(4)]}
+
+    counts = LLMHandler._token_counts({"details": details}, {})
+
+    assert counts == {"prefill_tokens": 4, "generated_tokens": 57}
+
+
+def test_run_llm_passes_on_only_the_prompted_comments(mock_engine, client, preprocess_output):
+    """Comments past the prompt cap should not reach validate's coverage check."""
+    preprocess_output["comments"] = "\n".join(f"comment number {i}" for i in range(1000))
+
+    data = client.post("/run-llm", json=preprocess_output).json()
+
+    assert data["comments"] == preprocess_output["comments"][:3000]
+
+
+def test_run_llm_reports_tgi_time_in_server_timing(mock_engine, client, preprocess_output):
+    """The response should carry TGI and total handler time for the DAG's stage metrics."""
+    response = client.post("/run-llm", json=preprocess_output)
+
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("tgi;dur=")
+    assert ", app;dur=" in timing
+
+
+def test_run_llm_routes_prompts_through_batcher(mock_engine, client, preprocess_output):
+    """With batching enabled, both prompts should go through the micro-batcher."""
+    batcher = MicroBatcher(mock_engine.generate_with_usage, max_batch_size=4, max_wait_ms=5)
+    try:
+        with patch("main.llm_batcher", batcher):
+            response = client.post("/run-llm", json=preprocess_output)
+    finally:
+        batcher.shutdown()
+
+    assert response.status_code == 200
+    assert batcher.stats()["prompts_dispatched"] == 2
+
+
+def test_run_llm_missing_transcript_returns_422(client):
+    """POST /run-llm without transcript should return 422."""
+    response = client.post("/run-llm", json={"video_id": "abc123", "comments": ""})
+
+    assert response.status_code == 422
+
+
+def test_run_llm_defaults_to_full_comment_summary(mock_engine, client, preprocess_output):
+    """Without prior state the comment summary should be recomputed in full."""
+    response = client.post("/run-llm", json=preprocess_output)
+
+    assert response.json()["comment_summary_mode"] == "full"
+
+
+def test_run_llm_updates_comment_summary_incrementally(mock_engine, client, preprocess_output):
+    """A small comment delta should send only the new comments with the old summary."""
+    old = [f"old comment {i}" for i in range(19)]
+    preprocess_output["previous_comments"] = "\n".join(old)
+    preprocess_output["previous_comment_summary"] = "Viewers liked the video."
+    preprocess_output["comments"] = "\n".join(old + ["brand new comment"])
+
+    response = client.post("/run-llm", json=preprocess_output)
+
+    assert response.status_code == 200
+    assert response.json()["comment_summary_mode"] == "incremental"
+    comment_prompt = mock_engine.generate_with_usage.call_args_list[1].args[0]
+    assert "Viewers liked the video." in comment_prompt
+    assert "brand new comment" in comment_prompt
+    assert "old comment 3" not in comment_prompt
+
+
+def test_run_llm_reuses_comment_summary_when_unchanged(mock_engine, client, preprocess_output):
+    """An unchanged comment set should reuse the previous summary without calling TGI."""
+    preprocess_output["previous_comments"] = preprocess_output["comments"]
+    preprocess_output["previous_comment_summary"] = "Viewers liked the video."
+
+    response = client.post("/run-llm", json=preprocess_output)
+
+    data = response.json()
+    assert data["comment_summary_mode"] == "reused"
+    assert data["comment_summary"] == "Viewers liked the video."
+    assert mock_engine.generate_with_usage.call_count == 1
+
+
+def test_run_llm_reuses_comment_summary_for_long_unchanged_comments(mock_engine, client, preprocess_output):
+    """Comments past the prompt cap, and the line it cuts, should not count as new on a re-run."""
+    preprocess_output["comments"] = "\n".join(f"comment number {i}" for i in range(1000))
+    first = client.post("/run-llm", json=preprocess_output).json()
+    preprocess_output["previous_comments"] = first["comments"]
+    preprocess_output["previous_comment_summary"] = first["comment_summary"]
+
+    data = client.post("/run-llm", json=preprocess_output).json()
+
+    assert len(preprocess_output["comments"]) > 3000
+    assert data["comment_summary_mode"] == "reused"
+    assert data["comment_summary"] == first["comment_summary"]
+
+
+def test_batcher_stats_reports_disabled(client):
+    """GET /batcher/stats should report batching disabled by default."""
+    response = client.get("/batcher/stats")
+
+    assert response.status_code == 200
+    assert response.json() == {"enabled": False}
+
+
+# ---------------------------------------------------------------------------
+# Tests for MicroBatcher
+# ---------------------------------------------------------------------------
+
+class TestMicroBatcher:
+    """Unit tests for the MicroBatcher dispatcher."""
+
+    def test_results_are_returned_to_the_right_caller(self):
+        """Each caller should receive the result for its own prompt."""
+        batcher = MicroBatcher(lambda p: p.upper(), max_batch_size=8, max_wait_ms=20)
+        try:
+            results = batcher.generate_many([f"prompt {i}" for i in range(20)])
+        finally:
+            batcher.shutdown()
+
+        assert results == [f"PROMPT {i}" for i in range(20)]
+
+    def test_concurrent_prompts_are_grouped(self):
+        """Prompts arriving inside the window should share a batch."""
+        batcher = MicroBatcher(lambda p: p, max_batch_size=8, max_wait_ms=200)
+        try:
+            futures = [batcher.submit(str(i)) for i in range(8)]
+            [f.result(timeout=5) for f in futures]
+            stats = batcher.stats()
+        finally:
+            batcher.shutdown()
+
+        assert stats["batches_dispatched"] == 1
+        assert stats["avg_batch_size"] == 8
+
+    def test_batch_size_cap_is_respected(self):
+        """No batch should exceed max_batch_size."""
+        batcher = MicroBatcher(lambda p: p, max_batch_size=3, max_wait_ms=200)
+        try:
+            batcher.generate_many([str(i) for i in range(9)])
+            stats = batcher.stats()
+        finally:
+            batcher.shutdown()
+
+        assert stats["batches_dispatched"] == 3
+        assert stats["prompts_dispatched"] == 9
+
+    def test_batch_dispatches_after_window_expires(self):
+        """A lone prompt should not wait much longer than max_wait_ms."""
+        batcher = MicroBatcher(lambda p: p, max_batch_size=8, max_wait_ms=20)
+        try:
+            start = time.monotonic()
+            batcher.generate("only one")
+            elapsed = time.monotonic() - start
+        finally:
+            batcher.shutdown()
+
+        assert elapsed < 1.0
+
+    def test_batch_members_run_concurrently(self):
+        """Prompts in one batch should be in flight at the same time."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow(prompt):
+            with lock:
+                active.append(prompt)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(prompt)
+            return prompt
+
+        batcher = MicroBatcher(slow, max_batch_size=4, max_wait_ms=100)
+        try:
+            batcher.generate_many(["a", "b", "c", "d"])
+        finally:
+            batcher.shutdown()
+
+        assert max(peak) == 4
+
+    def test_exceptions_propagate_to_caller(self):
+        """An error for one prompt should surface only on that caller's future."""
+        def flaky(prompt):
+            if prompt == "bad":
+                raise RuntimeError("TGI exploded")
+            return prompt
+
+        batcher = MicroBatcher(flaky, max_batch_size=4, max_wait_ms=50)
+        try:
+            good = batcher.submit("good")
+            bad = batcher.submit("bad")
+            assert good.result(timeout=5) == "good"
+            with pytest.raises(RuntimeError):
+                bad.result(timeout=5)
+        finally:
+            batcher.shutdown()
+
+    def test_rejects_invalid_configuration(self):
+        """Invalid sizes should raise ValueError."""
+        with pytest.raises(ValueError):
+            MicroBatcher(lambda p: p, max_batch_size=0)
+
+        with pytest.raises(ValueError):
+            MicroBatcher(lambda p: p, max_batch_size=8, max_in_flight=4)
+
+    def test_submit_after_shutdown_raises(self):
+        """submit() should refuse new work after shutdown."""
+        batcher = MicroBatcher(lambda p: p)
+        batcher.shutdown()
+
+        with pytest.raises(RuntimeError):
+            batcher.submit("late")
+
+
+# ---------------------------------------------------------------------------
+# Tests for incremental comment planning
+# ---------------------------------------------------------------------------
+
+class TestIncrementalPlanning:
+    """Unit tests for the incremental comment summary planner."""
+
+    def test_drift_is_zero_for_identical_sets(self):
+        """Identical comment sets should have no drift and no new comments."""
+        new, drift = comment_drift(["a", "b"], ["b", "a"])
+
+        assert new == []
+        assert drift == 0.0
+
+    def test_drift_counts_added_and_removed_comments(self):
+        """Drift should be the Jaccard distance between the two sets."""
+        new, drift = comment_drift(["a", "b", "c"], ["b", "c", "d"])
+
+        assert new == ["d"]
+        assert drift == pytest.approx(0.5)
+
+    def test_plan_is_full_without_previous_summary(self):
+        """Missing prior summary should force a full recompute."""
+        plan = plan_comment_summary("a\nb", None, "a", 0.3)
+
+        assert plan.mode == CommentPlan.FULL
+
+    def test_plan_is_full_when_drift_exceeds_threshold(self):
+        """Large changes in the comment set should force a full recompute."""
+        plan = plan_comment_summary("x\ny\nz", "old summary", "a\nb\nc", 0.3)
+
+        assert plan.mode == CommentPlan.FULL
+        assert plan.drift == 1.0
+
+    def test_plan_is_incremental_for_small_delta(self):
+        """A handful of new comments should produce an incremental plan."""
+        previous = "\n".join(str(i) for i in range(10))
+        current = previous + "\nnew one"
+
+        plan = plan_comment_summary(current, "old summary", previous, 0.3)
+
+        assert plan.mode == CommentPlan.INCREMENTAL
+        assert plan.new_comments == ["new one"]
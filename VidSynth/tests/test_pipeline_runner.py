@@ -0,0 +1,201 @@
+"""
+Tests for the gateway's in-process pipeline runner (gateway_service/pipeline_runner.py).
+"""
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "gateway_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
+
+import httpx
+import pytest
+
+from pipeline_runner import STAGES, PipelineRunner, StageDeadlineExceeded, StageError
+from vidsynth_common.freshness import input_hash
+
+URLS = {stage: f"http://{stage}.test" for stage in STAGES}
+
+
+class FakeServices:
+    """Answers every service endpoint like the real services would for one video."""
+
+    def __init__(self, is_valid=True, delays=None, statuses=None):
+        self.is_valid = is_valid
+        self.delays = delays or {}
+        self.statuses = dict(statuses or {})
+        self.calls = []
+        self.active = {}
+        self.max_active = {}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        stage = request.url.host.split(".")[0]
+        path = request.url.path
+        payload = json.loads(request.content)
+        self.calls.append((stage, path, payload))
+        self.active[stage] = self.active.get(stage, 0) + 1
+        self.max_active[stage] = max(self.max_active.get(stage, 0), self.active[stage])
+        try:
+            await asyncio.sleep(self.delays.get(stage, 0))
+        finally:
+            self.active[stage] -= 1
+
+        statuses = self.statuses.get(stage)
+        if statuses:
+            return httpx.Response(statuses.pop(0), text="unavailable")
+        if path == "/read":
+            return httpx.Response(200, json={"video_id": "dQw4w9WgXcQ", "original_link": payload["video_link"]})
+        if path == "/preprocess":
+            return httpx.Response(200, json={"video_id": payload["video_id"], "transcript": "t", "comments": "c", "video_title": "Title"})
+        if path == "/run-llm":
+            return httpx.Response(200, json=dict(payload, video_summary="vs", comment_summary="cs", token_counts={"prefill_tokens": 900, "generated_tokens": 120}))
+        if path == "/validate":
+            # Like ValidateOutput: llm's comments and token counts are not passed on
+            fields = {key: payload[key] for key in ("video_id", "video_summary", "comment_summary")}
+            return httpx.Response(200, json=dict(fields, is_valid=self.is_valid, issues=[] if self.is_valid else ["Video summary is too short."]))
+        return httpx.Response(200, json={"status": "success", "video_id": payload["video_id"]})
+
+
+def make_runner(services, **kwargs):
+    return PipelineRunner(URLS, client=httpx.AsyncClient(transport=httpx.MockTransport(services)), **kwargs)
+
+
+def run(runner, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await runner.aclose()
+    return asyncio.run(main())
+
+
+def test_run_chains_all_stages_and_pushes_with_token():
+    """Each stage's output should feed the next, and push should get the run token, hashes and metrics."""
+    services = FakeServices()
+    runner = make_runner(services)
+
+    outcome = run(runner, runner.run("https://youtu.be/dQw4w9WgXcQ", run_token="t1"))
+
+    assert outcome["status"] == "pushed"
+    assert [stage for stage, _, _ in services.calls] == list(STAGES)
+    push_payload = services.calls[-1][2]
+    assert push_payload["run_token"] == "t1"
+    assert push_payload["video_summary"] == "vs"
+    assert push_payload["token_counts"] == {"prefill_tokens": 900, "generated_tokens": 120}
+    assert set(push_payload["stage_timings"]) == {"read", "preprocess", "llm", "validate"}
+    assert set(push_payload["input_hashes"]) == {"llm", "validate"}
+    # Same summary as a DAG run (RunMetrics.summary)
+    run_metrics = push_payload["run_metrics"]
+    assert set(run_metrics) == {"stages", "wall_seconds", "http_seconds", "retries", "request_bytes", "response_bytes"}
+    assert run_metrics["stages"]["llm"]["request_bytes"] > 0
+    assert run_metrics["stages"]["llm"]["skipped"] is False
+
+
+def test_unchanged_stages_reuse_the_previous_result():
+    """With the previous result's hashes matching, llm and validate should not be called."""
+    services = FakeServices()
+    preprocessed = {"video_id": "dQw4w9WgXcQ", "transcript": "t", "comments": "c", "video_title": "Title"}
+    reused = dict(preprocessed, video_summary="old vs", comment_summary="old cs")
+    previous = {
+        "generated_at": "2026-10-18T12:00:00+00:00",
+        "input_hashes": {"llm": input_hash("llm", preprocessed), "validate": input_hash("validate", reused)},
+        "data": {"video_summary": "old vs", "comment_summary": "old cs"},
+        "is_valid": True,
+        "issues": [],
+        "bias_check": {"similarity_score": 0.7, "is_biased": False, "threshold": 0.3},
+    }
+    runner = make_runner(services)
+
+    outcome = run(runner, runner.run("https://youtu.be/dQw4w9WgXcQ", previous=previous))
+
+    assert outcome["status"] == "pushed"
+    assert [stage for stage, _, _ in services.calls] == ["read", "preprocess", "push"]
+    push_payload = services.calls[-1][2]
+    assert push_payload["video_summary"] == "old vs"
+    assert push_payload["bias_check"] == previous["bias_check"]
+    assert push_payload["run_metrics"]["stages"]["llm"]["skipped"] is True
+
+
+def test_llm_gets_previous_comment_summary_and_push_stores_comments():
+    """A changed video should get an incremental comment summary, and its comments should be pushed for next time."""
+    services = FakeServices()
+    previous = {"input_hashes": {"llm": "old"}, "data": {"video_summary": "vs", "comment_summary": "old cs"}, "comments": "b"}
+    runner = make_runner(services)
+
+    run(runner, runner.run("https://youtu.be/dQw4w9WgXcQ", previous=previous))
+
+    llm_payload = next(payload for stage, _, payload in services.calls if stage == "llm")
+    assert llm_payload["previous_comment_summary"] == "old cs"
+    assert llm_payload["previous_comments"] == "b"
+    assert services.calls[-1][2]["comments"] == "c"
+
+
+def test_invalid_result_goes_to_telemetry_not_push():
+    """A result that fails validation should be recorded, not stored."""
+    services = FakeServices(is_valid=False)
+    runner = make_runner(services)
+
+    outcome = run(runner, runner.run("https://youtu.be/dQw4w9WgXcQ"))
+
+    assert outcome["status"] == "discarded"
+    assert services.calls[-1][:2] == ("push", "/telemetry")
+
+
+def test_superseded_push_is_not_an_error():
+    """409 from push means a newer run owns the result."""
+    services = FakeServices(statuses={"push": [409]})
+    runner = make_runner(services)
+
+    assert run(runner, runner.run("https://youtu.be/dQw4w9WgXcQ"))["status"] == "superseded"
+
+
+def test_gateway_errors_are_retried():
+    """502/503/504 should be retried; a persistent 4xx should fail the run at that stage."""
+    services = FakeServices(statuses={"preprocess": [503]})
+    runner = make_runner(services)
+    assert run(runner, runner.run("https://youtu.be/dQw4w9WgXcQ"))["status"] == "pushed"
+
+    services = FakeServices(statuses={"read": [400]})
+    runner = make_runner(services)
+    with pytest.raises(StageError) as error:
+        run(runner, runner.run("https://vimeo.com/1"))
+    assert error.value.stage == "read"
+    assert runner.stats()["read"]["failed"] == 1
+
+
+def test_stage_concurrency_is_bounded():
+    """No more than the stage's limit should be in flight, whatever the number of runs."""
+    services = FakeServices(delays={"llm": 0.05})
+    runner = make_runner(services, concurrency={"llm": 2})
+
+    async def many():
+        return await asyncio.gather(*(runner.run("https://youtu.be/dQw4w9WgXcQ") for _ in range(6)))
+
+    outcomes = run(runner, many())
+
+    assert all(o["status"] == "pushed" for o in outcomes)
+    assert services.max_active["llm"] == 2
+    assert max(o["metrics"]["stages"]["llm"]["queue_seconds"] for o in outcomes) > 0.05
+
+
+def test_stage_deadline_counts_queue_time():
+    """A call that cannot finish within its stage deadline should fail the run."""
+    services = FakeServices(delays={"llm": 0.2})
+    runner = make_runner(services, concurrency={"llm": 1}, deadlines={"llm": 0.3})
+
+    async def two():
+        return await asyncio.gather(*(runner.run("https://youtu.be/dQw4w9WgXcQ") for _ in range(2)), return_exceptions=True)
+
+    outcomes = run(runner, two())
+
+    assert sum(1 for o in outcomes if isinstance(o, StageDeadlineExceeded)) == 1
+    assert runner.stats()["llm"]["deadline_exceeded"] == 1
+    assert runner.stats()["llm"]["queued"] == 0
+    assert runner.stats()["llm"]["in_flight"] == 0
+
+
+def test_runner_requires_every_service_url():
+    """A missing service URL should be reported when the runner is created."""
+    with pytest.raises(ValueError):
+        PipelineRunner(dict(URLS, llm=None))
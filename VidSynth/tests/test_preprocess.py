@@ -11,9 +11,10 @@ import sys
 # Set fake API key before youtube_client.py is imported
 os.environ["YOUTUBE_API_KEY"] = "fake_key_for_testing"
 
-# Add preprocess service directory to Python path
+# Add preprocess service and shared package directories to Python path
 # This allows `from main import app` to find preprocess_service/main.py
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "preprocess_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
 
 import pytest
 from unittest.mock import patch, MagicMock
@@ -59,7 +60,9 @@ def test_preprocess_returns_all_fields(mock_youtube_client, client):
     mock_youtube_client.get_video_data.return_value = {
         "transcript": "This is the video transcript.",
         "comments": "Great video!\nVery informative.",
-        "video_title": "Test Video Title"
+        "video_title": "Test Video Title",
+        "category": "education",
+        "language": "en"
     }
     
     response = client.post("/preprocess", json={"video_id": "abc123"})
@@ -70,6 +73,8 @@ def test_preprocess_returns_all_fields(mock_youtube_client, client):
     assert data["transcript"] == "This is the video transcript."
     assert data["comments"] == "Great video!\nVery informative."
     assert data["video_title"] == "Test Video Title"
+    assert data["category"] == "education"
+    assert data["language"] == "en"
 
 
 def test_preprocess_empty_transcript_and_comments(mock_youtube_client, client):
@@ -198,12 +203,12 @@ class TestYouTubeClientComments:
         assert result == ""
 
 
-class TestYouTubeClientVideoTitle:
-    """Unit tests for YouTubeClient._get_video_title method."""
+class TestYouTubeClientVideoDetails:
+    """Unit tests for YouTubeClient._get_video_details method."""
     
     @patch("youtube_client.build")
     def test_get_video_title_returns_title(self, mock_build):
-        """_get_video_title should extract title from API response."""
+        """_get_video_details should extract title from API response."""
         mock_api = MagicMock()
         mock_build.return_value = mock_api
         
@@ -213,13 +218,13 @@ class TestYouTubeClientVideoTitle:
         
         from youtube_client import YouTubeClient
         yt_client = YouTubeClient()
-        result = yt_client._get_video_title("test_video")
+        result = yt_client._get_video_details("test_video")["video_title"]
         
         assert result == "My Awesome Video"
     
     @patch("youtube_client.build")
     def test_get_video_title_handles_no_items(self, mock_build):
-        """_get_video_title should return 'Unknown' when video not found."""
+        """_get_video_details should return 'Unknown' when video not found."""
         mock_api = MagicMock()
         mock_build.return_value = mock_api
         mock_api.videos.return_value.list.return_value.execute.return_value = {
@@ -228,22 +233,42 @@ class TestYouTubeClientVideoTitle:
         
         from youtube_client import YouTubeClient
         yt_client = YouTubeClient()
-        result = yt_client._get_video_title("nonexistent_video")
+        result = yt_client._get_video_details("nonexistent_video")["video_title"]
         
         assert result == "Unknown"
     
     @patch("youtube_client.build")
     def test_get_video_title_handles_api_exception(self, mock_build):
-        """_get_video_title should return 'Unknown' on API error."""
+        """_get_video_details should return 'Unknown' on API error."""
         mock_api = MagicMock()
         mock_build.return_value = mock_api
         mock_api.videos.return_value.list.return_value.execute.side_effect = Exception("API Error")
         
         from youtube_client import YouTubeClient
         yt_client = YouTubeClient()
-        result = yt_client._get_video_title("test_video")
+        result = yt_client._get_video_details("test_video")["video_title"]
         
         assert result == "Unknown"
+    
+    @patch("youtube_client.build")
+    def test_get_video_details_returns_category_and_language(self, mock_build):
+        """_get_video_details should report the category name and the audio language's primary code."""
+        mock_api = MagicMock()
+        mock_build.return_value = mock_api
+        mock_api.videos.return_value.list.return_value.execute.return_value = {
+            "items": [{"snippet": {"title": "My Awesome Video", "categoryId": "27", "defaultAudioLanguage": "en-US", "defaultLanguage": "fr"}}]
+        }
+        
+        from youtube_client import YouTubeClient
+        yt_client = YouTubeClient()
+        
+        details = yt_client._get_video_details("test_video")
+        assert details["category"] == "education"
+        assert details["language"] == "en"
+        mock_api.videos.return_value.list.return_value.execute.return_value = {
+            "items": [{"snippet": {"title": "My Awesome Video"}}]
+        }
+        assert yt_client._get_video_details("test_video")["language"] is None
 
 
 class TestYouTubeClientTranscript:
@@ -332,11 +357,12 @@ class TestYouTubeClientGetVideoData:
         # Mock the individual methods
         with patch.object(yt_client, "_get_transcript", return_value="transcript text"):
             with patch.object(yt_client, "_get_comments", return_value="comments text"):
-                with patch.object(yt_client, "_get_video_title", return_value="Video Title"):
+                with patch.object(yt_client, "_get_video_details", return_value={"video_title": "Video Title", "language": "en"}):
                     result = yt_client.get_video_data("test_video")
         
         assert result == {
             "transcript": "transcript text",
             "comments": "comments text",
-            "video_title": "Video Title"
+            "video_title": "Video Title",
+            "language": "en"
         }
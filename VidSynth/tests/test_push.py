@@ -3,18 +3,22 @@ Tests for the push service.
 """
 import os
 import sys
+import gzip
 import json
+from datetime import datetime
 
 # ---------------------------------------------------------------------------
 # Path setup (must come before importing service code)
 # ---------------------------------------------------------------------------
 
-# Add push service directory to Python path
+# Add push service and shared package directories to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "push_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
 
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
+import main
 from main import app, BUCKET_NAME
 
 
@@ -51,7 +55,9 @@ def valid_push_input():
 @pytest.fixture
 def mock_gcs():
     """Mock Google Cloud Storage client and its chain of calls."""
-    with patch("main.storage.Client") as mock_client_class:
+    # The store (and its client) is cached per process; start each test without one
+    main._result_store = None
+    with patch("main.RESULT_STORE", "gcs"), patch("google.cloud.storage.Client") as mock_client_class:
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
         
@@ -124,9 +130,9 @@ def test_push_uploads_correct_json_structure(mock_gcs, client, valid_push_input)
     """POST /push should upload JSON with required structure for extension."""
     client.post("/push", json=valid_push_input)
     
-    # Get the data that was uploaded
+    # Get the data that was uploaded (gzip-compressed by default)
     call_args = mock_gcs["blob"].upload_from_string.call_args
-    uploaded_data = json.loads(call_args.kwargs["data"])
+    uploaded_data = json.loads(gzip.decompress(call_args.kwargs["data"]))
     
     assert uploaded_data["status"] == "ready"
     assert uploaded_data["video_id"] == "abc123"
@@ -291,3 +297,345 @@ def test_push_missing_issues_returns_422(client):
     })
     
     assert response.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# Tests for the shared storage client and /push/batch
+# ---------------------------------------------------------------------------
+
+def test_push_reuses_storage_client(mock_gcs, client, valid_push_input):
+    """Consecutive pushes should share one storage client."""
+    client.post("/push", json=valid_push_input)
+    client.post("/push", json=valid_push_input)
+    
+    mock_gcs["client_class"].assert_called_once()
+    assert mock_gcs["blob"].upload_from_string.call_count == 2
+
+
+def test_push_batch_uploads_every_item(mock_gcs, client, valid_push_input):
+    """POST /push/batch should upload one blob per item."""
+    items = [dict(valid_push_input, video_id=f"vid{i}") for i in range(5)]
+    
+    response = client.post("/push/batch", json={"items": items})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pushed"] == 5
+    assert data["failed"] == 0
+    assert [r["video_id"] for r in data["results"]] == [f"vid{i}" for i in range(5)]
+    blob_names = sorted(c.args[0] for c in mock_gcs["bucket"].blob.call_args_list)
+    assert blob_names == [f"vid{i}.json" for i in range(5)]
+
+
+def test_push_batch_reports_failures_per_item(mock_gcs, client, valid_push_input):
+    """A failed upload should be reported on its item without failing the batch."""
+    items = [dict(valid_push_input, video_id=f"vid{i}") for i in range(3)]
+    mock_gcs["blob"].upload_from_string.side_effect = [None, Exception("GCS connection failed"), None]
+    
+    response = client.post("/push/batch", json={"items": items})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pushed"] == 2
+    assert data["failed"] == 1
+    failed = [r for r in data["results"] if r["status"] == "failed"]
+    assert "GCS connection failed" in failed[0]["error"]
+
+
+def test_push_batch_rejects_oversized_batch(mock_gcs, client, valid_push_input):
+    """POST /push/batch should return 400 above PUSH_BATCH_MAX_ITEMS."""
+    with patch("main.PUSH_BATCH_MAX_ITEMS", 2):
+        response = client.post("/push/batch", json={"items": [valid_push_input] * 3})
+    
+    assert response.status_code == 400
+    mock_gcs["blob"].upload_from_string.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Tests for result compression
+# ---------------------------------------------------------------------------
+
+def test_push_sets_gzip_content_encoding(mock_gcs, client, valid_push_input):
+    """gzip results should carry Content-Encoding so GCS can transcode them."""
+    client.post("/push", json=valid_push_input)
+    
+    assert mock_gcs["blob"].content_encoding == "gzip"
+
+
+def test_push_can_write_uncompressed_results(mock_gcs, client, valid_push_input):
+    """RESULT_COMPRESSION=none should write plain JSON, as before."""
+    with patch("main.RESULT_COMPRESSION", "none"):
+        client.post("/push", json=valid_push_input)
+    
+    call_args = mock_gcs["blob"].upload_from_string.call_args
+    assert json.loads(call_args.kwargs["data"])["video_id"] == "abc123"
+    assert mock_gcs["blob"].content_encoding is None
+
+
+def test_encode_result_zstd_round_trips():
+    """zstd results should decompress back to the same JSON."""
+    zstandard = pytest.importorskip("zstandard")
+    result = {"status": "ready", "video_id": "abc123", "data": {"video_summary": "S", "comment_summary": "C"}}
+    
+    data, encoding = main.encode_result(result, "zstd")
+    
+    assert encoding == "zstd"
+    assert json.loads(zstandard.ZstdDecompressor().decompress(data)) == result
+
+
+def test_encode_result_rejects_unknown_codec():
+    """An unknown RESULT_COMPRESSION should fail loudly."""
+    with pytest.raises(ValueError):
+        main.encode_result({}, "brotli")
+
+
+def test_push_writes_to_local_result_store(client, valid_push_input, tmp_path):
+    """RESULT_STORE=local should write results under RESULT_STORE_PATH."""
+    main._result_store = None
+    with patch("main.RESULT_STORE", "local"), patch("main.RESULT_STORE_PATH", str(tmp_path)):
+        response = client.post("/push", json=valid_push_input)
+        stored = main.get_result_store().get("abc123.json")
+    main._result_store = None
+    
+    assert response.status_code == 200
+    assert json.loads(gzip.decompress(stored))["video_id"] == "abc123"
+
+
+# ---------------------------------------------------------------------------
+# Tests for run fencing (conditional writes)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def memory_store():
+    """In-memory result store standing in for the bucket."""
+    from vidsynth_common.result_store import MemoryResultStore
+    main._result_store = MemoryResultStore()
+    yield main._result_store
+    main._result_store = None
+
+
+def start_run(store, video_id, token):
+    """What the gateway does when it triggers a run: stamp a placeholder."""
+    placeholder = {"status": "processing", "video_id": video_id, "run_token": token}
+    store.put(f"{video_id}.json", json.dumps(placeholder).encode())
+
+
+def stored_result(store, video_id):
+    return json.loads(gzip.decompress(store.get(f"{video_id}.json")))
+
+
+def test_push_stores_freshness_metadata(memory_store, client, valid_push_input):
+    """The result should record when it was generated and the stage input hashes it came from."""
+    hashes = {"llm": "a" * 64, "validate": "b" * 64}
+    client.post("/push", json=dict(valid_push_input, input_hashes=hashes))
+    
+    result = stored_result(memory_store, "abc123")
+    assert result["input_hashes"] == hashes
+    assert datetime.fromisoformat(result["generated_at"]).tzinfo is not None
+
+
+def test_push_stores_comments_for_incremental_refresh(memory_store, client, valid_push_input):
+    """The comments behind the comment summary should be kept for the next run's llm request."""
+    client.post("/push", json=dict(valid_push_input, comments="Great video\nVery clear"))
+
+    assert stored_result(memory_store, "abc123")["comments"] == "Great video\nVery clear"
+
+
+def test_push_stores_validation_results_for_reuse(memory_store, client, valid_push_input):
+    """validate's verdict and reports should be kept for a later run that skips validate."""
+    coverage = {"coverage": 0.4}
+    client.post("/push", json=dict(valid_push_input, issues=["Low coverage"], comment_coverage=coverage))
+
+    result = stored_result(memory_store, "abc123")
+    assert result["is_valid"] is True
+    assert result["issues"] == ["Low coverage"]
+    assert result["bias_check"]["threshold"] == 0.30
+    assert result["comment_coverage"] == coverage
+    assert "grounding" not in result
+
+
+def test_push_stores_run_metrics_and_reports_store_time(memory_store, client, valid_push_input):
+    """The DAG's run summary should be kept with the result, and upload time reported."""
+    run_metrics = {"stages": {"llm": {"wall_seconds": 9.2}}, "wall_seconds": 9.2}
+    response = client.post("/push", json=dict(valid_push_input, run_metrics=run_metrics))
+    
+    assert stored_result(memory_store, "abc123")["metrics"] == run_metrics
+    assert response.headers["Server-Timing"].startswith("store;dur=")
+
+
+def test_push_from_current_run_succeeds(memory_store, client, valid_push_input):
+    """The run whose token is in the placeholder should be able to write, and retry."""
+    start_run(memory_store, "abc123", "run-a")
+    
+    first = client.post("/push", json=dict(valid_push_input, run_token="run-a"))
+    retry = client.post("/push", json=dict(valid_push_input, run_token="run-a"))
+    
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert stored_result(memory_store, "abc123")["run_token"] == "run-a"
+
+
+def test_push_from_superseded_run_is_rejected(memory_store, client, valid_push_input):
+    """A late push from an older run should get 409 and leave the newer result alone."""
+    start_run(memory_store, "abc123", "run-a")
+    start_run(memory_store, "abc123", "run-b")
+    client.post("/push", json=dict(valid_push_input, run_token="run-b", video_summary="Newer summary."))
+    
+    response = client.post("/push", json=dict(valid_push_input, run_token="run-a", video_summary="Older summary."))
+    
+    assert response.status_code == 409
+    result = stored_result(memory_store, "abc123")
+    assert result["run_token"] == "run-b"
+    assert result["data"]["video_summary"] == "Newer summary."
+
+
+def test_push_rejected_when_new_run_starts_mid_write(memory_store, client, valid_push_input):
+    """A run superseded between its token check and its write should still lose."""
+    start_run(memory_store, "abc123", "run-a")
+    get_versioned = memory_store.get_versioned
+    
+    def read_then_retrigger(key):
+        current = get_versioned(key)
+        start_run(memory_store, "abc123", "run-b")
+        return current
+    
+    with patch.object(memory_store, "get_versioned", side_effect=read_then_retrigger):
+        response = client.post("/push", json=dict(valid_push_input, run_token="run-a"))
+    
+    assert response.status_code == 409
+    assert json.loads(memory_store.get("abc123.json"))["run_token"] == "run-b"
+
+
+def test_concurrent_runs_only_latest_lands(memory_store, client, valid_push_input):
+    """Pushes from many overlapping runs should leave exactly the latest run's result."""
+    tokens = [f"run-{i}" for i in range(6)]
+    for token in tokens:
+        start_run(memory_store, "abc123", token)
+    items = [dict(valid_push_input, run_token=t, video_summary=f"Summary from {t}.") for t in tokens] * 3
+    
+    data = client.post("/push/batch", json={"items": items}).json()
+    
+    # Duplicates of the latest run may also lose the generation race to each other
+    pushed_tokens = {item["run_token"] for item, r in zip(items, data["results"]) if r["status"] == "pushed"}
+    assert pushed_tokens == {"run-5"}
+    assert data["pushed"] + data["stale"] == len(items)
+    assert stored_result(memory_store, "abc123")["data"]["video_summary"] == "Summary from run-5."
+
+
+def bulk_item(valid_push_input, generation, summary="Bulk summary."):
+    """A /push/batch item as the DAG's bulk mode sends it."""
+    return dict(valid_push_input, run_token="bulk-run", expected_generation=generation, video_summary=summary)
+
+
+def test_bulk_push_does_not_overwrite_interactive_run_started_after_read(memory_store, client, valid_push_input):
+    """An interactive run triggered after the bulk run read the video keeps its placeholder and its push."""
+    bulk = bulk_item(valid_push_input, generation=0)  # nothing stored when the bulk run started
+    start_run(memory_store, "abc123", "run-a")
+
+    data = client.post("/push/batch", json={"items": [bulk]}).json()
+    assert data["results"][0]["status"] == "stale"
+    assert json.loads(memory_store.get("abc123.json"))["status"] == "processing"
+
+    response = client.post("/push", json=dict(valid_push_input, run_token="run-a", video_summary="Interactive summary."))
+    assert response.status_code == 200
+    assert stored_result(memory_store, "abc123")["data"]["video_summary"] == "Interactive summary."
+
+
+def test_bulk_result_is_fenced_against_older_interactive_run(memory_store, client, valid_push_input):
+    """A bulk result is stored with its token, so a late push from an interactive run it replaced loses."""
+    client.post("/push", json=dict(valid_push_input, run_token="run-a", video_summary="Interactive summary."))
+    _, generation = memory_store.get_versioned("abc123.json")
+
+    data = client.post("/push/batch", json={"items": [bulk_item(valid_push_input, generation)]}).json()
+    response = client.post("/push", json=dict(valid_push_input, run_token="run-a", video_summary="Late summary."))
+
+    assert data["results"][0]["status"] == "pushed"
+    assert response.status_code == 409
+    result = stored_result(memory_store, "abc123")
+    assert result["run_token"] == "bulk-run"
+    assert result["data"]["video_summary"] == "Bulk summary."
+
+
+def test_retried_bulk_push_overwrites_its_own_result(memory_store, client, valid_push_input):
+    """A retried bulk chunk should not be reported stale because of its own earlier write."""
+    items = [bulk_item(valid_push_input, generation=0)]
+
+    first = client.post("/push/batch", json={"items": items}).json()
+    retry = client.post("/push/batch", json={"items": items}).json()
+
+    assert first["pushed"] == 1
+    assert retry["pushed"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Tests for telemetry
+# ---------------------------------------------------------------------------
+
+def read_telemetry(root):
+    import pyarrow.dataset as ds
+    return ds.dataset(str(root), format="parquet", partitioning="hive").to_table().to_pylist()
+
+
+def test_telemetry_group_commits_into_partitions(tmp_path):
+    """Buffered records should land in a few Parquet files under date/hour partitions."""
+    from telemetry import TelemetryWriter
+    writer = TelemetryWriter(str(tmp_path), flush_rows=1000, flush_seconds=60)
+    for i in range(2500):
+        writer.record({"video_id": f"vid{i}", "status": "pushed", "similarity_score": i / 2500})
+    writer.close()
+    
+    rows = read_telemetry(tmp_path)
+    files = [f for _, _, names in os.walk(tmp_path) for f in names]
+    assert len(rows) == 2500
+    assert all(f.endswith(".parquet") and not f.startswith(".") for f in files)
+    assert len(files) <= 3
+    assert os.listdir(tmp_path)[0].startswith("date=")
+
+
+def test_telemetry_buffer_is_bounded(tmp_path):
+    """Records beyond max_buffer_rows should be dropped and counted, not queued."""
+    from telemetry import TelemetryWriter
+    writer = TelemetryWriter(str(tmp_path), flush_rows=1000, flush_seconds=60, max_buffer_rows=10)
+    for i in range(15):
+        writer.record({"video_id": f"vid{i}"})
+    
+    stats = writer.stats()
+    writer.close()
+    assert stats["buffered"] == 10
+    assert stats["dropped"] == 5
+
+
+def test_push_records_telemetry(mock_gcs, client, valid_push_input, tmp_path):
+    """A successful push should record its scores, issues and timings."""
+    from telemetry import TelemetryWriter
+    writer = TelemetryWriter(str(tmp_path), flush_seconds=60)
+    valid_push_input["stage_timings"] = {"llm": 12.5, "validate": 0.4}
+    valid_push_input["token_counts"] = {"generated": 210}
+    
+    with patch("main.telemetry_writer", writer):
+        client.post("/push", json=valid_push_input)
+    writer.close()
+    
+    row, = read_telemetry(tmp_path)
+    assert row["status"] == "pushed"
+    assert row["similarity_score"] == 0.75
+    assert dict(row["stage_timings"]) == {"llm": 12.5, "validate": 0.4}
+    assert dict(row["token_counts"]) == {"generated": 210}
+
+
+def test_telemetry_endpoint_records_discarded_runs(client, valid_push_input, tmp_path):
+    """POST /telemetry should record an invalid run without writing a result."""
+    from telemetry import TelemetryWriter
+    writer = TelemetryWriter(str(tmp_path), flush_seconds=60)
+    valid_push_input["is_valid"] = False
+    valid_push_input["issues"] = ["Video summary is too short."]
+    
+    with patch("main.telemetry_writer", writer):
+        response = client.post("/telemetry", json=valid_push_input)
+    writer.close()
+    
+    assert response.json() == {"recorded": True}
+    row, = read_telemetry(tmp_path)
+    assert row["status"] == "discarded"
+    assert row["issues"] == ["Video summary is too short."]
+    assert row["num_issues"] == 1
@@ -8,8 +8,9 @@ import sys
 # Path setup (must come before importing service code)
 # ---------------------------------------------------------------------------
 
-# Add read service directory to Python path
+# Add read service and shared package directories to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "read_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
 
 import pytest
 from fastapi.testclient import TestClient
@@ -90,6 +91,30 @@ class TestExtractVideoId:
         url = "https://www.youtube.com/watch"
         assert extract_video_id(url) is None
 
+    def test_other_youtube_hosts_and_paths(self):
+        """Should extract ID from shorts, live, mobile, music and no-cookie links."""
+        for url in [
+            "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+            "https://www.youtube.com/live/dQw4w9WgXcQ?si=abc",
+            "https://m.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+            "https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RD",
+            "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+            "HTTPS://WWW.YouTube.com/watch?v=dQw4w9WgXcQ",
+            "  https://youtu.be/dQw4w9WgXcQ\n",
+        ]:
+            assert extract_video_id(url) == "dQw4w9WgXcQ", url
+
+    def test_rejects_malformed_ids_and_lookalike_hosts(self):
+        """IDs must be exactly 11 characters, on a real YouTube host."""
+        for url in [
+            "https://youtu.be/dQw4w9WgXc",
+            "https://youtu.be/dQw4w9WgXcQQ",
+            "https://www.youtube.com/watch?v=dQw4w9WgX!Q",
+            "https://youtube.com.evil.example/watch?v=dQw4w9WgXcQ",
+            "https://evil.example/youtu.be/dQw4w9WgXcQ",
+        ]:
+            assert extract_video_id(url) is None, url
+
 
 # ---------------------------------------------------------------------------
 # Tests for /read endpoint - success cases
@@ -97,27 +122,35 @@ class TestExtractVideoId:
 
 def test_read_extracts_video_id_from_youtu_be(client):
     """POST /read with youtu.be link should return extracted video_id."""
-    response = client.post("/read", json={"video_link": "https://youtu.be/abc123XYZ"})
+    response = client.post("/read", json={"video_link": "https://youtu.be/abc123XYZ_0"})
     
     assert response.status_code == 200
     data = response.json()
-    assert data["video_id"] == "abc123XYZ"
-    assert data["original_link"] == "https://youtu.be/abc123XYZ"
+    assert data["video_id"] == "abc123XYZ_0"
+    assert data["original_link"] == "https://youtu.be/abc123XYZ_0"
 
 
 def test_read_extracts_video_id_from_watch_url(client):
     """POST /read with youtube.com/watch link should return extracted video_id."""
-    response = client.post("/read", json={"video_link": "https://www.youtube.com/watch?v=abc123XYZ"})
+    response = client.post("/read", json={"video_link": "https://www.youtube.com/watch?v=abc123XYZ_0"})
     
     assert response.status_code == 200
     data = response.json()
-    assert data["video_id"] == "abc123XYZ"
-    assert data["original_link"] == "https://www.youtube.com/watch?v=abc123XYZ"
+    assert data["video_id"] == "abc123XYZ_0"
+    assert data["original_link"] == "https://www.youtube.com/watch?v=abc123XYZ_0"
+
+
+def test_read_returns_canonical_link(client):
+    """POST /read should map every link variant to one canonical URL."""
+    response = client.post("/read", json={"video_link": "https://m.youtube.com/shorts/dQw4w9WgXcQ?si=x"})
+
+    assert response.status_code == 200
+    assert response.json()["canonical_link"] == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
 
 
 def test_read_preserves_original_link(client):
     """POST /read should return the original link unchanged."""
-    original = "https://youtu.be/testVideo123"
+    original = "https://youtu.be/testVideo12"
     response = client.post("/read", json={"video_link": original})
     
     assert response.status_code == 200
@@ -148,3 +181,197 @@ def test_read_empty_string_returns_400(client):
     response = client.post("/read", json={"video_link": ""})
     
     assert response.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# Tests for /read/batch endpoint
+# ---------------------------------------------------------------------------
+
+def test_read_batch_reports_invalid_links_per_item(client):
+    """POST /read/batch should keep order and not fail the batch on a bad link."""
+    links = ["https://youtu.be/dQw4w9WgXcQ", "https://vimeo.com/123456", "https://www.youtube.com/watch?v=HAnw168huqA"]
+    response = client.post("/read/batch", json={"items": [{"video_link": link} for link in links]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["video_id"] for r in data["results"]] == ["dQw4w9WgXcQ", None, "HAnw168huqA"]
+    assert [r["original_link"] for r in data["results"]] == links
+    assert data["results"][1]["error"]
+    assert (data["valid"], data["invalid"]) == (2, 1)
+
+
+def test_read_batch_too_large_returns_400(client, monkeypatch):
+    """POST /read/batch over READ_BATCH_MAX_ITEMS should be rejected."""
+    import main
+    monkeypatch.setattr(main, "READ_BATCH_MAX_ITEMS", 2)
+    response = client.post("/read/batch", json={"items": [{"video_link": "https://youtu.be/dQw4w9WgXcQ"}] * 3})
+
+    assert response.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# Tests for playlist/channel expansion
+# ---------------------------------------------------------------------------
+
+import json
+
+from expander import PlaylistExpander, parse_collection_link
+
+
+def make_video_id(i):
+    return f"vid{i:08d}"
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeDataAPI:
+    """Serves playlistItems/channels like the Data API, 50 items per page."""
+
+    def __init__(self, playlists, handles=None):
+        self.playlists = playlists
+        self.handles = handles or {}
+        self.private = set()
+        self.calls = []
+
+    def get(self, url, params, timeout):
+        self.calls.append((url.rsplit("/", 1)[-1], params))
+        if url.endswith("/channels"):
+            uploads = self.handles.get(params.get("forHandle"))
+            return FakeResponse({"items": [{"contentDetails": {"relatedPlaylists": {"uploads": uploads}}}]} if uploads else {})
+        ids = self.playlists.get(params["playlistId"])
+        if ids is None:
+            return FakeResponse({}, status_code=404)
+        start = int(params.get("pageToken") or 0)
+        page = {"items": [{"contentDetails": {"videoId": v}, "status": {"privacyStatus": "private" if v in self.private else "public"}} for v in ids[start:start + 50]]}
+        if start + 50 < len(ids):
+            page["nextPageToken"] = str(start + 50)
+        return FakeResponse(page)
+
+
+@pytest.fixture
+def data_api():
+    return FakeDataAPI(
+        {"PLbig": [make_video_id(i) for i in range(120)], "UUchannel000000000000000": [make_video_id(1)]},
+        handles={"@vidsynth": "UUhandle"},
+    )
+
+
+@pytest.fixture
+def expander(data_api):
+    return PlaylistExpander("fake_key", session=data_api, prefetch_workers=2)
+
+
+def test_parse_collection_link():
+    """Playlist, channel and video links should be told apart."""
+    assert parse_collection_link("https://www.youtube.com/playlist?list=PLbig") == ("playlist", "PLbig")
+    assert parse_collection_link("https://youtube.com/watch?v=dQw4w9WgXcQ&list=PLbig&index=2") == ("video", "dQw4w9WgXcQ")
+    assert parse_collection_link("https://www.youtube.com/channel/UCchannel000000000000000/videos") == ("channel", "UCchannel000000000000000")
+    assert parse_collection_link("https://www.youtube.com/@vidsynth") == ("handle", "@vidsynth")
+    assert parse_collection_link("https://youtu.be/dQw4w9WgXcQ") == ("video", "dQw4w9WgXcQ")
+    assert parse_collection_link("https://vimeo.com/123456") is None
+
+
+def test_expand_playlist_pages_in_order(expander, data_api):
+    """All pages should be streamed in order, skipping repeats and private videos."""
+    data_api.playlists["PLbig"][10] = make_video_id(3)
+    data_api.private.add(make_video_id(20))
+
+    ids = list(expander.expand("https://www.youtube.com/playlist?list=PLbig"))
+
+    assert len(ids) == 118
+    assert make_video_id(20) not in ids
+    assert ids[:3] == [make_video_id(0), make_video_id(1), make_video_id(2)]
+    assert ids[-1] == make_video_id(119)
+    assert len(data_api.calls) == 3
+
+
+def test_expand_stops_at_max_items(expander, data_api):
+    """No page past the one holding the last wanted video should be requested."""
+    ids = list(expander.expand("https://www.youtube.com/playlist?list=PLbig", max_items=30))
+
+    assert ids == [make_video_id(i) for i in range(30)]
+    assert len(data_api.calls) == 1
+
+
+def test_expansion_cache_saves_api_calls(expander, data_api):
+    """A playlist expanded before should be served without calling the API."""
+    list(expander.expand("https://www.youtube.com/playlist?list=PLbig"))
+    calls = len(data_api.calls)
+
+    again = list(expander.expand("https://m.youtube.com/playlist?list=PLbig", max_items=10))
+
+    assert again == [make_video_id(i) for i in range(10)]
+    assert len(data_api.calls) == calls
+
+
+def test_expand_channel_uses_uploads_playlist(expander, data_api):
+    """Channel ids map straight to their uploads playlist; handles are looked up once."""
+    assert list(expander.expand("https://www.youtube.com/channel/UCchannel000000000000000")) == [make_video_id(1)]
+    assert [name for name, _ in data_api.calls] == ["playlistItems"]
+
+    data_api.playlists["UUhandle"] = [make_video_id(7)]
+    assert list(expander.expand("https://www.youtube.com/@vidsynth")) == [make_video_id(7)]
+    assert [name for name, _ in data_api.calls][1:] == ["channels", "playlistItems"]
+
+
+def test_uploads_lookups_are_bounded(data_api):
+    """Only the most recent handle lookups should be kept."""
+    data_api.handles["@other"] = "UUother"
+    data_api.playlists.update({"UUhandle": [make_video_id(7)], "UUother": [make_video_id(8)]})
+    expander = PlaylistExpander("fake_key", session=data_api, prefetch_workers=2, uploads_cache_size=1)
+
+    for link in ("https://www.youtube.com/@vidsynth", "https://www.youtube.com/@other", "https://www.youtube.com/@vidsynth"):
+        expander.resolve(link)
+
+    assert [name for name, _ in data_api.calls] == ["channels"] * 3
+    assert expander.api_calls == 3
+
+
+def test_not_found_names_the_requested_resource():
+    """A 404 on a channel lookup should name the channel, not a playlist."""
+    from expander import ExpansionError
+
+    class NotFound:
+        def get(self, url, params, timeout):
+            return FakeResponse({}, status_code=404)
+
+    expander = PlaylistExpander("fake_key", session=NotFound(), prefetch_workers=1)
+
+    with pytest.raises(ExpansionError, match="Channel not found: @gone"):
+        expander.resolve("https://www.youtube.com/@gone")
+    with pytest.raises(ExpansionError, match="Playlist not found: PLgone"):
+        list(expander.expand("https://www.youtube.com/playlist?list=PLgone"))
+
+
+def test_expand_endpoint_streams_ndjson(client, expander, monkeypatch):
+    """POST /expand should stream one JSON line per video, then a summary line."""
+    import main
+    monkeypatch.setattr(main, "get_expander", lambda: expander)
+
+    response = client.post("/expand", json={"video_link": "https://www.youtube.com/playlist?list=PLbig", "max_items": 60})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(lines) == 61
+    assert lines[0] == {"video_id": make_video_id(0), "canonical_link": f"https://www.youtube.com/watch?v={make_video_id(0)}"}
+    assert lines[-1] == {"count": 60, "limit_reached": True}
+
+
+def test_expand_endpoint_errors(client, expander, monkeypatch):
+    """Unknown playlists should be 404 and unsupported links 400, before any streaming."""
+    import main
+    monkeypatch.setattr(main, "get_expander", lambda: expander)
+
+    assert client.post("/expand", json={"video_link": "https://www.youtube.com/playlist?list=PLmissing"}).status_code == 404
+    assert client.post("/expand", json={"video_link": "https://vimeo.com/123456"}).status_code == 400
@@ -0,0 +1,272 @@
+"""
+Conformance and performance tests for the result store backends
+(common/vidsynth_common/result_store.py, used by push_service and gateway_service).
+Every test runs against every backend.
+"""
+import itertools
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
+
+import pytest
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+from vidsynth_common import result_store
+
+
+# ---------------------------------------------------------------------------
+# In-memory stand-in for a GCS bucket (just the calls GCSResultStore makes)
+# ---------------------------------------------------------------------------
+
+class FakeBlob:
+    def __init__(self, client, name):
+        self.objects = client.objects
+        self.client = client
+        self.name = name
+        self.content_encoding = None
+        self.generation = None
+
+    def upload_from_string(self, data, content_type=None, if_generation_match=None):
+        with self.client.lock:
+            current = self.objects.get(self.name, (None, 0))[1]
+            if if_generation_match is not None and current != if_generation_match:
+                raise PreconditionFailed(self.name)
+            self.generation = next(self.client.generations)
+            self.objects[self.name] = (bytes(data), self.generation)
+
+    def download_as_bytes(self, raw_download=False):
+        if self.name not in self.objects:
+            raise NotFound(self.name)
+        data, self.generation = self.objects[self.name]
+        return data
+
+    def exists(self):
+        return self.name in self.objects
+
+    def delete(self):
+        if self.objects.pop(self.name, None) is None:
+            raise NotFound(self.name)
+
+
+class FakeClient:
+    def __init__(self):
+        self.objects = {}
+        self.generations = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def bucket(self, name):
+        client = self
+
+        class Bucket:
+            def blob(self, key):
+                return FakeBlob(client, key)
+
+        return Bucket()
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def module():
+    return result_store
+
+
+@pytest.fixture(params=["memory", "local", "gcs"])
+def store(request, module, tmp_path):
+    if request.param == "memory":
+        return module.MemoryResultStore()
+    if request.param == "local":
+        return module.LocalFSResultStore(str(tmp_path / "results"))
+    return module.GCSResultStore("vidsynth-results", client=FakeClient())
+
+
+# ---------------------------------------------------------------------------
+# Conformance
+# ---------------------------------------------------------------------------
+
+def test_get_missing_returns_none(store):
+    """Reading an object that was never written should return None."""
+    assert store.get("missing.json") is None
+    assert store.exists("missing.json") is False
+
+
+def test_put_then_get_round_trips_bytes(store):
+    """Stored bytes should come back unchanged, including binary data."""
+    data = b"\x1f\x8b\x08\x00binary\x00payload"
+    store.put("abc123.json", data, content_encoding="gzip")
+
+    assert store.get("abc123.json") == data
+    assert store.exists("abc123.json") is True
+
+
+def test_put_replaces_existing_object(store):
+    """A second put should overwrite the first."""
+    store.put("abc123.json", b'{"status": "processing"}')
+    store.put("abc123.json", b'{"status": "ready"}')
+
+    assert store.get("abc123.json") == b'{"status": "ready"}'
+
+
+def test_delete_reports_whether_object_existed(store):
+    """delete should remove the object and say whether there was one."""
+    store.put("abc123.json", b"{}")
+
+    assert store.delete("abc123.json") is True
+    assert store.delete("abc123.json") is False
+    assert store.get("abc123.json") is None
+
+
+def test_keys_are_independent(store):
+    """Objects under different keys should not interfere."""
+    for i in range(20):
+        store.put(f"vid{i}.json", str(i).encode())
+
+    assert [store.get(f"vid{i}.json") for i in range(20)] == [str(i).encode() for i in range(20)]
+
+
+def test_create_result_store_selects_backend(module, tmp_path):
+    """The factory should build the configured backend and reject unknown ones."""
+    assert isinstance(module.create_result_store("memory"), module.MemoryResultStore)
+    assert isinstance(module.create_result_store("local", path=str(tmp_path)), module.LocalFSResultStore)
+    assert isinstance(module.create_result_store("gcs"), module.GCSResultStore)
+    with pytest.raises(ValueError):
+        module.create_result_store("local")
+    with pytest.raises(ValueError):
+        module.create_result_store("s3")
+
+
+def test_put_returns_changing_generations(store):
+    """Every write should produce a new generation, visible to readers."""
+    first = store.put("abc123.json", b"1")
+    second = store.put("abc123.json", b"2")
+
+    assert first != second
+    assert store.get_versioned("abc123.json") == (b"2", second)
+
+
+def test_conditional_put_rejects_stale_generation(store, module):
+    """A write conditioned on an old generation should fail and change nothing."""
+    first = store.put("abc123.json", b"old")
+    store.put("abc123.json", b"new")
+
+    with pytest.raises(module.StaleWriteError):
+        store.put("abc123.json", b"late", if_generation_match=first)
+    assert store.get("abc123.json") == b"new"
+
+
+def test_generation_zero_means_create_only(store, module):
+    """if_generation_match=0 should only write when the object does not exist."""
+    store.put("abc123.json", b"first", if_generation_match=0)
+
+    with pytest.raises(module.StaleWriteError):
+        store.put("abc123.json", b"second", if_generation_match=0)
+    assert store.get("abc123.json") == b"first"
+
+
+def test_concurrent_conditional_writes_have_one_winner(store, module):
+    """Of many writers racing from the same generation, exactly one should succeed."""
+    generation = store.put("abc123.json", b"base")
+    barrier = threading.Barrier(8)
+    outcomes = []
+
+    def writer(i):
+        barrier.wait()
+        try:
+            store.put("abc123.json", f"writer{i}".encode(), if_generation_match=generation)
+            outcomes.append(i)
+        except module.StaleWriteError:
+            pass
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(outcomes) == 1
+    assert store.get("abc123.json") == f"writer{outcomes[0]}".encode()
+
+
+# ---------------------------------------------------------------------------
+# Local filesystem specifics
+# ---------------------------------------------------------------------------
+
+def test_local_store_shards_keys(module, tmp_path):
+    """Objects should spread across two levels of shard directories."""
+    store = module.LocalFSResultStore(str(tmp_path), shard_depth=2)
+    for i in range(200):
+        store.put(f"vid{i}.json", b"{}")
+
+    top_level = [d for d in os.listdir(tmp_path) if os.path.isdir(tmp_path / d)]
+    path = store.path("vid0.json")
+    assert len(top_level) > 50
+    assert os.path.relpath(path, tmp_path).count(os.sep) == 2
+
+
+def test_local_store_rejects_path_traversal(module, tmp_path):
+    """Keys must not escape the store root."""
+    store = module.LocalFSResultStore(str(tmp_path))
+    for key in ["../escape.json", "a/b.json", ".hidden", ""]:
+        with pytest.raises(ValueError):
+            store.put(key, b"{}")
+
+
+def test_local_store_leaves_no_temp_files(module, tmp_path):
+    """Atomic writes should not leave temporary files behind."""
+    store = module.LocalFSResultStore(str(tmp_path), fsync=True)
+    store.put("abc123.json", b"{}")
+    store.put("abc123.json", b"[]")
+
+    leftovers = [f for _, _, files in os.walk(tmp_path) for f in files if f.startswith(".tmp-")]
+    assert leftovers == []
+
+
+# ---------------------------------------------------------------------------
+# Performance and concurrency
+# ---------------------------------------------------------------------------
+
+def test_concurrent_writers_never_expose_partial_objects(module, tmp_path):
+    """Readers racing writers on one key should only see complete objects."""
+    store = module.LocalFSResultStore(str(tmp_path))
+    payloads = [bytes([i]) * 256 * 1024 for i in range(4)]
+    store.put("hot.json", payloads[0])
+    stop = threading.Event()
+    torn = []
+
+    def writer(payload):
+        while not stop.is_set():
+            store.put("hot.json", payload)
+
+    def reader():
+        while not stop.is_set():
+            data = store.get("hot.json")
+            if data not in payloads:
+                torn.append(len(data))
+
+    threads = [threading.Thread(target=writer, args=(p,)) for p in payloads] + [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    time.sleep(0.5)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    assert torn == []
+
+
+def test_stores_sustain_bulk_traffic(store):
+    """A few thousand small writes and reads should finish well within a second or two."""
+    data = b'{"status": "ready", "data": {"video_summary": "' + b"x" * 1500 + b'"}}'
+    start = time.perf_counter()
+    for i in range(2000):
+        store.put(f"vid{i}.json", data)
+    for i in range(2000):
+        assert store.get(f"vid{i}.json") == data
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 10
@@ -0,0 +1,99 @@
+"""
+Tests for the per-stage instrumentation (common/vidsynth_common/stage_metrics.py).
+"""
+import json
+import os
+import socket
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
+
+from vidsynth_common.stage_metrics import (
+    FileMetricsClient, NullMetricsClient, RunMetrics, StatsDClient,
+    create_metrics_client, parse_server_timing, stage_record
+)
+
+
+class ListClient:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, stage, record):
+        self.sent.append((stage, record))
+
+
+def test_parse_server_timing():
+    """Server-Timing entries with a duration should be read as milliseconds."""
+    header = 'tgi;dur=8010.2, app;desc="handler";dur=8123.4, cache'
+
+    assert parse_server_timing(header) == {"tgi": 8010.2, "app": 8123.4}
+    assert parse_server_timing(None) == {}
+
+
+def test_run_summary_adds_up_stages():
+    """The run summary should total time, retries and bytes across stages."""
+    client = ListClient()
+    metrics = RunMetrics()
+    metrics.record("read", stage_record(0.2, http_seconds=0.15, request_bytes=60, response_bytes=120), client)
+    metrics.record("llm", stage_record(9.0, http_seconds=8.9, retries=1, request_bytes=40000, response_bytes=41000, server={"tgi": 8700.0}), client)
+
+    summary = metrics.summary()
+
+    assert summary["wall_seconds"] == pytest.approx(9.2)
+    assert summary["http_seconds"] == pytest.approx(9.05)
+    assert summary["retries"] == 1
+    assert summary["request_bytes"] == 40060
+    assert summary["stages"]["llm"]["server"] == {"tgi": 8700.0}
+    assert metrics.stage_timings() == {"read": 0.2, "llm": 9.0}
+    assert [stage for stage, _ in client.sent] == ["read", "llm"]
+
+
+def test_run_metrics_resume_from_summary():
+    """A later task should continue the summary carried on its input payload."""
+    first = RunMetrics()
+    first.record("read", stage_record(0.2), NullMetricsClient())
+    carried = json.loads(json.dumps(first.summary()))
+
+    second = RunMetrics(carried)
+    second.record("preprocess", stage_record(1.5), NullMetricsClient())
+
+    assert list(second.summary()["stages"]) == ["read", "preprocess"]
+
+
+def test_statsd_client_sends_timers_and_counters():
+    """Records should arrive as StatsD lines over UDP."""
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(2)
+    client = StatsDClient("127.0.0.1", receiver.getsockname()[1], prefix="test")
+
+    client.send("llm", stage_record(2.5, http_seconds=2.4, retries=2, request_bytes=100, response_bytes=200, server={"tgi": 2300.0}))
+    lines = receiver.recv(65536).decode().splitlines()
+    receiver.close()
+
+    assert "test.stage.llm.wall:2500.000|ms" in lines
+    assert "test.stage.llm.retries:2|c" in lines
+    assert "test.stage.llm.request_bytes:100|h" in lines
+    assert "test.stage.llm.server.tgi:2300.000|ms" in lines
+
+
+def test_file_client_writes_json_lines(tmp_path):
+    """The local stand-in should append one JSON record per call."""
+    path = tmp_path / "metrics" / "stages.jsonl"
+    client = create_metrics_client(f"file://{path}")
+    client.send("read", stage_record(0.1))
+    client.send("push", stage_record(0.3, error=True))
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert isinstance(client, FileMetricsClient)
+    assert [(r["stage"], r["error"]) for r in records] == [("read", False), ("push", True)]
+
+
+def test_create_metrics_client_backends():
+    """Unset means no-op; unknown schemes are rejected."""
+    assert isinstance(create_metrics_client(None), NullMetricsClient)
+    assert isinstance(create_metrics_client("statsd://localhost:9125"), StatsDClient)
+    with pytest.raises(ValueError):
+        create_metrics_client("prometheus://localhost")
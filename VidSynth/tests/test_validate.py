@@ -1,6 +1,7 @@
 """
 Tests for the validate service.
 """
+import json
 import os
 import sys
 
@@ -11,9 +12,11 @@ import sys
 # Disable bias check by default for most tests (avoids loading heavy ML model)
 os.environ["ENABLE_BIAS_CHECK"] = "false"
 
-# Add validate service directory to Python path
+# Add validate service and shared package directories to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "validate_service"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "common"))
 
+import numpy as np
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
@@ -321,6 +324,68 @@ class TestValidateWithBiasCheck:
             assert "threshold" in data["bias_check"]
 
 
+# ---------------------------------------------------------------------------
+# Tests for /validate/batch endpoint
+# ---------------------------------------------------------------------------
+
+class TestValidateBatch:
+    """Tests for batched validation."""
+    
+    def test_validate_batch_returns_result_per_item(self, valid_llm_output):
+        """POST /validate/batch should validate every item independently."""
+        import importlib
+        import main
+        importlib.reload(main)
+        main.ENABLE_BIAS_CHECK = False
+        
+        short = dict(valid_llm_output, video_id="short1", video_summary="Too short.")
+        
+        client = TestClient(main.app)
+        response = client.post("/validate/batch", json={"items": [valid_llm_output, short]})
+        
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["video_id"] for r in results] == ["abc123", "short1"]
+        assert results[0]["is_valid"] == True
+        assert results[1]["is_valid"] == False
+        assert "Video summary is too short." in results[1]["issues"]
+    
+    def test_validate_batch_uses_single_bias_call(self, valid_llm_output):
+        """Bias checks for the batch should go through one check_bias_many call."""
+        import importlib
+        import main
+        importlib.reload(main)
+        main.ENABLE_BIAS_CHECK = True
+        
+        second = dict(valid_llm_output, video_id="def456")
+        
+        with patch.object(main, "get_bias_monitor") as mock_get:
+            mock_monitor = MagicMock()
+            mock_get.return_value = mock_monitor
+            mock_monitor.check_bias_many.return_value = [
+                {"similarity_score": 0.80, "is_biased": False, "threshold": 0.30},
+                {"similarity_score": 0.10, "is_biased": True, "threshold": 0.30},
+            ]
+            
+            client = TestClient(main.app)
+            response = client.post("/validate/batch", json={"items": [valid_llm_output, second]})
+            
+            assert response.status_code == 200
+            mock_monitor.check_bias_many.assert_called_once()
+            mock_monitor.check_bias.assert_not_called()
+            results = response.json()["results"]
+            assert results[0]["is_valid"] == True
+            assert results[1]["is_valid"] == False
+            assert results[1]["bias_check"]["similarity_score"] == 0.10
+    
+    def test_validate_batch_empty_items(self, client):
+        """POST /validate/batch with no items should return no results."""
+        response = client.post("/validate/batch", json={"items": []})
+        
+        assert response.status_code == 200
+        assert response.json() == {"results": []}
+
+
 # ---------------------------------------------------------------------------
 # Tests for BiasMonitor class
 # ---------------------------------------------------------------------------
@@ -334,10 +399,11 @@ class TestBiasMonitor:
         mock_model = MagicMock()
         mock_transformer.return_value = mock_model
         
-        # Mock embeddings that will produce high similarity
-        mock_model.encode.side_effect = [
-            [[1.0, 0.0, 0.0]],  # title embedding
-            [[0.9, 0.1, 0.0]]   # summary embedding (similar)
+        # Mock embeddings that will produce high similarity (title and summary
+        # are encoded together in one batch)
+        mock_model.encode.return_value = [
+            [1.0, 0.0, 0.0],  # title embedding
+            [0.9, 0.1, 0.0]   # summary embedding (similar)
         ]
         
         from bias_monitor import BiasMonitor
@@ -358,9 +424,9 @@ class TestBiasMonitor:
         mock_transformer.return_value = mock_model
         
         # Mock embeddings that will produce low similarity
-        mock_model.encode.side_effect = [
-            [[1.0, 0.0, 0.0]],  # title embedding
-            [[0.0, 1.0, 0.0]]   # summary embedding (orthogonal = 0 similarity)
+        mock_model.encode.return_value = [
+            [1.0, 0.0, 0.0],  # title embedding
+            [0.0, 1.0, 0.0]   # summary embedding (orthogonal = 0 similarity)
         ]
         
         from bias_monitor import BiasMonitor
@@ -426,6 +492,78 @@ class TestBiasMonitor:
         assert result["summary_type"] == "skipped"
         assert result["skip_reason"] == "Placeholder message"
     
+    @patch("bias_monitor.SentenceTransformer")
+    def test_check_bias_encodes_title_and_summary_in_one_pass(self, mock_transformer):
+        """check_bias should run a single encoder pass for both texts."""
+        mock_model = MagicMock()
+        mock_transformer.return_value = mock_model
+        mock_model.encode.return_value = [[1.0, 0.0], [1.0, 0.0]]
+        
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor()
+        
+        monitor.check_bias(video_title="Title", generated_summary="A summary about the title.")
+        
+        mock_model.encode.assert_called_once()
+        assert mock_model.encode.call_args.args[0] == ["Title", "A summary about the title."]
+    
+    @patch("bias_monitor.SentenceTransformer")
+    def test_check_bias_many_scores_batch_in_order(self, mock_transformer):
+        """check_bias_many should encode unique texts once and keep input order."""
+        mock_model = MagicMock()
+        mock_transformer.return_value = mock_model
+        # Unique texts in order: title A, title B, summary 1, summary 2, summary 3
+        mock_model.encode.return_value = [
+            [1.0, 0.0],
+            [0.0, 1.0],
+            [2.0, 0.0],   # same direction as A (not unit length)
+            [0.0, 3.0],   # same direction as B
+            [0.0, 1.0],   # orthogonal to A
+        ]
+        
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor(bias_threshold=0.30)
+        
+        results = monitor.check_bias_many(
+            ["Title A", "Title B", "Title A", "Title B"],
+            ["Summary one", "Summary two", "Summary three", ""]
+        )
+        
+        mock_model.encode.assert_called_once()
+        assert mock_model.encode.call_args.args[0] == [
+            "Title A", "Title B", "Summary one", "Summary two", "Summary three"
+        ]
+        assert results[0]["similarity_score"] == pytest.approx(1.0)
+        assert results[1]["similarity_score"] == pytest.approx(1.0)
+        assert results[2]["similarity_score"] == pytest.approx(0.0)
+        assert results[2]["is_biased"] == True
+        assert results[3]["error_reason"] == "Empty summary"
+    
+    @patch("bias_monitor.SentenceTransformer")
+    def test_check_bias_many_skips_encoder_when_nothing_to_score(self, mock_transformer):
+        """Batches made only of skipped items should not touch the model."""
+        mock_model = MagicMock()
+        mock_transformer.return_value = mock_model
+        
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor()
+        
+        results = monitor.check_bias_many(["", "Title"], ["Summary", "No transcript available"])
+        
+        assert [r["summary_type"] for r in results] == ["skipped", "skipped"]
+        mock_model.encode.assert_not_called()
+    
+    @patch("bias_monitor.SentenceTransformer")
+    def test_check_bias_many_rejects_mismatched_lengths(self, mock_transformer):
+        """check_bias_many should reject misaligned inputs."""
+        mock_transformer.return_value = MagicMock()
+        
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor()
+        
+        with pytest.raises(ValueError):
+            monitor.check_bias_many(["a", "b"], ["only one"])
+    
     @patch("bias_monitor.SentenceTransformer")
     def test_update_threshold_changes_threshold(self, mock_transformer):
         """update_threshold should update the bias_threshold value."""
@@ -451,3 +589,943 @@ class TestBiasMonitor:
         
         with pytest.raises(ValueError):
             monitor.update_threshold(-0.1)
+
+
+# ---------------------------------------------------------------------------
+# Tests for EmbeddingCache
+# ---------------------------------------------------------------------------
+
+class TestEmbeddingCache:
+    """Unit tests for the embedding cache."""
+    
+    def test_lru_evicts_oldest_entry(self):
+        """The in-memory LRU should stay within max_entries."""
+        import numpy as np
+        from bias_monitor import EmbeddingCache
+        cache = EmbeddingCache("model", max_entries=2)
+        
+        cache.put_many(["a", "b"], np.eye(2, dtype=np.float32))
+        cache.get_many(["a"])  # touch "a" so "b" is the oldest
+        cache.put_many(["c"], np.ones((1, 2), dtype=np.float32))
+        
+        found = cache.get_many(["a", "b", "c"])
+        assert found[0] is not None
+        assert found[1] is None
+        assert found[2] is not None
+    
+    def test_keys_depend_on_model_name(self):
+        """The same text under different models should not collide."""
+        from bias_monitor import EmbeddingCache
+        
+        assert EmbeddingCache("model-a").key("text") != EmbeddingCache("model-b").key("text")
+    
+    def test_stats_report_hit_rate(self):
+        """stats() should count hits and misses."""
+        import numpy as np
+        from bias_monitor import EmbeddingCache
+        cache = EmbeddingCache("model")
+        
+        cache.get_many(["a"])
+        cache.put_many(["a"], np.ones((1, 3), dtype=np.float32))
+        cache.get_many(["a", "a", "a"])
+        
+        stats = cache.stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.75)
+    
+    def test_disk_store_survives_restart(self, tmp_path):
+        """A new cache over the same directory should serve stored embeddings."""
+        import numpy as np
+        from bias_monitor import EmbeddingCache
+        vectors = np.array([[0.6, 0.8], [1.0, 0.0]], dtype=np.float32)
+        
+        first = EmbeddingCache("model", disk_dir=str(tmp_path))
+        first.put_many(["title", "summary"], vectors)
+        
+        second = EmbeddingCache("model", disk_dir=str(tmp_path))
+        found = second.get_many(["summary", "title", "unknown"])
+        
+        assert np.allclose(found[0], vectors[1], atol=1e-3)
+        assert np.allclose(found[1], vectors[0], atol=1e-3)
+        assert found[2] is None
+        assert second.stats()["disk_hits"] == 2
+    
+    def test_disk_store_serves_rows_appended_after_startup(self, tmp_path):
+        """Rows written after the store was mapped should still be readable."""
+        import numpy as np
+        from bias_monitor import EmbeddingCache
+        cache = EmbeddingCache("model", max_entries=1, disk_dir=str(tmp_path))
+        
+        cache.put_many(["a"], np.array([[1.0, 0.0]], dtype=np.float32))
+        cache.put_many(["b"], np.array([[0.0, 1.0]], dtype=np.float32))  # evicts "a" from memory
+        
+        found = cache.get_many(["a"])
+        assert np.allclose(found[0], [1.0, 0.0])
+        assert cache.stats()["disk_hits"] == 1
+    
+    def test_disk_store_shared_between_processes(self, tmp_path):
+        """Caches over one directory (one per worker) should not overwrite each other's rows."""
+        import numpy as np
+        from bias_monitor import EmbeddingCache
+        first = EmbeddingCache("model", max_entries=1, disk_dir=str(tmp_path))
+        second = EmbeddingCache("model", max_entries=1, disk_dir=str(tmp_path))
+        
+        first.put_many(["a"], np.array([[1.0, 0.0]], dtype=np.float32))
+        second.put_many(["b"], np.array([[0.0, 1.0]], dtype=np.float32))
+        first.put_many(["c", "b"], np.array([[0.6, 0.8], [0.0, 1.0]], dtype=np.float32))
+        
+        assert first.stats()["disk_entries"] == 3
+        assert (tmp_path / "model" / "keys.txt").read_text().count("\n") == 3
+        restarted = EmbeddingCache("model", disk_dir=str(tmp_path))
+        found = restarted.get_many(["a", "b", "c"])
+        assert np.allclose(found[0], [1.0, 0.0])
+        assert np.allclose(found[1], [0.0, 1.0])
+        assert np.allclose(found[2], [0.6, 0.8], atol=1e-3)
+    
+    def test_disk_store_repairs_interrupted_append(self, tmp_path):
+        """A vectors row written without its key should be dropped, not shift later rows."""
+        import numpy as np
+        from bias_monitor import EmbeddingCache
+        cache = EmbeddingCache("model", disk_dir=str(tmp_path))
+        cache.put_many(["a"], np.array([[1.0, 0.0]], dtype=np.float32))
+        with open(tmp_path / "model" / "vectors.f16", "ab") as f:
+            f.write(np.zeros(2, dtype=np.float16).tobytes())
+        
+        restarted = EmbeddingCache("model", max_entries=1, disk_dir=str(tmp_path))
+        restarted.put_many(["b"], np.array([[0.0, 1.0]], dtype=np.float32))
+        restarted.put_many(["c"], np.array([[0.6, 0.8]], dtype=np.float32))  # evicts "b" from memory
+        
+        found = restarted.get_many(["a", "b"])
+        assert np.allclose(found[0], [1.0, 0.0])
+        assert np.allclose(found[1], [0.0, 1.0])
+    
+    @patch("bias_monitor.SentenceTransformer")
+    def test_monitor_reuses_cached_embeddings(self, mock_transformer):
+        """Repeated checks should only encode texts that were not seen before."""
+        mock_model = MagicMock()
+        mock_transformer.return_value = mock_model
+        mock_model.encode.side_effect = lambda texts, **kwargs: [[1.0, float(i)] for i in range(len(texts))]
+        
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor()
+        
+        first = monitor.check_bias("Title", "A summary of the video.")
+        second = monitor.check_bias("Title", "A summary of the video.")
+        monitor.check_bias("Title", "A different summary.")
+        
+        assert first["similarity_score"] == second["similarity_score"]
+        assert mock_model.encode.call_count == 2
+        assert mock_model.encode.call_args.args[0] == ["A different summary."]
+    
+    @patch("bias_monitor.SentenceTransformer")
+    def test_cache_can_be_disabled(self, mock_transformer):
+        """cache_size=0 should encode every time."""
+        mock_model = MagicMock()
+        mock_transformer.return_value = mock_model
+        mock_model.encode.return_value = [[1.0, 0.0], [1.0, 0.0]]
+        
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor(cache_size=0)
+        
+        monitor.check_bias("Title", "Summary text.")
+        monitor.check_bias("Title", "Summary text.")
+        
+        assert monitor.cache is None
+        assert mock_model.encode.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Tests for the ONNX backend (parity with PyTorch)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def tiny_sentence_model(tmp_path_factory):
+    """Build a small random sentence-transformer on disk so model tests run offline."""
+    import torch
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+    from sentence_transformers import SentenceTransformer, models
+
+    root = tmp_path_factory.mktemp("tiny_model")
+    words = (
+        "the a video python tutorial music war history cooking review summary of "
+        "and is about covers basics programming recipe guide news game players"
+    ).split()
+    vocab_file = root / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+
+    torch.manual_seed(0)
+    bert_dir = root / "bert"
+    BertModel(BertConfig(
+        vocab_size=5 + len(words), hidden_size=64, num_hidden_layers=2,
+        num_attention_heads=4, intermediate_size=128, max_position_embeddings=128
+    )).save_pretrained(bert_dir)
+    BertTokenizerFast(vocab_file=str(vocab_file)).save_pretrained(bert_dir)
+
+    transformer = models.Transformer(str(bert_dir), max_seq_length=64)
+    pooling = models.Pooling(transformer.get_word_embedding_dimension(), "mean")
+    model_dir = root / "sentence_model"
+    SentenceTransformer(modules=[transformer, pooling]).save(str(model_dir))
+    return str(model_dir)
+
+
+class TestOnnxBackend:
+    """Parity between the PyTorch and ONNX bias backends."""
+
+    @pytest.fixture(autouse=True)
+    def requires_onnxruntime(self):
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("onnx")
+
+    TITLES = ["Python tutorial", "Music history", "Cooking guide", "Game review"]
+    SUMMARIES = [
+        "the video covers python programming basics",
+        "a summary of the history of music",
+        "the recipe guide is about cooking",
+        "news about the war and the players"
+    ]
+
+    def _scores(self, monitor):
+        results = monitor.check_bias_many(self.TITLES, self.SUMMARIES)
+        return np.array([r["similarity_score"] for r in results])
+
+    def test_fp32_onnx_matches_torch(self, tiny_sentence_model, tmp_path):
+        """Unquantised ONNX should reproduce PyTorch similarities almost exactly."""
+        from bias_monitor import BiasMonitor
+        from onnx_encoder import OnnxEncoder
+
+        torch_monitor = BiasMonitor(model_name=tiny_sentence_model, cache_size=0)
+        onnx_monitor = BiasMonitor(model_name=tiny_sentence_model, cache_size=0)
+        onnx_monitor.model = OnnxEncoder(tiny_sentence_model, export_dir=str(tmp_path), quantize=False)
+
+        assert np.allclose(self._scores(torch_monitor), self._scores(onnx_monitor), atol=1e-4)
+
+    def test_int8_onnx_within_tolerance(self, tiny_sentence_model, tmp_path, monkeypatch):
+        """The int8 backend selected via backend='onnx' should stay close to PyTorch."""
+        from bias_monitor import BiasMonitor
+        monkeypatch.setenv("BIAS_ONNX_DIR", str(tmp_path))
+
+        torch_monitor = BiasMonitor(model_name=tiny_sentence_model, cache_size=0)
+        onnx_monitor = BiasMonitor(model_name=tiny_sentence_model, cache_size=0, backend="onnx")
+
+        assert onnx_monitor.backend == "onnx"
+        assert np.allclose(self._scores(torch_monitor), self._scores(onnx_monitor), atol=0.05)
+
+    def test_onnx_export_is_reused(self, tiny_sentence_model, tmp_path):
+        """A second encoder over the same export dir should not re-export."""
+        from onnx_encoder import OnnxEncoder
+
+        OnnxEncoder(tiny_sentence_model, export_dir=str(tmp_path))
+        with patch("onnx_encoder.export_onnx") as mock_export:
+            OnnxEncoder(tiny_sentence_model, export_dir=str(tmp_path))
+
+        mock_export.assert_not_called()
+
+    def test_unknown_backend_rejected(self):
+        """BiasMonitor should reject unknown backends."""
+        from bias_monitor import BiasMonitor
+
+        with pytest.raises(ValueError):
+            BiasMonitor(backend="tensorrt")
+
+
+# ---------------------------------------------------------------------------
+# Tests for offline model loading and readiness
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def baked_model_dir(tiny_sentence_model, tmp_path):
+    """A copy of the tiny model with a manifest, as model_loader.bake would produce."""
+    import shutil
+    from model_loader import write_manifest
+
+    model_dir = tmp_path / "baked"
+    shutil.copytree(tiny_sentence_model, model_dir)
+    write_manifest(str(model_dir), "tiny-test-model")
+    return str(model_dir)
+
+
+class TestModelLoader:
+    """Unit tests for the checksum-verified local model loader."""
+
+    def test_load_local_model_encodes_offline(self, baked_model_dir, monkeypatch):
+        """A baked artifact should load, warm up and encode with the hub disabled."""
+        from model_loader import load_local_model
+        monkeypatch.setenv("HF_HUB_OFFLINE", "0")
+
+        model = load_local_model(baked_model_dir)
+
+        assert os.environ["HF_HUB_OFFLINE"] == "1"
+        assert model.encode(["python tutorial"]).shape[0] == 1
+
+    def test_manifest_lists_safetensors_weights(self, baked_model_dir):
+        """The manifest should checksum the safetensors weights."""
+        from model_loader import verify_model_dir
+
+        manifest = verify_model_dir(baked_model_dir)
+
+        assert manifest["model_name"] == "tiny-test-model"
+        assert any(name.endswith(".safetensors") for name in manifest["files"])
+
+    def test_tampered_file_fails_verification(self, baked_model_dir):
+        """A file whose checksum no longer matches should be rejected."""
+        from model_loader import ModelArtifactError, verify_model_dir
+
+        with open(os.path.join(baked_model_dir, "modules.json"), "a") as f:
+            f.write(" ")
+
+        with pytest.raises(ModelArtifactError, match="Checksum mismatch"):
+            verify_model_dir(baked_model_dir)
+
+    def test_revision_is_checked_against_manifest(self, baked_model_dir):
+        """An artifact baked from another hub commit should be rejected."""
+        from model_loader import ModelArtifactError, verify_model_dir, write_manifest
+        write_manifest(baked_model_dir, "tiny-test-model", "a" * 40)
+
+        assert verify_model_dir(baked_model_dir, "a" * 40)["revision"] == "a" * 40
+        with pytest.raises(ModelArtifactError, match="expected"):
+            verify_model_dir(baked_model_dir, "b" * 40)
+
+    def test_bake_requires_commit_hash(self, tmp_path):
+        """Branch names move, so bake should only accept a full commit hash."""
+        from model_loader import bake
+
+        with pytest.raises(ValueError):
+            bake("all-MiniLM-L6-v2", str(tmp_path), "main")
+
+    def test_missing_manifest_fails_verification(self, tiny_sentence_model):
+        """A directory without a manifest should not be loaded."""
+        from model_loader import ModelArtifactError, load_local_model
+
+        with pytest.raises(ModelArtifactError):
+            load_local_model(tiny_sentence_model)
+
+    def test_bias_monitor_uses_model_dir(self, baked_model_dir):
+        """BiasMonitor should load from model_dir and key its cache by the manifest name."""
+        from bias_monitor import BiasMonitor
+
+        monitor = BiasMonitor(model_dir=baked_model_dir)
+        monitor.warm_up()
+
+        assert monitor.model_name == "tiny-test-model"
+        assert monitor.cache.model_name == "tiny-test-model"
+
+
+class TestReadiness:
+    """Tests for the /ready probe."""
+
+    def test_ready_without_bias_check(self, client):
+        """With bias checks disabled there is nothing to load."""
+        with patch("main.ENABLE_BIAS_CHECK", False):
+            response = client.get("/ready")
+
+        assert response.status_code == 200
+
+    def test_not_ready_while_loading(self, client):
+        """/ready should return 503 until the model has been warmed up."""
+        with patch("main.ENABLE_BIAS_CHECK", True), \
+             patch.dict("main.model_state", {"status": "loading"}):
+            response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "loading"
+
+    def test_ready_after_load(self, client):
+        """A successful background load should flip /ready to 200."""
+        import main
+        mock_monitor = MagicMock()
+
+        with patch("main.ENABLE_BIAS_CHECK", True), \
+             patch.dict("main.model_state", {"status": "loading"}), \
+             patch.object(main, "get_bias_monitor", return_value=mock_monitor):
+            main.load_bias_model()
+            response = client.get("/ready")
+
+        mock_monitor.warm_up.assert_called_once()
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_failed_load_stays_unready(self, client):
+        """A load error should be reported and keep /ready at 503."""
+        import main
+
+        with patch("main.ENABLE_BIAS_CHECK", True), \
+             patch.dict("main.model_state", {"status": "loading"}), \
+             patch.object(main, "get_bias_monitor", side_effect=RuntimeError("checksum mismatch")):
+            main.load_bias_model()
+            response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json()["error"] == "checksum mismatch"
+
+
+# ---------------------------------------------------------------------------
+# Tests for the encoder worker pool
+# ---------------------------------------------------------------------------
+
+def fake_bias_results(titles, summaries, categories=None, languages=None):
+    return [{"similarity_score": 0.9, "is_biased": False, "video_title": t, "summary_preview": s}
+            for t, s in zip(titles, summaries)]
+
+
+@pytest.fixture
+def thread_pool():
+    """EncoderPool driven by a thread executor and a mocked BiasMonitor."""
+    from concurrent.futures import ThreadPoolExecutor
+    from encoder_pool import EncoderPool
+
+    mock_monitor = MagicMock()
+    mock_monitor.check_bias_many.side_effect = fake_bias_results
+    with patch("encoder_pool.get_bias_monitor", return_value=mock_monitor):
+        pool = EncoderPool(workers=2, max_batch_size=8, max_wait_ms=200, executor=ThreadPoolExecutor(2))
+        yield pool, mock_monitor
+        pool.shutdown()
+
+
+class TestEncoderPool:
+    """Unit tests for EncoderPool coalescing and result routing."""
+
+    def test_concurrent_requests_are_coalesced(self, thread_pool):
+        """Requests arriving inside the window should share one worker call."""
+        pool, mock_monitor = thread_pool
+
+        futures = [pool.submit([f"title {i}"], [f"summary {i}"]) for i in range(4)]
+        results = [f.result(timeout=5) for f in futures]
+
+        assert [r[0]["video_title"] for r in results] == [f"title {i}" for i in range(4)]
+        assert mock_monitor.check_bias_many.call_count == 1
+        assert pool.stats()["avg_batch_size"] == 4
+
+    def test_batch_size_cap_is_respected(self, thread_pool):
+        """Requests that would overflow max_batch_size should go in the next batch."""
+        pool, mock_monitor = thread_pool
+
+        futures = [pool.submit(["t"] * 3, ["s"] * 3) for _ in range(4)]
+        [f.result(timeout=5) for f in futures]
+
+        assert all(len(c.args[0]) <= 8 for c in mock_monitor.check_bias_many.call_args_list)
+        assert pool.stats()["pairs_dispatched"] == 12
+
+    def test_worker_errors_reach_every_caller_in_the_batch(self, thread_pool):
+        """A failed batch should fail each request it contained."""
+        pool, mock_monitor = thread_pool
+        mock_monitor.check_bias_many.side_effect = RuntimeError("worker died")
+
+        futures = [pool.submit(["t"], ["s"]) for _ in range(2)]
+
+        for f in futures:
+            with pytest.raises(RuntimeError):
+                f.result(timeout=5)
+
+    def test_submit_after_shutdown_raises(self, thread_pool):
+        """submit() should refuse new work after shutdown."""
+        pool, _ = thread_pool
+        pool.shutdown()
+
+        with pytest.raises(RuntimeError):
+            pool.submit(["t"], ["s"])
+
+    def test_validate_routes_through_pool(self, thread_pool, valid_llm_output):
+        """In process mode the async endpoint should await the pool, not the threadpool."""
+        import main
+        pool, mock_monitor = thread_pool
+
+        with patch("main.ENABLE_BIAS_CHECK", True), patch("main.encoder_pool", pool), \
+             patch.object(main, "get_bias_monitor") as mock_get:
+            response = TestClient(main.app).post("/validate", json=valid_llm_output)
+
+        assert response.status_code == 200
+        assert response.json()["bias_check"]["similarity_score"] == 0.9
+        mock_get.assert_not_called()
+        mock_monitor.check_bias_many.assert_called_once()
+
+    def test_worker_processes_score_with_real_model(self, baked_model_dir, monkeypatch):
+        """Spawned workers should load the model themselves and return scores."""
+        from encoder_pool import EncoderPool
+        monkeypatch.setenv("BIAS_MODEL_DIR", baked_model_dir)
+        monkeypatch.setenv("BIAS_EMBED_CACHE_SIZE", "0")
+
+        pool = EncoderPool(workers=1, max_batch_size=16, max_wait_ms=20)
+        try:
+            pool.warm_up(timeout=120)
+            results = pool.submit(["Python tutorial"], ["the video covers python programming basics"]).result(timeout=60)
+        finally:
+            pool.shutdown()
+
+        assert results[0]["video_title"] == "Python tutorial"
+        assert isinstance(results[0]["similarity_score"], float)
+
+
+# ---------------------------------------------------------------------------
+# Tests for comment coverage
+# ---------------------------------------------------------------------------
+
+def topic_embeddings(topics, per_topic, dim=16, noise=0.05, seed=0):
+    """Unit vectors scattered tightly around one axis per topic."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for t in topics:
+        base = np.zeros(dim)
+        base[t] = 1.0
+        rows.append(base + rng.normal(scale=noise, size=(per_topic, dim)))
+    emb = np.vstack(rows).astype(np.float32)
+    return emb / np.linalg.norm(emb, axis=1, keepdims=True)
+
+
+class TestCommentCoverage:
+    """Unit tests for comment clustering and coverage scoring."""
+
+    def test_split_sentences(self):
+        """Summaries should split on sentence punctuation."""
+        from comment_coverage import split_sentences
+
+        assert split_sentences("Viewers loved it. Some found it long!  Why? ") == [
+            "Viewers loved it.", "Some found it long!", "Why?"
+        ]
+
+    def test_clusters_follow_topics(self):
+        """Comments around three topics should form three clusters."""
+        from comment_coverage import cluster_comments
+
+        labels, leaders = cluster_comments(topic_embeddings([0, 1, 2], 300), threshold=0.8)
+
+        assert len(leaders) == 3
+        assert len(set(labels[:300])) == 1
+        assert labels[0] != labels[300] != labels[600]
+
+    def test_reports_covered_and_missed_clusters(self):
+        """Clusters with no matching summary sentence should be reported as missed."""
+        from comment_coverage import comment_coverage
+
+        comments = [f"topic0 {i}" for i in range(50)] + [f"topic1 {i}" for i in range(30)] + [f"topic2 {i}" for i in range(20)]
+        emb = np.vstack([topic_embeddings([0], 50), topic_embeddings([1], 30, seed=1), topic_embeddings([2], 20, seed=2)])
+        sentences = topic_embeddings([0, 2], 1, seed=3)
+
+        result = comment_coverage(emb, sentences, comments, cluster_threshold=0.8, coverage_threshold=0.8)
+
+        assert result["num_major_clusters"] == 3
+        assert result["covered_share"] == pytest.approx(0.7)
+        assert [c["size"] for c in result["covered_clusters"]] == [50, 20]
+        assert result["missed_clusters"][0]["representative"].startswith("topic1")
+
+    def test_empty_summary_covers_nothing(self):
+        """No summary sentences should mean zero coverage."""
+        from comment_coverage import comment_coverage
+
+        emb = topic_embeddings([0], 10)
+        result = comment_coverage(emb, np.zeros((0, 16), dtype=np.float32), ["c"] * 10)
+
+        assert result["covered_share"] == 0.0
+
+    def test_validate_reports_low_coverage(self, valid_llm_output):
+        """Low coverage should be flagged on the result without failing validation by default."""
+        import main
+        mock_monitor = self.low_coverage_monitor()
+        valid_llm_output["comments"] = "audio is bad\naudio too quiet\nnice video"
+
+        with patch("main.ENABLE_BIAS_CHECK", True), patch("main.encoder_pool", None), \
+             patch.object(main, "get_bias_monitor", return_value=mock_monitor):
+            response = TestClient(main.app).post("/validate", json=valid_llm_output)
+
+        data = response.json()
+        assert data["is_valid"] is True
+        assert data["comment_coverage"]["low_coverage"] is True
+        assert data["comment_coverage"]["missed_clusters"][0]["representative"] == "audio is bad"
+        comments_arg = mock_monitor.check_comment_coverage.call_args.args[0]
+        assert comments_arg == ["audio is bad", "audio too quiet", "nice video"]
+
+    def test_enforced_low_coverage_fails_validation(self, valid_llm_output):
+        """With COMMENT_COVERAGE_ENFORCE on, low coverage should add an issue."""
+        import main
+        mock_monitor = self.low_coverage_monitor()
+        valid_llm_output["comments"] = "audio is bad\naudio too quiet\nnice video"
+
+        with patch("main.ENABLE_BIAS_CHECK", True), patch("main.COMMENT_COVERAGE_ENFORCE", True), \
+             patch("main.encoder_pool", None), patch.object(main, "get_bias_monitor", return_value=mock_monitor):
+            response = TestClient(main.app).post("/validate", json=valid_llm_output)
+
+        data = response.json()
+        assert data["is_valid"] is False
+        assert any("misses major discussion points" in issue for issue in data["issues"])
+
+    @staticmethod
+    def low_coverage_monitor():
+        mock_monitor = MagicMock()
+        mock_monitor.check_bias.return_value = {"similarity_score": 0.8, "is_biased": False, "threshold": 0.3}
+        mock_monitor.check_comment_coverage.return_value = {
+            "num_comments": 3, "num_clusters": 2, "num_major_clusters": 2,
+            "covered_share": 0.25, "comment_share_covered": 0.3, "threshold": 0.4,
+            "covered_clusters": [], "missed_clusters": [{"size": 2, "representative": "audio is bad", "similarity": 0.1}]
+        }
+        return mock_monitor
+
+    def test_validate_skips_coverage_without_comments(self, valid_llm_output):
+        """Requests without comments should not run the coverage check."""
+        import main
+        mock_monitor = MagicMock()
+        mock_monitor.check_bias.return_value = {"similarity_score": 0.8, "is_biased": False, "threshold": 0.3}
+
+        with patch("main.ENABLE_BIAS_CHECK", True), patch("main.encoder_pool", None), \
+             patch.object(main, "get_bias_monitor", return_value=mock_monitor):
+            response = TestClient(main.app).post("/validate", json=valid_llm_output)
+
+        assert response.json()["comment_coverage"] is None
+        mock_monitor.check_comment_coverage.assert_not_called()
+
+    def test_bias_monitor_coverage_with_real_model(self, tiny_sentence_model):
+        """BiasMonitor should embed comments and sentences and return a full report."""
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor(model_name=tiny_sentence_model, cache_size=0)
+        comments = ["the recipe guide is about cooking"] * 5 + ["news about the war"] * 3
+
+        result = monitor.check_comment_coverage(comments, "The recipe guide is about cooking.")
+
+        assert result["num_comments"] == 8
+        assert result["num_major_clusters"] >= 1
+
+
+# ---------------------------------------------------------------------------
+# Tests for transcript grounding
+# ---------------------------------------------------------------------------
+
+class TestGrounding:
+    """Unit tests for transcript chunking and grounding scores."""
+
+    def test_chunks_overlap_and_cover_transcript(self):
+        """Chunks should overlap by the configured words and reach the end."""
+        from grounding import chunk_transcript
+        words = [f"w{i}" for i in range(200)]
+
+        chunks = chunk_transcript(" ".join(words), chunk_words=80, overlap=20)
+
+        assert len(chunks) == 3
+        assert chunks[1].split()[0] == "w60"
+        assert chunks[-1].split()[-1] == "w199"
+
+    def test_short_and_empty_transcripts(self):
+        """Short transcripts give one chunk and empty ones give none."""
+        from grounding import chunk_transcript
+
+        assert chunk_transcript("just a few words") == ["just a few words"]
+        assert chunk_transcript("   ") == []
+
+    def test_unsupported_sentences_are_flagged(self):
+        """Sentences with no similar chunk should be reported with their best chunk."""
+        from grounding import grounding_scores
+        chunks = topic_embeddings([0, 1], 1)
+        sentences = np.vstack([topic_embeddings([0], 1, seed=1), topic_embeddings([5], 1, seed=2)])
+
+        result = grounding_scores(chunks, sentences, ["on topic.", "made up."], ["chunk a", "chunk b"], threshold=0.5)
+
+        assert result["supported_share"] == 0.5
+        assert [u["sentence"] for u in result["unsupported_sentences"]] == ["made up."]
+
+    def test_transcript_chunks_are_cached_per_video(self, tiny_sentence_model):
+        """Re-validating the same transcript should only encode the summary sentences."""
+        from bias_monitor import BiasMonitor
+        monitor = BiasMonitor(model_name=tiny_sentence_model, cache_size=0)
+        transcript = " ".join(["the video covers python programming basics and the recipe guide"] * 30)
+        summary = "The video covers python programming. It is about cooking."
+
+        first = monitor.check_grounding("vid1", transcript, summary, chunk_words=40, overlap=10)
+        with patch.object(monitor, "_encode", wraps=monitor._encode) as spy:
+            second = monitor.check_grounding("vid1", transcript, summary, chunk_words=40, overlap=10)
+
+        assert first == second
+        assert spy.call_args.args[0] == ["The video covers python programming.", "It is about cooking."]
+        assert monitor.transcript_cache.stats()["hits"] == 1
+
+    def test_validate_reports_weak_grounding(self, valid_llm_output):
+        """A weakly grounded summary should be flagged with its unsupported sentences but stay valid by default."""
+        import main
+        mock_monitor = self.weak_grounding_monitor()
+        valid_llm_output["transcript"] = "Some transcript text about the topic."
+
+        with patch("main.ENABLE_BIAS_CHECK", True), patch("main.encoder_pool", None), \
+             patch.object(main, "get_bias_monitor", return_value=mock_monitor):
+            response = TestClient(main.app).post("/validate", json=valid_llm_output)
+
+        data = response.json()
+        assert data["is_valid"] is True
+        assert data["grounding"]["weakly_grounded"] is True
+        assert data["grounding"]["unsupported_sentences"][0]["sentence"] == "Invented claim."
+        assert mock_monitor.check_grounding.call_args.args[0] == "abc123"
+
+    def test_enforced_weak_grounding_fails_validation(self, valid_llm_output):
+        """With GROUNDING_ENFORCE on, weak grounding should add an issue."""
+        import main
+        mock_monitor = self.weak_grounding_monitor()
+        valid_llm_output["transcript"] = "Some transcript text about the topic."
+
+        with patch("main.ENABLE_BIAS_CHECK", True), patch("main.GROUNDING_ENFORCE", True), \
+             patch("main.encoder_pool", None), patch.object(main, "get_bias_monitor", return_value=mock_monitor):
+            response = TestClient(main.app).post("/validate", json=valid_llm_output)
+
+        data = response.json()
+        assert data["is_valid"] is False
+        assert any("weakly grounded" in issue for issue in data["issues"])
+
+    @staticmethod
+    def weak_grounding_monitor():
+        mock_monitor = MagicMock()
+        mock_monitor.check_bias.return_value = {"similarity_score": 0.8, "is_biased": False, "threshold": 0.3}
+        mock_monitor.check_grounding.return_value = {
+            "grounding_score": 0.3, "min_sentence_score": 0.1, "supported_share": 0.5, "threshold": 0.35,
+            "num_chunks": 4,
+            "unsupported_sentences": [{"sentence": "Invented claim.", "similarity": 0.1, "best_chunk": "..."}]
+        }
+        return mock_monitor
+
+
+# ---------------------------------------------------------------------------
+# Tests for the score drift monitor
+# ---------------------------------------------------------------------------
+
+class TestScoreMonitor:
+    """Unit tests for sketches, rolling windows and drift alerts."""
+
+    def test_kll_quantiles_are_accurate_in_bounded_memory(self):
+        """The sketch should stay small and track quantiles closely."""
+        from score_monitor import KLLSketch
+        values = np.random.default_rng(0).beta(5, 3, 50000)
+        sketch = KLLSketch(k=200, seed=1)
+        for v in values:
+            sketch.add(float(v))
+
+        quantiles = sketch.quantiles()
+
+        assert sketch.size() < 3 * 200
+        assert quantiles["p50"] == pytest.approx(np.quantile(values, 0.5), abs=0.02)
+        assert quantiles["p95"] == pytest.approx(np.quantile(values, 0.95), abs=0.02)
+
+    def test_psi_is_zero_for_identical_histograms(self):
+        """Identical distributions should have no drift."""
+        from score_monitor import population_stability_index
+        hist = np.array([5, 10, 20, 10, 5])
+
+        assert population_stability_index(hist, hist * 3) == pytest.approx(0.0)
+
+    def _feed(self, monitor, scores, start, step=1.0):
+        for i, score in enumerate(scores):
+            monitor.record("video", float(score), "en", now=start + i * step)
+
+    def test_reference_pins_after_a_full_window_and_drift_alerts(self):
+        """A shifted distribution should raise an alert against the pinned reference."""
+        from score_monitor import ScoreMonitor
+        rng = np.random.default_rng(0)
+        monitor = ScoreMonitor(window_seconds=100, buckets=10, min_samples=200)
+
+        self._feed(monitor, rng.beta(5, 3, 600), start=0, step=0.25)
+        stable = monitor.snapshot(now=150)
+        self._feed(monitor, rng.beta(2, 6, 600), start=150, step=0.25)
+        drifted = monitor.snapshot(now=300)
+
+        assert stable["series"][0]["reference_count"] > 0
+        assert stable["alerts"] == []
+        assert drifted["alerts"] == ["video/en"]
+        assert drifted["series"][0]["psi"] > 0.2
+
+    def test_old_scores_age_out_of_the_window(self):
+        """Scores older than the window should not count."""
+        from score_monitor import ScoreMonitor
+        monitor = ScoreMonitor(window_seconds=100, buckets=10)
+
+        self._feed(monitor, [0.5] * 20, start=0)
+        snapshot = monitor.snapshot(now=500)
+
+        assert snapshot["series"][0]["window_count"] == 0
+        assert snapshot["series"][0]["total"] == 20
+
+    def test_pin_reference_clears_alerts(self):
+        """Re-pinning should accept the current distribution as normal."""
+        from score_monitor import ScoreMonitor
+        rng = np.random.default_rng(0)
+        monitor = ScoreMonitor(window_seconds=100, buckets=10, min_samples=200)
+        self._feed(monitor, rng.beta(5, 3, 600), start=0, step=0.25)
+        self._feed(monitor, rng.beta(2, 6, 600), start=150, step=0.25)
+
+        monitor.pin_reference(now=300)
+
+        assert monitor.snapshot(now=300)["alerts"] == []
+
+    def test_series_count_is_capped(self):
+        """Languages beyond max_series should fold into 'other'."""
+        from score_monitor import ScoreMonitor
+        monitor = ScoreMonitor(max_series=2)
+
+        for language in ["en", "de", "fr", "es"]:
+            monitor.record("video", 0.5, language)
+
+        languages = [s["language"] for s in monitor.snapshot()["series"]]
+        assert languages == ["de", "en", "other"]
+
+    def test_validate_feeds_the_monitor(self, valid_llm_output):
+        """Bias scores from /validate should show up under /monitor/scores."""
+        import main
+        from score_monitor import ScoreMonitor
+        mock_monitor = MagicMock()
+        mock_monitor.check_bias.return_value = {"similarity_score": 0.7, "is_biased": False, "threshold": 0.3}
+        valid_llm_output["language"] = "EN"
+
+        with patch("main.ENABLE_BIAS_CHECK", True), patch("main.encoder_pool", None), \
+             patch("main.score_monitor", ScoreMonitor()), \
+             patch.object(main, "get_bias_monitor", return_value=mock_monitor):
+            client = TestClient(main.app)
+            client.post("/validate", json=valid_llm_output)
+            data = client.get("/monitor/scores").json()
+
+        assert data["series"][0]["summary_type"] == "video"
+        assert data["series"][0]["language"] == "en"
+        assert data["series"][0]["lifetime_quantiles"]["p50"] == 0.7
+
+
+# ---------------------------------------------------------------------------
+# Threshold calibration
+# ---------------------------------------------------------------------------
+
+class TestThresholdCalibration:
+    """Unit tests for calibrate.py and per-category / per-language thresholds."""
+
+    def test_max_fpr_picks_highest_threshold_within_budget(self):
+        """No acceptable summary should be discarded when max_fpr is 0."""
+        from calibrate import choose_threshold
+        scores = np.array([0.1, 0.2, 0.25, 0.6, 0.7, 0.8, 0.9])
+        labels = np.array([0, 0, 0, 1, 1, 1, 1])
+
+        result = choose_threshold(scores, labels, objective="max-fpr", max_fpr=0.0)
+
+        assert 0.25 < result["threshold"] <= 0.6
+        assert result["fpr"] == 0.0
+        assert result["tpr"] == 1.0
+
+    def test_youden_separates_overlapping_classes(self):
+        """Youden's J should land between the two score clusters."""
+        from calibrate import choose_threshold
+        rng = np.random.default_rng(0)
+        scores = np.concatenate([rng.normal(0.2, 0.05, 200), rng.normal(0.6, 0.05, 200)])
+        labels = np.array([0] * 200 + [1] * 200)
+
+        result = choose_threshold(scores, labels, objective="youden")
+
+        assert 0.3 < result["threshold"] < 0.5
+
+    def test_calibrate_falls_back_for_small_groups(self):
+        """Groups with too few rows should be left to the default threshold."""
+        from calibrate import calibrate
+        rows = [{"score": 0.7 + i / 100, "label": 1, "category": "Music", "language": "en"} for i in range(10)]
+        rows += [{"score": 0.1, "label": 0, "category": "Music", "language": "en"} for _ in range(5)]
+        rows += [{"score": 0.5, "label": 1, "category": "News", "language": "en"}]
+
+        thresholds = calibrate(rows, max_fpr=0.0, min_group_size=5)
+
+        assert "music" in thresholds["by_category"]
+        assert "news" not in thresholds["by_category"]
+        assert thresholds["samples"]["labelled"] == 16
+
+    def test_group_of_mostly_negatives_keeps_default(self):
+        """A group with few acceptable rows should not get a quantile of its negatives' scores."""
+        from calibrate import calibrate
+        rows = [{"score": 0.6 + i / 100, "label": 1, "category": "Music"} for i in range(10)]
+        rows += [{"score": 0.1, "label": 0, "category": "Music"} for _ in range(5)]
+        rows += [{"score": 0.7, "label": 1, "category": "Education", "language": "en"} for _ in range(2)]
+        rows += [{"score": 0.01 + i / 1000, "label": 0, "category": "Education", "language": "en"} for i in range(12)]
+
+        thresholds = calibrate(rows, max_fpr=0.0, min_group_size=5)
+
+        assert "education" not in thresholds["by_category"]
+        assert "en" not in thresholds["by_language"]
+        assert thresholds["default"] > 0.1
+
+    def test_log_scores_calibrate_by_quantile(self):
+        """Unlabelled log scores should calibrate to the discard-rate quantile."""
+        from calibrate import calibrate, parse_log_scores
+        lines = [f"INFO:bias_monitor:Video Summary - Similarity: {s:.4f}, Biased: False" for s in np.linspace(0.2, 0.9, 100)]
+        lines += ["INFO:main:PUSH: Video 'A title' | Result: ✅ UNBIASED (Score: 0.85)", "unrelated line"]
+
+        rows = parse_log_scores(lines)
+        thresholds = calibrate(rows, discard_rate=0.1)
+
+        # The push line repeats a validated run's score, so it is not counted again
+        assert len(rows) == 100
+        assert thresholds["default"] == pytest.approx(np.quantile([r["score"] for r in rows], 0.1), abs=1e-4)
+
+    def test_log_scores_count_each_run_once(self):
+        """A run's validate and push lines (and a re-run with the same score) should give one row."""
+        from calibrate import parse_log_scores
+        lines = [
+            "INFO:bias_monitor:Video Summary - Similarity: 0.8512, Biased: False",
+            "INFO:main:✅ Bias Check Passed for abc123: Score 0.8512",
+            "INFO:main:PUSH: Video 'A title' (abc123) | Result: ✅ UNBIASED (Score: 0.85)",
+            "INFO:main:✅ Bias Check Passed for abc123: Score 0.8512",
+            "WARNING:main:⚠️ BIAS DETECTED for def456: Score 0.1200 < 0.30",
+            "INFO:main:PUSH: Video 'It's pushed only' (ghi789) | Result: ✅ UNBIASED (Score: 0.64)"
+        ]
+
+        rows = parse_log_scores(lines)
+
+        assert sorted(r["score"] for r in rows) == [0.12, 0.64, 0.8512]
+
+    def test_video_list_rows_include_mismatched_negatives(self, tmp_path):
+        """Each video should yield one labelled pair plus off-topic negatives."""
+        from calibrate import load_video_list
+        videos = [
+            {"transcript": "[Music] learn python today", "trans_summary": "A Python lesson.", "trans_eval_score": 0.9,
+             "category": "Education", "speaker": "English male"},
+            {"transcript": "cook pasta at home", "trans_summary": "A pasta recipe.", "trans_eval_score": 0.2,
+             "category": "Food", "speaker": "Hindi"}
+        ]
+        path = tmp_path / "videoList.json"
+        path.write_text(json.dumps({"videoList": videos}))
+
+        rows = load_video_list(str(path), negatives_per_video=1)
+
+        assert rows[0]["title"] == "learn python today"
+        assert (rows[0]["label"], rows[1]["label"]) == (1, 0)
+        assert rows[1]["language"] == "hi"
+        assert rows[2]["summary"] == "A pasta recipe." and rows[2]["label"] == 0
+
+    @patch("bias_monitor.SentenceTransformer")
+    def test_thresholds_file_overrides_and_hot_reloads(self, mock_transformer, tmp_path):
+        """Category beats language beats default, and file changes are picked up."""
+        import bias_monitor
+        from bias_monitor import BiasMonitor
+        path = tmp_path / "thresholds.json"
+        path.write_text(json.dumps({"default": 0.3, "by_category": {"Music": 0.1}, "by_language": {"hi": 0.2}}))
+        monitor = BiasMonitor(thresholds_file=str(path))
+
+        assert monitor.threshold_for("music", "hi") == 0.1
+        assert monitor.threshold_for("News", "HI") == 0.2
+        assert monitor.threshold_for(None, "en") == 0.3
+
+        path.write_text(json.dumps({"default": 0.4}))
+        os.utime(path, (1, 1))
+        with patch.object(bias_monitor, "THRESHOLDS_CHECK_INTERVAL", 0):
+            monitor.maybe_reload_thresholds()
+
+        assert monitor.threshold_for("music", "hi") == 0.4
+
+    @patch("bias_monitor.SentenceTransformer")
+    def test_invalid_thresholds_file_keeps_current_values(self, mock_transformer, tmp_path):
+        """A bad file should be rejected without changing live thresholds."""
+        from bias_monitor import BiasMonitor
+        path = tmp_path / "thresholds.json"
+        path.write_text(json.dumps({"default": 0.3, "by_category": {"music": 0.1}}))
+        monitor = BiasMonitor(thresholds_file=str(path))
+        path.write_text(json.dumps({"default": 0.3, "by_category": {"music": 1.5}}))
+
+        with pytest.raises(ValueError):
+            monitor.reload_thresholds()
+        assert monitor.threshold_for("music") == 0.1
+
+    def test_reload_endpoint_reports_errors_as_400(self):
+        """POST /thresholds/reload should turn a bad file into a 400."""
+        import main
+        mock_monitor = MagicMock()
+        mock_monitor.reload_thresholds.side_effect = ValueError("Threshold out of range")
+
+        with patch("main.ENABLE_BIAS_CHECK", True), patch("main.encoder_pool", None), \
+             patch.object(main, "get_bias_monitor", return_value=mock_monitor):
+            response = TestClient(main.app).post("/thresholds/reload")
+
+        assert response.status_code == 400
+        assert "out of range" in response.json()["detail"]
@@ -4,16 +4,207 @@ Detects potential bias in generated summaries by comparing semantic similarity
 between the video title and the generated summary.
 """
 
+import fcntl
+import hashlib
+import json
 import logging
 import os
-from typing import Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from comment_coverage import comment_coverage, split_sentences
+from grounding import TranscriptChunkCache, chunk_transcript, grounding_scores
+from model_loader import WARMUP_TEXT, enable_offline_mode, load_local_model, verify_model_dir
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# How often check_bias looks at BIAS_THRESHOLDS_FILE's mtime
+THRESHOLDS_CHECK_INTERVAL = 5.0
+# Cache keys are fixed-width hex, so keys.txt rows are too (key + newline)
+KEY_LENGTH = 32
+KEY_ROW_BYTES = KEY_LENGTH + 1
+
+class EmbeddingCache:
+    """
+    Bounded in-memory LRU of normalised embeddings, keyed by a hash of model name
+    and text. Optionally backed by an append-only float16 store on disk that is
+    memory-mapped at startup, so warm restarts skip re-encoding.
+    
+    The store may be shared by several processes (gunicorn workers, pool
+    workers): appends hold an flock on the directory's .lock file and first
+    pick up rows other processes wrote, so row numbers always follow the files.
+    """
+    
+    def __init__(self, model_name: str, max_entries: int = 4096, disk_dir: Optional[str] = None):
+        """
+        Args:
+            model_name: Model whose embeddings are cached (part of every key)
+            max_entries: Capacity of the in-memory LRU
+            disk_dir: Directory for the on-disk store; None keeps the cache in memory only
+        """
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        self._disk_path = None
+        self._disk_index: Dict[str, int] = {}
+        self._disk_count = 0
+        self._disk_rows = None
+        self._dim = None
+        if disk_dir:
+            slug = model_name.replace("/", "__")
+            self._disk_path = os.path.join(disk_dir, slug)
+            os.makedirs(self._disk_path, exist_ok=True)
+            self._load_disk()
+    
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()[:KEY_LENGTH]
+    
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up texts; returns None for misses."""
+        found: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for text in texts:
+                k = self.key(text)
+                vec = self._lru.get(k)
+                if vec is not None:
+                    self._lru.move_to_end(k)
+                    self.hits += 1
+                elif k in self._disk_index:
+                    vec = self._disk_row(self._disk_index[k])
+                    self._remember(k, vec)
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+                found.append(vec)
+        return found
+    
+    def put_many(self, texts: List[str], embeddings: np.ndarray):
+        """Store freshly computed (normalised) embeddings."""
+        with self._lock:
+            new_keys, new_rows = [], []
+            for text, vec in zip(texts, embeddings):
+                k = self.key(text)
+                self._remember(k, vec)
+                if self._disk_path and k not in self._disk_index:
+                    new_keys.append(k)
+                    new_rows.append(vec)
+            if new_keys:
+                self._append_disk(new_keys, np.vstack(new_rows))
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "model_name": self.model_name,
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "disk_entries": len(self._disk_index),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+    
+    def _remember(self, k: str, vec: np.ndarray):
+        self._lru[k] = vec
+        self._lru.move_to_end(k)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+    
+    # --- On-disk store: keys.txt (one key per row) + vectors.f16 (raw rows) ---
+    
+    @contextmanager
+    def _disk_locked(self):
+        with open(os.path.join(self._disk_path, ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    def _load_disk(self):
+        with self._disk_locked():
+            self._sync_disk()
+        if self._disk_count:
+            self._map_disk()
+            logger.info(f"Embedding cache: mapped {len(self._disk_index)} stored embeddings from {self._disk_path}")
+    
+    def _sync_disk(self):
+        """
+        Index the rows other processes appended since the last sync. Must hold the
+        disk lock. A crash between the two appends can leave one file longer than
+        the other; the extra bytes are cut off so the next append lines up again.
+        """
+        if self._dim is None:
+            meta_file = os.path.join(self._disk_path, "meta.json")
+            if not os.path.exists(meta_file):
+                return
+            with open(meta_file) as f:
+                self._dim = json.load(f)["dim"]
+        
+        keys_file = os.path.join(self._disk_path, "keys.txt")
+        vectors_file = os.path.join(self._disk_path, "vectors.f16")
+        row_bytes = self._dim * 2
+        keys_size = os.path.getsize(keys_file) if os.path.exists(keys_file) else 0
+        vectors_size = os.path.getsize(vectors_file) if os.path.exists(vectors_file) else 0
+        rows = min(keys_size // KEY_ROW_BYTES, vectors_size // row_bytes)
+        if keys_size != rows * KEY_ROW_BYTES:
+            os.truncate(keys_file, rows * KEY_ROW_BYTES)
+        if vectors_size != rows * row_bytes:
+            os.truncate(vectors_file, rows * row_bytes)
+        if rows <= self._disk_count:
+            return
+        
+        with open(keys_file, "rb") as f:
+            f.seek(self._disk_count * KEY_ROW_BYTES)
+            new_keys = f.read((rows - self._disk_count) * KEY_ROW_BYTES).decode("ascii").split()
+        for i, k in enumerate(new_keys, start=self._disk_count):
+            self._disk_index.setdefault(k, i)
+        self._disk_count = rows
+    
+    def _map_disk(self):
+        self._disk_rows = np.memmap(
+            os.path.join(self._disk_path, "vectors.f16"),
+            dtype=np.float16,
+            mode="r",
+            shape=(self._disk_count, self._dim)
+        ) if self._disk_count else None
+    
+    def _disk_row(self, row: int) -> np.ndarray:
+        if self._disk_rows is None or row >= self._disk_rows.shape[0]:
+            self._map_disk()
+        return np.asarray(self._disk_rows[row], dtype=np.float32)
+    
+    def _append_disk(self, keys: List[str], rows: np.ndarray):
+        with self._disk_locked():
+            self._sync_disk()
+            if self._dim is None:
+                self._dim = int(rows.shape[1])
+                with open(os.path.join(self._disk_path, "meta.json"), "w") as f:
+                    json.dump({"model_name": self.model_name, "dim": self._dim}, f)
+            
+            # Another process may have stored some of these since they were looked up
+            fresh = {k: i for i, k in enumerate(keys) if k not in self._disk_index}
+            if not fresh:
+                return
+            with open(os.path.join(self._disk_path, "vectors.f16"), "ab") as f:
+                f.write(np.ascontiguousarray(rows[list(fresh.values())], dtype=np.float16).tobytes())
+            with open(os.path.join(self._disk_path, "keys.txt"), "a") as f:
+                f.write("".join(f"{k}\n" for k in fresh))
+            for row, k in enumerate(fresh, start=self._disk_count):
+                self._disk_index[k] = row
+            self._disk_count += len(fresh)
+
 class BiasMonitor:
     """
     Real-time bias detection using semantic similarity.
@@ -22,7 +213,15 @@ class BiasMonitor:
     def __init__(
         self, 
         model_name: str = 'all-MiniLM-L6-v2',
-        bias_threshold: float = 0.30
+        bias_threshold: float = 0.30,
+        encode_batch_size: int = 256,
+        cache_size: int = 4096,
+        cache_dir: Optional[str] = None,
+        backend: str = "torch",
+        model_dir: Optional[str] = None,
+        model_revision: Optional[str] = None,
+        transcript_cache_size: int = 256,
+        thresholds_file: Optional[str] = None
     ):
         """
         Initialize the bias monitor.
@@ -30,11 +229,33 @@ class BiasMonitor:
         Args:
             model_name: Sentence transformer model to use
             bias_threshold: Minimum similarity score (0-1). Scores below indicate bias.
+            encode_batch_size: Maximum texts per padded forward pass
+            cache_size: Embedding LRU capacity (0 disables caching)
+            cache_dir: Optional directory for the persistent float16 embedding store
+            backend: "torch" (SentenceTransformer) or "onnx" (int8 onnxruntime on CPU)
+            model_dir: Pinned local model artifact (see model_loader); loads offline
+                with checksum verification instead of going through the hub
+            model_revision: Hub commit hash the model must come from; checked against
+                model_dir's manifest, or passed to the hub download without one
+            transcript_cache_size: Videos whose transcript chunk embeddings are kept for grounding
+            thresholds_file: Calibrated thresholds JSON (see calibrate.py); re-read when it changes
         """
-        logger.info(f"Initializing BiasMonitor with model: {model_name}")
+        logger.info(f"Initializing BiasMonitor with model: {model_name} (backend: {backend})")
+        
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown bias backend: {backend}")
         
         try:
-            self.model = SentenceTransformer(model_name)
+            if model_dir:
+                enable_offline_mode()
+                model_name = verify_model_dir(model_dir, model_revision).get("model_name", model_name)
+            if backend == "onnx":
+                from onnx_encoder import OnnxEncoder
+                self.model = OnnxEncoder(model_dir or model_name, export_dir=os.getenv("BIAS_ONNX_DIR") or None)
+            elif model_dir:
+                self.model = load_local_model(model_dir, verify=False, warm_up=False)
+            else:
+                self.model = SentenceTransformer(model_name, revision=model_revision)
             logger.info("Sentence transformer model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load sentence transformer model: {e}")
@@ -42,6 +263,21 @@ class BiasMonitor:
         
         self.bias_threshold = bias_threshold
         self.model_name = model_name
+        self.encode_batch_size = encode_batch_size
+        self.backend = backend
+        # Quantised embeddings differ slightly, so each backend gets its own cache keys
+        cache_model = model_name if backend == "torch" else f"{model_name}:{backend}"
+        self.cache = EmbeddingCache(cache_model, cache_size, cache_dir) if cache_size > 0 else None
+        self.transcript_cache = TranscriptChunkCache(transcript_cache_size) if transcript_cache_size > 0 else None
+        
+        # Per-category / per-language overrides of bias_threshold
+        self.category_thresholds: Dict[str, float] = {}
+        self.language_thresholds: Dict[str, float] = {}
+        self.thresholds_file = thresholds_file
+        self._thresholds_mtime: Optional[float] = None
+        self._thresholds_checked_at = 0.0
+        if thresholds_file:
+            self.reload_thresholds()
         
         logger.info(f"BiasMonitor initialized with threshold: {bias_threshold}")
     
@@ -49,7 +285,9 @@ class BiasMonitor:
         self, 
         video_title: str, 
         generated_summary: str,
-        summary_type: str = "video"
+        summary_type: str = "video",
+        category: Optional[str] = None,
+        language: Optional[str] = None
     ) -> Dict:
         """
         Check for bias by comparing semantic similarity between title and summary.
@@ -58,12 +296,230 @@ class BiasMonitor:
             video_title: The title of the YouTube video
             generated_summary: The AI-generated summary
             summary_type: Type of summary ("video" or "comment")
+            category: Optional video category (selects a calibrated threshold)
+            language: Optional video language (selects a calibrated threshold)
         
         Returns:
             Dictionary with bias detection results
         """
+        return self.check_bias_many(
+            [video_title], [generated_summary], [summary_type], [category], [language]
+        )[0]
+    
+    def check_bias_many(
+        self,
+        video_titles: List[str],
+        generated_summaries: List[str],
+        summary_types: Optional[List[str]] = None,
+        categories: Optional[List[Optional[str]]] = None,
+        languages: Optional[List[Optional[str]]] = None
+    ) -> List[Dict]:
+        """
+        Batched check_bias: every title and summary that needs scoring is encoded
+        in a single padded batch and the similarities come from one vectorised dot.
+        
+        Args:
+            video_titles: Titles, one per item
+            generated_summaries: Summaries, aligned with video_titles
+            summary_types: Optional per-item summary types (default "video")
+            categories: Optional per-item categories for calibrated thresholds
+            languages: Optional per-item languages for calibrated thresholds
+        
+        Returns:
+            List of result dictionaries in input order (same shape as check_bias)
+        """
+        if len(video_titles) != len(generated_summaries):
+            raise ValueError("video_titles and generated_summaries must have the same length")
+        if summary_types is None:
+            summary_types = ["video"] * len(video_titles)
+        categories = categories or [None] * len(video_titles)
+        languages = languages or [None] * len(video_titles)
+        self.maybe_reload_thresholds()
+        
+        results: List[Optional[Dict]] = [None] * len(video_titles)
+        to_score = []
+        
+        for i, (title, summary) in enumerate(zip(video_titles, generated_summaries)):
+            precheck = self._precheck(title, summary)
+            if precheck is not None:
+                results[i] = precheck
+            else:
+                to_score.append(i)
+        
+        if not to_score:
+            return results
+        
+        # Deduplicate texts: titles repeat across summary types and retries
+        positions: Dict[str, int] = {}
+        title_rows = [positions.setdefault(video_titles[i], len(positions)) for i in to_score]
+        summary_rows = [positions.setdefault(generated_summaries[i], len(positions)) for i in to_score]
+        texts = list(positions)
+        
+        try:
+            logger.debug(f"Generating embeddings for {len(texts)} texts ({len(to_score)} pairs)")
+            embeddings = self.embed(texts)
+            
+            # Rows are unit-normalised, so the row-wise dot is the cosine similarity
+            scores = np.einsum("ij,ij->i", embeddings[title_rows], embeddings[summary_rows])
+        except Exception as e:
+            logger.error(f"Error during bias check: {e}", exc_info=True)
+            for i in to_score:
+                results[i] = self._create_biased_result(
+                    video_titles[i],
+                    generated_summaries[i],
+                    0.0,
+                    f"Error during check: {str(e)}"
+                )
+            return results
+        
+        for i, score in zip(to_score, scores):
+            similarity_score = float(score)
+            summary = generated_summaries[i]
+            summary_type = summary_types[i]
+            
+            # Determine if biased
+            threshold = self.threshold_for(categories[i], languages[i])
+            is_biased = similarity_score < threshold
+            
+            logger.info(
+                f"{summary_type.capitalize()} Summary - "
+                f"Similarity: {similarity_score:.4f}, "
+                f"Biased: {is_biased}"
+            )
+            
+            results[i] = {
+                "similarity_score": similarity_score,
+                "is_biased": is_biased,
+                "threshold": threshold,
+                "summary_preview": summary[:100] + "..." if len(summary) > 100 else summary,
+                "video_title": video_titles[i],
+                "summary_type": summary_type
+            }
+        
+        return results
+    
+    def check_comment_coverage(
+        self,
+        comments: List[str],
+        comment_summary: str,
+        cluster_threshold: float = 0.55,
+        coverage_threshold: float = 0.40,
+        min_cluster_size: int = 2
+    ) -> Dict:
+        """
+        Check which comment discussion clusters the comment summary covers.
+        
+        Args:
+            comments: Individual comments the summary was built from
+            comment_summary: The generated comment summary
+            cluster_threshold: Similarity for a comment to join a cluster
+            coverage_threshold: Similarity for a summary sentence to cover a cluster
+            min_cluster_size: Smaller clusters are ignored as noise
+        
+        Returns:
+            Dictionary with coverage results (see comment_coverage.comment_coverage)
+        """
+        # Comment sets are large and mostly one-off, so they skip the embedding
+        # cache rather than evicting titles and summaries from it
+        comment_embeddings = self._encode(comments)
+        sentences = split_sentences(comment_summary)
+        sentence_embeddings = self.embed(sentences) if sentences else np.zeros((0, comment_embeddings.shape[1]), dtype=np.float32)
+        
+        result = comment_coverage(
+            comment_embeddings,
+            sentence_embeddings,
+            comments,
+            cluster_threshold=cluster_threshold,
+            coverage_threshold=coverage_threshold,
+            min_cluster_size=min_cluster_size
+        )
+        logger.info(
+            f"Comment Coverage - {result['covered_share']:.0%} of clustered comments covered "
+            f"({result['num_major_clusters']} clusters, {len(result['missed_clusters'])} missed shown)"
+        )
+        return result
+    
+    def check_grounding(
+        self,
+        video_id: str,
+        transcript: str,
+        summary: str,
+        threshold: float = 0.35,
+        chunk_words: int = 80,
+        overlap: int = 20
+    ) -> Optional[Dict]:
+        """
+        Check that each summary sentence is supported by some transcript chunk.
         
-        # Input validation
+        Args:
+            video_id: Video the transcript belongs to (chunk cache key)
+            transcript: Full transcript text
+            summary: The generated video summary
+            threshold: Minimum best-chunk similarity for a supported sentence
+            chunk_words: Words per transcript chunk
+            overlap: Words shared by consecutive chunks
+        
+        Returns:
+            Dictionary with grounding results, or None when there is nothing to score
+        """
+        sentences = split_sentences(summary)
+        if not sentences or not transcript or not transcript.strip():
+            return None
+        
+        key = TranscriptChunkCache.key(video_id, transcript, chunk_words, overlap)
+        chunks = chunk_transcript(transcript, chunk_words, overlap)
+        chunk_embeddings = self.transcript_cache.get(key) if self.transcript_cache else None
+        
+        if chunk_embeddings is None:
+            # Cold video: chunks and sentences share one padded encode
+            embeddings = self._encode(chunks + sentences)
+            chunk_embeddings, sentence_embeddings = embeddings[:len(chunks)], embeddings[len(chunks):]
+            if self.transcript_cache:
+                self.transcript_cache.put(key, chunk_embeddings)
+        else:
+            sentence_embeddings = self._encode(sentences)
+        
+        result = grounding_scores(chunk_embeddings, sentence_embeddings, sentences, chunks, threshold)
+        logger.info(
+            f"Grounding - score {result['grounding_score']:.4f}, "
+            f"{len(result['unsupported_sentences'])}/{len(sentences)} sentences unsupported"
+        )
+        return result
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Return L2-normalised float32 embeddings for texts, serving repeats from the
+        embedding cache and encoding the rest in one padded batch.
+        """
+        if self.cache is None:
+            return self._encode(texts)
+        
+        cached = self.cache.get_many(texts)
+        missing = list(dict.fromkeys(t for t, vec in zip(texts, cached) if vec is None))
+        if missing:
+            fresh = self._encode(missing)
+            self.cache.put_many(missing, fresh)
+            by_text = dict(zip(missing, fresh))
+            cached = [vec if vec is not None else by_text[t] for t, vec in zip(texts, cached)]
+        
+        return np.vstack(cached)
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts in one padded batch and return L2-normalised float32 rows."""
+        embeddings = np.asarray(
+            self.model.encode(
+                texts,
+                batch_size=max(1, min(len(texts), self.encode_batch_size)),
+                convert_to_numpy=True,
+                show_progress_bar=False
+            ),
+            dtype=np.float32
+        )
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+    
+    def _precheck(self, video_title: str, generated_summary: str) -> Optional[Dict]:
+        """Input validation. Returns a final result for items that skip scoring."""
         if not video_title or not video_title.strip():
             logger.warning("Empty video title provided, skipping bias check")
             return self._create_skip_result("Empty video title")
@@ -84,44 +540,7 @@ class BiasMonitor:
             logger.info("Placeholder message detected, skipping bias check")
             return self._create_skip_result("Placeholder message")
         
-        try:
-            # Generate embeddings
-            logger.debug(f"Generating embeddings for title and {summary_type} summary")
-            title_embedding = self.model.encode([video_title])
-            summary_embedding = self.model.encode([generated_summary])
-            
-            # Calculate cosine similarity
-            similarity_score = cosine_similarity(title_embedding, summary_embedding)[0][0]
-            similarity_score = float(similarity_score)
-            
-            # Determine if biased
-            is_biased = similarity_score < self.bias_threshold
-            
-            logger.info(
-                f"{summary_type.capitalize()} Summary - "
-                f"Similarity: {similarity_score:.4f}, "
-                f"Biased: {is_biased}"
-            )
-            
-            result = {
-                "similarity_score": similarity_score,
-                "is_biased": is_biased,
-                "threshold": self.bias_threshold,
-                "summary_preview": generated_summary[:100] + "..." if len(generated_summary) > 100 else generated_summary,
-                "video_title": video_title,
-                "summary_type": summary_type
-            }
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error during bias check: {e}", exc_info=True)
-            return self._create_biased_result(
-                video_title,
-                generated_summary,
-                0.0,
-                f"Error during check: {str(e)}"
-            )
+        return None
     
     def _create_skip_result(self, reason: str) -> Dict:
         """Create a result for skipped bias checks."""
@@ -153,29 +572,148 @@ class BiasMonitor:
             "error_reason": reason
         }
     
-    def update_threshold(self, new_threshold: float):
-        """Update the bias detection threshold."""
+    def warm_up(self):
+        """Run one dummy encode so the first real request doesn't pay for lazy init."""
+        self._encode([WARMUP_TEXT])
+    
+    def update_threshold(
+        self,
+        new_threshold: float,
+        category: Optional[str] = None,
+        language: Optional[str] = None
+    ):
+        """
+        Update the bias detection threshold, either the default or the override
+        for one category or language.
+        """
         if not 0 <= new_threshold <= 1:
             raise ValueError("Threshold must be between 0 and 1")
+        if category and language:
+            raise ValueError("Set a category or a language threshold, not both")
         
-        logger.info(f"Updating bias threshold from {self.bias_threshold} to {new_threshold}")
-        self.bias_threshold = new_threshold
+        if category:
+            key = _threshold_key(category)
+            logger.info(f"Updating bias threshold for category '{key}' to {new_threshold}")
+            self.category_thresholds[key] = new_threshold
+        elif language:
+            key = _threshold_key(language)
+            logger.info(f"Updating bias threshold for language '{key}' to {new_threshold}")
+            self.language_thresholds[key] = new_threshold
+        else:
+            logger.info(f"Updating bias threshold from {self.bias_threshold} to {new_threshold}")
+            self.bias_threshold = new_threshold
+    
+    def threshold_for(self, category: Optional[str] = None, language: Optional[str] = None) -> float:
+        """Threshold for an item: category override, then language override, then the default."""
+        if category:
+            threshold = self.category_thresholds.get(_threshold_key(category))
+            if threshold is not None:
+                return threshold
+        if language:
+            threshold = self.language_thresholds.get(_threshold_key(language))
+            if threshold is not None:
+                return threshold
+        return self.bias_threshold
+    
+    def reload_thresholds(self, path: Optional[str] = None) -> Dict:
+        """
+        Apply a calibrated thresholds file ({"default", "by_category", "by_language"}).
+        Overrides not in the file are dropped. Returns the thresholds now in effect.
+        """
+        path = path or self.thresholds_file
+        if not path:
+            raise ValueError("No thresholds file configured")
+        
+        mtime = os.path.getmtime(path)
+        with open(path) as f:
+            data = json.load(f)
+        
+        # Validate everything before touching live state
+        default = float(data.get("default", self.bias_threshold))
+        by_category = {_threshold_key(k): float(v) for k, v in data.get("by_category", {}).items()}
+        by_language = {_threshold_key(k): float(v) for k, v in data.get("by_language", {}).items()}
+        for value in [default, *by_category.values(), *by_language.values()]:
+            if not 0 <= value <= 1:
+                raise ValueError(f"Threshold out of range in {path}: {value}")
+        
+        self.update_threshold(default)
+        self.category_thresholds = by_category
+        self.language_thresholds = by_language
+        self.thresholds_file = path
+        self._thresholds_mtime = mtime
+        logger.info(
+            f"🎚️ Loaded bias thresholds from {path} "
+            f"({len(by_category)} categories, {len(by_language)} languages)"
+        )
+        return self.thresholds()
+    
+    def maybe_reload_thresholds(self):
+        """Re-read the thresholds file if it changed (checked at most every few seconds)."""
+        if not self.thresholds_file:
+            return
+        now = time.monotonic()
+        if now - self._thresholds_checked_at < THRESHOLDS_CHECK_INTERVAL:
+            return
+        self._thresholds_checked_at = now
+        try:
+            if os.path.getmtime(self.thresholds_file) != self._thresholds_mtime:
+                self.reload_thresholds()
+        except (OSError, ValueError) as e:
+            # Keep serving with the thresholds already loaded
+            logger.error(f"Failed to reload bias thresholds: {e}")
+    
+    def thresholds(self) -> Dict:
+        """Thresholds currently in effect."""
+        return {
+            "default": self.bias_threshold,
+            "by_category": dict(self.category_thresholds),
+            "by_language": dict(self.language_thresholds),
+            "source": self.thresholds_file
+        }
+
+
+def _threshold_key(name: str) -> str:
+    return name.strip().lower()
 
 
 # Singleton instance
 _bias_monitor_instance = None
+_bias_monitor_lock = threading.Lock()
 
 def get_bias_monitor() -> BiasMonitor:
     """Get or create the singleton BiasMonitor instance."""
     global _bias_monitor_instance
     
-    if _bias_monitor_instance is None:
+    if _bias_monitor_instance is not None:
+        return _bias_monitor_instance
+    
+    # Startup loads in the background, so a request may race the loader
+    with _bias_monitor_lock:
+        if _bias_monitor_instance is not None:
+            return _bias_monitor_instance
+        
         model_name = os.getenv("BIAS_MODEL_NAME", "all-MiniLM-L6-v2")
         threshold = float(os.getenv("BIAS_THRESHOLD", "0.30"))
+        encode_batch_size = int(os.getenv("BIAS_ENCODE_BATCH_SIZE", "256"))
+        cache_size = int(os.getenv("BIAS_EMBED_CACHE_SIZE", "4096"))
+        cache_dir = os.getenv("BIAS_EMBED_CACHE_DIR") or None
+        backend = os.getenv("BIAS_BACKEND", "torch").lower()
+        model_dir = os.getenv("BIAS_MODEL_DIR") or None
+        model_revision = os.getenv("BIAS_MODEL_REVISION") or None
+        transcript_cache_size = int(os.getenv("BIAS_TRANSCRIPT_CACHE_SIZE", "256"))
+        thresholds_file = os.getenv("BIAS_THRESHOLDS_FILE") or None
         
         _bias_monitor_instance = BiasMonitor(
             model_name=model_name,
-            bias_threshold=threshold
+            bias_threshold=threshold,
+            encode_batch_size=encode_batch_size,
+            cache_size=cache_size,
+            cache_dir=cache_dir,
+            backend=backend,
+            model_dir=model_dir,
+            model_revision=model_revision,
+            transcript_cache_size=transcript_cache_size,
+            thresholds_file=thresholds_file
         )
     
     return _bias_monitor_instance
\ No newline at end of file
@@ -0,0 +1,333 @@
+"""
+Bias Threshold Calibration
+Derives BiasMonitor thresholds from data instead of the fixed BIAS_THRESHOLD.
+It writes a thresholds file ({"default", "by_category", "by_language"}) that
+the service hot-reloads from BIAS_THRESHOLDS_FILE.
+
+Sources (any mix):
+  --video-list  Model_Dev_Pipeline videoList.json. Each video's summary is a
+                labelled pair (acceptable when the judge score passes), and
+                titles paired with other categories' summaries are added as
+                off-topic negatives. Videos without a title use the opening
+                words of the transcript as a stand-in. The seed list has at
+                most three videos per category and one per language, so with
+                the default --min-group-size of 5 it only calibrates the
+                default; per-category and per-language thresholds need
+                --labelled data or --logs. Its category names are free-form,
+                while the service looks thresholds up by YouTube category name
+                (e.g. "education", "howto & style"), so labelled corpora should
+                use those.
+  --labelled    JSONL of {title, summary | score, label, category?, language?};
+                label 1 / "ok" means the summary is acceptable.
+  --logs        validate / push service logs. Scores are unlabelled, so they
+                calibrate by quantile (historical discard rate). A run logs
+                its score in both services; each video's score counts once.
+
+With labels, a threshold is picked per group by --objective:
+  max-fpr  highest threshold that discards at most --max-fpr of acceptable summaries
+  youden   maximise TPR - FPR
+  f1       maximise F1 of flagging off-topic summaries
+
+Usage:
+    python calibrate.py --video-list ../../Model_Dev_Pipeline/src/videoList.json --out thresholds.json
+    python calibrate.py --logs push.log validate.log --discard-rate 0.02 --out thresholds.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# videoList "speaker" values look like "English female" or "Hindi"
+LANGUAGE_CODES = {
+    "english": "en", "hindi": "hi", "spanish": "es", "arabic": "ar", "french": "fr",
+    "german": "de", "portuguese": "pt", "chinese": "zh", "japanese": "ja", "korean": "ko"
+}
+
+# validate: "✅ Bias Check Passed for abc123: Score 0.9703" / "⚠️ BIAS DETECTED for abc123: Score 0.1200 < 0.30"
+_VALIDATE_LINE = re.compile(r"(?:Bias Check Passed|BIAS DETECTED) for (?P<video_id>[\w-]+): Score (?P<score>-?\d+(?:\.\d+)?)")
+# push: "PUSH: Video 'Title' (abc123) | Result: ✅ UNBIASED (Score: 0.97)"; older lines have no video id
+_PUSH_LINE = re.compile(r"PUSH: Video '(?P<title>.*)'(?: \((?P<video_id>[\w-]+)\))? \| Result: .*\(Score: (?P<score>-?\d+(?:\.\d+)?)\)")
+# bias_monitor: "Video Summary - Similarity: 0.9703, Biased: False" (no video id)
+_MONITOR_LINE = re.compile(r"Summary - Similarity: (?P<score>-?\d+(?:\.\d+)?), Biased: (?P<biased>True|False)")
+# push logs scores to two decimals, so that is the precision runs are matched at
+LOG_MATCH_DECIMALS = 2
+_TAG = re.compile(r"\[[^\]]*\]")
+
+
+# --- Corpus loading ---
+
+def title_proxy(transcript: str, words: int = 25) -> str:
+    """Opening words of a transcript, minus [Music]-style tags."""
+    return " ".join(_TAG.sub(" ", transcript or "").split()[:words])
+
+
+def language_code(speaker: Optional[str]) -> Optional[str]:
+    if not speaker:
+        return None
+    first = speaker.split()[0].lower()
+    return LANGUAGE_CODES.get(first, first)
+
+
+def load_video_list(path: str, judge_pass: float = 0.5, negatives_per_video: int = 3, seed: int = 0) -> List[Dict]:
+    """Labelled rows from a Model_Dev_Pipeline videoList.json."""
+    with open(path) as f:
+        videos = json.load(f)["videoList"]
+
+    rows = []
+    for v in videos:
+        title = v.get("video_title") or v.get("title") or title_proxy(v.get("transcript", ""))
+        score = v.get("trans_eval_score")
+        rows.append({
+            "title": title,
+            "summary": v.get("trans_summary", ""),
+            "label": 1 if score is None or float(score) >= judge_pass else 0,
+            "category": v.get("category"),
+            "language": language_code(v.get("speaker")),
+            "source": "video_list"
+        })
+
+    # Off-topic negatives: a title paired with summaries from other categories
+    rng = np.random.default_rng(seed)
+    originals = list(rows)
+    for r in originals:
+        others = [o for o in originals if o["category"] != r["category"] and o["summary"]]
+        for o in rng.permutation(len(others))[:negatives_per_video]:
+            rows.append({**r, "summary": others[o]["summary"], "label": 0, "source": "video_list_mismatch"})
+
+    return rows
+
+
+def _parse_label(value) -> int:
+    if isinstance(value, str):
+        return 1 if value.strip().lower() in ("1", "ok", "true", "acceptable", "unbiased") else 0
+    return 1 if value else 0
+
+
+def load_labelled(path: str) -> List[Dict]:
+    rows = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                row["label"] = _parse_label(row.get("label"))
+                rows.append(row)
+    return rows
+
+
+def parse_log_scores(lines: Iterable[str]) -> List[Dict]:
+    """
+    Unlabelled historical scores from validate / push log lines.
+
+    validate and push both log a run's score, so lines carrying a video id are
+    keyed by (video_id, score): the two lines of one run, and re-runs that
+    reused the same summary, count once (validate's four-decimal score wins).
+    Lines without a video id (older logs) cannot be matched; bias_monitor's are
+    used only when no validate line has an id, and push's only when the logs
+    have no validate lines at all.
+    """
+    by_run: Dict[tuple, Dict] = {}
+    monitor_rows, push_rows = [], []
+    has_validate_ids = False
+    for line in lines:
+        match = _VALIDATE_LINE.search(line) or _PUSH_LINE.search(line)
+        if match and match.group("video_id"):
+            score = float(match.group("score"))
+            key = (match.group("video_id"), round(score, LOG_MATCH_DECIMALS))
+            from_validate = match.re is _VALIDATE_LINE
+            has_validate_ids = has_validate_ids or from_validate
+            if from_validate or key not in by_run:
+                by_run[key] = {"score": score, "label": None, "source": "logs"}
+            continue
+        if match:
+            push_rows.append({"score": float(match.group("score")), "label": None, "source": "logs"})
+            continue
+        match = _MONITOR_LINE.search(line)
+        if match:
+            monitor_rows.append({"score": float(match.group("score")), "label": None, "source": "logs"})
+
+    rows = list(by_run.values())
+    if not has_validate_ids:
+        rows += monitor_rows
+    if not has_validate_ids and not monitor_rows:
+        rows += push_rows
+    return rows
+
+
+def score_rows(rows: List[Dict], model_name: str, model_dir: Optional[str] = None):
+    """Fill in similarity scores for rows that have a title and summary but no score."""
+    todo = [r for r in rows if r.get("score") is None]
+    if not todo:
+        return
+
+    from bias_monitor import BiasMonitor
+    monitor = BiasMonitor(model_name=model_name, model_dir=model_dir, cache_size=0)
+    results = monitor.check_bias_many([r["title"] for r in todo], [r["summary"] for r in todo])
+    for row, result in zip(todo, results):
+        row["score"] = result["similarity_score"]
+
+
+# --- Threshold selection ---
+
+def choose_threshold(scores: np.ndarray, labels: np.ndarray, objective: str = "max-fpr", max_fpr: float = 0.02) -> Dict:
+    """
+    Pick a threshold (flag = score < t) from labelled scores; label 1 = acceptable.
+
+    Returns:
+        {"threshold", "fpr", "tpr"} measured on the given scores
+    """
+    ok = np.sort(scores[labels == 1])
+    bad = np.sort(scores[labels == 0])
+
+    values = np.unique(scores)
+    candidates = np.concatenate([[values[0] - 1e-6], (values[:-1] + values[1:]) / 2, [values[-1] + 1e-6]])
+
+    # Flagged counts for every candidate at once
+    fp = np.searchsorted(ok, candidates, side="left")
+    tp = np.searchsorted(bad, candidates, side="left")
+    fpr = fp / max(len(ok), 1)
+    tpr = tp / max(len(bad), 1) if len(bad) else np.zeros_like(fpr)
+
+    if objective == "max-fpr":
+        allowed = np.flatnonzero(fpr <= max_fpr)
+        best = allowed[-1]
+    elif objective == "youden":
+        best = int(np.argmax(tpr - fpr))
+    elif objective == "f1":
+        precision = tp / np.maximum(tp + fp, 1)
+        f1 = 2 * precision * tpr / np.maximum(precision + tpr, 1e-12)
+        best = int(np.argmax(f1))
+    else:
+        raise ValueError(f"Unknown objective: {objective}")
+
+    return {
+        "threshold": round(float(np.clip(candidates[best], 0.0, 1.0)), 4),
+        "fpr": round(float(fpr[best]), 4),
+        "tpr": round(float(tpr[best]), 4)
+    }
+
+
+def calibrate(
+    rows: List[Dict],
+    objective: str = "max-fpr",
+    max_fpr: float = 0.02,
+    discard_rate: float = 0.02,
+    min_group_size: int = 5
+) -> Dict:
+    """
+    Thresholds from scored rows: labelled rows use choose_threshold, unlabelled
+    ones the discard_rate quantile. Groups with too few rows, or labelled groups
+    with too few acceptable rows, fall back to the default.
+    """
+    labelled = [r for r in rows if r.get("label") is not None and r.get("score") is not None]
+    unlabelled = [r for r in rows if r.get("label") is None and r.get("score") is not None]
+
+    def pick(group: List[Dict]) -> Optional[Dict]:
+        group_labelled = [r for r in group if r.get("label") is not None]
+        if sum(r["label"] for r in group_labelled) >= min_group_size:
+            scores = np.array([r["score"] for r in group_labelled], dtype=np.float64)
+            labels = np.array([r["label"] for r in group_labelled])
+            return {**choose_threshold(scores, labels, objective, max_fpr), "n": len(group_labelled), "method": objective}
+        if group_labelled:
+            # Mostly negatives (e.g. videoList mismatches); a quantile over them would sit below every real summary
+            return None
+        scores = np.array([r["score"] for r in group if r.get("score") is not None], dtype=np.float64)
+        if len(scores) >= min_group_size:
+            return {
+                "threshold": round(float(np.clip(np.quantile(scores, discard_rate), 0.0, 1.0)), 4),
+                "n": len(scores),
+                "method": f"quantile@{discard_rate}"
+            }
+        return None
+
+    overall = pick(labelled) if labelled else None
+    if overall is None:
+        overall = pick(unlabelled)
+    if overall is None:
+        raise ValueError(f"Not enough scored rows to calibrate (need {min_group_size})")
+
+    report = {"default": overall, "by_category": {}, "by_language": {}}
+    for field, out in (("category", "by_category"), ("language", "by_language")):
+        groups = defaultdict(list)
+        for r in labelled + unlabelled:
+            if r.get(field):
+                groups[str(r[field]).strip().lower()].append(r)
+        for name, group in sorted(groups.items()):
+            result = pick(group)
+            if result is not None:
+                report[out][name] = result
+            else:
+                logger.info(f"{field} '{name}': {len(group)} rows, too few for its own threshold (min_group_size {min_group_size})")
+
+    return {
+        "default": overall["threshold"],
+        "by_category": {k: v["threshold"] for k, v in report["by_category"].items()},
+        "by_language": {k: v["threshold"] for k, v in report["by_language"].items()},
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "samples": {"labelled": len(labelled), "unlabelled": len(unlabelled)},
+        "report": report
+    }
+
+
+def write_thresholds(thresholds: Dict, path: str):
+    """Write atomically so a hot-reloading service never reads a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(thresholds, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate BiasMonitor thresholds from data")
+    parser.add_argument("--video-list", help="Model_Dev_Pipeline videoList.json")
+    parser.add_argument("--labelled", nargs="*", default=[], help="Labelled JSONL corpora")
+    parser.add_argument("--logs", nargs="*", default=[], help="validate / push log files")
+    parser.add_argument("--objective", choices=["max-fpr", "youden", "f1"], default="max-fpr")
+    parser.add_argument("--max-fpr", type=float, default=0.02, help="Tolerated false-discard rate (max-fpr)")
+    parser.add_argument("--discard-rate", type=float, default=0.02, help="Quantile used for unlabelled scores")
+    parser.add_argument("--judge-pass", type=float, default=0.5, help="videoList judge score counted as acceptable")
+    parser.add_argument("--min-group-size", type=int, default=5)
+    parser.add_argument("--model", default=os.getenv("BIAS_MODEL_NAME", "all-MiniLM-L6-v2"))
+    parser.add_argument("--model-dir", default=os.getenv("BIAS_MODEL_DIR"))
+    parser.add_argument("--out", default="thresholds.json")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    rows: List[Dict] = []
+    if args.video_list:
+        rows += load_video_list(args.video_list, judge_pass=args.judge_pass)
+    for path in args.labelled:
+        rows += load_labelled(path)
+    for path in args.logs:
+        with open(path, errors="replace") as f:
+            rows += parse_log_scores(f)
+
+    score_rows(rows, args.model, args.model_dir)
+    thresholds = calibrate(
+        rows,
+        objective=args.objective,
+        max_fpr=args.max_fpr,
+        discard_rate=args.discard_rate,
+        min_group_size=args.min_group_size
+    )
+    write_thresholds(thresholds, args.out)
+
+    print(f"default: {thresholds['default']}  ({thresholds['report']['default']})")
+    for group in ("by_category", "by_language"):
+        for name, info in thresholds["report"][group].items():
+            print(f"{group[3:]:>9} {name:<20} {info['threshold']:.4f}  n={info['n']}  {info['method']}")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
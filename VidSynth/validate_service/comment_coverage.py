@@ -0,0 +1,148 @@
+"""
+Comment Coverage Module
+Checks whether the comment summary actually reflects the comments it claims
+to summarise. Comments are embedded in one batch and grouped into discussion
+clusters. The summary's sentences are embedded and scored against every
+comment with a single matrix product, and each cluster is reported as covered
+or missed.
+"""
+
+import logging
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+# Comments are clustered this many at a time against the leaders found so far
+CLUSTER_CHUNK = 256
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a summary into sentences (the LLM writes short plain sentences)."""
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text or "") if s.strip()]
+
+
+def cluster_comments(embeddings: np.ndarray, threshold: float) -> Tuple[np.ndarray, List[int]]:
+    """
+    Greedy leader clustering of L2-normalised embeddings.
+
+    A comment joins the most similar existing leader when that similarity is
+    at least threshold, otherwise it becomes a new leader. Comments are matched
+    against the known leaders a chunk at a time with one matrix product. Only
+    the comments that match no leader are resolved one by one, using the
+    chunk's own similarity matrix.
+
+    Returns:
+        (labels, leader indices); labels[i] is the cluster of comment i
+    """
+    n = len(embeddings)
+    labels = np.full(n, -1, dtype=np.int64)
+    leaders: List[int] = []
+
+    for start in range(0, n, CLUSTER_CHUNK):
+        chunk = embeddings[start:start + CLUSTER_CHUNK]
+
+        if leaders:
+            sims = chunk @ embeddings[leaders].T
+            best = sims.argmax(axis=1)
+            matched = sims[np.arange(len(chunk)), best] >= threshold
+            labels[start:start + len(chunk)][matched] = best[matched]
+        else:
+            matched = np.zeros(len(chunk), dtype=bool)
+
+        unmatched = np.flatnonzero(~matched)
+        if len(unmatched) == 0:
+            continue
+
+        intra = chunk[unmatched] @ chunk[unmatched].T
+        new_leaders: List[int] = []  # positions within unmatched
+        for j in range(len(unmatched)):
+            if new_leaders:
+                scores = intra[j, new_leaders]
+                k = int(scores.argmax())
+                if scores[k] >= threshold:
+                    labels[start + unmatched[j]] = labels[start + unmatched[new_leaders[k]]]
+                    continue
+            new_leaders.append(j)
+            labels[start + unmatched[j]] = len(leaders)
+            leaders.append(start + int(unmatched[j]))
+
+    return labels, leaders
+
+
+def comment_coverage(
+    comment_embeddings: np.ndarray,
+    sentence_embeddings: np.ndarray,
+    comments: List[str],
+    cluster_threshold: float = 0.55,
+    coverage_threshold: float = 0.40,
+    min_cluster_size: int = 2,
+    max_reported: int = 5
+) -> Dict:
+    """
+    Score how well summary sentences cover the comment clusters.
+
+    A cluster counts as covered when its centroid is at least coverage_threshold
+    similar to some summary sentence. Clusters smaller than min_cluster_size are
+    treated as noise and left out of the coverage share.
+
+    Args:
+        comment_embeddings: (n, d) L2-normalised comment embeddings
+        sentence_embeddings: (m, d) L2-normalised summary sentence embeddings
+        comments: The n comment texts (for representatives in the report)
+
+    Returns:
+        Dictionary matching CommentCoverageResult
+    """
+    if len(sentence_embeddings) == 0:
+        # Empty summary: nothing is covered
+        sentence_embeddings = np.zeros((1, comment_embeddings.shape[1]), dtype=np.float32)
+
+    labels, leaders = cluster_comments(comment_embeddings, cluster_threshold)
+    k = len(leaders)
+
+    # Full comment x sentence similarity matrix
+    similarity = comment_embeddings @ sentence_embeddings.T
+    comment_best = similarity.max(axis=1)
+
+    sizes = np.bincount(labels, minlength=k)
+    centroids = np.zeros((k, comment_embeddings.shape[1]), dtype=np.float32)
+    np.add.at(centroids, labels, comment_embeddings)
+    centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    cluster_best = (centroids @ sentence_embeddings.T).max(axis=1)
+
+    # Representative: the member closest to its centroid
+    closeness = np.einsum("ij,ij->i", comment_embeddings, centroids[labels])
+    order = np.lexsort((closeness, labels))
+    representative = order[np.searchsorted(labels[order], np.arange(k), side="right") - 1]
+
+    major = sizes >= min_cluster_size
+    covered = cluster_best >= coverage_threshold
+    major_total = int(sizes[major].sum())
+    share = float(sizes[major & covered].sum() / major_total) if major_total else 1.0
+
+    def describe(idx: np.ndarray) -> List[Dict]:
+        order = idx[np.argsort(-sizes[idx], kind="stable")][:max_reported]
+        return [
+            {
+                "size": int(sizes[c]),
+                "representative": comments[representative[c]][:200],
+                "similarity": round(float(cluster_best[c]), 4)
+            }
+            for c in order
+        ]
+
+    return {
+        "num_comments": len(comments),
+        "num_clusters": k,
+        "num_major_clusters": int(major.sum()),
+        "covered_share": round(share, 4),
+        "comment_share_covered": round(float((comment_best >= coverage_threshold).mean()), 4) if len(comments) else 1.0,
+        "threshold": coverage_threshold,
+        "covered_clusters": describe(np.flatnonzero(major & covered)),
+        "missed_clusters": describe(np.flatnonzero(major & ~covered))
+    }
@@ -0,0 +1,249 @@
+"""
+Encoder Pool Module
+Runs bias checks in dedicated worker processes instead of the API process's
+threadpool, so transformer forward passes never hold the GIL the event loop
+needs for parsing requests and answering health checks.
+
+Requests go onto a queue. A dispatcher thread coalesces whatever arrives
+within a short window into one check_bias_many batch and sends it to a
+worker. Each worker owns its own BiasMonitor, built once by the pool
+initializer.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+from bias_monitor import get_bias_monitor
+
+logger = logging.getLogger(__name__)
+
+
+# --- Worker-process side (module level so they pickle) ---
+
+def _init_worker(num_threads: int):
+    """Build and warm this worker's BiasMonitor before it takes any work."""
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+    get_bias_monitor().warm_up()
+
+
+def _warm_up() -> bool:
+    get_bias_monitor()
+    return True
+
+
+def _check_bias_batch(titles: List[str], summaries: List[str], categories: List, languages: List) -> List[Dict]:
+    return get_bias_monitor().check_bias_many(titles, summaries, categories=categories, languages=languages)
+
+
+def _call_monitor(method: str, args: tuple, kwargs: Dict):
+    return getattr(get_bias_monitor(), method)(*args, **kwargs)
+
+
+# --- API-process side ---
+
+class _Request:
+    __slots__ = ("titles", "summaries", "categories", "languages", "future")
+
+    def __init__(self, titles: List[str], summaries: List[str], categories: List, languages: List):
+        self.titles = titles
+        self.summaries = summaries
+        self.categories = categories
+        self.languages = languages
+        self.future: Future = Future()
+
+
+class EncoderPool:
+    """
+    Queue-fed pool of encoder worker processes with request coalescing.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        worker_threads: int = 1,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            workers: Worker processes, and so the number of batches in flight
+            max_batch_size: Most title/summary pairs coalesced into one batch
+            max_wait_ms: How long the dispatcher waits for more requests to join a batch
+            worker_threads: torch intra-op threads per worker (0 = torch default)
+            executor: Use this executor instead of spawning processes (tests, benchmarks)
+        """
+        if workers < 1 or max_batch_size < 1:
+            raise ValueError("workers and max_batch_size must be >= 1")
+
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        # spawn, not fork: the parent may already have torch threads running
+        self._executor = executor or ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(worker_threads,)
+        )
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._slots = threading.Semaphore(workers)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._batches = 0
+        self._pairs = 0
+        self._requests = 0
+
+        self._dispatcher = threading.Thread(target=self._run, name="encoder-pool-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+        logger.info(f"EncoderPool started (workers={workers}, max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms})")
+
+    def submit(
+        self,
+        titles: List[str],
+        summaries: List[str],
+        categories: Optional[List[Optional[str]]] = None,
+        languages: Optional[List[Optional[str]]] = None
+    ) -> Future:
+        """Queue a check_bias_many call; the Future resolves to its results."""
+        if len(titles) != len(summaries):
+            raise ValueError("titles and summaries must have the same length")
+        if self._closed:
+            raise RuntimeError("EncoderPool has been shut down")
+
+        request = _Request(
+            list(titles),
+            list(summaries),
+            list(categories or [None] * len(titles)),
+            list(languages or [None] * len(titles))
+        )
+        if not titles:
+            request.future.set_result([])
+        else:
+            self._queue.put(request)
+        return request.future
+
+    async def check_bias_many(
+        self,
+        titles: List[str],
+        summaries: List[str],
+        categories: Optional[List[Optional[str]]] = None,
+        languages: Optional[List[Optional[str]]] = None
+    ) -> List[Dict]:
+        """Awaitable submit() for async endpoints."""
+        return await asyncio.wrap_future(self.submit(titles, summaries, categories, languages))
+
+    async def call_monitor(self, method: str, *args, **kwargs):
+        """
+        Run any BiasMonitor method on a worker. Meant for checks that are already
+        one large batch (comment coverage, grounding), so they are not coalesced.
+        """
+        if self._closed:
+            raise RuntimeError("EncoderPool has been shut down")
+        future = self._executor.submit(_call_monitor, method, args, kwargs)
+        return await asyncio.wrap_future(future)
+
+    def warm_up(self, timeout: Optional[float] = None):
+        """Block until the workers have started and loaded their models."""
+        futures = [self._executor.submit(_warm_up) for _ in range(self.workers)]
+        done, _ = wait(futures, timeout=timeout)
+        for f in done:
+            f.result()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "requests": self._requests,
+                "batches_dispatched": self._batches,
+                "pairs_dispatched": self._pairs,
+                "avg_batch_size": round(self._pairs / self._batches, 2) if self._batches else 0.0,
+                "queue_depth": self._queue.qsize()
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work, flush the queue and stop the workers."""
+        self._closed = True
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self):
+        pending: Optional[_Request] = None
+        while True:
+            first = pending or self._queue.get()
+            pending = None
+            if first is None:
+                return
+
+            batch = [first]
+            size = len(first.titles)
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                if size + len(nxt.titles) > self.max_batch_size:
+                    pending = nxt
+                    break
+                batch.append(nxt)
+                size += len(nxt.titles)
+
+            self._dispatch(batch, size)
+            if stop:
+                return
+
+    def _dispatch(self, batch: List[_Request], size: int):
+        self._slots.acquire()
+        with self._lock:
+            self._batches += 1
+            self._pairs += size
+            self._requests += len(batch)
+
+        titles = [t for r in batch for t in r.titles]
+        summaries = [s for r in batch for s in r.summaries]
+        categories = [c for r in batch for c in r.categories]
+        languages = [lang for r in batch for lang in r.languages]
+        try:
+            future = self._executor.submit(_check_bias_batch, titles, summaries, categories, languages)
+        except Exception as e:
+            self._slots.release()
+            for r in batch:
+                r.future.set_exception(e)
+            return
+
+        def _complete(f: Future):
+            self._slots.release()
+            error = f.exception()
+            if error is not None:
+                for r in batch:
+                    r.future.set_exception(error)
+                return
+            results = f.result()
+            start = 0
+            for r in batch:
+                r.future.set_result(results[start:start + len(r.titles)])
+                start += len(r.titles)
+
+        future.add_done_callback(_complete)
@@ -0,0 +1,122 @@
+"""
+Grounding Module
+Transcript-grounded consistency check for the video summary. The transcript
+is split into overlapping word windows. Each summary sentence is scored by its
+best match over the chunk embedding matrix, and sentences with no supporting
+chunk are flagged. Chunk embeddings are cached per video, so re-validating
+the same transcript only encodes the summary.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_transcript(transcript: str, chunk_words: int = 80, overlap: int = 20) -> List[str]:
+    """Split a transcript into overlapping windows of chunk_words words."""
+    words = (transcript or "").split()
+    if not words:
+        return []
+
+    step = max(1, chunk_words - overlap)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + chunk_words]))
+        if start + chunk_words >= len(words):
+            break
+    return chunks
+
+
+class TranscriptChunkCache:
+    """
+    LRU of per-video chunk embedding matrices, keyed by video_id plus a hash of
+    the transcript (a re-fetched transcript that changed gets new chunks).
+    """
+
+    def __init__(self, max_videos: int = 256):
+        self.max_videos = max_videos
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(video_id: str, transcript: str, chunk_words: int, overlap: int) -> str:
+        digest = hashlib.sha256(transcript.encode("utf-8")).hexdigest()[:16]
+        return f"{video_id}:{digest}:{chunk_words}/{overlap}"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return matrix
+
+    def put(self, key: str, matrix: np.ndarray):
+        with self._lock:
+            self._entries[key] = matrix
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_videos:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "videos": len(self._entries),
+                "max_videos": self.max_videos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def grounding_scores(
+    chunk_embeddings: np.ndarray,
+    sentence_embeddings: np.ndarray,
+    sentences: List[str],
+    chunks: List[str],
+    threshold: float = 0.35
+) -> Dict:
+    """
+    Score each summary sentence by its best-matching transcript chunk.
+
+    Args:
+        chunk_embeddings: (c, d) L2-normalised transcript chunk embeddings
+        sentence_embeddings: (m, d) L2-normalised summary sentence embeddings
+        sentences: The m summary sentences
+        chunks: The c chunk texts (for the best-supporting excerpt)
+        threshold: Minimum best-chunk similarity for a sentence to count as supported
+
+    Returns:
+        Dictionary matching GroundingResult
+    """
+    similarity = sentence_embeddings @ chunk_embeddings.T
+    best_chunk = similarity.argmax(axis=1)
+    best = similarity[np.arange(len(sentences)), best_chunk]
+    supported = best >= threshold
+
+    return {
+        "grounding_score": round(float(best.mean()), 4),
+        "min_sentence_score": round(float(best.min()), 4),
+        "supported_share": round(float(supported.mean()), 4),
+        "threshold": threshold,
+        "num_chunks": len(chunks),
+        "unsupported_sentences": [
+            {
+                "sentence": sentences[i],
+                "similarity": round(float(best[i]), 4),
+                "best_chunk": chunks[best_chunk[i]][:200]
+            }
+            for i in np.flatnonzero(~supported)
+        ]
+    }
@@ -1,8 +1,18 @@
+import asyncio
 import logging
 import os
-from fastapi import FastAPI, HTTPException
-from schemas import LLMOutput, ValidateOutput, BiasCheckResult
+import time
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, List, Optional
+from schemas import (
+    LLMOutput, ValidateOutput, BiasCheckResult, CommentCoverageResult, GroundingResult,
+    ValidateBatchInput, ValidateBatchOutput
+)
 from bias_monitor import get_bias_monitor
+from encoder_pool import EncoderPool
+from score_monitor import ScoreMonitor
+from vidsynth_common.server_timing import add_server_timing
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -10,32 +20,291 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="VidSynth Validate Service")
 
+add_server_timing(app)
+
 # Configuration
 ENABLE_BIAS_CHECK = os.getenv("ENABLE_BIAS_CHECK", "true").lower() == "true"
 MIN_SUMMARY_LENGTH = 10
 
+# "thread": encode in Starlette's threadpool; "process": dedicated encoder worker processes
+BIAS_EXECUTION_MODE = os.getenv("BIAS_EXECUTION_MODE", "thread").lower()
+BIAS_POOL_WORKERS = int(os.getenv("BIAS_POOL_WORKERS", "2"))
+BIAS_POOL_MAX_BATCH = int(os.getenv("BIAS_POOL_MAX_BATCH", "64"))
+BIAS_POOL_MAX_WAIT_MS = float(os.getenv("BIAS_POOL_MAX_WAIT_MS", "5"))
+BIAS_POOL_WORKER_THREADS = int(os.getenv("BIAS_POOL_WORKER_THREADS", "1"))
+
+# Comment coverage: which comment clusters the comment summary reflects
+ENABLE_COMMENT_COVERAGE = os.getenv("ENABLE_COMMENT_COVERAGE", "true").lower() == "true"
+COMMENT_CLUSTER_THRESHOLD = float(os.getenv("COMMENT_CLUSTER_THRESHOLD", "0.55"))
+COMMENT_COVERAGE_THRESHOLD = float(os.getenv("COMMENT_COVERAGE_THRESHOLD", "0.40"))
+COMMENT_COVERAGE_MIN_SHARE = float(os.getenv("COMMENT_COVERAGE_MIN_SHARE", "0.5"))
+COMMENT_COVERAGE_MAX_COMMENTS = int(os.getenv("COMMENT_COVERAGE_MAX_COMMENTS", "5000"))
+# The thresholds above are not calibrated yet: low coverage is only reported
+# (low_coverage on the result) unless this is set, in which case it fails validation
+COMMENT_COVERAGE_ENFORCE = os.getenv("COMMENT_COVERAGE_ENFORCE", "false").lower() == "true"
+
+# Grounding: every video-summary sentence should be supported by a transcript chunk
+ENABLE_GROUNDING_CHECK = os.getenv("ENABLE_GROUNDING_CHECK", "true").lower() == "true"
+GROUNDING_THRESHOLD = float(os.getenv("GROUNDING_THRESHOLD", "0.35"))
+GROUNDING_MIN_SUPPORTED = float(os.getenv("GROUNDING_MIN_SUPPORTED", "0.6"))
+GROUNDING_CHUNK_WORDS = int(os.getenv("GROUNDING_CHUNK_WORDS", "80"))
+GROUNDING_CHUNK_OVERLAP = int(os.getenv("GROUNDING_CHUNK_OVERLAP", "20"))
+# Uncalibrated like the coverage thresholds: weak grounding is reported (weakly_grounded
+# and the unsupported sentences) and only fails validation when this is set
+GROUNDING_ENFORCE = os.getenv("GROUNDING_ENFORCE", "false").lower() == "true"
+
+encoder_pool: Optional[EncoderPool] = None
+
+# Rolling score distributions with drift alerts (see /monitor/scores)
+score_monitor = ScoreMonitor(
+    window_seconds=float(os.getenv("SCORE_MONITOR_WINDOW_SECONDS", "3600")),
+    buckets=int(os.getenv("SCORE_MONITOR_BUCKETS", "12")),
+    bins=int(os.getenv("SCORE_MONITOR_BINS", "50")),
+    psi_threshold=float(os.getenv("SCORE_DRIFT_PSI_THRESHOLD", "0.2")),
+    min_samples=int(os.getenv("SCORE_DRIFT_MIN_SAMPLES", "200"))
+)
+
+# Readiness of the bias model: "loading" until the background load finishes
+model_state = {"status": "loading", "load_seconds": None, "error": None}
+
+def load_bias_model():
+    """Load and warm up the bias monitor, recording the outcome for /ready."""
+    start = time.perf_counter()
+    try:
+        if encoder_pool is not None:
+            encoder_pool.warm_up()
+        else:
+            get_bias_monitor().warm_up()
+        model_state.update(status="ready", load_seconds=round(time.perf_counter() - start, 3))
+        logger.info(f"✅ Bias monitor initialized successfully in {model_state['load_seconds']}s")
+    except Exception as e:
+        model_state.update(status="failed", error=str(e))
+        logger.error(f"❌ Failed to initialize bias monitor: {e}")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize resources on startup."""
+    global encoder_pool
     logger.info("VidSynth Validate Service starting up...")
     
     if ENABLE_BIAS_CHECK:
-        try:
-            get_bias_monitor()
-            logger.info("✅ Bias monitor initialized successfully")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize bias monitor: {e}")
+        if BIAS_EXECUTION_MODE == "process":
+            encoder_pool = EncoderPool(
+                workers=BIAS_POOL_WORKERS,
+                max_batch_size=BIAS_POOL_MAX_BATCH,
+                max_wait_ms=BIAS_POOL_MAX_WAIT_MS,
+                worker_threads=BIAS_POOL_WORKER_THREADS
+            )
+        # Load off the event loop so / and /ready answer while the model warms up
+        asyncio.get_running_loop().run_in_executor(None, load_bias_model)
+    else:
+        model_state["status"] = "ready"
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop the encoder worker processes."""
+    global encoder_pool
+    if encoder_pool is not None:
+        encoder_pool.shutdown()
+        encoder_pool = None
 
 @app.get("/")
 def root():
     return {"message": "VidSynth Validate Service Running"}
 
-@app.post("/validate", response_model=ValidateOutput)
-def validate(request: LLMOutput):
-    logger.info(f"VALIDATE: Starting validation for video_id={request.video_id}")
-    
+@app.get("/ready")
+def ready(response: Response):
+    """Readiness probe: 200 only once the bias model is loaded and warmed up."""
+    if ENABLE_BIAS_CHECK and model_state["status"] != "ready":
+        response.status_code = 503
+    return model_state
+
+@app.get("/stats/embedding-cache")
+def embedding_cache_stats():
+    """Hit rates for the bias monitor's embedding cache."""
+    if not ENABLE_BIAS_CHECK or encoder_pool is not None:
+        # In process mode each worker owns its own cache
+        return {"enabled": False}
+    cache = get_bias_monitor().cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@app.get("/stats/transcript-cache")
+def transcript_cache_stats():
+    """Hit rates for the per-video transcript chunk embeddings used by grounding."""
+    if not ENABLE_BIAS_CHECK or encoder_pool is not None:
+        return {"enabled": False}
+    cache = get_bias_monitor().transcript_cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@app.get("/monitor/scores")
+def monitor_scores(histograms: bool = False):
+    """Rolling and lifetime score distributions per summary type and language, with drift alerts."""
+    return score_monitor.snapshot(include_histograms=histograms)
+
+@app.post("/monitor/scores/reference")
+def pin_score_reference():
+    """Use the current rolling window as the new drift reference for every series."""
+    return {"pinned": score_monitor.pin_reference()}
+
+def record_scores(
+    request: LLMOutput,
+    bias_check: Optional[BiasCheckResult],
+    coverage: Optional[CommentCoverageResult],
+    grounding: Optional[GroundingResult]
+):
+    """Feed this item's scores into the drift monitor."""
+    if bias_check is not None:
+        score_monitor.record("video", bias_check.similarity_score, request.language)
+    if coverage is not None:
+        score_monitor.record("comment_coverage", coverage.covered_share, request.language)
+    if grounding is not None:
+        score_monitor.record("grounding", grounding.grounding_score, request.language)
+
+@app.get("/thresholds")
+async def get_thresholds():
+    """Bias thresholds currently in effect (default plus category/language overrides)."""
+    if not ENABLE_BIAS_CHECK:
+        return {"enabled": False}
+    return await run_monitor("thresholds")
+
+@app.post("/thresholds/reload")
+async def reload_thresholds():
+    """
+    Re-read BIAS_THRESHOLDS_FILE now. Monitors also pick up file changes on their
+    own within a few seconds, which is how the other workers in process mode catch up.
+    """
+    if not ENABLE_BIAS_CHECK:
+        raise HTTPException(status_code=400, detail="Bias check is disabled")
+    try:
+        return await run_monitor("reload_thresholds")
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/stats/encoder-pool")
+def encoder_pool_stats():
+    """Coalescing stats for the encoder worker pool (process mode only)."""
+    if encoder_pool is None:
+        return {"execution_mode": BIAS_EXECUTION_MODE, "enabled": False}
+    return {"execution_mode": BIAS_EXECUTION_MODE, "enabled": True, **encoder_pool.stats()}
+
+async def check_bias(
+    video_title: str,
+    summary: str,
+    category: Optional[str] = None,
+    language: Optional[str] = None
+) -> Dict:
+    """Run one bias check off the event loop (worker pool or threadpool)."""
+    if encoder_pool is not None:
+        return (await encoder_pool.check_bias_many([video_title], [summary], [category], [language]))[0]
+    return await run_in_threadpool(
+        lambda: get_bias_monitor().check_bias(
+            video_title=video_title,
+            generated_summary=summary,
+            category=category,
+            language=language
+        )
+    )
+
+async def check_bias_many(
+    video_titles: List[str],
+    summaries: List[str],
+    categories: List[Optional[str]],
+    languages: List[Optional[str]]
+) -> List[Dict]:
+    """Batched check_bias, also off the event loop."""
+    if encoder_pool is not None:
+        return await encoder_pool.check_bias_many(video_titles, summaries, categories, languages)
+    return await run_in_threadpool(
+        lambda: get_bias_monitor().check_bias_many(
+            video_titles, summaries, categories=categories, languages=languages
+        )
+    )
+
+async def run_monitor(method: str, *args, **kwargs):
+    """Run a BiasMonitor method off the event loop (worker pool or threadpool)."""
+    if encoder_pool is not None:
+        return await encoder_pool.call_monitor(method, *args, **kwargs)
+    return await run_in_threadpool(
+        lambda: getattr(get_bias_monitor(), method)(*args, **kwargs)
+    )
+
+async def coverage_check(request: LLMOutput, issues: List[str]) -> Optional[CommentCoverageResult]:
+    """Comment coverage for one item; missed major clusters are flagged, and recorded as an issue if enforced."""
+    if not (ENABLE_BIAS_CHECK and ENABLE_COMMENT_COVERAGE and request.comments):
+        return None
+    if not request.comment_summary or "No comments available" in request.comment_summary:
+        return None
+
+    comments = [c.strip() for c in request.comments.split("\n") if c.strip()][:COMMENT_COVERAGE_MAX_COMMENTS]
+    if not comments:
+        return None
+
+    try:
+        result = await run_monitor(
+            "check_comment_coverage",
+            comments,
+            request.comment_summary,
+            cluster_threshold=COMMENT_CLUSTER_THRESHOLD,
+            coverage_threshold=COMMENT_COVERAGE_THRESHOLD
+        )
+    except Exception as e:
+        logger.error(f"Comment coverage failed: {e}")
+        issues.append(f"Comment coverage error: {str(e)}")
+        return None
+
+    share = result["covered_share"]
+    low_coverage = bool(result["num_major_clusters"]) and share < COMMENT_COVERAGE_MIN_SHARE
+    if low_coverage:
+        logger.warning(f"⚠️ LOW COMMENT COVERAGE: {share:.2f} < {COMMENT_COVERAGE_MIN_SHARE:.2f}")
+        if COMMENT_COVERAGE_ENFORCE:
+            issues.append(f"Comment summary misses major discussion points: covers {share:.0%} of clustered comments.")
+
+    return CommentCoverageResult(**result, low_coverage=low_coverage)
+
+async def grounding_check(request: LLMOutput, issues: List[str]) -> Optional[GroundingResult]:
+    """Transcript grounding for one item; too few supported sentences are flagged, and recorded as an issue if enforced."""
+    if not (ENABLE_BIAS_CHECK and ENABLE_GROUNDING_CHECK and request.transcript):
+        return None
+    if not request.video_summary or "No transcript available" in request.video_summary:
+        return None
+
+    try:
+        result = await run_monitor(
+            "check_grounding",
+            request.video_id,
+            request.transcript,
+            request.video_summary,
+            threshold=GROUNDING_THRESHOLD,
+            chunk_words=GROUNDING_CHUNK_WORDS,
+            overlap=GROUNDING_CHUNK_OVERLAP
+        )
+    except Exception as e:
+        logger.error(f"Grounding check failed: {e}")
+        issues.append(f"Grounding check error: {str(e)}")
+        return None
+
+    if result is None:
+        return None
+
+    share = result["supported_share"]
+    weakly_grounded = share < GROUNDING_MIN_SUPPORTED
+    if weakly_grounded:
+        logger.warning(f"⚠️ WEAK GROUNDING: {share:.2f} < {GROUNDING_MIN_SUPPORTED:.2f}")
+        if GROUNDING_ENFORCE:
+            issues.append(
+                f"Video summary is weakly grounded: {len(result['unsupported_sentences'])} sentence(s) "
+                f"have no supporting transcript passage ({share:.0%} supported)."
+            )
+
+    return GroundingResult(**result, weakly_grounded=weakly_grounded)
+
+def quality_issues(request: LLMOutput) -> List[str]:
+    """Length and placeholder checks on both summaries."""
     issues = []
-    bias_check_result = None
 
     if not request.video_summary or "No transcript available" in request.video_summary:
         issues.append("Video summary is missing.")
@@ -47,36 +316,63 @@ def validate(request: LLMOutput):
     elif len(request.comment_summary.split()) < MIN_SUMMARY_LENGTH:
         issues.append("Comment summary is too short.")
 
+    return issues
+
+def apply_bias_result(bias_result: Dict, issues: List[str], video_id: Optional[str] = None) -> BiasCheckResult:
+    """Turn a BiasMonitor result into the response object, recording any bias issue."""
+    bias_check_result = BiasCheckResult(
+        similarity_score=bias_result.get("similarity_score"),
+        is_biased=bias_result.get("is_biased", False),
+        threshold=bias_result.get("threshold", 0.30),
+        summary_preview=bias_result.get("summary_preview", ""),
+        video_title=bias_result.get("video_title")
+    )
+    
+    if bias_result.get("is_biased"):
+        score = bias_result.get("similarity_score", 0)
+        issues.append(f"Potential bias detected: Low similarity ({score:.2f}) between title and summary.")
+        logger.warning(f"⚠️ BIAS DETECTED for {video_id}: Score {score:.4f} < {bias_check_result.threshold:.2f}")
+    elif bias_check_result.similarity_score is not None:
+        # calibrate.py reads these lines (one per video) back as historical scores
+        logger.info(f"✅ Bias Check Passed for {video_id}: Score {bias_check_result.similarity_score:.4f}")
+    else:
+        logger.info("✅ Bias Check Passed.")
+
+    return bias_check_result
+
+@app.post("/validate", response_model=ValidateOutput)
+async def validate(request: LLMOutput, response: Response):
+    logger.info(f"VALIDATE: Starting validation for video_id={request.video_id}")
+    
+    issues = quality_issues(request)
+    bias_check_result = None
+    timings = {}
+    start = time.perf_counter()
+
     if ENABLE_BIAS_CHECK and request.video_title:
         logger.info(f"Performing bias detection against title: '{request.video_title}'")
         try:
-            monitor = get_bias_monitor()
-            
-            bias_result = monitor.check_bias(
-                video_title=request.video_title,
-                generated_summary=request.video_summary
-            )
-            
-            # Create Result Object
-            bias_check_result = BiasCheckResult(
-                similarity_score=bias_result.get("similarity_score"),
-                is_biased=bias_result.get("is_biased", False),
-                threshold=bias_result.get("threshold", 0.30),
-                summary_preview=bias_result.get("summary_preview", ""),
-                video_title=bias_result.get("video_title")
+            bias_result = await check_bias(
+                request.video_title,
+                request.video_summary,
+                category=request.category,
+                language=request.language
             )
             
-            if bias_result.get("is_biased"):
-                score = bias_result.get("similarity_score", 0)
-                issues.append(f"Potential bias detected: Low similarity ({score:.2f}) between title and summary.")
-                logger.warning(f"⚠️ BIAS DETECTED: Score {score:.2f} < 0.30")
-            else:
-                logger.info("✅ Bias Check Passed.")
+            bias_check_result = apply_bias_result(bias_result, issues, request.video_id)
                 
         except Exception as e:
             logger.error(f"Bias detection failed: {e}")
             issues.append(f"Bias check error: {str(e)}")
 
+    timings["bias"], start = time.perf_counter() - start, time.perf_counter()
+    comment_coverage = await coverage_check(request, issues)
+    timings["coverage"], start = time.perf_counter() - start, time.perf_counter()
+    grounding = await grounding_check(request, issues)
+    timings["grounding"] = time.perf_counter() - start
+    response.headers["Server-Timing"] = ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
+    record_scores(request, bias_check_result, comment_coverage, grounding)
+
     is_valid = len(issues) == 0
     
     return ValidateOutput(
@@ -85,5 +381,56 @@ def validate(request: LLMOutput):
         comment_summary=request.comment_summary,
         is_valid=is_valid,
         issues=issues,
-        bias_check=bias_check_result
-    )
\ No newline at end of file
+        bias_check=bias_check_result,
+        comment_coverage=comment_coverage,
+        grounding=grounding
+    )
+
+@app.post("/validate/batch", response_model=ValidateBatchOutput)
+async def validate_batch(request: ValidateBatchInput):
+    """
+    Validate many LLM outputs at once. Bias checks for the whole batch share a
+    single encoder pass via BiasMonitor.check_bias_many.
+    """
+    items = request.items
+    logger.info(f"VALIDATE: Starting batch validation for {len(items)} item(s)")
+
+    all_issues = [quality_issues(item) for item in items]
+    bias_checks = [None] * len(items)
+
+    to_check = [i for i, item in enumerate(items) if item.video_title]
+    if ENABLE_BIAS_CHECK and to_check:
+        try:
+            bias_results = await check_bias_many(
+                [items[i].video_title for i in to_check],
+                [items[i].video_summary for i in to_check],
+                [items[i].category for i in to_check],
+                [items[i].language for i in to_check]
+            )
+
+            for i, bias_result in zip(to_check, bias_results):
+                bias_checks[i] = apply_bias_result(bias_result, all_issues[i], items[i].video_id)
+
+        except Exception as e:
+            logger.error(f"Batch bias detection failed: {e}")
+            for i in to_check:
+                all_issues[i].append(f"Bias check error: {str(e)}")
+
+    coverages = await asyncio.gather(*(coverage_check(item, issues) for item, issues in zip(items, all_issues)))
+    groundings = await asyncio.gather(*(grounding_check(item, issues) for item, issues in zip(items, all_issues)))
+    for item, bias_check, coverage, grounding in zip(items, bias_checks, coverages, groundings):
+        record_scores(item, bias_check, coverage, grounding)
+
+    return ValidateBatchOutput(results=[
+        ValidateOutput(
+            video_id=item.video_id,
+            video_summary=item.video_summary,
+            comment_summary=item.comment_summary,
+            is_valid=len(issues) == 0,
+            issues=issues,
+            bias_check=bias_check,
+            comment_coverage=coverage,
+            grounding=grounding
+        )
+        for item, issues, bias_check, coverage, grounding in zip(items, all_issues, bias_checks, coverages, groundings)
+    ])
\ No newline at end of file
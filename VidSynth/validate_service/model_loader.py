@@ -0,0 +1,213 @@
+"""
+Model Loader Module
+Loads the bias monitor's sentence-transformer from a pinned local artifact
+directory instead of the Hugging Face hub. Every file is checked against the
+sha256 checksums in the directory's manifest.json, weights must be safetensors
+(memory-mapped on load rather than unpickled), and the hub is never contacted.
+
+Artifacts are baked from a fixed hub commit, recorded in the manifest; loading
+with an expected revision (BIAS_MODEL_REVISION) rejects an artifact baked from
+any other, so a moved branch on the hub cannot change the model silently.
+
+Bake an artifact (needs network once, e.g. at image build time):
+    python model_loader.py bake all-MiniLM-L6-v2 /app/models/all-MiniLM-L6-v2 --revision <commit hash>
+
+Re-generate the manifest for an existing directory:
+    python model_loader.py manifest /app/models/all-MiniLM-L6-v2
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+WARMUP_TEXT = "VidSynth warm-up sentence."
+# Branches and tags can move; only a full commit hash pins the download
+_COMMIT_HASH = re.compile(r"[0-9a-f]{40}")
+
+
+class ModelArtifactError(RuntimeError):
+    """The local model artifact is missing, incomplete or fails verification."""
+
+
+def _sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_manifest(model_dir: str, model_name: Optional[str] = None, revision: Optional[str] = None) -> Dict:
+    """
+    Record a sha256 checksum for every file under model_dir in manifest.json,
+    along with the hub revision the files came from (None if unknown).
+
+    Returns:
+        The manifest that was written
+    """
+    files = {}
+    for root, _, names in os.walk(model_dir):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, model_dir)
+            if rel == MANIFEST_FILE:
+                continue
+            files[rel] = _sha256(path)
+
+    manifest = {
+        "model_name": model_name or os.path.basename(os.path.normpath(model_dir)),
+        "revision": revision,
+        "files": files
+    }
+    with open(os.path.join(model_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    logger.info(f"Wrote manifest for {len(files)} file(s) in {model_dir}")
+    return manifest
+
+
+def verify_model_dir(model_dir: str, revision: Optional[str] = None) -> Dict:
+    """
+    Check model_dir against its manifest.
+
+    Args:
+        model_dir: Directory holding the artifact and its manifest.json
+        revision: Hub commit the artifact must have been baked from (None skips the check)
+
+    Returns:
+        The parsed manifest
+
+    Raises:
+        ModelArtifactError: Missing manifest or files, checksum mismatch,
+            weights that are not safetensors, or a different revision
+    """
+    manifest_path = os.path.join(model_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise ModelArtifactError(f"No {MANIFEST_FILE} in {model_dir}")
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if revision and manifest.get("revision") != revision:
+        raise ModelArtifactError(
+            f"{model_dir} was baked from revision {manifest.get('revision') or 'unknown'}, expected {revision}"
+        )
+
+    files = manifest.get("files", {})
+    if not any(name.endswith(".safetensors") for name in files):
+        raise ModelArtifactError(f"No safetensors weights listed in {manifest_path}")
+
+    for rel, expected in files.items():
+        path = os.path.join(model_dir, rel)
+        if not os.path.exists(path):
+            raise ModelArtifactError(f"Missing model file: {rel}")
+        actual = _sha256(path)
+        if actual != expected:
+            raise ModelArtifactError(f"Checksum mismatch for {rel}: expected {expected[:12]}, got {actual[:12]}")
+
+    return manifest
+
+
+def enable_offline_mode():
+    """Stop transformers / huggingface_hub from making any network calls."""
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+    # Both libraries snapshot the variables at import time, which has usually happened already
+    hub_constants = sys.modules.get("huggingface_hub.constants")
+    if hub_constants is not None:
+        hub_constants.HF_HUB_OFFLINE = True
+    transformers_hub = sys.modules.get("transformers.utils.hub")
+    if transformers_hub is not None and hasattr(transformers_hub, "_is_offline_mode"):
+        transformers_hub._is_offline_mode = True
+
+
+def load_local_model(model_dir: str, verify: bool = True, warm_up: bool = True, revision: Optional[str] = None):
+    """
+    Load a SentenceTransformer from a verified local artifact, fully offline.
+
+    Args:
+        model_dir: Directory produced by `bake` (or any saved model plus manifest)
+        verify: Check file checksums before loading
+        warm_up: Run one dummy encode so the first request doesn't pay for it
+        revision: Hub commit the artifact must have been baked from
+
+    Returns:
+        The loaded SentenceTransformer
+    """
+    enable_offline_mode()
+    from sentence_transformers import SentenceTransformer
+
+    start = time.perf_counter()
+    if verify:
+        verify_model_dir(model_dir, revision)
+    elif not os.path.isdir(model_dir):
+        raise ModelArtifactError(f"Model directory not found: {model_dir}")
+    verified = time.perf_counter()
+
+    # transformers prefers model.safetensors when present and mmaps it instead of unpickling
+    model = SentenceTransformer(model_dir, device="cpu")
+    loaded = time.perf_counter()
+
+    if warm_up:
+        model.encode([WARMUP_TEXT], show_progress_bar=False)
+
+    logger.info(
+        f"📦 Loaded local model from {model_dir} "
+        f"(verify {verified - start:.2f}s, load {loaded - verified:.2f}s, "
+        f"warm-up {time.perf_counter() - loaded:.2f}s)"
+    )
+    return model
+
+
+def bake(model_name: str, model_dir: str, revision: str) -> Dict:
+    """Download model_name at revision (a commit hash), save it as safetensors and write its manifest."""
+    if not _COMMIT_HASH.fullmatch(revision or ""):
+        raise ValueError(f"revision must be a full 40-character commit hash, got {revision!r}")
+    from sentence_transformers import SentenceTransformer
+
+    SentenceTransformer(model_name, device="cpu", revision=revision).save(model_dir, safe_serialization=True)
+    return write_manifest(model_dir, model_name, revision)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prepare pinned model artifacts for the validate service")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bake_cmd = sub.add_parser("bake", help="Download a model and write its manifest")
+    bake_cmd.add_argument("model_name")
+    bake_cmd.add_argument("model_dir")
+    bake_cmd.add_argument("--revision", required=True, help="Hub commit hash to download")
+
+    manifest_cmd = sub.add_parser("manifest", help="Write a manifest for an existing model directory")
+    manifest_cmd.add_argument("model_dir")
+    manifest_cmd.add_argument("--model-name")
+    manifest_cmd.add_argument("--revision", help="Hub commit the files came from")
+
+    verify_cmd = sub.add_parser("verify", help="Check a model directory against its manifest")
+    verify_cmd.add_argument("model_dir")
+    verify_cmd.add_argument("--revision", help="Expected hub commit")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "bake":
+        bake(args.model_name, args.model_dir, args.revision)
+    elif args.command == "manifest":
+        write_manifest(args.model_dir, args.model_name, args.revision)
+    else:
+        verify_model_dir(args.model_dir, args.revision)
+        logger.info(f"✅ {args.model_dir} matches its manifest")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+ONNX Encoder Module
+CPU inference backend for BiasMonitor. Exports the sentence-transformer's
+transformer body to ONNX once, applies int8 dynamic quantisation, and runs it
+through onnxruntime with the same tokenisation and pooling. Exposes the subset
+of SentenceTransformer.encode that BiasMonitor uses.
+
+Requires the optional `onnxruntime` and `onnx` packages.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "vidsynth", "onnx")
+INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+def _pooling_mode(pooling_module) -> str:
+    """Read the pooling mode across sentence-transformers config layouts."""
+    config = pooling_module.get_config_dict()
+    if "pooling_mode" in config:
+        return config["pooling_mode"]
+    if config.get("pooling_mode_cls_token"):
+        return "cls"
+    if config.get("pooling_mode_mean_tokens"):
+        return "mean"
+    raise ValueError(f"Unsupported pooling configuration for ONNX export: {config}")
+
+
+def export_onnx(model_name: str, out_dir: str, quantize: bool = True) -> str:
+    """
+    Export a sentence-transformer to ONNX (optionally int8-quantised) in out_dir.
+
+    Returns:
+        Path to the ONNX file the encoder should load
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    logger.info(f"Exporting {model_name} to ONNX in {out_dir}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    pooling = _pooling_mode(st_model[1])
+    if pooling not in ("mean", "cls"):
+        raise ValueError(f"Unsupported pooling mode for ONNX export: {pooling}")
+
+    class _Body(torch.nn.Module):
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.auto_model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    tokenizer = st_model.tokenizer
+    dummy = tokenizer(["warm up sentence"], return_tensors="pt", padding=True)
+    if "token_type_ids" not in dummy:
+        dummy["token_type_ids"] = torch.zeros_like(dummy["input_ids"])
+
+    fp32_path = os.path.join(out_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            _Body(st_model[0].auto_model).eval(),
+            tuple(dummy[name] for name in INPUT_NAMES),
+            fp32_path,
+            input_names=INPUT_NAMES,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES + ["last_hidden_state"]},
+            opset_version=14,
+            dynamo=False
+        )
+
+    model_path = fp32_path
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        model_path = os.path.join(out_dir, "model_int8.onnx")
+        quantize_dynamic(fp32_path, model_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(out_dir)
+    with open(os.path.join(out_dir, "encoder_config.json"), "w") as f:
+        json.dump({
+            "model_name": model_name,
+            "pooling": pooling,
+            "max_seq_length": st_model.max_seq_length,
+            "model_file": os.path.basename(model_path)
+        }, f)
+
+    logger.info(f"ONNX export complete: {model_path}")
+    return model_path
+
+
+class OnnxEncoder:
+    """
+    onnxruntime-backed encoder with a SentenceTransformer-compatible encode().
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        export_dir: Optional[str] = None,
+        quantize: bool = True,
+        num_threads: Optional[int] = None
+    ):
+        """
+        Args:
+            model_name: Sentence transformer model (hub name or local path) to export
+            export_dir: Where exported models live; reused across restarts
+            quantize: Use int8 dynamic quantisation (False keeps fp32 ONNX)
+            num_threads: onnxruntime intra-op threads (default: onnxruntime's choice)
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "The ONNX bias backend needs onnxruntime and onnx (pip install onnxruntime onnx)"
+            ) from e
+        from transformers import AutoTokenizer
+
+        slug = model_name.strip("/").replace("/", "__") + ("-int8" if quantize else "-fp32")
+        out_dir = os.path.join(export_dir or DEFAULT_EXPORT_DIR, slug)
+        config_file = os.path.join(out_dir, "encoder_config.json")
+
+        if not os.path.exists(config_file):
+            export_onnx(model_name, out_dir, quantize=quantize)
+
+        with open(config_file) as f:
+            self.config: Dict = json.load(f)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(out_dir)
+        self.max_seq_length = self.config["max_seq_length"]
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            os.path.join(out_dir, self.config["model_file"]),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        logger.info(f"OnnxEncoder ready ({self.config['model_file']}, pooling={self.config['pooling']})")
+
+    def encode(self, sentences: List[str], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Encode sentences into (unnormalised) pooled embeddings."""
+        chunks = []
+        for start in range(0, len(sentences), batch_size):
+            batch = sentences[start:start + batch_size]
+            tokens = self.tokenizer(
+                batch,
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            feeds = {
+                name: tokens[name].astype(np.int64)
+                for name in INPUT_NAMES if name in self._input_names and name in tokens
+            }
+            if "token_type_ids" in self._input_names and "token_type_ids" not in feeds:
+                feeds["token_type_ids"] = np.zeros_like(feeds["input_ids"])
+
+            hidden = self.session.run(None, feeds)[0]
+            chunks.append(self._pool(hidden, tokens["attention_mask"]))
+
+        return np.vstack(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+
+    def _pool(self, hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        if self.config["pooling"] == "cls":
+            return hidden[:, 0]
+        mask = attention_mask[..., None].astype(hidden.dtype)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
@@ -9,12 +9,48 @@ class BiasCheckResult(BaseModel):
     summary_preview: Optional[str] = None
     video_title: Optional[str] = None
 
+# --- Comment Coverage Schemas ---
+class CommentCluster(BaseModel):
+    size: int
+    representative: str
+    similarity: float
+
+class CommentCoverageResult(BaseModel):
+    num_comments: int
+    num_clusters: int
+    num_major_clusters: int
+    covered_share: float
+    comment_share_covered: float
+    threshold: float
+    covered_clusters: List[CommentCluster]
+    missed_clusters: List[CommentCluster]
+    low_coverage: bool = False  # covered_share below COMMENT_COVERAGE_MIN_SHARE
+
+# --- Grounding Schemas ---
+class UnsupportedSentence(BaseModel):
+    sentence: str
+    similarity: float
+    best_chunk: str
+
+class GroundingResult(BaseModel):
+    grounding_score: float
+    min_sentence_score: float
+    supported_share: float
+    threshold: float
+    num_chunks: int
+    unsupported_sentences: List[UnsupportedSentence]
+    weakly_grounded: bool = False  # supported_share below GROUNDING_MIN_SUPPORTED
+
 # --- Input Schema (From LLM) ---
 class LLMOutput(BaseModel):
     video_id: str
     video_summary: str
     comment_summary: str
     video_title: Optional[str] = None 
+    comments: Optional[str] = None  # newline-joined comments the summary was built from
+    transcript: Optional[str] = None  # transcript the video summary was built from
+    language: Optional[str] = None  # e.g. "en"; used to split score monitoring
+    category: Optional[str] = None  # e.g. "education"; selects a calibrated bias threshold
 
 # --- Output Schema (To Push) ---
 class ValidateOutput(BaseModel):
@@ -23,4 +59,13 @@ class ValidateOutput(BaseModel):
     comment_summary: str
     is_valid: bool
     issues: List[str]
-    bias_check: Optional[BiasCheckResult] = None
\ No newline at end of file
+    bias_check: Optional[BiasCheckResult] = None
+    comment_coverage: Optional[CommentCoverageResult] = None
+    grounding: Optional[GroundingResult] = None
+
+# --- Batch Schemas ---
+class ValidateBatchInput(BaseModel):
+    items: List[LLMOutput]
+
+class ValidateBatchOutput(BaseModel):
+    results: List[ValidateOutput]
\ No newline at end of file
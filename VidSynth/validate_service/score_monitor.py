@@ -0,0 +1,282 @@
+"""
+Score Monitor Module
+In-process, constant-memory monitor for validation scores (bias similarity,
+grounding, comment coverage), kept per summary type and language.
+
+For every series it keeps:
+- a rolling window of fixed-bin histograms in a ring of time buckets, so old
+  scores age out without being stored;
+- a reference histogram, pinned once the series has run for a full window
+  with enough scores (or on demand);
+- a KLL quantile sketch over the series lifetime.
+
+The rolling window is compared with the reference using the population
+stability index (PSI). A drift alert is raised when it crosses a threshold.
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang, Liberty 2016). Memory is bounded by
+    roughly 3k items however many values are added; rank error is about 1.7/k.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self._levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def add(self, value: float):
+        self._levels[0].append(value)
+        self.count += 1
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append([])
+                items.sort()
+                # Promote every other item (random offset) to the next level at double weight
+                offset = self._rng.randint(0, 1)
+                keep_odd = items[-1] if len(items) % 2 else None
+                pairs = items[:len(items) - (1 if keep_odd is not None else 0)]
+                self._levels[level + 1].extend(pairs[offset::2])
+                self._levels[level] = [keep_odd] if keep_odd is not None else []
+            level += 1
+
+    def quantiles(self, qs=QUANTILES) -> Dict[str, Optional[float]]:
+        weighted = sorted(
+            (value, 1 << level) for level, items in enumerate(self._levels) for value in items
+        )
+        if not weighted:
+            return {f"p{int(q * 100)}": None for q in qs}
+
+        values = np.array([v for v, _ in weighted])
+        cumulative = np.cumsum([w for _, w in weighted])
+        total = cumulative[-1]
+        return {
+            f"p{int(q * 100)}": round(float(values[min(np.searchsorted(cumulative, q * total), len(values) - 1)]), 4)
+            for q in qs
+        }
+
+    def size(self) -> int:
+        return sum(len(items) for items in self._levels)
+
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray, bins: int = 10, eps: float = 1e-4) -> float:
+    """
+    PSI between two histograms (counts); 0 = identical, > 0.2 is usually called drift.
+    Fine histograms are first merged into `bins` groups, since sparse bins make PSI
+    mostly sampling noise.
+    """
+    if len(expected) > bins:
+        starts = np.linspace(0, len(expected), bins, endpoint=False).astype(int)
+        expected = np.add.reduceat(expected, starts)
+        actual = np.add.reduceat(actual, starts)
+    e = expected / max(expected.sum(), 1)
+    a = actual / max(actual.sum(), 1)
+    e = np.maximum(e, eps)
+    a = np.maximum(a, eps)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+class ScoreSeries:
+    """Rolling histogram window, pinned reference and lifetime sketch for one series."""
+
+    def __init__(self, bins: np.ndarray, window_seconds: float, buckets: int, sketch_k: int):
+        self.edges = bins
+        self.bucket_seconds = window_seconds / buckets
+        self.ring = np.zeros((buckets, len(bins) - 1), dtype=np.int64)
+        self.ring_epoch = np.full(buckets, -1, dtype=np.int64)
+        self.reference: Optional[np.ndarray] = None
+        self.reference_pinned_at: Optional[float] = None
+        self.sketch = KLLSketch(sketch_k)
+        self.total = 0
+        self.first_seen: Optional[float] = None
+        self.alerting = False
+
+    def _bin(self, score: float) -> int:
+        return int(np.clip(np.searchsorted(self.edges, score, side="right") - 1, 0, len(self.edges) - 2))
+
+    def add(self, score: float, now: float):
+        epoch = int(now // self.bucket_seconds)
+        slot = epoch % len(self.ring)
+        if self.ring_epoch[slot] != epoch:
+            self.ring[slot] = 0
+            self.ring_epoch[slot] = epoch
+        self.ring[slot, self._bin(score)] += 1
+        self.sketch.add(score)
+        self.total += 1
+        if self.first_seen is None:
+            self.first_seen = now
+
+    def window(self, now: float) -> np.ndarray:
+        oldest = int(now // self.bucket_seconds) - len(self.ring) + 1
+        live = self.ring_epoch >= oldest
+        return self.ring[live].sum(axis=0)
+
+    def window_quantiles(self, hist: np.ndarray) -> Dict[str, Optional[float]]:
+        """Quantiles interpolated within histogram bins."""
+        n = hist.sum()
+        if n == 0:
+            return {f"p{int(q * 100)}": None for q in QUANTILES}
+        cumulative = np.cumsum(hist)
+        out = {}
+        for q in QUANTILES:
+            target = q * n
+            i = int(np.searchsorted(cumulative, target))
+            below = cumulative[i - 1] if i > 0 else 0
+            frac = (target - below) / hist[i] if hist[i] else 0.0
+            out[f"p{int(q * 100)}"] = round(float(self.edges[i] + frac * (self.edges[i + 1] - self.edges[i])), 4)
+        return out
+
+
+class ScoreMonitor:
+    """
+    Per-(summary_type, language) score monitor with PSI drift alerting.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 3600.0,
+        buckets: int = 12,
+        bins: int = 50,
+        low: float = -0.2,
+        high: float = 1.0,
+        sketch_k: int = 200,
+        psi_threshold: float = 0.2,
+        min_samples: int = 200,
+        max_series: int = 64
+    ):
+        """
+        Args:
+            window_seconds: Length of the rolling window
+            buckets: Time buckets in the window ring (ageing granularity)
+            bins: Fixed histogram bins between low and high (out-of-range scores are clamped)
+            sketch_k: KLL accuracy parameter
+            psi_threshold: PSI above which a series is flagged as drifting
+            min_samples: Scores needed in both windows before pinning a reference or alerting
+            max_series: Cap on tracked series; new languages beyond it fold into "other"
+        """
+        self.edges = np.linspace(low, high, bins + 1)
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.sketch_k = sketch_k
+        self.psi_threshold = psi_threshold
+        self.min_samples = min_samples
+        self.max_series = max_series
+        self._series: Dict[Tuple[str, str], ScoreSeries] = {}
+        self._lock = threading.Lock()
+
+    def _get_series(self, summary_type: str, language: str) -> ScoreSeries:
+        key = (summary_type, language)
+        series = self._series.get(key)
+        if series is None:
+            if len(self._series) >= self.max_series:
+                key = (summary_type, "other")
+                series = self._series.get(key)
+            if series is None:
+                series = ScoreSeries(self.edges, self.window_seconds, self.buckets, self.sketch_k)
+                self._series[key] = series
+        return series
+
+    def record(self, summary_type: str, score: Optional[float], language: Optional[str] = None, now: Optional[float] = None):
+        """Add one score; pins the reference or checks drift as the window fills."""
+        if score is None or not math.isfinite(score):
+            return
+        now = time.time() if now is None else now
+        language = (language or "unknown").lower()
+
+        with self._lock:
+            series = self._get_series(summary_type, language)
+            series.add(score, now)
+            window = series.window(now)
+
+            if series.reference is None:
+                full_window = now - series.first_seen >= self.window_seconds
+                if full_window and window.sum() >= self.min_samples:
+                    series.reference = window.copy()
+                    series.reference_pinned_at = now
+                    logger.info(f"📌 Score reference pinned for {summary_type}/{language} ({int(window.sum())} scores)")
+                return
+
+            if window.sum() < self.min_samples:
+                return
+            psi = population_stability_index(series.reference, window)
+            drifting = psi > self.psi_threshold
+            if drifting and not series.alerting:
+                logger.warning(f"⚠️ SCORE DRIFT: {summary_type}/{language} PSI {psi:.3f} > {self.psi_threshold}")
+            elif series.alerting and not drifting:
+                logger.info(f"✅ Score drift cleared for {summary_type}/{language} (PSI {psi:.3f})")
+            series.alerting = drifting
+
+    def pin_reference(self, now: Optional[float] = None) -> int:
+        """Make each series' current window its new reference. Returns the number pinned."""
+        now = time.time() if now is None else now
+        pinned = 0
+        with self._lock:
+            for series in self._series.values():
+                window = series.window(now)
+                if window.sum() > 0:
+                    series.reference = window.copy()
+                    series.reference_pinned_at = now
+                    series.alerting = False
+                    pinned += 1
+        return pinned
+
+    def snapshot(self, now: Optional[float] = None, include_histograms: bool = False) -> Dict:
+        """Current state of every series, for the monitoring endpoint."""
+        now = time.time() if now is None else now
+        out = []
+        with self._lock:
+            for (summary_type, language), series in sorted(self._series.items()):
+                window = series.window(now)
+                psi = None
+                if series.reference is not None and window.sum() > 0:
+                    psi = round(population_stability_index(series.reference, window), 4)
+                entry = {
+                    "summary_type": summary_type,
+                    "language": language,
+                    "total": series.total,
+                    "window_count": int(window.sum()),
+                    "window_quantiles": series.window_quantiles(window),
+                    "lifetime_quantiles": series.sketch.quantiles(),
+                    "reference_count": int(series.reference.sum()) if series.reference is not None else 0,
+                    "reference_pinned_at": series.reference_pinned_at,
+                    "psi": psi,
+                    "drift_alert": series.alerting
+                }
+                if include_histograms:
+                    entry["window_histogram"] = window.tolist()
+                    entry["reference_histogram"] = series.reference.tolist() if series.reference is not None else None
+                out.append(entry)
+
+        return {
+            "window_seconds": self.window_seconds,
+            "psi_threshold": self.psi_threshold,
+            "bin_edges": [round(float(e), 4) for e in self.edges] if include_histograms else None,
+            "alerts": [f"{s['summary_type']}/{s['language']}" for s in out if s["drift_alert"]],
+            "series": out
+        }